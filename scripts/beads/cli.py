@@ -127,13 +127,56 @@ def list_issues(status: str, issue_type: str, parent: str, label: str, use_globa
             click.echo(f"{status_icon} {issue.id}: {issue.title}")
 
 
+def _echo_issue(issue) -> None:
+    """Human-readable issue details (``show`` without --json)."""
+    click.echo(f"ID: {issue.id}")
+    click.echo(f"Title: {issue.title}")
+    click.echo(f"Status: {issue.status.value}")
+    click.echo(f"Type: {issue.type.value}")
+    click.echo(f"Priority: {issue.priority}")
+    if issue.description:
+        click.echo(f"\nDescription:\n{issue.description}")
+    if issue.depends_on:
+        click.echo(f"\nDepends on: {', '.join(issue.depends_on)}")
+    if issue.blocks:
+        click.echo(f"Blocks: {', '.join(issue.blocks)}")
+    if issue.parent:
+        click.echo(f"Parent: {issue.parent}")
+    if issue.children:
+        click.echo(f"Children: {', '.join(issue.children)}")
+
+
 @cli.command()
-@click.argument('issue_id')
+@click.argument('issue_ids', nargs=-1, required=True)
 @click.option('--global', '-g', 'use_global', is_flag=True, help='Look in global beads (~/.claude/beads/)')
 @click.option('--json', 'as_json', is_flag=True, help='Output as JSON')
-def show(issue_id: str, use_global: bool, as_json: bool):
-    """Show issue details."""
+def show(issue_ids: tuple, use_global: bool, as_json: bool):
+    """Show issue details.
+
+    With several IDs, one invocation looks them all up: --json prints a list
+    of the issues found, unknown IDs are reported on stderr, and the exit
+    status is 0 either way.
+    """
     db = get_db(use_global=use_global)
+
+    if len(issue_ids) > 1:
+        issues = []
+        for issue_id in issue_ids:
+            issue = db.get(issue_id)
+            if issue:
+                issues.append(issue)
+            else:
+                click.echo(f"Issue not found: {issue_id}", err=True)
+        if as_json:
+            click.echo(json.dumps([i.to_dict() for i in issues], indent=2))
+        else:
+            for n, issue in enumerate(issues):
+                if n:
+                    click.echo("")
+                _echo_issue(issue)
+        return
+
+    issue_id = issue_ids[0]
     issue = db.get(issue_id)
 
     if not issue:
@@ -143,21 +186,7 @@ def show(issue_id: str, use_global: bool, as_json: bool):
     if as_json:
         click.echo(json.dumps(issue.to_dict(), indent=2))
     else:
-        click.echo(f"ID: {issue.id}")
-        click.echo(f"Title: {issue.title}")
-        click.echo(f"Status: {issue.status.value}")
-        click.echo(f"Type: {issue.type.value}")
-        click.echo(f"Priority: {issue.priority}")
-        if issue.description:
-            click.echo(f"\nDescription:\n{issue.description}")
-        if issue.depends_on:
-            click.echo(f"\nDepends on: {', '.join(issue.depends_on)}")
-        if issue.blocks:
-            click.echo(f"Blocks: {', '.join(issue.blocks)}")
-        if issue.parent:
-            click.echo(f"Parent: {issue.parent}")
-        if issue.children:
-            click.echo(f"Children: {', '.join(issue.children)}")
+        _echo_issue(issue)
 
 
 @cli.command()
@@ -218,10 +247,16 @@ def depend(issue_id: str, depends_on_id: str):
 
 
 @cli.command()
-def ready():
+@click.option('--label', '-l', default=None, help='Only ready issues with this label')
+@click.option('--json', 'as_json', is_flag=True, help='Output as JSON')
+def ready(label: str, as_json: bool):
     """Show issues ready to work (open, not blocked)."""
     db = get_db()
-    issues = db.ready()
+    issues = db.ready(label=label)
+
+    if as_json:
+        click.echo(json.dumps([i.to_dict() for i in issues], indent=2))
+        return
 
     if not issues:
         click.echo("No issues ready")
@@ -346,9 +381,7 @@ def add_label(issue_id: str, label: str):
         click.echo(f"Issue not found: {issue_id}", err=True)
         raise SystemExit(1)
 
-    if label not in issue.labels:
-        issue.labels.append(label)
-        db._rewrite_jsonl()
+    if db.add_label(issue_id, label):
         click.echo(f"Added label '{label}' to {issue_id}")
     else:
         click.echo(f"Issue {issue_id} already has label '{label}'")
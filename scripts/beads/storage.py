@@ -2,17 +2,26 @@
 ABOUTME: JSONL storage backend for Beads.
 ABOUTME: Provides file-based persistence with git-friendly format.
 """
+import contextlib
 import json
+import os
 import secrets
 import string
+from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 from filelock import FileLock
 
 from .models import Issue, IssueStatus, IssueType
 
 
+# Compact once the log holds this many lines AND more than COMPACT_RATIO
+# lines per live issue (i.e. mostly superseded snapshots).
+COMPACT_MIN_LINES = 1000
+COMPACT_RATIO = 4
+
+
 class BeadsDatabase:
     """
     JSONL-based storage for beads issues.
@@ -22,6 +31,19 @@ class BeadsDatabase:
         ├── issues.jsonl      # All issues (append-only, compacted periodically)
         ├── config.yaml       # Database configuration
         └── .gitignore        # Excludes temp files
+
+    issues.jsonl is a mutation log: every create/update appends the issue's
+    full new snapshot and the last line for an id wins on load. A mutation is
+    therefore one small append, not a rewrite of every issue; compact()
+    folds superseded lines away once they dominate the file.
+
+    Secondary indexes (status, label, parent, assignee -> ids) are kept in
+    memory alongside the cache, so list() only looks at matching issues.
+    The ready frontier is maintained incrementally too: a reverse-dependency
+    index plus, per issue, a count of its unresolved prerequisites. Closing
+    an issue touches only its dependents, and ready() reads the frontier
+    without visiting the rest of the graph. Mutate issues through this class
+    (update, add_label, ...) so the indexes stay in step.
     """
 
     def __init__(self, beads_dir: Path, prefix: str = "gz", event_emitter=None):
@@ -45,6 +67,27 @@ class BeadsDatabase:
         # In-memory cache (loaded from JSONL on first access)
         self._cache: Dict[str, Issue] = {}
         self._cache_loaded = False
+        self._log_lines = 0
+        # How far into issues.jsonl (and which inode) this instance has
+        # applied, so refresh() only reads what other processes appended.
+        self._log_offset = 0
+        self._log_inode: Optional[int] = None
+        # batch(): snapshots held back until the outermost batch exits
+        self._batch_depth = 0
+        self._pending: Dict[str, Issue] = {}
+
+        # Secondary indexes: field value -> issue ids
+        self._by_status: Dict[str, Set[str]] = defaultdict(set)
+        self._by_label: Dict[str, Set[str]] = defaultdict(set)
+        self._by_parent: Dict[str, Set[str]] = defaultdict(set)
+        self._by_assignee: Dict[str, Set[str]] = defaultdict(set)
+
+        # Ready frontier: dependency id -> ids that depend on it (dangling
+        # ids included), unresolved-prerequisite counts, and the open issues
+        # whose count is zero.
+        self._dependents: Dict[str, Set[str]] = defaultdict(set)
+        self._blocked_count: Dict[str, int] = {}
+        self._ready: Set[str] = set()
 
     def _generate_id(self) -> str:
         """Generate unique bead ID in format: prefix-xxxxx."""
@@ -58,32 +101,233 @@ class BeadsDatabase:
             return
 
         self._cache = {}
+        self._log_lines = 0
+        self._log_offset = 0
+        self._log_inode = None
         if self.issues_file.exists():
-            with open(self.issues_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        data = json.loads(line)
-                        issue = Issue.from_dict(data)
-                        self._cache[issue.id] = issue
+            with open(self.issues_file, 'rb') as f:
+                self._log_inode = os.fstat(f.fileno()).st_ino
+                data = f.read()
+            for issue in self._parse_lines(data):
+                self._cache[issue.id] = issue
         self._cache_loaded = True
+        self._rebuild_indexes()
+
+    def _parse_lines(self, data: bytes) -> List[Issue]:
+        """Issues from the complete lines of ``data``; advances the log offset past them."""
+        end = data.rfind(b'\n') + 1  # a torn last line is left for the next read
+        issues = []
+        for line in data[:end].decode('utf-8').splitlines():
+            line = line.strip()
+            if line:
+                self._log_lines += 1
+                issues.append(Issue.from_dict(json.loads(line)))
+        self._log_offset += end
+        return issues
+
+    def refresh(self) -> bool:
+        """Pick up issues other processes wrote since this instance last read the log.
+
+        Reads only the bytes appended since then and applies each snapshot
+        through the indexes; a compacted or replaced file triggers a full
+        reload. Long-lived callers (the loop runner) call this before each
+        read. Returns True if anything was applied.
+        """
+        if not self._cache_loaded:
+            self._load_cache()
+            return True
+        if self._batch_depth:
+            return False  # in-memory state is ahead of the file until the batch flushes
+        try:
+            st = self.issues_file.stat()
+        except FileNotFoundError:
+            return False
+        if (self._log_inode is not None and st.st_ino != self._log_inode) or st.st_size < self._log_offset:
+            self._cache_loaded = False
+            self._load_cache()
+            return True
+        if st.st_size == self._log_offset:
+            return False
+        with open(self.issues_file, 'rb') as f:
+            self._log_inode = os.fstat(f.fileno()).st_ino
+            f.seek(self._log_offset)
+            data = f.read()
+        issues = self._parse_lines(data)
+        for issue in issues:
+            self._apply_snapshot(issue)
+        return bool(issues)
+
+    def _apply_snapshot(self, issue: Issue) -> None:
+        """Replace (or add) an issue with a snapshot read from the log, keeping indexes in step."""
+        old = self._cache.get(issue.id)
+        if old is not None:
+            self._unindex(old)
+            was_blocking = self._blocks(issue.id)
+            old_deps = set(old.depends_on)
+        else:
+            was_blocking = False
+            old_deps = set()
+        self._cache[issue.id] = issue
+        self._index(issue)
+        self._set_depends_on(issue, old_deps)
+        is_blocking = self._blocks(issue.id)
+        if is_blocking != was_blocking:
+            self._propagate(issue.id, +1 if is_blocking else -1)
+
+    def _rebuild_indexes(self) -> None:
+        for index in (self._by_status, self._by_label, self._by_parent, self._by_assignee):
+            index.clear()
+        for issue in self._cache.values():
+            self._index(issue)
+
+        self._dependents.clear()
+        self._blocked_count = {}
+        self._ready = set()
+        for issue in self._cache.values():
+            for dep_id in set(issue.depends_on):
+                self._dependents[dep_id].add(issue.id)
+        for issue in self._cache.values():
+            self._blocked_count[issue.id] = sum(
+                1 for dep_id in set(issue.depends_on) if self._blocks(dep_id)
+            )
+            self._refresh_ready(issue)
+
+    def _blocks(self, dep_id: str) -> bool:
+        """A prerequisite blocks while it exists and is not done/closed."""
+        dep = self._cache.get(dep_id)
+        return dep is not None and dep.status not in (IssueStatus.DONE, IssueStatus.CLOSED)
+
+    def _refresh_ready(self, issue: Issue) -> None:
+        if issue.status == IssueStatus.OPEN and not self._blocked_count.get(issue.id):
+            self._ready.add(issue.id)
+        else:
+            self._ready.discard(issue.id)
+
+    def _propagate(self, issue_id: str, delta: int) -> None:
+        """``issue_id`` started (+1) or stopped (-1) blocking: adjust its dependents."""
+        for dependent_id in self._dependents.get(issue_id, ()):
+            dependent = self._cache.get(dependent_id)
+            if dependent is not None:
+                self._blocked_count[dependent_id] = self._blocked_count.get(dependent_id, 0) + delta
+                self._refresh_ready(dependent)
+
+    def _set_depends_on(self, issue: Issue, old_deps: Set[str]) -> None:
+        """Re-link the dependency edges of ``issue`` after depends_on changed."""
+        new_deps = set(issue.depends_on)
+        for dep_id in old_deps - new_deps:
+            self._dependents[dep_id].discard(issue.id)
+        for dep_id in new_deps - old_deps:
+            self._dependents[dep_id].add(issue.id)
+        self._blocked_count[issue.id] = sum(1 for dep_id in new_deps if self._blocks(dep_id))
+        self._refresh_ready(issue)
+
+    def _index(self, issue: Issue) -> None:
+        self._by_status[issue.status.value].add(issue.id)
+        self._by_parent[issue.parent].add(issue.id)
+        self._by_assignee[issue.assignee].add(issue.id)
+        for label in issue.labels:
+            self._by_label[label].add(issue.id)
+
+    def _unindex(self, issue: Issue) -> None:
+        self._by_status[issue.status.value].discard(issue.id)
+        self._by_parent[issue.parent].discard(issue.id)
+        self._by_assignee[issue.assignee].discard(issue.id)
+        for label in issue.labels:
+            self._by_label[label].discard(issue.id)
+
+    def _append(self, issues: Iterable[Issue]) -> None:
+        """Append the current snapshot of each issue to the mutation log."""
+        if self._batch_depth:
+            for issue in issues:
+                self._pending[issue.id] = issue
+            return
+
+        lines = [issue.to_jsonl() + '\n' for issue in issues if not issue.ephemeral]
+        if not lines:
+            return  # Wisps not persisted
+
+        payload = ''.join(lines).encode('utf-8')
+        with FileLock(str(self.lock_file)):
+            with open(self.issues_file, 'ab') as f:
+                st = os.fstat(f.fileno())
+                caught_up = st.st_size == self._log_offset and self._log_inode in (None, st.st_ino)
+                f.write(payload)
+            if caught_up:
+                # Nobody else wrote since our last read: skip our own lines on refresh().
+                self._log_offset += len(payload)
+                self._log_inode = st.st_ino
+        self._log_lines += len(lines)
+
+        if self._log_lines >= max(COMPACT_MIN_LINES, COMPACT_RATIO * len(self._cache)):
+            self.compact()
 
     def _save_issue(self, issue: Issue) -> None:
         """Append issue to JSONL file."""
-        if issue.ephemeral:
-            return  # Wisps not persisted
+        self._append([issue])
 
+    def compact(self) -> None:
+        """Fold the mutation log down to one line per issue (last snapshot wins).
+
+        Works from the file rather than this instance's cache, so lines
+        appended by other processes since our load are kept, and the
+        replacement is atomic (temp file + os.replace) under the lock.
+        """
         with FileLock(str(self.lock_file)):
-            with open(self.issues_file, 'a', encoding='utf-8') as f:
-                f.write(issue.to_jsonl() + '\n')
+            if not self.issues_file.exists():
+                return
+            latest: Dict[str, str] = {}
+            with open(self.issues_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        latest[json.loads(line)['id']] = line
+            caught_up = self.issues_file.stat().st_size == self._log_offset
+            tmp_file = self.issues_file.with_name(self.issues_file.name + '.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.writelines(line + '\n' for line in latest.values())
+            os.replace(tmp_file, self.issues_file)
+            st = self.issues_file.stat()
+        self._log_lines = len(latest)
+        if caught_up:
+            self._log_offset, self._log_inode = st.st_size, st.st_ino
+        else:
+            self._log_inode = -1  # others' lines were folded in: reload on next refresh()
 
     def _rewrite_jsonl(self) -> None:
-        """Rewrite JSONL with current cache state (compaction)."""
+        """Rewrite JSONL with current cache state.
+
+        Only needed after editing cached Issue objects in place; it also
+        rebuilds the indexes. Normal mutations append instead.
+        """
+        self._load_cache()
         with FileLock(str(self.lock_file)):
             with open(self.issues_file, 'w', encoding='utf-8') as f:
                 for issue in self._cache.values():
                     if not issue.ephemeral:
                         f.write(issue.to_jsonl() + '\n')
+        self._log_lines = sum(1 for issue in self._cache.values() if not issue.ephemeral)
+        st = self.issues_file.stat()
+        self._log_offset, self._log_inode = st.st_size, st.st_ino
+        self._rebuild_indexes()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Group mutations into one locked append.
+
+        Inside the block every mutation applies to the cache and indexes at
+        once, but its snapshot is held back; on exit (also on error, so disk
+        matches memory) each touched issue is appended once, in its final
+        state. Batches nest; only the outermost one writes.
+        """
+        self._load_cache()
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._pending:
+                pending, self._pending = list(self._pending.values()), {}
+                self._append(pending)
 
     def create(
         self,
@@ -113,12 +357,17 @@ class BeadsDatabase:
         )
 
         self._cache[issue.id] = issue
-        self._save_issue(issue)
+        self._index(issue)
+        self._blocked_count[issue.id] = 0
+        self._refresh_ready(issue)
+        self._propagate(issue.id, +1)  # dangling edges to this id now block
+        changed = [issue]
 
         # Update parent's children list
         if parent and parent in self._cache:
             self._cache[parent].children.append(issue.id)
-            self._rewrite_jsonl()
+            changed.append(self._cache[parent])
+        self._append(changed)
 
         # Emit event if emitter configured
         if self.event_emitter:
@@ -142,8 +391,23 @@ class BeadsDatabase:
         """List issues with optional filters."""
         self._load_cache()
 
+        # Narrow to the smallest matching index bucket, then filter.
+        buckets = []
+        if status:
+            buckets.append(self._by_status.get(status, set()))
+        if parent is not None:
+            buckets.append(self._by_parent.get(parent, set()))
+        if label:
+            buckets.append(self._by_label.get(label, set()))
+        if assignee is not None:
+            buckets.append(self._by_assignee.get(assignee, set()))
+        if buckets:
+            candidates = (self._cache[i] for i in min(buckets, key=len))
+        else:
+            candidates = self._cache.values()
+
         results = []
-        for issue in self._cache.values():
+        for issue in candidates:
             if status and issue.status.value != status:
                 continue
             if type and issue.type.value != type:
@@ -169,6 +433,9 @@ class BeadsDatabase:
         if not issue:
             return None
 
+        self._unindex(issue)
+        was_blocking = self._blocks(issue_id)
+        old_deps = set(issue.depends_on)
         old_values = {}
         for key, value in kwargs.items():
             if key == 'status' and isinstance(value, str):
@@ -180,7 +447,14 @@ class BeadsDatabase:
                 setattr(issue, key, value)
 
         issue.updated_at = datetime.now(timezone.utc).isoformat()
-        self._rewrite_jsonl()
+        self._index(issue)
+        if set(issue.depends_on) != old_deps:
+            self._set_depends_on(issue, old_deps)
+        is_blocking = self._blocks(issue_id)
+        if is_blocking != was_blocking:
+            self._propagate(issue_id, +1 if is_blocking else -1)
+        self._refresh_ready(issue)
+        self._append([issue])
 
         # Emit event if emitter configured
         if self.event_emitter:
@@ -207,11 +481,13 @@ class BeadsDatabase:
             return False
 
         if depends_on_id not in issue.depends_on:
+            old_deps = set(issue.depends_on)
             issue.depends_on.append(depends_on_id)
+            self._set_depends_on(issue, old_deps)
         if issue_id not in dep.blocks:
             dep.blocks.append(issue_id)
 
-        self._rewrite_jsonl()
+        self._append([issue, dep])
 
         # Emit event if emitter configured
         if self.event_emitter:
@@ -226,30 +502,42 @@ class BeadsDatabase:
         issue = self._cache.get(issue_id)
         dep = self._cache.get(depends_on_id)
 
+        changed = []
         if issue and depends_on_id in issue.depends_on:
+            old_deps = set(issue.depends_on)
             issue.depends_on.remove(depends_on_id)
+            self._set_depends_on(issue, old_deps)
+            changed.append(issue)
         if dep and issue_id in dep.blocks:
             dep.blocks.remove(issue_id)
+            changed.append(dep)
 
-        self._rewrite_jsonl()
+        self._append(changed)
         return True
 
-    def ready(self) -> List[Issue]:
-        """Get issues that are ready to work (open, not blocked)."""
+    def add_label(self, issue_id: str, label: str) -> bool:
+        """Add a label; False if the issue does not exist or already has it."""
         self._load_cache()
 
-        results = []
-        for issue in self._cache.values():
-            if issue.status != IssueStatus.OPEN:
-                continue
-            # Check if all dependencies are closed/done
-            blocked = False
-            for dep_id in issue.depends_on:
-                dep = self._cache.get(dep_id)
-                if dep and dep.status not in (IssueStatus.DONE, IssueStatus.CLOSED):
-                    blocked = True
-                    break
-            if not blocked:
-                results.append(issue)
+        issue = self._cache.get(issue_id)
+        if not issue or label in issue.labels:
+            return False
 
-        return sorted(results, key=lambda i: (i.priority, i.created_at))
+        issue.labels.append(label)
+        issue.updated_at = datetime.now(timezone.utc).isoformat()
+        self._by_label[label].add(issue.id)
+        self._append([issue])
+        return True
+
+    def ready(self, label: str = None) -> List[Issue]:
+        """Get issues that are ready to work (open, not blocked).
+
+        Served from the incrementally maintained frontier; ``label``
+        intersects it with the label index.
+        """
+        self._load_cache()
+
+        ids = self._ready
+        if label:
+            ids = ids & self._by_label.get(label, set())
+        return sorted((self._cache[i] for i in ids), key=lambda i: (i.priority, i.created_at))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""ABOUTME: Stdlib-only client for brain_daemon.py's Unix-socket JSON-RPC API.
+ABOUTME: Hooks call the resident daemon first and fall back to spawning open_brain.py.
+
+Wire format: one JSON object per line, in both directions.
+
+    -> {"jsonrpc": "2.0", "id": 1, "method": "search", "params": {...}}
+    <- {"jsonrpc": "2.0", "id": 1, "result": [...]}
+    <- {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "..."}}
+
+A request without an ``id`` is a notification: the daemon runs it and sends
+nothing back, so a fire-and-forget capture costs one connect + one write.
+
+Environment:
+    OPEN_BRAIN_DAEMON            0/false/off disables the daemon path entirely
+    OPEN_BRAIN_DAEMON_SOCKET     socket path (default ~/.claude/brain-daemon.sock)
+    OPEN_BRAIN_DAEMON_AUTOSTART  0 stops a failed call from spawning the daemon
+
+This module must stay import-cheap — it is loaded by every hook invocation,
+so it never imports open_brain (or anything outside the stdlib).
+"""
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+DEFAULT_SOCKET = Path.home() / ".claude" / "brain-daemon.sock"
+CONNECT_TIMEOUT_S = 0.2  # local socket: refused/missing is immediate; this bounds a wedged accept
+SPAWN_THROTTLE_S = 60.0  # at most one autostart attempt per minute across all hooks
+MAX_RESPONSE = 16 * 1024 * 1024
+
+_ids = itertools.count(1)
+
+
+class DaemonUnavailable(Exception):
+    """The request never reached the daemon (disabled, not running, send failed)."""
+
+
+class DaemonNoResponse(Exception):
+    """The request was sent but no valid answer came back; the daemon may have run it."""
+
+
+class DaemonError(Exception):
+    """The daemon answered with a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def enabled() -> bool:
+    """True unless OPEN_BRAIN_DAEMON disables the daemon or the platform has no AF_UNIX."""
+    flag = os.environ.get("OPEN_BRAIN_DAEMON", "1").strip().lower()
+    return flag not in ("0", "false", "no", "off") and hasattr(socket, "AF_UNIX")
+
+
+def socket_path() -> Path:
+    return Path(os.environ.get("OPEN_BRAIN_DAEMON_SOCKET") or DEFAULT_SOCKET).expanduser()
+
+
+def _daemon_script() -> Path:
+    return Path(__file__).resolve().parent / "brain_daemon.py"
+
+
+def _open(path: Optional[Path], timeout: float) -> socket.socket:
+    if not enabled():
+        raise DaemonUnavailable("brain daemon disabled")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(min(timeout, CONNECT_TIMEOUT_S))
+    try:
+        sock.connect(str(path or socket_path()))
+    except OSError as e:
+        sock.close()
+        raise DaemonUnavailable(str(e)) from e
+    sock.settimeout(timeout)
+    return sock
+
+
+def call(method: str, params: Optional[dict] = None, timeout: float = 10.0,
+         path: Optional[Path] = None) -> Any:
+    """Run ``method`` on the daemon and return its result.
+
+    Raises DaemonUnavailable when the request could not be delivered (connect
+    or send failed). Once it is sent, DaemonNoResponse means the connection
+    closed without a valid answer, socket.timeout (an OSError) that none
+    arrived within ``timeout`` seconds, and DaemonError that the daemon
+    answered with an error.
+    """
+    request_id = next(_ids)
+    payload = json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method,
+                          "params": params or {}}, default=str).encode("utf-8") + b"\n"
+    sock = _open(path, timeout)
+    try:
+        try:
+            sock.sendall(payload)
+        except OSError as e:
+            raise DaemonUnavailable(f"send failed: {e}") from e
+        with sock.makefile("rb") as reader:
+            line = reader.readline(MAX_RESPONSE)
+    finally:
+        sock.close()
+    if not line:
+        raise DaemonNoResponse("connection closed without a response")
+    response = json.loads(line)
+    if response.get("id") != request_id:
+        raise DaemonNoResponse("response id mismatch")
+    if "error" in response:
+        err = response["error"] or {}
+        raise DaemonError(int(err.get("code", -32000)), str(err.get("message", "")))
+    return response.get("result")
+
+
+def notify(method: str, params: Optional[dict] = None,
+           path: Optional[Path] = None) -> bool:
+    """Send a fire-and-forget request. True once the daemon has accepted it."""
+    payload = json.dumps({"jsonrpc": "2.0", "method": method, "params": params or {}},
+                         default=str).encode("utf-8") + b"\n"
+    try:
+        sock = _open(path, CONNECT_TIMEOUT_S)
+    except DaemonUnavailable:
+        return False
+    try:
+        sock.sendall(payload)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def ping(path: Optional[Path] = None, timeout: float = 0.5) -> bool:
+    try:
+        return call("ping", timeout=timeout, path=path) == "pong"
+    except Exception:
+        return False
+
+
+def spawn_detached() -> None:
+    """Best-effort, throttled, detached start of brain_daemon.py.
+
+    The daemon exits 0 if another instance already owns the socket, so a
+    race between two hooks costs one short-lived process. The throttle file
+    keeps a daemon that cannot start (no DB, no model) from being re-spawned
+    on every single prompt.
+    """
+    if os.environ.get("OPEN_BRAIN_DAEMON_AUTOSTART", "1").strip().lower() in ("0", "false", "no", "off"):
+        return
+    script = _daemon_script()
+    if not script.exists():
+        return
+    marker = socket_path().with_suffix(".spawned")
+    try:
+        if time.time() - marker.stat().st_mtime < SPAWN_THROTTLE_S:
+            return
+    except OSError:
+        pass
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+        subprocess.Popen(
+            [sys.executable, str(script)],
+            start_new_session=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+        )
+    except Exception:
+        pass
+
+
+def try_call(method: str, params: Optional[dict] = None,
+             timeout: float = 10.0, idempotent: bool = True) -> Tuple[bool, Any]:
+    """``(True, result)`` when the daemon served the call, else ``(False, None)``.
+
+    Never raises. ``False`` means "use the CLI": the daemon is disabled, not
+    running (an autostart is kicked off for next time), timed out, or
+    answered with an error.
+
+    Pass ``idempotent=False`` for writes (capture, capture_batch). Once the
+    request is sent, a timeout, dropped connection or error reply may come
+    after the daemon already applied it, so replaying it through the CLI
+    could write it twice: those outcomes return ``(True, None)`` and only an
+    undelivered request (DaemonUnavailable) returns ``False``.
+    """
+    if not enabled():
+        return False, None
+    try:
+        return True, call(method, params, timeout=timeout)
+    except DaemonUnavailable:
+        spawn_detached()
+        return False, None
+    except Exception:
+        return (False, None) if idempotent else (True, None)
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""ABOUTME: Resident brain daemon — keeps open_brain imported, Postgres connections open and the
+ABOUTME: embedder warm, and serves hook recall/capture over a Unix-socket JSON-RPC API (brain_client.py).
+
+Every hook that shells ``python3 open_brain.py ...`` re-imports the 7k-line
+module, the redact pipeline and jsonpatch, then opens a fresh TLS connection
+to Neon — on every prompt. This process pays those costs once.
+
+Methods (params mirror the CLI flags; results are exactly what ``--json``
+prints, round-tripped through ``json.dumps(default=str)``):
+
+    ping                                               -> "pong"
+    search      {query, limit?, sort_by?, dedup?, ann_candidates?, dedup_server?, format?}
+                format="text" returns the CLI's human-readable rendering
+    capture     {text, source?, session_id?, project?, prov_agent?,
+                 prov_activity?, was_derived_from?, stv_f?, stv_c?, condition_score?,
+                 write_fast?}
+    capture_batch {items, source?, session_id?, project?, write_fast?}
+                items: capture's per-thought params (or bare strings), one result each
+    enrich_pending {limit?}      drain queued write-fast captures (LLM metadata)
+    enrich_wake                  wake the enrichment worker (sent by CLI write-fast captures)
+    recent      {days?, limit?, thought_type?}
+    prime       {query, days?, limit?, search_limit?}
+                recent + search for query on one connection ({recent, search})
+    inspect     {thought_id}     latest version, falling back to the live row
+    inspect_many {thought_ids}   the same per ID, one lookup ({id: payload})
+    show_links  {atom_id}
+
+user_id is ALWAYS derived from the daemon's OS principal (open_brain._get_user_id),
+never from params — same rule as the --from-pi bridge. The socket is created
+0600 inside ~/.claude, so only that principal can connect at all.
+
+Enrichment worker: a background thread drains brain.enrichment_queue for the
+daemon's principal (open_brain.enrich_pending) while rows are due, then sleeps
+until the next row's not_before — at most ENRICH_POLL_S, so rows queued by a
+CLI without a wake are picked up too. Write-fast captures served here, and the
+``enrich_wake`` notification open_brain.py sends after its own, wake it early.
+It starts with the daemon (hooks autostart it; so does a CLI write-fast
+capture that finds no daemon running).
+
+Environment:
+    OPEN_BRAIN_DAEMON_SOCKET   socket path (default ~/.claude/brain-daemon.sock)
+    OPEN_BRAIN_POOL_*          connection pool sizing / recycling and
+                               OPEN_BRAIN_POOLER_URL (see open_brain._connection_pool)
+    OPEN_BRAIN_DAEMON_IDLE_S   exit after this many idle seconds (default 1800; 0 disables)
+    OPEN_BRAIN_DAEMON_EMBED    0 skips loading the local model; embeddings then
+                               go through embed_server like the CLI does
+    OPEN_BRAIN_DAEMON_ENRICH   0 disables the enrichment worker (drain with
+                               open_brain.py --enrich-pending instead)
+
+As with embed_server, the model is loaded BEFORE the socket is bound: a hook
+that connects mid-startup gets connection-refused and falls back to the CLI
+instead of blocking on the load. If another daemon already answers on the
+socket, exit 0.
+"""
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import brain_client
+import open_brain
+from embed_server import start_idle_watchdog
+
+IDLE_TIMEOUT_S = float(os.environ.get("OPEN_BRAIN_DAEMON_IDLE_S", "1800"))
+ENRICH_POLL_S = 60.0  # longest enrichment-worker sleep between queue checks
+ENRICH_IDLE_S = 1.0   # shortest, so rows held by another worker are not spun on
+MAX_REQUEST = 1048576  # one request line; a capture is capped far below this
+
+# JSON-RPC 2.0 error codes.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _str_param(params: dict, name: str) -> str:
+    value = params.get(name)
+    if not isinstance(value, str) or not value.strip():
+        raise RpcError(INVALID_PARAMS, f"{name} must be a non-empty string")
+    return value
+
+
+def _int_param(params: dict, name: str, default: int) -> int:
+    value = params.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise RpcError(INVALID_PARAMS, f"{name} must be a non-negative integer")
+    return value
+
+
+def _unit_param(params: dict, name: str) -> Optional[float]:
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise RpcError(INVALID_PARAMS, f"{name} must be a float")
+    if not 0.0 <= value <= 1.0:
+        raise RpcError(INVALID_PARAMS, f"{name} must be in [0, 1]")
+    return value
+
+
+def _op_search(conn, user_id: str, params: dict):
+    sort_by = params.get("sort_by", "similarity")
+    if sort_by not in ("similarity", "time"):
+        raise RpcError(INVALID_PARAMS, "sort_by must be 'similarity' or 'time'")
+    results = open_brain.search(
+        conn,
+        query=_str_param(params, "query"),
+        user_id=user_id,
+        limit=_int_param(params, "limit", open_brain.DEFAULT_RECENT_LIMIT),
+        sort_by=sort_by,
+        dedup=bool(params.get("dedup", False)),
+        ann_candidates=params.get("ann_candidates"),
+        dedup_server=params.get("dedup_server"),
+    )
+    if params.get("format") == "text":
+        return open_brain._format_search_results(results, sort_by=sort_by)
+    return results
+
+
+def _op_capture(conn, user_id: str, params: dict):
+    return open_brain.capture(
+        conn,
+        text=_str_param(params, "text"),
+        user_id=user_id,
+        source=params.get("source") or "manual",
+        session_id=params.get("session_id") or "",
+        project=params.get("project") or "",
+        prov_agent=params.get("prov_agent"),
+        prov_activity=params.get("prov_activity"),
+        was_derived_from=params.get("was_derived_from"),
+        stv_f=_unit_param(params, "stv_f"),
+        stv_c=_unit_param(params, "stv_c"),
+        condition_score=params.get("condition_score"),
+        write_fast=params.get("write_fast"),
+    )
+
+
+def _op_capture_batch(conn, user_id: str, params: dict):
+    items = params.get("items")
+    if not isinstance(items, list) or not items:
+        raise RpcError(INVALID_PARAMS, "items must be a non-empty list")
+    try:
+        items = [open_brain._validate_batch_item(item, i) for i, item in enumerate(items)]
+    except ValueError as e:
+        raise RpcError(INVALID_PARAMS, str(e))
+    return open_brain.capture_batch(
+        conn,
+        items,
+        user_id=user_id,
+        source=params.get("source") or "manual",
+        session_id=params.get("session_id") or "",
+        project=params.get("project") or "",
+        write_fast=params.get("write_fast"),
+    )
+
+
+def _op_enrich_pending(conn, user_id: str, params: dict):
+    limit = _int_param(params, "limit", open_brain.ENRICH_BATCH_SIZE)
+    if limit < 1:
+        raise RpcError(INVALID_PARAMS, "limit must be >= 1")
+    return open_brain.enrich_pending(conn, user_id=user_id, limit=limit)
+
+
+def _op_recent(conn, user_id: str, params: dict):
+    return open_brain.recent(
+        conn,
+        user_id=user_id,
+        days=_int_param(params, "days", open_brain.DEFAULT_RECENT_DAYS),
+        limit=_int_param(params, "limit", open_brain.DEFAULT_RECENT_LIMIT),
+        thought_type=params.get("thought_type"),
+    )
+
+
+def _op_prime(conn, user_id: str, params: dict):
+    return open_brain.prime(
+        conn,
+        query=_str_param(params, "query"),
+        user_id=user_id,
+        days=_int_param(params, "days", open_brain.DEFAULT_RECENT_DAYS),
+        recent_limit=_int_param(params, "limit", open_brain.DEFAULT_RECENT_LIMIT),
+        search_limit=_int_param(params, "search_limit", open_brain.DEFAULT_SEARCH_LIMIT),
+    )
+
+
+def _op_inspect(conn, user_id: str, params: dict):
+    import time_travel
+    thought_id = _str_param(params, "thought_id")
+    # Same no-qualifier path as `--inspect ID --json`: latest snapshot, else
+    # the live row. A wrong-principal RuntimeError becomes an error reply.
+    result = time_travel.inspect_latest(conn, thought_id=thought_id, user_id=user_id)
+    if result is None:
+        result = time_travel.inspect_live(conn, thought_id=thought_id, user_id=user_id)
+    if result is None:
+        return {"thought_id": thought_id, "result": None,
+                "message": "no version exists at this query"}
+    return time_travel.inspect_result_to_dict(result)
+
+
+def _op_inspect_many(conn, user_id: str, params: dict):
+    thought_ids = params.get("thought_ids")
+    if (not isinstance(thought_ids, list) or not thought_ids
+            or not all(isinstance(t, str) and t.strip() for t in thought_ids)):
+        raise RpcError(INVALID_PARAMS, "thought_ids must be a non-empty list of strings")
+    return open_brain._inspect_many(conn, thought_ids, user_id)
+
+
+def _op_show_links(conn, user_id: str, params: dict):
+    return open_brain.show_links(conn, atom_id=_str_param(params, "atom_id"), user_id=user_id)
+
+
+# Safe to re-run on a fresh connection after a disconnect (pg_pool.run retry).
+# capture is not: a COMMIT whose acknowledgement was lost would insert twice.
+RETRYABLE = frozenset({"search", "recent", "prime", "inspect", "inspect_many", "show_links"})
+
+OPERATIONS: Dict[str, Callable[[Any, str, dict], Any]] = {
+    "search": _op_search,
+    "capture": _op_capture,
+    "recent": _op_recent,
+    "prime": _op_prime,
+    "inspect": _op_inspect,
+    "inspect_many": _op_inspect_many,
+    "show_links": _op_show_links,
+    "capture_batch": _op_capture_batch,
+    "enrich_pending": _op_enrich_pending,
+}
+
+
+class BrainService:
+    """Dispatch parsed JSON-RPC requests onto pooled connections (pg_pool.ConnectionPool)."""
+
+    def __init__(self, pool, user_id: Optional[str] = None):
+        self.pool = pool
+        self.user_id = user_id or open_brain._get_user_id()
+        self.enrich_due = threading.Event()  # set -> the enrichment worker runs now
+
+    def dispatch(self, request: Any) -> Optional[dict]:
+        """Return the response object, or None for a notification."""
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "request must be an object with a method")
+        request_id = request.get("id")
+        is_notification = "id" not in request
+        try:
+            result = self._run(request["method"], request.get("params") or {})
+        except RpcError as e:
+            response = _error(request_id, e.code, str(e))
+        except Exception as e:
+            response = _error(request_id, SERVER_ERROR, f"{type(e).__name__}: {e}")
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        return None if is_notification else response
+
+    def _run(self, method: str, params: Any):
+        if method == "ping":
+            return "pong"
+        if method == "enrich_wake":
+            self.enrich_due.set()
+            return "ok"
+        op = OPERATIONS.get(method)
+        if op is None:
+            raise RpcError(METHOD_NOT_FOUND, f"unknown method: {method}")
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "params must be an object")
+        if "user_id" in params:
+            # Never honoured (principal-scoping); dropped like the Pi bridge does.
+            params = {k: v for k, v in params.items() if k != "user_id"}
+        result = self.pool.run(lambda conn: op(conn, self.user_id, params),
+                               retry=method in RETRYABLE)
+        if method in ("capture", "capture_batch") and open_brain._resolve_write_fast(
+                params.get("write_fast")):
+            self.enrich_due.set()
+        return result
+
+
+def enrich_once(service: BrainService) -> float:
+    """One enrich_pending batch for the daemon's principal; seconds to sleep next.
+
+    0 when the batch was full (more may be due), else until the next row is
+    due, clamped to [ENRICH_IDLE_S, ENRICH_POLL_S]. Never raises: a failure
+    (no DB, schema without the queue) is logged and waits a full poll.
+    """
+    try:
+        counts = service.pool.run(lambda conn: open_brain.enrich_pending(conn, service.user_id))
+        if counts["claimed"] >= open_brain.ENRICH_BATCH_SIZE:
+            return 0.0
+        due = service.pool.run(lambda conn: open_brain.enrich_next_due(conn, service.user_id),
+                               retry=True)
+    except Exception as e:
+        print(f"brain_daemon: enrichment failed: {e}", file=sys.stderr)
+        return ENRICH_POLL_S
+    if due is None:
+        return ENRICH_POLL_S
+    return min(max(due, ENRICH_IDLE_S), ENRICH_POLL_S)
+
+
+def start_enrich_worker(service: BrainService, stop: threading.Event) -> Optional[threading.Thread]:
+    """Run enrich_once in a loop until ``stop`` is set (see the module docstring).
+
+    Returns the worker thread, or None when OPEN_BRAIN_DAEMON_ENRICH disables it.
+    """
+    if os.environ.get("OPEN_BRAIN_DAEMON_ENRICH", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+
+    def work():
+        while not stop.is_set():
+            service.enrich_due.clear()
+            delay = enrich_once(service)
+            if delay:
+                service.enrich_due.wait(delay)
+
+    thread = threading.Thread(target=work, name="brain-enrich", daemon=True)
+    thread.start()
+    return thread
+
+
+def _error(request_id, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def make_handler(service: BrainService, state: dict):
+    """Build a StreamRequestHandler serving newline-delimited JSON-RPC until EOF."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            while True:
+                line = self.rfile.readline(MAX_REQUEST + 1)
+                if not line:
+                    return
+                state["last_request"] = time.time()
+                if len(line) > MAX_REQUEST:
+                    self._send(_error(None, INVALID_REQUEST, "request too large"))
+                    return
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    self._send(_error(None, PARSE_ERROR, "invalid JSON"))
+                    continue
+                response = service.dispatch(request)
+                if response is not None and not self._send(response):
+                    return
+
+        def _send(self, response: dict) -> bool:
+            try:
+                self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+                self.wfile.flush()
+                return True
+            except OSError:
+                return False  # caller hung up (e.g. a timed-out hook); nothing to do
+
+    return Handler
+
+
+class BrainServer(socketserver.ThreadingUnixStreamServer):
+    # Non-daemon handler threads + block_on_close: a shutdown (idle watchdog,
+    # SIGTERM) waits for in-flight captures instead of killing them mid-write.
+    daemon_threads = False
+    block_on_close = True
+
+
+def bind(path: Path, handler) -> BrainServer:
+    """Bind ``path`` as a 0600 socket, replacing a stale socket file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()
+    old_umask = os.umask(0o177)
+    try:
+        return BrainServer(str(path), handler)
+    finally:
+        os.umask(old_umask)
+
+
+def main():
+    path = brain_client.socket_path()
+    if brain_client.ping(path):
+        sys.exit(0)  # another daemon is already serving this socket
+
+    if os.environ.get("OPEN_BRAIN_DAEMON_EMBED", "1").strip().lower() not in ("0", "false", "no", "off"):
+        # The slow import + load, paid once. _generate_embedding uses a
+        # resident model directly instead of the embed_server hop.
+        open_brain._get_embedding_model()
+
+    pool = open_brain._connection_pool()
+    try:
+        pool.prime()
+    except Exception as e:
+        # No DB right now: still serve; each request retries the connect.
+        print(f"brain_daemon: initial connect failed: {e}", file=sys.stderr)
+
+    state = {"last_request": time.time()}
+    service = BrainService(pool)
+    server = bind(path, make_handler(service, state))
+    inode = path.stat().st_ino
+
+    def _stop(_signum, _frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _stop)
+    start_idle_watchdog(server, state, IDLE_TIMEOUT_S)
+    stop_enrich = threading.Event()
+    enrich_worker = start_enrich_worker(service, stop_enrich)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        stop_enrich.set()
+        service.enrich_due.set()
+        if enrich_worker is not None:
+            # A batch mid-extraction is abandoned; its rows return after the lease.
+            enrich_worker.join(timeout=5)
+        pool.close_all()
+        # Only remove the socket if it is still ours (a replacement daemon
+        # may have re-bound the path after we stopped answering).
+        try:
+            if path.stat().st_ino == inode:
+                path.unlink()
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    main()
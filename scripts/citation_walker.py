@@ -20,6 +20,16 @@ PS scoping (Principal Scoping per Lin/Li/Chen 2026 §12.1):
     NOT recursed into; the walker emits an ``orphan_marker='orphaned'``
     sentinel and stops that branch.
 
+Query modes:
+
+  - recursive (default) — one ``WITH RECURSIVE`` statement returns the whole
+    in-scope chain (scope check, PROV and STV columns included) and the tree
+    is rebuilt in memory; the sentinels are derived from the last row.
+  - per-step (``recursive=False``) — the original walk, one ``SELECT`` per
+    ancestor. Kept as the reference implementation.
+
+Both modes return identical trees.
+
 Reference: ``optivai-builder/src/agents/citation-walker.ts`` (TypeScript port
 of the same algorithm, ~329 LOC).
 """
@@ -77,6 +87,7 @@ def trace_citation(
     thought_id: str,
     user_id: str,
     max_depth: int = DEFAULT_MAX_DEPTH,
+    recursive: bool = True,
 ) -> CitationNode:
     """Walk the provenance chain starting at ``thought_id`` toward the original.
 
@@ -92,6 +103,9 @@ def trace_citation(
     max_depth
         Stop recursion when depth reaches this value. Default is 50.
         Must be a positive integer.
+    recursive
+        Fetch the chain with one ``WITH RECURSIVE`` query (default) instead
+        of one round trip per ancestor. The returned tree is the same.
 
     Returns
     -------
@@ -119,6 +133,9 @@ def trace_citation(
     if not user_id:
         raise ValueError("trace_citation: user_id must be a non-empty string")
 
+    if recursive:
+        return _trace_recursive(conn, thought_id, user_id, max_depth)
+
     # PS scope check on the starting thought. We open one cursor for the
     # check and close it before the walk; the walk opens fresh cursors.
     cur = conn.cursor()
@@ -146,6 +163,113 @@ def trace_citation(
     )
 
 
+# The anchor row doubles as the PS scope check on the starting thought; each
+# recursive step joins the parent under the same user_id, so a cross-user or
+# missing parent simply ends the chain (-> "orphaned" sentinel in memory).
+# ``path`` stops the recursion on a repeated thought_id (-> "cycle"), and the
+# depth predicate stops it one short of max_depth (-> "max-depth"), matching
+# the per-step walk which never queries a row it would discard.
+_CHAIN_SQL = """
+    WITH RECURSIVE chain AS (
+        SELECT t.thought_id, 0 AS depth, left(t.raw_text, %(preview)s) AS preview,
+               t.prov_agent, t.prov_activity, t.was_generated_by,
+               t.was_derived_from, t.source_uri, t.stv_frequency, t.stv_confidence,
+               ARRAY[t.thought_id::text] AS path
+          FROM brain.thoughts t
+         WHERE t.thought_id = %(thought_id)s AND t.user_id = %(user_id)s
+        UNION ALL
+        SELECT p.thought_id, c.depth + 1, left(p.raw_text, %(preview)s),
+               p.prov_agent, p.prov_activity, p.was_generated_by,
+               p.was_derived_from, p.source_uri, p.stv_frequency, p.stv_confidence,
+               c.path || p.thought_id::text
+          FROM chain c
+          JOIN brain.thoughts p
+            ON p.thought_id = c.was_derived_from AND p.user_id = %(user_id)s
+         WHERE c.depth + 1 < %(max_depth)s
+           AND NOT (p.thought_id::text = ANY(c.path))
+    )
+    SELECT thought_id, depth, preview, prov_agent, prov_activity, was_generated_by,
+           was_derived_from, source_uri, stv_frequency, stv_confidence
+      FROM chain
+     ORDER BY depth
+"""
+
+
+def _sentinel(thought_id: str, depth: int, marker: str) -> CitationNode:
+    return CitationNode(
+        thought_id=thought_id,
+        depth=depth,
+        raw_text_preview=f"[{marker}]",
+        prov_agent="",
+        prov_activity="",
+        was_generated_by="",
+        was_derived_from=None,
+        source_uri=None,
+        orphan_marker=marker,
+    )
+
+
+def _trace_recursive(
+    conn,
+    thought_id: str,
+    user_id: str,
+    max_depth: int,
+) -> CitationNode:
+    """``trace_citation`` in one round trip: fetch the chain, rebuild the tree."""
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            _CHAIN_SQL,
+            {
+                "thought_id": thought_id,
+                "user_id": user_id,
+                "max_depth": max_depth,
+                "preview": PREVIEW_CHARS,
+            },
+        )
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+    if not rows:
+        raise RuntimeError(
+            f"trace_citation: thought {thought_id} not in user scope "
+            f"(user={user_id})"
+        )
+
+    chain: List[CitationNode] = []
+    for tid, depth, preview, prov_agent, prov_activity, was_generated_by, \
+            was_derived_from, source_uri, stv_f, stv_c in rows:
+        node = CitationNode(
+            thought_id=tid,
+            depth=depth,
+            raw_text_preview=preview or "",
+            prov_agent=prov_agent or "",
+            prov_activity=prov_activity or "",
+            was_generated_by=was_generated_by or "",
+            was_derived_from=was_derived_from,
+            source_uri=source_uri,
+            stv_frequency=float(stv_f) if stv_f is not None else None,
+            stv_confidence=float(stv_c) if stv_c is not None else None,
+        )
+        if chain:
+            chain[-1].children.append(node)
+        chain.append(node)
+
+    # The recursion stopped at the last row. If it still names a parent, say
+    # why that parent is missing — in the order the per-step walk checks.
+    last = chain[-1]
+    if last.was_derived_from is not None:
+        next_depth = last.depth + 1
+        if next_depth >= max_depth:
+            marker = "max-depth"
+        elif any(n.thought_id == last.was_derived_from for n in chain):
+            marker = "cycle"
+        else:
+            marker = "orphaned"
+        last.children.append(_sentinel(last.was_derived_from, next_depth, marker))
+    return chain[0]
+
+
 def _walk(
     conn,
     thought_id: str,
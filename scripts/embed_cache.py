@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""ABOUTME: Content-addressed on-disk embedding cache shared by open_brain.py and embed_server.py.
+ABOUTME: (model, sha256(text)) -> float32 vector in a local sqlite file, LRU-evicted under a size cap.
+
+Identical text is embedded over and over: the working-directory basename that
+context_primer searches on every session start, repeated auto-recall prompts,
+recaptured duplicates. The cache turns each repeat into one indexed sqlite read.
+
+Storage:
+    OPEN_BRAIN_EMBED_CACHE_PATH  sqlite file (default ~/.claude/embed-cache.sqlite)
+    OPEN_BRAIN_EMBED_CACHE_MAX   entry cap (default 20000, ~60 MB of 768-dim
+                                 float32); 0 disables the cache entirely.
+
+Vectors are stored as raw little-endian float32 BLOBs (vector_codec.pack_f32).
+all-mpnet-base-v2 emits float32, so a round-trip through the cache is lossless.
+
+Invalidation: the model name is part of every key, so a different EMBED_MODEL
+can never read another model's vector. The file also records the model that
+last opened it; when that changes, rows for every other model are purged so a
+model switch does not leave the old space squatting on the size cap.
+
+Every failure (locked file, corrupt db, read-only home) degrades to a cache
+miss — the cache is an optimisation, never a dependency of the embed path.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from vector_codec import pack_f32, unpack_f32
+
+DEFAULT_PATH = Path.home() / ".claude" / "embed-cache.sqlite"
+DEFAULT_MAX_ENTRIES = 20000
+EVICT_FRACTION = 0.1  # evict down to 90% of the cap so eviction is amortised, not per-put
+SQLITE_TIMEOUT_S = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model     TEXT NOT NULL,
+    text_sha  TEXT NOT NULL,
+    dim       INTEGER NOT NULL,
+    vec       BLOB NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model, text_sha)
+);
+CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def text_key(text: str) -> str:
+    """sha256 hex digest of the (already-truncated) text."""
+    return hashlib.sha256(text.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+class EmbeddingCache:
+    """sqlite-backed LRU of embeddings for ONE model.
+
+    Safe to share across threads (one connection, guarded by a lock) and
+    across processes (sqlite WAL + a short busy timeout; a lock that outlasts
+    the timeout is a miss, not an error).
+    """
+
+    def __init__(self, model: str, path: Optional[Path] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.model = model
+        self.path = Path(path) if path is not None else DEFAULT_PATH
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._conn = None
+        self._open()
+
+    def _open(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=SQLITE_TIMEOUT_S,
+                                   check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'model'").fetchone()
+            if row is None or row[0] != self.model:
+                conn.execute("DELETE FROM embeddings WHERE model != ?", (self.model,))
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('model', ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                    (self.model,),
+                )
+            self._conn = conn
+        except (sqlite3.Error, OSError):
+            self._conn = None
+
+    @property
+    def available(self) -> bool:
+        return self._conn is not None
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Cached vector for ``text`` under this cache's model, or None."""
+        if self._conn is None:
+            return None
+        key = text_key(text)
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT vec FROM embeddings WHERE model = ? AND text_sha = ?",
+                    (self.model, key),
+                ).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_sha = ?",
+                    (time.time(), self.model, key),
+                )
+            return unpack_f32(row[0])
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def put(self, text: str, vec) -> None:
+        """Store ``vec`` for ``text``; evicts least-recently-used rows past the cap."""
+        if self._conn is None:
+            return
+        try:
+            blob = pack_f32(vec)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO embeddings (model, text_sha, dim, vec, last_used) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (model, text_sha) DO UPDATE SET "
+                    "vec = excluded.vec, dim = excluded.dim, last_used = excluded.last_used",
+                    (self.model, text_key(text), len(vec), blob, time.time()),
+                )
+                self._evict_locked()
+        except (sqlite3.Error, TypeError, OverflowError, ValueError):
+            pass
+
+    def _evict_locked(self) -> None:
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        keep = int(self.max_entries * (1.0 - EVICT_FRACTION))
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN ("
+            "  SELECT rowid FROM embeddings ORDER BY last_used ASC, rowid ASC LIMIT ?)",
+            (count - keep,),
+        )
+
+    def __len__(self) -> int:
+        if self._conn is None:
+            return 0
+        try:
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+
+_default = None
+_default_key = None
+_default_lock = threading.Lock()
+
+
+def default_cache(model: str) -> Optional[EmbeddingCache]:
+    """Process-wide cache for ``model`` honouring the OPEN_BRAIN_EMBED_CACHE_* env.
+
+    Returns None when disabled (cap 0) or the file cannot be opened. Env is
+    re-read on every call so a changed path/cap (tests, long-lived daemons)
+    takes effect without a restart.
+    """
+    global _default, _default_key
+    try:
+        max_entries = int(os.environ.get("OPEN_BRAIN_EMBED_CACHE_MAX", DEFAULT_MAX_ENTRIES))
+    except (TypeError, ValueError):
+        max_entries = DEFAULT_MAX_ENTRIES
+    if max_entries <= 0:
+        return None
+    path = Path(os.environ.get("OPEN_BRAIN_EMBED_CACHE_PATH") or DEFAULT_PATH).expanduser()
+    key = (model, str(path), max_entries)
+    with _default_lock:
+        if _default_key != key:
+            if _default is not None:
+                _default.close()
+            _default = EmbeddingCache(model, path=path, max_entries=max_entries)
+            _default_key = key
+        return _default if _default.available else None
+
+
+def encode_through(cache: Optional[EmbeddingCache], texts: List[str],
+                   encode_batch_fn: Callable[[List[str]], list]) -> list:
+    """Encode ``texts`` via ``encode_batch_fn``, serving hits from ``cache``.
+
+    Only the misses are passed to ``encode_batch_fn`` (in one call), and their
+    vectors are written back. Output order matches ``texts``.
+    """
+    if cache is None:
+        return list(encode_batch_fn(texts))
+    out: list = [cache.get(t) for t in texts]
+    missing = [i for i, v in enumerate(out) if v is None]
+    if missing:
+        fresh = list(encode_batch_fn([texts[i] for i in missing]))
+        for i, vec in zip(missing, fresh):
+            out[i] = vec
+            cache.put(texts[i], vec)
+    return out
@@ -1,10 +1,25 @@
 #!/usr/bin/env python3
 """ABOUTME: Warm embedding server — keeps the sentence-transformers model resident
 ABOUTME: so open_brain.py queries embed in ~0.1s instead of paying a ~10s torch import.
+ABOUTME: Shares embed_cache.py's on-disk (model, sha256(text)) cache with open_brain.py.
 
 Stdlib-only HTTP server bound to 127.0.0.1. Endpoints:
-    GET  /health -> {"status": "ok", "model": ..., "uptime_s": ...}
-    POST /embed  {"text": "..."} -> {"embedding": [...], "dim": 768}
+    GET  /health       -> {"status": "ok", "model": ..., "uptime_s": ...}
+    POST /embed        {"text": "..."} -> {"embedding": [...], "dim": 768}
+    POST /embed_batch  {"texts": ["...", ...]} -> {"embeddings": [[...], ...], "dim": 768, "count": N}
+
+Binary responses: a request carrying ``Accept: application/octet-stream`` gets
+the vector(s) back as raw little-endian float32 (vector_codec.pack_f32; /embed_batch
+rows concatenated in request order) with X-Embedding-Dim / X-Embedding-Count
+headers — 3 KB per vector and no JSON float formatting/parsing on either side.
+Errors are always JSON.
+
+Micro-batching: concurrent /embed requests (several hooks and loop workers
+capturing at once) are gathered for up to OPEN_BRAIN_EMBED_BATCH_WINDOW_MS
+(default 5) and run through ONE SentenceTransformer.encode() call — a batched
+forward pass costs far less CPU than N single ones. /embed_batch texts go
+through the same queue, so the model is only ever driven from one thread.
+A window of 0 disables the batcher (each request encodes inline, as before).
 
 Resource contract (gaming-rig friendly):
     - Device is CPU unless OPEN_BRAIN_EMBED_DEVICE says otherwise — never touches
@@ -23,11 +38,15 @@ If the port is already bound, another instance is warm — exit 0, not an error.
 import errno
 import json
 import os
+import queue
 import sys
 import threading
 import time
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
+import embed_cache
+from vector_codec import F32_CONTENT_TYPE, pack_f32
+
 EMBED_MODEL = os.environ.get("OPEN_BRAIN_EMBED_MODEL", "all-mpnet-base-v2")
 EMBED_DEVICE = os.environ.get("OPEN_BRAIN_EMBED_DEVICE", "cpu")
 PORT = int(os.environ.get("OPEN_BRAIN_EMBED_PORT", "8474"))
@@ -36,14 +55,108 @@ TORCH_THREADS = int(os.environ.get("OPEN_BRAIN_EMBED_THREADS", "8"))
 WATCHDOG_POLL_S = 30.0
 MAX_TEXT = 8000  # mirrors open_brain._generate_embedding truncation
 MAX_BODY = 65536  # maximum accepted Content-Length in bytes; prevents unbounded reads
+MAX_BATCH = 64  # maximum texts per /embed_batch request (and per encode() call)
+MAX_BATCH_BODY = 1048576  # /embed_batch Content-Length cap: MAX_BATCH texts of MAX_TEXT chars, with headroom
+BATCH_WINDOW_S = float(os.environ.get("OPEN_BRAIN_EMBED_BATCH_WINDOW_MS", "5")) / 1000.0
+
+
+class MicroBatcher:
+    """Coalesce concurrent encode requests into batched ``encode_batch_fn`` calls.
+
+    Handler threads call :meth:`submit` / :meth:`submit_many` and block; a
+    single worker thread drains the queue, waiting at most ``window_s`` after
+    the first queued text for more to arrive (capped at ``max_batch``), then
+    encodes the whole group in one call and hands each caller its own row.
+
+    ``encode_batch_fn(texts) -> list of vectors`` must return one vector per
+    input text, in order. Any exception (or a length mismatch) fails every
+    caller in that group — the handler turns it into the usual 500.
+    """
+
+    class _Item:
+        __slots__ = ("text", "result", "error", "done")
+
+        def __init__(self, text):
+            self.text = text
+            self.result = None
+            self.error = None
+            self.done = threading.Event()
+
+    def __init__(self, encode_batch_fn, window_s=BATCH_WINDOW_S, max_batch=MAX_BATCH):
+        self._encode_batch = encode_batch_fn
+        self._window_s = max(0.0, window_s)
+        self._max_batch = max(1, max_batch)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
 
+    def submit(self, text):
+        """Encode one text; blocks until its batch has run."""
+        return self.submit_many([text])[0]
 
-def make_handler(encode_fn, model_name, started_at, state):
+    def submit_many(self, texts):
+        """Encode ``texts`` (possibly alongside other callers' texts); returns vectors in order."""
+        items = [self._Item(t) for t in texts]
+        for item in items:
+            self._queue.put(item)
+        for item in items:
+            item.done.wait()
+        for item in items:
+            if item.error is not None:
+                raise item.error
+        return [item.result for item in items]
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self._window_s
+            stop = False
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._encode_group(batch)
+            if stop:
+                return
+
+    def _encode_group(self, batch):
+        try:
+            vecs = self._encode_batch([item.text for item in batch])
+            if len(vecs) != len(batch):
+                raise ValueError(f"encode_batch returned {len(vecs)} vectors for {len(batch)} texts")
+            for item, vec in zip(batch, vecs):
+                item.result = vec
+        except Exception as e:  # one bad group must not kill the worker thread
+            for item in batch:
+                item.error = e
+        finally:
+            for item in batch:
+                item.done.set()
+
+
+def make_handler(encode_fn, model_name, started_at, state, batcher=None):
     """Build a request handler around an injected encode function (testable without a model).
 
     ``state["last_request"]`` is stamped on every request so the idle watchdog
     can measure inactivity. The store is a single scalar write under the GIL,
     which is atomic in CPython — no lock needed for this access pattern.
+
+    With a :class:`MicroBatcher`, /embed and /embed_batch encode through it;
+    without one, /embed calls ``encode_fn`` inline and /embed_batch calls it
+    once per text.
     """
 
     class Handler(BaseHTTPRequestHandler):
@@ -58,6 +171,19 @@ def make_handler(encode_fn, model_name, started_at, state):
             self.end_headers()
             self.wfile.write(body)
 
+        def _wants_f32(self):
+            return F32_CONTENT_TYPE in (self.headers.get("Accept") or "")
+
+        def _f32(self, vecs):
+            body = b"".join(pack_f32(v) for v in vecs)
+            self.send_response(200)
+            self.send_header("Content-Type", F32_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("X-Embedding-Dim", str(len(vecs[0])))
+            self.send_header("X-Embedding-Count", str(len(vecs)))
+            self.end_headers()
+            self.wfile.write(body)
+
         def do_GET(self):
             state["last_request"] = time.time()
             if self.path == "/health":
@@ -66,26 +192,67 @@ def make_handler(encode_fn, model_name, started_at, state):
             else:
                 self._json(404, {"error": "not found"})
 
-        def do_POST(self):
-            state["last_request"] = time.time()
-            if self.path != "/embed":
-                return self._json(404, {"error": "not found"})
+        def _read_json(self, max_body):
+            """Return the decoded JSON body, or None after sending a 4xx."""
             try:
                 length = int(self.headers.get("Content-Length", 0))
-                if length < 0 or length > MAX_BODY:
-                    return self._json(413, {"error": "request too large"})
+                if length < 0 or length > max_body:
+                    self._json(413, {"error": "request too large"})
+                    return None
                 body = json.loads(self.rfile.read(length) or b"{}")
             except (ValueError, json.JSONDecodeError):
-                return self._json(400, {"error": "invalid JSON or Content-Length"})
+                self._json(400, {"error": "invalid JSON or Content-Length"})
+                return None
+            if not isinstance(body, dict):
+                self._json(400, {"error": "invalid JSON or Content-Length"})
+                return None
+            return body
+
+        def do_POST(self):
+            state["last_request"] = time.time()
+            if self.path == "/embed_batch":
+                return self._embed_batch()
+            if self.path != "/embed":
+                return self._json(404, {"error": "not found"})
+            body = self._read_json(MAX_BODY)
+            if body is None:
+                return
             text = body.get("text")
             if not isinstance(text, str) or not text.strip():
                 return self._json(400, {"error": "missing or empty 'text'"})
             try:
-                vec = encode_fn(text[:MAX_TEXT])
+                if batcher is not None:
+                    vec = batcher.submit(text[:MAX_TEXT])
+                else:
+                    vec = encode_fn(text[:MAX_TEXT])
             except Exception:
                 return self._json(500, {"error": "embedding failed"})
+            if self._wants_f32():
+                return self._f32([vec])
             self._json(200, {"embedding": vec, "dim": len(vec)})
 
+        def _embed_batch(self):
+            body = self._read_json(MAX_BATCH_BODY)
+            if body is None:
+                return
+            texts = body.get("texts")
+            if (not isinstance(texts, list) or not texts
+                    or not all(isinstance(t, str) and t.strip() for t in texts)):
+                return self._json(400, {"error": "'texts' must be a non-empty list of non-empty strings"})
+            if len(texts) > MAX_BATCH:
+                return self._json(413, {"error": f"too many texts (max {MAX_BATCH})"})
+            texts = [t[:MAX_TEXT] for t in texts]
+            try:
+                if batcher is not None:
+                    vecs = batcher.submit_many(texts)
+                else:
+                    vecs = [encode_fn(t) for t in texts]
+            except Exception:
+                return self._json(500, {"error": "embedding failed"})
+            if self._wants_f32():
+                return self._f32(vecs)
+            self._json(200, {"embeddings": vecs, "dim": len(vecs[0]), "count": len(vecs)})
+
     return Handler
 
 
@@ -118,13 +285,23 @@ def main():
     torch.set_num_threads(TORCH_THREADS)
     model = SentenceTransformer(EMBED_MODEL, device=EMBED_DEVICE)
 
+    # Shared on-disk cache (same file open_brain.py reads): hits skip the
+    # forward pass; only misses reach the model.
+    cache = embed_cache.default_cache(EMBED_MODEL)
+
     def encode(text):
-        return model.encode(text).tolist()
+        return embed_cache.encode_through(cache, [text], lambda ts: [model.encode(ts[0]).tolist()])[0]
+
+    def encode_batch(texts):
+        return embed_cache.encode_through(
+            cache, texts, lambda ts: model.encode(ts, batch_size=len(ts)).tolist())
 
+    batcher = MicroBatcher(encode_batch) if BATCH_WINDOW_S > 0 else None
     state = {"last_request": time.time()}
     try:
         server = ThreadingHTTPServer(("127.0.0.1", PORT),
-                                     make_handler(encode, EMBED_MODEL, started_at, state))
+                                     make_handler(encode, EMBED_MODEL, started_at, state,
+                                                  batcher=batcher))
     except OSError as e:
         if e.errno == errno.EADDRINUSE:
             sys.exit(0)  # port taken: another instance is already warm
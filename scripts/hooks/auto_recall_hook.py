@@ -28,8 +28,9 @@ import re
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # ─── Configuration ────────────────────────────────────────────────────────────
 
@@ -62,8 +63,13 @@ BEAD_ID_CAP = 10                 # max bead IDs per prompt to look up
 ATOM_ID_CAP = 5                  # max atom IDs per prompt to look up
 BEADS_SHOW_TIMEOUT_SECONDS = 8   # per-call timeout for `beads show`
 ATOM_INSPECT_TIMEOUT_SECONDS = 8  # per-call timeout for open_brain --inspect
-STALE_GUARD_BUDGET_SECONDS = 15  # total wall-clock budget for ALL bead lookups
-ATOM_STALE_GUARD_BUDGET_SECONDS = 10  # total wall-clock budget for ALL atom lookups
+# Every ID is first looked up by ONE batched call per kind (`beads show ID...
+# --json`, `open_brain.py --inspect-many ID... --json`), run concurrently with
+# each other and with the recall search. The budgets below bound only the
+# per-ID fallback, used for IDs the batched call did not answer (an older
+# beads CLI / daemon, a failed call).
+STALE_GUARD_BUDGET_SECONDS = 15  # total wall-clock budget for per-ID bead lookups
+ATOM_STALE_GUARD_BUDGET_SECONDS = 10  # total wall-clock budget for per-ID atom lookups
 # Without this cap: ATOM_ID_CAP × ATOM_INSPECT_TIMEOUT_SECONDS = 5 × 8 = 40s worst case.
 STALE_BEAD_STATES = {"closed", "done"}  # which states warrant a warning
 BEAD_TITLE_MAX_CHARS = 120       # trim bead title in the output section
@@ -76,6 +82,22 @@ if not OPEN_BRAIN_SCRIPT.exists():
     OPEN_BRAIN_SCRIPT = Path(__file__).parent.parent / "open_brain.py"
 
 
+def _brain_daemon_call(method: str, params: dict, timeout: float) -> Tuple[bool, object]:
+    """Ask the resident brain daemon first (brain_client.try_call).
+
+    ``(False, None)`` means the daemon could not serve the call (disabled,
+    not running, error) and the caller should shell open_brain.py as before.
+    brain_client sits next to open_brain.py in both layouts.
+    """
+    try:
+        if str(OPEN_BRAIN_SCRIPT.parent) not in sys.path:
+            sys.path.insert(0, str(OPEN_BRAIN_SCRIPT.parent))
+        import brain_client
+    except Exception:
+        return False, None
+    return brain_client.try_call(method, params, timeout=timeout)
+
+
 # ─── Trigger logic ────────────────────────────────────────────────────────────
 
 def _should_fire(prompt: str) -> bool:
@@ -102,6 +124,9 @@ def _should_fire(prompt: str) -> bool:
 def _run_brain_search(query: str) -> Optional[List[dict]]:
     """Invoke open_brain.py --search and return parsed atom list, or None on any error.
 
+    The resident brain daemon answers first when it is running; the
+    subprocess below is the fallback.
+
     The HF_HUB_OFFLINE / TRANSFORMERS_OFFLINE env vars suppress the
     HuggingFace Hub warning + occasional client-closed errors when many
     captures fire rapid-fire.
@@ -109,6 +134,14 @@ def _run_brain_search(query: str) -> Optional[List[dict]]:
     if not OPEN_BRAIN_SCRIPT.exists():
         return None
 
+    served, data = _brain_daemon_call(
+        "search",
+        {"query": query[:QUERY_WINDOW_CHARS], "limit": RECALL_LIMIT},
+        SEARCH_TIMEOUT_SECONDS,
+    )
+    if served:
+        return data if isinstance(data, list) else None
+
     env = {**os.environ, "HF_HUB_OFFLINE": "1", "TRANSFORMERS_OFFLINE": "1"}
 
     try:
@@ -388,19 +421,71 @@ def _run_beads_show(bead_id: str) -> Optional[dict]:
     return data
 
 
-def _collect_stale_beads(bead_ids: List[str]) -> List[Tuple[str, str, str]]:
+def _run_beads_show_many(bead_ids: List[str]) -> Dict[str, Optional[dict]]:
+    """One ``beads show <id>... --json`` for every ID; ``{bead_id: issue or None}``.
+
+    Several IDs answer with a JSON list of the issues found — every requested
+    ID is then covered, None meaning "no such bead". A lone object (one ID)
+    covers only its own ``id``. A timeout covers every ID with None — the
+    per-ID lookups would only spend their budget on the same slow store.
+    Any other failure returns ``{}``: nothing covered, so the caller falls
+    back to per-ID lookups (an older beads CLI rejects extra IDs with a
+    non-zero exit).
+    """
+    if not bead_ids:
+        return {}
+    try:
+        proc = subprocess.run(
+            ["beads", "show", *bead_ids, "--json"],
+            capture_output=True,
+            text=True,
+            timeout=BEADS_SHOW_TIMEOUT_SECONDS,
+        )
+    except subprocess.TimeoutExpired:
+        return {bid: None for bid in bead_ids}
+    except Exception:
+        return {}
+    if proc.returncode != 0 or not (proc.stdout or "").strip():
+        return {}
+    try:
+        data = json.loads(proc.stdout)
+    except Exception:
+        return {}
+
+    if isinstance(data, dict):
+        bid = data.get("id")
+        return {bid: data} if bid in bead_ids else {}
+    if not isinstance(data, list):
+        return {}
+    found: Dict[str, Optional[dict]] = {bid: None for bid in bead_ids}
+    for item in data:
+        if isinstance(item, dict) and item.get("id") in found:
+            found[item["id"]] = item
+    return found
+
+
+def _collect_stale_beads(
+    bead_ids: List[str],
+    looked_up: Optional[Dict[str, Optional[dict]]] = None,
+) -> List[Tuple[str, str, str]]:
     """For each ID, look up via beads show; return only stale (closed/done) ones.
 
+    ``looked_up`` holds the answers of the batched lookup
+    (_run_beads_show_many); only IDs it does not cover are shown one by one.
     Returns list of ``(bead_id, status, title)`` tuples. Honors the wall-clock
-    budget — short-circuits the loop if total elapsed time exceeds
+    budget — short-circuits the per-ID loop if total elapsed time exceeds
     STALE_GUARD_BUDGET_SECONDS, emitting whatever was already collected.
     """
+    looked_up = looked_up or {}
     stale: List[Tuple[str, str, str]] = []
     start = time.monotonic()
     for bid in bead_ids:
-        if time.monotonic() - start > STALE_GUARD_BUDGET_SECONDS:
-            break
-        data = _run_beads_show(bid)
+        if bid in looked_up:
+            data = looked_up[bid]
+        elif time.monotonic() - start > STALE_GUARD_BUDGET_SECONDS:
+            continue
+        else:
+            data = _run_beads_show(bid)
         if not data:
             continue
         status = str(data.get("status") or "").strip().lower()
@@ -437,6 +522,11 @@ def _run_open_brain_inspect(atom_id: str) -> Optional[dict]:
     """Call ``open_brain.py --inspect <id> --json`` and return parsed dict, or None on error."""
     if not OPEN_BRAIN_SCRIPT.exists():
         return None
+    served, data = _brain_daemon_call(
+        "inspect", {"thought_id": atom_id}, ATOM_INSPECT_TIMEOUT_SECONDS,
+    )
+    if served:
+        return data if isinstance(data, dict) else None
     env = {**os.environ, "HF_HUB_OFFLINE": "1", "TRANSFORMERS_OFFLINE": "1"}
     try:
         proc = subprocess.run(
@@ -501,24 +591,77 @@ def _extract_atom_supersession(data: dict) -> Optional[str]:
     return None
 
 
-def _collect_stale_atoms(atom_ids: List[str]) -> List[Tuple[str, str]]:
-    """For each atom ID, look up via open_brain --inspect; surface only stale ones.
+def _run_open_brain_inspect_many(atom_ids: List[str]) -> Dict[str, Optional[dict]]:
+    """One ``open_brain.py --inspect-many <id>... --json`` for every ID.
+
+    Daemon first (method ``inspect_many``), as for single inspects. Returns
+    ``{atom_id: payload or None}`` — None for an ID the lookup answered
+    with an error (not in scope / forgotten), matching what a failed
+    single ``--inspect`` yields. A CLI timeout covers every ID with None, so
+    the per-ID lookups do not add their budget on top; any other failure
+    returns ``{}`` so the caller falls back to per-ID lookups.
+    """
+    if not atom_ids or not OPEN_BRAIN_SCRIPT.exists():
+        return {}
+    served, data = _brain_daemon_call(
+        "inspect_many", {"thought_ids": atom_ids}, ATOM_INSPECT_TIMEOUT_SECONDS,
+    )
+    if not served:
+        env = {**os.environ, "HF_HUB_OFFLINE": "1", "TRANSFORMERS_OFFLINE": "1"}
+        try:
+            proc = subprocess.run(
+                ["python3", str(OPEN_BRAIN_SCRIPT), "--inspect-many", *atom_ids, "--json"],
+                capture_output=True,
+                text=True,
+                timeout=ATOM_INSPECT_TIMEOUT_SECONDS,
+                env=env,
+            )
+            if proc.returncode != 0 or not (proc.stdout or "").strip():
+                return {}
+            data = json.loads(proc.stdout)
+        except subprocess.TimeoutExpired:
+            return {aid: None for aid in atom_ids}
+        except Exception:
+            return {}
+    if not isinstance(data, dict):
+        return {}
+    found: Dict[str, Optional[dict]] = {}
+    for aid in atom_ids:
+        payload = data.get(aid)
+        if isinstance(payload, dict):
+            found[aid] = None if payload.get("error") else payload
+    return found
 
-    Returns ``(atom_id, reason)`` tuples. Atoms without supersession/forget
-    metadata (the vast majority) are silently skipped — no warning needed.
 
-    Honors a cumulative wall-clock budget of ATOM_STALE_GUARD_BUDGET_SECONDS.
-    Without this cap the worst case is ATOM_ID_CAP × ATOM_INSPECT_TIMEOUT_SECONDS
-    (5 × 8 = 40 s) blocking every prompt that mentions atom IDs. When the budget
-    is hit mid-loop, we stop and return whatever was already collected — partial
-    stale info is fine (fail-open: missing stale info is safer than a 40s hang).
+def _collect_stale_atoms(
+    atom_ids: List[str],
+    looked_up: Optional[Dict[str, Optional[dict]]] = None,
+) -> List[Tuple[str, str]]:
+    """For each atom ID, look up via open_brain --inspect; surface only stale ones.
+
+    ``looked_up`` holds the answers of the batched lookup
+    (_run_open_brain_inspect_many); only IDs it does not cover are inspected
+    one by one. Returns ``(atom_id, reason)`` tuples. Atoms without
+    supersession/forget metadata (the vast majority) are silently skipped —
+    no warning needed.
+
+    The per-ID loop honors a cumulative wall-clock budget of
+    ATOM_STALE_GUARD_BUDGET_SECONDS. Without this cap the worst case is
+    ATOM_ID_CAP × ATOM_INSPECT_TIMEOUT_SECONDS (5 × 8 = 40 s) blocking every
+    prompt that mentions atom IDs. When the budget is hit mid-loop, we stop
+    inspecting and return whatever was already collected — partial stale
+    info is fine (fail-open: missing stale info is safer than a 40s hang).
     """
+    looked_up = looked_up or {}
     stale: List[Tuple[str, str]] = []
     start = time.monotonic()
     for aid in atom_ids:
-        if time.monotonic() - start > ATOM_STALE_GUARD_BUDGET_SECONDS:
-            break
-        data = _run_open_brain_inspect(aid)
+        if aid in looked_up:
+            data = looked_up[aid]
+        elif time.monotonic() - start > ATOM_STALE_GUARD_BUDGET_SECONDS:
+            continue
+        else:
+            data = _run_open_brain_inspect(aid)
         if not data:
             continue
         reason = _extract_atom_supersession(data)
@@ -569,17 +712,23 @@ def _format_stale_guard_section(
 def _build_stale_guard_for_prompt(prompt: str) -> Optional[str]:
     """End-to-end stale-state guard pipeline for a single prompt.
 
-    Wraps extraction + lookup + formatting in a fail-open envelope so any
-    exception (subprocess crash, parse failure, etc) yields None — the recall
-    block keeps emitting unaffected.
+    The batched bead and atom lookups run concurrently; per-ID lookups then
+    cover only what they left unanswered. Wraps extraction + lookup +
+    formatting in a fail-open envelope so any exception (subprocess crash,
+    parse failure, etc) yields None — the recall block keeps emitting
+    unaffected.
     """
     try:
         bead_ids = _extract_bead_ids(prompt)
         atom_ids = _extract_atom_ids(prompt)
         if not bead_ids and not atom_ids:
             return None
-        stale_beads = _collect_stale_beads(bead_ids) if bead_ids else []
-        stale_atoms = _collect_stale_atoms(atom_ids) if atom_ids else []
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            beads_future = pool.submit(_run_beads_show_many, bead_ids)
+            atoms_future = pool.submit(_run_open_brain_inspect_many, atom_ids)
+            beads_found, atoms_found = beads_future.result(), atoms_future.result()
+        stale_beads = _collect_stale_beads(bead_ids, beads_found) if bead_ids else []
+        stale_atoms = _collect_stale_atoms(atom_ids, atoms_found) if atom_ids else []
         return _format_stale_guard_section(stale_beads, stale_atoms)
     except Exception:
         return None
@@ -617,13 +766,15 @@ def _read_prompt_from_stdin() -> str:
 def main() -> None:
     """Hook entry point. Always exits 0; emits stdout only when recall succeeds.
 
-    Composition: the recall block (semantic prior-memories pull) runs first.
-    The stale-state guard then runs independently — its job is to surface
+    Composition: the recall block (semantic prior-memories pull) comes first.
+    The stale-state guard runs independently — its job is to surface
     referenced bead-IDs that are already closed and recalled atoms that have
     been superseded. If the recall block is silent (trigger missed or empty
     result), the guard still runs against any IDs found in the prompt. Either
     block alone is sufficient to emit additionalContext; both blocks together
-    are concatenated recall-first.
+    are concatenated recall-first. The guard's lookups run on a worker thread
+    alongside the search, so the prompt waits for the slower of the two
+    rather than their sum.
     """
     try:
         prompt = _read_prompt_from_stdin()
@@ -631,12 +782,13 @@ def main() -> None:
             return
 
         recall_block: Optional[str] = None
-        if _should_fire(prompt):
-            atoms = _run_brain_search(prompt)
-            if atoms:
-                recall_block = _build_additional_context(atoms)
-
-        stale_block = _build_stale_guard_for_prompt(prompt)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            stale_future = pool.submit(_build_stale_guard_for_prompt, prompt)
+            if _should_fire(prompt):
+                atoms = _run_brain_search(prompt)
+                if atoms:
+                    recall_block = _build_additional_context(atoms)
+            stale_block = stale_future.result()
 
         if recall_block and stale_block:
             context = f"{recall_block}\n\n{stale_block}"
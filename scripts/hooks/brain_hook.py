@@ -146,6 +146,20 @@ def _fire_capture(
             payload_obj["prov_agent"] = prov_agent
         if prov_activity is not None:
             payload_obj["prov_activity"] = prov_activity
+        # Resident brain daemon first: a notification returns as soon as the
+        # daemon has the request, so the hook never waits on the capture.
+        try:
+            if str(BRAIN_SCRIPT.parent) not in sys.path:
+                sys.path.insert(0, str(BRAIN_SCRIPT.parent))
+            import brain_client
+            if brain_client.enabled():
+                params = {k: v for k, v in payload_obj.items() if k != "op"}
+                if brain_client.notify("capture", params):
+                    return
+                brain_client.spawn_detached()
+        except Exception:
+            pass
+
         payload = json.dumps(payload_obj)
 
         proc = subprocess.Popen(
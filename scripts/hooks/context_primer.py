@@ -18,9 +18,10 @@ import sys
 import json
 import argparse
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 
 def get_log_dir() -> Path:
@@ -169,8 +170,8 @@ def _format_atom_line(atom: Dict[str, str]) -> str:
     return f"- {atom['date']} | {atom['type']} | {atom['id']} — {atom['summary']}"
 
 
-def _run_open_brain(args: List[str], timeout: int = 8) -> List[Dict[str, Any]]:
-    """Shell open_brain.py with the given args and return parsed JSON list.
+def _run_open_brain_json(args: List[str], timeout: int = 8) -> Any:
+    """Shell open_brain.py with the given args and return its parsed JSON.
 
     Raises subprocess.CalledProcessError, subprocess.TimeoutExpired, or
     json.JSONDecodeError on failure — caller is responsible for fail-open.
@@ -184,12 +185,117 @@ def _run_open_brain(args: List[str], timeout: int = 8) -> List[Dict[str, Any]]:
         timeout=timeout,
         check=True,
     )
-    parsed = json.loads(proc.stdout)
+    return json.loads(proc.stdout)
+
+
+def _run_open_brain(args: List[str], timeout: int = 8) -> List[Dict[str, Any]]:
+    """Shell open_brain.py with the given args and return parsed JSON list.
+
+    Raises subprocess.CalledProcessError, subprocess.TimeoutExpired, or
+    json.JSONDecodeError on failure — caller is responsible for fail-open.
+    """
+    parsed = _run_open_brain_json(args, timeout=timeout)
     if not isinstance(parsed, list):
-        raise json.JSONDecodeError("expected list", proc.stdout, 0)
+        raise json.JSONDecodeError("expected list", json.dumps(parsed), 0)
     return parsed
 
 
+def _brain_daemon_call(method: str, params: Dict[str, Any], timeout: int = 8) -> Any:
+    """Ask the resident brain daemon (brain_client.py) to serve one call.
+
+    Returns None when the daemon cannot serve it — disabled, not running,
+    or it answered with an error — so the caller shells open_brain.py
+    exactly as before.
+    """
+    try:
+        client_dir = str(_open_brain_path().parent)
+        if client_dir not in sys.path:
+            sys.path.insert(0, client_dir)
+        import brain_client
+    except Exception:
+        return None
+    served, result = brain_client.try_call(method, params, timeout=timeout)
+    return result if served else None
+
+
+def _brain_daemon_list(method: str, params: Dict[str, Any], timeout: int = 8) -> Optional[List[Dict[str, Any]]]:
+    """Ask the resident brain daemon for a JSON list (None: not served)."""
+    result = _brain_daemon_call(method, params, timeout=timeout)
+    return result if isinstance(result, list) else None
+
+
+def _primed_lists(result: Any) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """Split a ``--prime`` payload into (recent, search); None if malformed."""
+    if not isinstance(result, dict):
+        return None
+    recent_raw = result.get("recent")
+    search_raw = result.get("search")
+    if not isinstance(recent_raw, list) or not isinstance(search_raw, list):
+        return None
+    if result.get("search_error"):
+        print(f"warn: brain --prime search failed: {result['search_error']}; "
+              "rendering recent-only block", file=sys.stderr)
+    return recent_raw, search_raw
+
+
+def _fetch_primed(
+    basename: str, days: int, recall_k: int,
+) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """Recent + project-relevant atoms from ONE open_brain call.
+
+    The daemon's ``prime`` method, else ``open_brain.py --prime``: one
+    process, one connection, one embedding. Returns None when neither
+    produced a well-formed answer (e.g. an open_brain.py that predates
+    --prime exits 2 on the unknown flag) so the caller can fall back to the
+    separate --recent / --search calls. TimeoutExpired propagates: the 8s
+    budget is already spent.
+    """
+    params = {"query": basename, "days": days, "limit": 10, "search_limit": recall_k}
+    primed = _primed_lists(_brain_daemon_call("prime", params))
+    if primed is not None:
+        return primed
+    try:
+        result = _run_open_brain_json(
+            ["--prime", basename, "--days", str(days), "--json",
+             "--limit", "10", "--search-limit", str(recall_k)],
+            timeout=8,
+        )
+    except (subprocess.CalledProcessError, json.JSONDecodeError):
+        return None
+    return _primed_lists(result)
+
+
+def _fetch_recent(days: int) -> List[Dict[str, Any]]:
+    recent_raw = _brain_daemon_list("recent", {"days": days, "limit": 10})
+    if recent_raw is None:
+        recent_raw = _run_open_brain(
+            ["--recent", "--days", str(days), "--json", "--limit", "10"],
+            timeout=8,
+        )
+    return recent_raw
+
+
+def _fetch_search(basename: str, recall_k: int) -> List[Dict[str, Any]]:
+    search_raw = _brain_daemon_list("search", {"query": basename, "limit": recall_k})
+    if search_raw is None:
+        search_raw = _run_open_brain(
+            ["--search", basename, "--json", "--limit", str(recall_k)],
+            timeout=8,
+        )
+    return search_raw
+
+
+def _brain_failure_message(flag: str, exc: BaseException, outcome: str) -> str:
+    """One-line stderr warning for a failed brain call."""
+    if isinstance(exc, subprocess.TimeoutExpired):
+        return f"warn: brain {flag} timed out (8s); {outcome}"
+    if isinstance(exc, subprocess.CalledProcessError):
+        return f"warn: brain {flag} exited {exc.returncode}; {outcome}"
+    if isinstance(exc, json.JSONDecodeError):
+        return f"warn: brain {flag} JSON parse failed: {exc}; {outcome}"
+    return f"warn: brain {flag} unexpected error: {exc}; {outcome}"
+
+
 def enrich_with_brain_context(
     working_dir: str,
     days: int = 3,
@@ -197,7 +303,13 @@ def enrich_with_brain_context(
 ) -> str:
     """Return a Markdown block of recent + project-relevant brain atoms.
 
-    Two subprocess calls (each capped at 8s):
+    One call (capped at 8s) answers both halves:
+      open_brain.py --prime "<basename of working_dir>" --days <days> --json
+                    --limit 10 --search-limit <recall_k>
+
+    served by the resident brain daemon when it is running, the subprocess
+    otherwise. If that call is unavailable, the two legacy calls run
+    concurrently (each capped at 8s):
       1. open_brain.py --recent --days <days> --json --limit 10
       2. open_brain.py --search "<basename of working_dir>" --json --limit <recall_k>
 
@@ -205,7 +317,8 @@ def enrich_with_brain_context(
     atoms. Fail-open semantics: any subprocess error, timeout, JSON parse
     failure, or generic exception returns "" and logs a one-line warning
     to stderr — this function MUST never raise and MUST never block
-    session priming.
+    session priming. A failed project search alone still renders the
+    recent atoms.
     """
     try:
         basename = os.path.basename(working_dir.rstrip("/")) or working_dir
@@ -213,52 +326,32 @@ def enrich_with_brain_context(
         print(f"warn: brain enrich basename failed: {exc}", file=sys.stderr)
         return ""
 
-    recent_raw: List[Dict[str, Any]] = []
-    search_raw: List[Dict[str, Any]] = []
-
     try:
-        recent_raw = _run_open_brain(
-            ["--recent", "--days", str(days), "--json", "--limit", "10"],
-            timeout=8,
-        )
-    except subprocess.TimeoutExpired:
-        print("warn: brain --recent timed out (8s); skipping brain block",
-              file=sys.stderr)
-        return ""
-    except subprocess.CalledProcessError as exc:
-        print(f"warn: brain --recent exited {exc.returncode}; skipping brain block",
-              file=sys.stderr)
-        return ""
-    except json.JSONDecodeError as exc:
-        print(f"warn: brain --recent JSON parse failed: {exc}; skipping brain block",
-              file=sys.stderr)
-        return ""
+        primed = _fetch_primed(basename, days, recall_k)
     except Exception as exc:
-        print(f"warn: brain --recent unexpected error: {exc}; skipping brain block",
+        print(_brain_failure_message("--prime", exc, "skipping brain block"),
               file=sys.stderr)
         return ""
 
-    try:
-        search_raw = _run_open_brain(
-            ["--search", basename, "--json", "--limit", str(recall_k)],
-            timeout=8,
-        )
-    except subprocess.TimeoutExpired:
-        print("warn: brain --search timed out (8s); rendering recent-only block",
-              file=sys.stderr)
-        search_raw = []
-    except subprocess.CalledProcessError as exc:
-        print(f"warn: brain --search exited {exc.returncode}; rendering recent-only block",
-              file=sys.stderr)
-        search_raw = []
-    except json.JSONDecodeError as exc:
-        print(f"warn: brain --search JSON parse failed: {exc}; rendering recent-only block",
-              file=sys.stderr)
-        search_raw = []
-    except Exception as exc:
-        print(f"warn: brain --search unexpected error: {exc}; rendering recent-only block",
-              file=sys.stderr)
-        search_raw = []
+    if primed is not None:
+        recent_raw, search_raw = primed
+    else:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            recent_future = pool.submit(_fetch_recent, days)
+            search_future = pool.submit(_fetch_search, basename, recall_k)
+            recent_exc = recent_future.exception()
+            search_exc = search_future.exception()
+        if recent_exc is not None:
+            print(_brain_failure_message("--recent", recent_exc, "skipping brain block"),
+                  file=sys.stderr)
+            return ""
+        recent_raw = recent_future.result()
+        if search_exc is not None:
+            print(_brain_failure_message("--search", search_exc, "rendering recent-only block"),
+                  file=sys.stderr)
+            search_raw = []
+        else:
+            search_raw = search_future.result()
 
     # Normalize + dedup. Recent atoms are added first (priority); project-
     # relevant atoms only appear if their id was not already seen.
@@ -0,0 +1,12 @@
+"""Shared pytest fixtures for scripts/hooks/tests.
+
+Hooks ask the resident brain daemon (brain_client.py) before shelling
+open_brain.py. Switch it off so a developer's running daemon never answers a
+test, and a test's CLI fallback never autostarts one.
+"""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolate_brain_daemon(monkeypatch):
+    monkeypatch.setenv("OPEN_BRAIN_DAEMON", "0")
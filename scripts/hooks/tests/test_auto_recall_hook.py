@@ -373,6 +373,32 @@ def test_hf_offline_env_vars_set():
     assert env.get("TRANSFORMERS_OFFLINE") == "1"
 
 
+# ─── Brain daemon path ─────────────────────────────────────────────────────────
+
+def test_daemon_answer_skips_subprocess():
+    """A served daemon call is used as-is; open_brain.py is never spawned."""
+    atoms = [_make_atom()]
+    mock_run = _make_mock_run([])
+    with patch.object(auto_recall_hook, "_brain_daemon_call",
+                      return_value=(True, atoms)) as daemon, \
+         patch.object(auto_recall_hook.subprocess, "run", mock_run):
+        assert auto_recall_hook._run_brain_search("q" * 900) == atoms
+    assert not mock_run.called
+    method, params, _timeout = daemon.call_args.args
+    assert method == "search"
+    assert params == {"query": "q" * auto_recall_hook.QUERY_WINDOW_CHARS,
+                      "limit": auto_recall_hook.RECALL_LIMIT}
+
+
+def test_daemon_unavailable_falls_back_to_subprocess():
+    atoms = [_make_atom()]
+    mock_run = _make_mock_run(atoms)
+    with patch.object(auto_recall_hook, "_brain_daemon_call", return_value=(False, None)), \
+         patch.object(auto_recall_hook.subprocess, "run", mock_run):
+        assert auto_recall_hook._run_brain_search("query") == atoms
+    assert mock_run.called
+
+
 # ─── Mock factory helpers (declared at end for readability) ───────────────────
 
 def _make_mock_run(atoms_to_return):
@@ -397,12 +423,13 @@ def _make_mock_run_callable(side_effect_callable):
 
 
 # ─── Stale-state guard test helpers ───────────────────────────────────────────
-# The guard issues two new subprocess command shapes alongside the existing
-# brain-search one:
-#   ["beads", "show", "<id>", "--json"]                                  (bead lookup)
-#   ["python3", "<open_brain.py>", "--inspect", "<id>", "--json"]        (atom inspect)
+# The guard issues these subprocess command shapes alongside the brain-search one:
+#   ["beads", "show", "<id>", ..., "--json"]                             (bead lookup)
+#   ["python3", "<open_brain.py>", "--inspect-many", "<id>", ..., "--json"]  (batched atoms)
+#   ["python3", "<open_brain.py>", "--inspect", "<id>", "--json"]        (per-ID fallback)
 # A dispatching mock routes by argv[0]/argv[1] so we can assert per-command
-# behavior in isolation.
+# behavior in isolation; batched=False makes it behave like a beads CLI /
+# open_brain.py that predates the batched forms.
 
 
 def _make_dispatching_mock(
@@ -411,6 +438,7 @@ def _make_dispatching_mock(
     bead_title_by_id=None,
     bead_raises_for=None,
     atom_prov_by_id=None,
+    batched=True,
 ):
     """Dispatch subprocess.run by command shape.
 
@@ -419,6 +447,8 @@ def _make_dispatching_mock(
     - bead_title_by_id: {bead_id: title_str} — paired with bead_status_by_id
     - bead_raises_for: set of bead_ids whose lookup should raise an exception
     - atom_prov_by_id: {atom_id: {"superseded_by": ...}} — open_brain --inspect payload
+    - batched: accept several IDs per `beads show` and `--inspect-many`
+      (False → exit 2 on either, like an older CLI)
     """
     from unittest.mock import MagicMock
 
@@ -433,20 +463,37 @@ def _make_dispatching_mock(
         if not argv:
             return _FakeCompletedProcess(stdout="", returncode=2)
 
-        # beads show <id> --json
+        # beads show <id>... --json
         if argv[0] == "beads" and len(argv) >= 3 and argv[1] == "show":
-            bid = argv[2]
-            if bid in bead_raises_for:
+            bids = [a for a in argv[2:] if a != "--json"]
+            if len(bids) > 1 and not batched:
+                return _FakeCompletedProcess(stdout="", returncode=2)
+            if bead_raises_for.intersection(bids):
                 raise subprocess.CalledProcessError(2, argv)
-            status = bead_status_by_id.get(bid)
-            if status is None:
+            found = [
+                {"id": bid, "status": bead_status_by_id[bid],
+                 "title": bead_title_by_id.get(bid, "")}
+                for bid in bids if bead_status_by_id.get(bid) is not None
+            ]
+            if len(bids) > 1:
+                return _FakeCompletedProcess(stdout=json.dumps(found), returncode=0)
+            if not found:
                 return _FakeCompletedProcess(stdout="", returncode=2)
-            payload = {"id": bid, "status": status, "title": bead_title_by_id.get(bid, "")}
-            return _FakeCompletedProcess(stdout=json.dumps(payload), returncode=0)
+            return _FakeCompletedProcess(stdout=json.dumps(found[0]), returncode=0)
 
         # python3 <open_brain.py> --inspect <id> --json
         # OR    python3 <open_brain.py> --search <query> ...
         if argv[0] == "python3" and len(argv) >= 4:
+            if "--inspect-many" in argv:
+                if not batched:
+                    return _FakeCompletedProcess(stdout="", returncode=2)
+                aids = argv[argv.index("--inspect-many") + 1:-1]
+                payload = {
+                    aid: atom_prov_by_id.get(aid)
+                    or {"thought_id": aid, "result": None, "error": "not in user scope"}
+                    for aid in aids
+                }
+                return _FakeCompletedProcess(stdout=json.dumps(payload), returncode=0)
             if "--inspect" in argv:
                 aid_idx = argv.index("--inspect") + 1
                 aid = argv[aid_idx] if aid_idx < len(argv) else ""
@@ -467,15 +514,25 @@ def _make_dispatching_mock(
     return mock
 
 
-def _count_beads_show_calls(mock_run, bead_id=None):
-    """Count how many times `beads show [<bead_id>]` was invoked."""
-    count = 0
+def _beads_show_argvs(mock_run):
+    argvs = []
     for call in mock_run.call_args_list:
         argv = call.args[0] if call.args else call.kwargs.get("args", [])
-        if not argv or argv[0] != "beads" or len(argv) < 3 or argv[1] != "show":
-            continue
-        if bead_id is None or argv[2] == bead_id:
-            count += 1
+        if argv and argv[0] == "beads" and len(argv) >= 3 and argv[1] == "show":
+            argvs.append(argv)
+    return argvs
+
+
+def _count_beads_show_calls(mock_run, bead_id=None):
+    """Count how many bead-ID lookups (`beads show [<bead_id>]`) were made.
+
+    A batched ``beads show a b c --json`` counts once per ID it carries.
+    """
+    count = 0
+    for argv in _beads_show_argvs(mock_run):
+        for bid in argv[2:]:
+            if bid != "--json" and (bead_id is None or bid == bead_id):
+                count += 1
     return count
 
 
@@ -813,3 +870,120 @@ def test_collect_stale_atoms_budget_constant_exists():
         f"(ATOM_ID_CAP={auto_recall_hook.ATOM_ID_CAP} × "
         f"ATOM_INSPECT_TIMEOUT_SECONDS={auto_recall_hook.ATOM_INSPECT_TIMEOUT_SECONDS})"
     )
+
+
+# ─── Batched, concurrent stale-guard lookups ─────────────────────────────────
+
+def _inspect_argvs(mock_run, flag):
+    return [
+        call.args[0] for call in mock_run.call_args_list
+        if call.args and call.args[0][0] == "python3" and flag in call.args[0]
+    ]
+
+
+_BATCH_PROMPT = (
+    "Please review gz-aaa111, gz-bbb222 and gz-ccc333 plus the recalled "
+    "atoms brain-1-aaaaaaaa and brain-2-bbbbbbbb before we decide the plan."
+)
+
+
+def test_stale_guard_one_batched_lookup_per_kind():
+    """Three beads + two atoms → one `beads show` and one --inspect-many, no per-ID calls."""
+    mock_run = _make_dispatching_mock(
+        atoms_to_return=[_make_atom()],
+        bead_status_by_id={"gz-aaa111": "closed", "gz-bbb222": "open", "gz-ccc333": "done"},
+        atom_prov_by_id={"brain-2-bbbbbbbb": {"thought_id": "brain-2-bbbbbbbb",
+                                              "superseded_by": "brain-3-cccccccc"}},
+    )
+    with patch.object(auto_recall_hook, "_brain_daemon_call", return_value=(False, None)):
+        out, exit_code = _run_hook_with_prompt(_BATCH_PROMPT, mock_run=mock_run)
+    assert exit_code == 0
+    ctx = json.loads(out)["additionalContext"]
+    assert "gz-aaa111 [closed]" in ctx and "gz-ccc333 [done]" in ctx
+    assert "gz-bbb222" not in ctx.split("## Stale-state guard")[1]
+    assert "brain-2-bbbbbbbb" in ctx and "brain-1-aaaaaaaa —" not in ctx
+
+    assert len(_beads_show_argvs(mock_run)) == 1
+    assert len(_inspect_argvs(mock_run, "--inspect-many")) == 1
+    assert _inspect_argvs(mock_run, "--inspect") == []
+
+
+def test_stale_guard_falls_back_per_id_for_older_clis():
+    """A beads CLI / open_brain.py without the batched forms → per-ID lookups, same output."""
+    mock_run = _make_dispatching_mock(
+        atoms_to_return=[_make_atom()],
+        bead_status_by_id={"gz-aaa111": "closed", "gz-bbb222": "open", "gz-ccc333": "done"},
+        atom_prov_by_id={"brain-2-bbbbbbbb": {"superseded_by": "brain-3-cccccccc"}},
+        batched=False,
+    )
+    with patch.object(auto_recall_hook, "_brain_daemon_call", return_value=(False, None)):
+        out, _ = _run_hook_with_prompt(_BATCH_PROMPT, mock_run=mock_run)
+    ctx = json.loads(out)["additionalContext"]
+    assert "gz-aaa111 [closed]" in ctx and "gz-ccc333 [done]" in ctx
+    assert "brain-2-bbbbbbbb" in ctx
+    assert len(_beads_show_argvs(mock_run)) == 1 + 3
+    assert len(_inspect_argvs(mock_run, "--inspect")) == 2
+
+
+def test_batched_timeout_skips_per_id_fallback():
+    """A batched call that timed out is not followed by per-ID lookups."""
+    def timeout(argv, **kwargs):
+        raise subprocess.TimeoutExpired(argv, kwargs.get("timeout"))
+
+    with patch.object(auto_recall_hook, "_brain_daemon_call", return_value=(False, None)), \
+         patch.object(auto_recall_hook.subprocess, "run", side_effect=timeout) as run:
+        assert auto_recall_hook._build_stale_guard_for_prompt(_BATCH_PROMPT) is None
+    argvs = [call.args[0] for call in run.call_args_list]
+    assert len(argvs) == 2
+    assert any(a[:2] == ["beads", "show"] and len(a) == 6 for a in argvs)
+    assert any("--inspect-many" in a for a in argvs)
+
+
+def test_batched_lookup_covers_every_id_past_the_fallback_budget():
+    """The per-ID budgets no longer drop IDs the batched call answered."""
+    bead_ids = [f"gz-id{i:04d}" for i in range(auto_recall_hook.BEAD_ID_CAP)]
+    looked_up = {bid: {"id": bid, "status": "closed", "title": bid} for bid in bead_ids}
+    with patch.object(auto_recall_hook, "STALE_GUARD_BUDGET_SECONDS", -1), \
+         patch.object(auto_recall_hook, "_run_beads_show") as per_id:
+        stale = auto_recall_hook._collect_stale_beads(bead_ids, looked_up)
+    assert [s[0] for s in stale] == bead_ids
+    per_id.assert_not_called()
+
+
+def test_inspect_many_prefers_daemon():
+    """A daemon that serves inspect_many → no subprocess; error entries map to None."""
+    answer = {
+        "brain-1-aaaaaaaa": {"thought_id": "brain-1-aaaaaaaa", "source": "live"},
+        "brain-2-bbbbbbbb": {"thought_id": "brain-2-bbbbbbbb", "result": None,
+                             "error": "not in user scope"},
+    }
+    with patch.object(auto_recall_hook, "_brain_daemon_call", return_value=(True, answer)) as d, \
+         patch.object(auto_recall_hook.subprocess, "run") as run:
+        found = auto_recall_hook._run_open_brain_inspect_many(list(answer))
+    assert d.call_args.args[:2] == ("inspect_many", {"thought_ids": list(answer)})
+    run.assert_not_called()
+    assert found == {"brain-1-aaaaaaaa": answer["brain-1-aaaaaaaa"], "brain-2-bbbbbbbb": None}
+
+
+def test_stale_guard_overlaps_recall_search():
+    """The guard's lookups run alongside the search: wall time ≈ max, not sum."""
+    import time as _time
+
+    def slow_search(_query):
+        _time.sleep(0.3)
+        return [_make_atom()]
+
+    def slow_beads(bead_ids):
+        _time.sleep(0.3)
+        return {bid: {"id": bid, "status": "closed", "title": "t"} for bid in bead_ids}
+
+    with patch.object(auto_recall_hook, "_run_brain_search", side_effect=slow_search), \
+         patch.object(auto_recall_hook, "_run_beads_show_many", side_effect=slow_beads), \
+         patch.object(auto_recall_hook, "_run_open_brain_inspect_many", return_value={}), \
+         patch.object(auto_recall_hook, "_run_open_brain_inspect", return_value=None):
+        started = _time.monotonic()
+        out, _ = _run_hook_with_prompt(_BATCH_PROMPT)
+        elapsed = _time.monotonic() - started
+    ctx = json.loads(out)["additionalContext"]
+    assert "## Recent neurosymbolic context" in ctx and "gz-aaa111 [closed]" in ctx
+    assert elapsed < 0.55
@@ -3,6 +3,8 @@
 TDD tests for context_primer.enrich_with_brain_context.
 
 Tests cover:
+  - One --prime call answers both halves (daemon first, then subprocess)
+  - Without --prime, the legacy --recent / --search pair runs concurrently
   - Happy path: mock subprocess returns valid JSON for both calls
   - Subprocess failure: nonzero exit → empty string (fail-open)
   - JSON parse failure → empty string (fail-open)
@@ -17,6 +19,7 @@ Run from repo root:
 import json
 import subprocess
 import sys
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -52,6 +55,29 @@ def _proc_ok(atoms: list) -> MagicMock:
     return m
 
 
+def _dispatch(recent=None, search=None, prime=None, calls=None):
+    """subprocess.run stand-in that answers by open_brain.py flag.
+
+    Each of recent / search / prime is a payload (JSON-encoded as stdout) or
+    an exception instance to raise. prime=None behaves like an open_brain.py
+    without --prime (argparse exits 2), so the legacy pair runs.
+    """
+    if prime is None:
+        prime = subprocess.CalledProcessError(returncode=2, cmd=["python3", "open_brain.py"])
+    answers = {"--recent": recent or [], "--search": search or [], "--prime": prime}
+
+    def run(cmd, **kwargs):
+        if calls is not None:
+            calls.append(cmd)
+        (flag,) = [a for a in cmd if a in answers]
+        answer = answers[flag]
+        if isinstance(answer, BaseException):
+            raise answer
+        return _proc_ok(answer)
+
+    return run
+
+
 # ---------------------------------------------------------------------------
 # Tests
 # ---------------------------------------------------------------------------
@@ -64,11 +90,8 @@ class TestEnrichWithBrainContext:
         recent_atoms = [_make_atom("id-r1", "Recent atom one")]
         search_atoms = [_make_atom("id-s1", "Search atom one")]
 
-        with patch("context_primer.subprocess.run") as mock_run:
-            mock_run.side_effect = [
-                _proc_ok(recent_atoms),
-                _proc_ok(search_atoms),
-            ]
+        with patch("context_primer.subprocess.run",
+                   side_effect=_dispatch(recent_atoms, search_atoms)):
             result = enrich_with_brain_context("/some/project/dir")
 
         assert result != ""
@@ -117,11 +140,8 @@ class TestEnrichWithBrainContext:
         recent_atoms = [shared_atom]
         search_atoms = [shared_atom, _make_atom("unique-s", "Unique search atom")]
 
-        with patch("context_primer.subprocess.run") as mock_run:
-            mock_run.side_effect = [
-                _proc_ok(recent_atoms),
-                _proc_ok(search_atoms),
-            ]
+        with patch("context_primer.subprocess.run",
+                   side_effect=_dispatch(recent_atoms, search_atoms)):
             result = enrich_with_brain_context("/some/project/dir")
 
         # shared-id must appear exactly once
@@ -135,11 +155,8 @@ class TestEnrichWithBrainContext:
         recent_atoms = [_make_atom(f"r-{i}", f"Recent {i}") for i in range(10)]
         search_atoms = [_make_atom(f"s-{i}", f"Search {i}") for i in range(10)]
 
-        with patch("context_primer.subprocess.run") as mock_run:
-            mock_run.side_effect = [
-                _proc_ok(recent_atoms),
-                _proc_ok(search_atoms),
-            ]
+        with patch("context_primer.subprocess.run",
+                   side_effect=_dispatch(recent_atoms, search_atoms)):
             result = enrich_with_brain_context("/some/project/dir")
 
         # Count distinct atom ids present in the output
@@ -169,23 +186,16 @@ class TestEnrichWithBrainContext:
         """If --search times out but --recent succeeds, recent block is returned."""
         recent_atoms = [_make_atom("r-timeout", "Recent despite search timeout")]
 
-        def side_effect(cmd, **kwargs):
-            if "--recent" in cmd:
-                return _proc_ok(recent_atoms)
-            raise subprocess.TimeoutExpired(cmd=cmd, timeout=8)
-
-        with patch("context_primer.subprocess.run", side_effect=side_effect):
+        timeout = subprocess.TimeoutExpired(cmd=["python3", "open_brain.py"], timeout=8)
+        with patch("context_primer.subprocess.run",
+                   side_effect=_dispatch(recent_atoms, timeout)):
             result = enrich_with_brain_context("/some/project/dir")
 
         assert "r-timeout" in result
 
     def test_enrich_empty_results_returns_empty_string(self):
         """Both calls return empty list → enrich returns empty string (not a block)."""
-        with patch("context_primer.subprocess.run") as mock_run:
-            mock_run.side_effect = [
-                _proc_ok([]),
-                _proc_ok([]),
-            ]
+        with patch("context_primer.subprocess.run", side_effect=_dispatch([], [])):
             result = enrich_with_brain_context("/some/project/dir")
 
         assert result == ""
@@ -194,16 +204,14 @@ class TestEnrichWithBrainContext:
         """The basename of working_dir is passed as the --search query."""
         captured_cmds = []
 
-        def side_effect(cmd, **kwargs):
-            captured_cmds.append(cmd)
-            return _proc_ok([])
-
-        with patch("context_primer.subprocess.run", side_effect=side_effect):
+        with patch("context_primer.subprocess.run",
+                   side_effect=_dispatch(calls=captured_cmds)):
             enrich_with_brain_context("/users/someone/dev/my-project")
 
-        # Second call should include the basename
-        assert len(captured_cmds) == 2
-        search_cmd = captured_cmds[1]
+        # --prime first, then the legacy pair; both queries use the basename
+        assert len(captured_cmds) == 3
+        assert captured_cmds[0][captured_cmds[0].index("--prime") + 1] == "my-project"
+        (search_cmd,) = [c for c in captured_cmds if "--search" in c]
         assert "my-project" in search_cmd
 
     def test_enrich_timeout_parameter_passed_to_subprocess(self):
@@ -219,3 +227,66 @@ class TestEnrichWithBrainContext:
         # Verify timeout was passed
         call_kwargs = mock_run.call_args[1]
         assert call_kwargs.get("timeout") == 8
+
+
+class TestPrime:
+    """One --prime call instead of the --recent / --search pair."""
+
+    def test_prime_subprocess_answers_both_halves(self):
+        calls = []
+        prime = {"recent": [_make_atom("r-1", "Recent one")],
+                 "search": [_make_atom("r-1"), _make_atom("s-1", "Search one")]}
+        with patch("context_primer.subprocess.run",
+                   side_effect=_dispatch(prime=prime, calls=calls)):
+            result = enrich_with_brain_context("/dev/my-project", recall_k=4)
+
+        assert len(calls) == 1
+        cmd = calls[0]
+        assert cmd[cmd.index("--prime") + 1] == "my-project"
+        assert cmd[cmd.index("--search-limit") + 1] == "4"
+        assert result.count("r-1") == 1 and "Search one" in result
+
+    def test_daemon_prime_skips_subprocess(self):
+        prime = {"recent": [_make_atom("d-r")], "search": [_make_atom("d-s")]}
+        with patch("context_primer._brain_daemon_call", return_value=prime) as daemon, \
+             patch("context_primer.subprocess.run") as mock_run:
+            result = enrich_with_brain_context("/dev/my-project", days=3, recall_k=5)
+
+        mock_run.assert_not_called()
+        daemon.assert_called_once_with(
+            "prime", {"query": "my-project", "days": 3, "limit": 10, "search_limit": 5})
+        assert "d-r" in result and "d-s" in result
+
+    def test_prime_search_error_renders_recent_only(self, capsys):
+        prime = {"recent": [_make_atom("r-ok")], "search": [], "search_error": "embed down"}
+        with patch("context_primer.subprocess.run", side_effect=_dispatch(prime=prime)):
+            result = enrich_with_brain_context("/dev/my-project")
+
+        assert "r-ok" in result
+        assert "embed down" in capsys.readouterr().err
+
+    def test_prime_timeout_does_not_fall_back(self):
+        calls = []
+        timeout = subprocess.TimeoutExpired(cmd=["python3", "open_brain.py"], timeout=8)
+        with patch("context_primer.subprocess.run",
+                   side_effect=_dispatch([_make_atom("r")], prime=timeout, calls=calls)):
+            assert enrich_with_brain_context("/dev/my-project") == ""
+        assert len(calls) == 1
+
+    def test_legacy_pair_runs_concurrently(self):
+        """Without --prime, --search starts before --recent returns."""
+        search_started = threading.Event()
+
+        def run(cmd, **kwargs):
+            if "--prime" in cmd:
+                raise subprocess.CalledProcessError(returncode=2, cmd=cmd)
+            if "--recent" in cmd:
+                assert search_started.wait(2.0), "--search waited for --recent"
+                return _proc_ok([_make_atom("r-c")])
+            search_started.set()
+            return _proc_ok([_make_atom("s-c")])
+
+        with patch("context_primer.subprocess.run", side_effect=run):
+            result = enrich_with_brain_context("/dev/my-project")
+
+        assert "r-c" in result and "s-c" in result
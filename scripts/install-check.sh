@@ -96,6 +96,12 @@ FILE_MAP=(
     "scripts/citation_walker.py"             "hooks/citation_walker.py"
     "scripts/vf_probe.py"                    "hooks/vf_probe.py"
     "scripts/time_travel.py"                 "hooks/time_travel.py"
+    "scripts/embed_server.py"                "hooks/embed_server.py"
+    "scripts/embed_cache.py"                 "hooks/embed_cache.py"
+    "scripts/vector_codec.py"                "hooks/vector_codec.py"
+    "scripts/brain_daemon.py"                "hooks/brain_daemon.py"
+    "scripts/brain_client.py"                "hooks/brain_client.py"
+    "scripts/pg_pool.py"                     "hooks/pg_pool.py"
 
     # redact/ package — repo: scripts/redact/  live: hooks/redact/
     "scripts/redact/__init__.py"                        "hooks/redact/__init__.py"
@@ -192,13 +192,15 @@ function Invoke-Uninstall([string]$pythonExe) {
 
     # Remove hook scripts
     $hookFiles = @(
-        "auto_recall_hook.py", "beads_writer.py", "brain_hook.py",
-        "citation_walker.py", "context_primer.py", "dispatch_gate.py", "log_writer.py",
-        "memory_writer.py", "open_brain.py", "pg_sync.py",
+        "auto_recall_hook.py", "beads_writer.py", "brain_client.py",
+        "brain_daemon.py", "brain_hook.py",
+        "citation_walker.py", "context_primer.py", "dispatch_gate.py",
+        "embed_cache.py", "embed_server.py", "log_writer.py",
+        "memory_writer.py", "open_brain.py", "pg_pool.py", "pg_sync.py",
         "post_tool_use.py", "pre-tool-use.py", "redact_secrets.py",
         "session_summary.py", "stop-hook.py", "stop-hook.sh",
         "subagent_context.py", "till_done.py", "time_travel.py",
-        "user-prompt-submit.py", "vf_probe.py"
+        "user-prompt-submit.py", "vector_codec.py", "vf_probe.py"
     )
     if (Test-Path $HooksDir) {
         foreach ($f in $hookFiles) {
@@ -417,7 +419,13 @@ function Invoke-Install() {
         "citation_walker.py",
         "time_travel.py",
         "vf_probe.py",
-        "pg_sync.py"
+        "pg_sync.py",
+        "embed_server.py",
+        "embed_cache.py",
+        "vector_codec.py",
+        "brain_daemon.py",
+        "brain_client.py",
+        "pg_pool.py"
     )
     foreach ($f in $topLevelFiles) {
         $src = Join-Path $ScriptDir $f
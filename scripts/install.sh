@@ -367,13 +367,18 @@ uninstall_unix() {
         local hook_files=(
             "auto_recall_hook.py"
             "beads_writer.py"
+            "brain_client.py"
+            "brain_daemon.py"
             "brain_hook.py"
             "citation_walker.py"
             "context_primer.py"
             "dispatch_gate.py"
+            "embed_cache.py"
+            "embed_server.py"
             "log_writer.py"
             "memory_writer.py"
             "open_brain.py"
+            "pg_pool.py"
             "pg_sync.py"
             "post_tool_use.py"
             "pre-tool-use.py"
@@ -385,6 +390,7 @@ uninstall_unix() {
             "till_done.py"
             "time_travel.py"
             "user-prompt-submit.py"
+            "vector_codec.py"
             "vf_probe.py"
         )
 
@@ -566,6 +572,12 @@ install_unix() {
         "time_travel.py"       # temporal memory retrieval hook
         "vf_probe.py"          # VF_ε verified-forget probe runner
         "pg_sync.py"           # activity-log-to-Postgres sync daemon
+        "embed_server.py"      # warm embedding server spawned by open_brain
+        "embed_cache.py"       # on-disk embedding cache used by open_brain/embed_server
+        "vector_codec.py"      # float32/pgvector codecs imported by open_brain/vf_probe
+        "brain_daemon.py"      # resident brain service (Unix-socket JSON-RPC) for hooks
+        "brain_client.py"      # stdlib client hooks use to reach brain_daemon
+        "pg_pool.py"           # pooled Postgres connections for long-lived processes
     )
     for file in "${scripts_top_files[@]}"; do
         if [ -f "$REPO_DIR/scripts/$file" ]; then
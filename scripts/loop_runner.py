@@ -406,6 +406,17 @@ class Runners:
     #   beads_relabel(bead_id, label) → None
     # Mayor-only; fail-safe.  Absent → relabel is skipped (best-effort signal).
     beads_relabel: Optional[Callable[[str, str], None]] = None
+    # Batched mutations: beads_batch() → ContextManager.  The Mayor wraps each
+    # tick's status updates in it so they reach the store as one write.
+    # Absent (CLI runners) → every mutation is written on its own.
+    beads_batch: Optional[Callable[[], Any]] = None
+
+
+def _beads_batch(runners: Runners) -> Any:
+    """``runners.beads_batch()`` when wired, else a no-op context."""
+    if runners.beads_batch is None:
+        return contextlib.nullcontext()
+    return runners.beads_batch()
 
 
 # ---------------------------------------------------------------------------
@@ -480,6 +491,91 @@ def _parse_beads_ready_text(text: str) -> List[dict]:
     return beads
 
 
+class InProcessBeads:
+    """Beads runners served by scripts/beads in this process — no `beads` spawns.
+
+    Opens the same store the CLI would (``beads.cli.get_db``: nearest
+    ``.beads`` walking up from the cwd, its configured prefix).  Every call
+    first ``refresh()``es, which reads only what other processes (workers
+    running `beads` themselves) appended since the last call, so a Mayor tick
+    costs a stat plus index lookups.  ``batch()`` defers the log writes of
+    the mutations inside it to one append.
+
+    Fail-safe like the ``_live_beads_*`` CLI runners: a store that cannot be
+    read or an unknown bead id is logged, and ready() returns [] while the
+    mutations do nothing.
+    """
+
+    def __init__(self, db: Any):
+        self.db = db
+        self._lock = threading.Lock()
+
+    def ready(self, molecule: str) -> List[dict]:
+        """Ready (open, unblocked) beads carrying label *molecule*, as `beads list --json` dicts."""
+        try:
+            with self._lock:
+                self.db.refresh()
+                return [issue.to_dict() for issue in self.db.ready(label=molecule)]
+        except Exception as exc:
+            logger.warning("beads_ready failed: %s", exc)
+            return []
+
+    def close(self, bead_id: str) -> None:
+        try:
+            with self._lock:
+                self.db.refresh()
+                self.db.close(bead_id)
+        except Exception as exc:
+            logger.warning("beads_close failed for %s: %s", bead_id, exc)
+
+    def update(self, bead_id: str, status: str) -> None:
+        try:
+            with self._lock:
+                self.db.refresh()
+                self.db.update(bead_id, status=status)
+        except Exception as exc:
+            logger.warning("beads_update failed for %s: %s", bead_id, exc)
+
+    def relabel(self, bead_id: str, label: str) -> None:
+        try:
+            with self._lock:
+                self.db.refresh()
+                self.db.add_label(bead_id, label)
+        except Exception as exc:
+            logger.warning("beads_relabel failed for %s: %s", bead_id, exc)
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        try:
+            with self._lock:
+                self.db.refresh()
+        except Exception as exc:
+            logger.warning("beads refresh failed: %s", exc)
+        with self.db.batch():
+            yield
+
+
+def _make_in_process_beads() -> Optional[InProcessBeads]:
+    """InProcessBeads on the CLI's store, or None → fall back to the `beads` CLI.
+
+    OPTIVAI_LOOP_BEADS=cli forces the subprocess path.
+    """
+    if os.environ.get("OPTIVAI_LOOP_BEADS", "").strip().lower() == "cli":
+        return None
+    try:
+        if str(_SCRIPTS_DIR) not in sys.path:
+            sys.path.insert(0, str(_SCRIPTS_DIR))
+        from beads.cli import find_beads_dir, get_db
+        if not find_beads_dir().exists():
+            return None  # let the CLI report the missing store as it always has
+        db = get_db()
+        db.refresh()
+        return InProcessBeads(db)
+    except Exception as exc:
+        logger.warning("in-process beads unavailable, using the beads CLI: %s", exc)
+        return None
+
+
 def _live_beads_close(bead_id: str) -> None:
     """Call `beads close <id>`."""
     subprocess.run(
@@ -502,8 +598,24 @@ def _live_beads_update(bead_id: str, status: str) -> None:
     )
 
 
+def _brain_daemon_call(method: str, params: dict, timeout: float, idempotent: bool = True):
+    """Try the resident brain daemon; ``(False, None)`` means use the CLI."""
+    try:
+        if str(_SCRIPTS_DIR) not in sys.path:
+            sys.path.insert(0, str(_SCRIPTS_DIR))
+        import brain_client
+    except ImportError:
+        return False, None
+    return brain_client.try_call(method, params, timeout=timeout, idempotent=idempotent)
+
+
 def _live_brain_recall(query: str) -> str:
-    """Call open_brain.py --search."""
+    """Call open_brain.py --search (via the brain daemon when it is running)."""
+    served, text = _brain_daemon_call(
+        "search", {"query": query, "limit": 3, "format": "text"}, timeout=30,
+    )
+    if served and isinstance(text, str):
+        return text.strip()
     open_brain = _SCRIPTS_DIR / "open_brain.py"
     try:
         result = subprocess.run(
@@ -519,7 +631,19 @@ def _live_brain_recall(query: str) -> str:
 
 
 def _live_brain_capture(text: str, type_: str) -> None:
-    """Call open_brain.py --capture."""
+    """Call open_brain.py --capture (via the brain daemon when it is running).
+
+    ``type_`` is forwarded to the CLI as ``--type``, which capture ignores
+    (the type is extracted from the text), so the daemon call omits it.
+    Only an unreachable daemon falls back to the CLI: after a timeout or an
+    error reply the capture may already be stored, so it is dropped instead.
+    """
+    served, result = _brain_daemon_call("capture", {"text": text}, timeout=30,
+                                        idempotent=False)
+    if served:
+        if result is None:
+            logger.warning("brain capture via daemon did not complete; not retried")
+        return
     open_brain = _SCRIPTS_DIR / "open_brain.py"
     try:
         subprocess.run(
@@ -981,11 +1105,15 @@ def make_live_runners() -> Runners:
     (kept for backward compat).  When worktree_create is present,
     _mayor_worker uses the VA0b path; otherwise it falls back to the context-
     manager path.
+
+    Beads calls go through InProcessBeads when scripts/beads can open the
+    store (see _make_in_process_beads), else through the `beads` CLI.
     """
+    beads = _make_in_process_beads()
     return Runners(
-        beads_ready=_live_beads_ready,
-        beads_close=_live_beads_close,
-        beads_update=_live_beads_update,
+        beads_ready=beads.ready if beads else _live_beads_ready,
+        beads_close=beads.close if beads else _live_beads_close,
+        beads_update=beads.update if beads else _live_beads_update,
         brain_recall=_live_brain_recall,
         brain_capture=_live_brain_capture,
         dispatch=_live_dispatch,
@@ -1001,7 +1129,8 @@ def make_live_runners() -> Runners:
         merge_batch=_live_merge_batch,
         git_snapshot=_live_git_snapshot,
         git_reset=_live_git_reset,
-        beads_relabel=_live_beads_relabel,
+        beads_relabel=beads.relabel if beads else _live_beads_relabel,
+        beads_batch=beads.batch if beads else None,
     )
 
 
@@ -2187,11 +2316,15 @@ def run_mayor_loop(cfg: RunConfig, runners: Runners) -> MayorSummary:
                     summary.stop_reason = "queue-empty"
                     break
 
+            # Mayor marks in_progress BEFORE submitting to pool (single-writer),
+            # all of this tick's picks in one store write.
+            if runners.beads_update is not None and to_dispatch:
+                with _beads_batch(runners):
+                    for bead in to_dispatch:
+                        runners.beads_update(bead["id"], "in_progress")
+
             for bead in to_dispatch:
                 bead_id = bead["id"]
-                # Mayor marks in_progress BEFORE submitting to pool (single-writer)
-                if runners.beads_update is not None:
-                    runners.beads_update(bead_id, "in_progress")
                 bead_statuses[bead_id] = "in_progress"
                 # VB2: remember priority for anti-starvation scoring of this
                 # bead's eventual MergeCandidate (only the bead_id survives to
@@ -29,9 +29,11 @@ import math
 import hashlib
 import argparse
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 import jsonpatch
 
@@ -65,6 +67,7 @@ from redact import (
     EntropyRedactor,
     ContextRedactor,
 )
+import vector_codec  # sibling module; float32 / pgvector binary codecs
 
 # Composed pipeline — built once at module load (immutable).
 _REDACT_PIPELINE = compose([
@@ -319,6 +322,39 @@ def _embed_server_path() -> Path:
     return Path(__file__).parent / "embed_server.py"
 
 
+EMBED_SERVER_MAX_BATCH = 64  # embed_server.MAX_BATCH: texts per /embed_batch request
+
+
+def _warm_embed_server_base() -> Optional[str]:
+    """Base URL of a healthy embed_server running EMBED_MODEL, else None.
+
+    Port: OPEN_BRAIN_EMBED_PORT env var (default 8474).
+    Health timeout: 0.5s (just a localhost TCP connect). Never raises.
+    """
+    import urllib.request
+
+    port = int(os.environ.get("OPEN_BRAIN_EMBED_PORT", "8474"))
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        health_req = urllib.request.Request(f"{base_url}/health")
+        with urllib.request.urlopen(health_req, timeout=0.5) as resp:
+            health_data = json.loads(resp.read().decode("utf-8"))
+    except Exception:
+        return None
+    if health_data.get("status") != "ok":
+        return None
+    # Model-identity guard (review fix, fblai-3yd1j): a leftover/idle
+    # embed_server (idle timeout is 1800s) may be running a DIFFERENT
+    # model — possibly a same-dim model (e.g. paraphrase-multilingual-
+    # mpnet-base-v2 is also 768d).  Its vectors live in an incompatible
+    # embedding space; the len==768 checks CANNOT catch that.  If the
+    # server's model differs from EMBED_MODEL, fall back to local load so
+    # the stored vector matches the embed_model='all-mpnet-base-v2' stamp.
+    if health_data.get("model") != EMBED_MODEL:
+        return None  # server running a different model — fall back to local load
+    return base_url
+
+
 def _try_warm_embed_server(text: str) -> Optional[list]:
     """Attempt to get an embedding from the warm embed_server.
 
@@ -330,45 +366,40 @@ def _try_warm_embed_server(text: str) -> Optional[list]:
       GET  /health  → {"status": "ok", "model": ..., "uptime_s": ...}
       POST /embed   {"text": ...} → {"embedding": [...], "dim": N}
 
-    Port: OPEN_BRAIN_EMBED_PORT env var (default 8474).
-    Health timeout: 0.5s (just a localhost TCP connect).
+    The embed request sends ``Accept: application/octet-stream`` so the server
+    answers with raw little-endian float32 (vector_codec.pack_f32) instead of
+    ~15 KB of JSON floats. A server that predates the binary format ignores
+    the header and answers JSON, which is still decoded.
+
+    Health check: see _warm_embed_server_base.
     Embed timeout: 10s (inference on a cold CPU model can take 2-4s).
     """
     import urllib.request
-    import urllib.error
 
-    port = int(os.environ.get("OPEN_BRAIN_EMBED_PORT", "8474"))
-    base_url = f"http://127.0.0.1:{port}"
+    # 1. Health check — fast localhost connect only.
+    base_url = _warm_embed_server_base()
+    if base_url is None:
+        return None
 
     try:
-        # 1. Health check — fast localhost connect only.
-        health_req = urllib.request.Request(f"{base_url}/health")
-        with urllib.request.urlopen(health_req, timeout=0.5) as resp:
-            health_data = json.loads(resp.read().decode("utf-8"))
-        if health_data.get("status") != "ok":
-            return None
-        # Model-identity guard (review fix, fblai-3yd1j): a leftover/idle
-        # embed_server (idle timeout is 1800s) may be running a DIFFERENT
-        # model — possibly a same-dim model (e.g. paraphrase-multilingual-
-        # mpnet-base-v2 is also 768d).  Its vectors live in an incompatible
-        # embedding space; the len==768 check below CANNOT catch that.  If the
-        # server's model differs from EMBED_MODEL, fall back to local load so
-        # the stored vector matches the embed_model='all-mpnet-base-v2' stamp.
-        if health_data.get("model") != EMBED_MODEL:
-            return None  # server running a different model — fall back to local load
-
         # 2. Embed request.
         body = json.dumps({"text": text[:8000]}).encode("utf-8")
         embed_req = urllib.request.Request(
             f"{base_url}/embed",
             data=body,
-            headers={"Content-Type": "application/json"},
+            headers={
+                "Content-Type": "application/json",
+                "Accept": vector_codec.F32_CONTENT_TYPE,
+            },
             method="POST",
         )
         with urllib.request.urlopen(embed_req, timeout=10) as resp:
-            embed_data = json.loads(resp.read().decode("utf-8"))
-
-        embedding = embed_data.get("embedding")
+            content_type = resp.headers.get("Content-Type", "")
+            payload = resp.read()
+        if content_type == vector_codec.F32_CONTENT_TYPE:
+            embedding = vector_codec.unpack_f32(payload)
+        else:
+            embedding = json.loads(payload.decode("utf-8")).get("embedding")
         if not isinstance(embedding, list) or len(embedding) != 768:
             # Wrong dim or malformed response — fall back to local.
             return None
@@ -381,6 +412,49 @@ def _try_warm_embed_server(text: str) -> Optional[list]:
         return None
 
 
+def _try_warm_embed_server_batch(texts: List[str]) -> Optional[List[list]]:
+    """Embed ``texts`` through the warm embed_server's ``/embed_batch``.
+
+    Sends at most EMBED_SERVER_MAX_BATCH texts per request (binary float32
+    accepted, as in _try_warm_embed_server). Returns one 768-dim vector per
+    text, or None on any failure — never a partial result. Never raises.
+    """
+    import urllib.request
+
+    base_url = _warm_embed_server_base()
+    if base_url is None:
+        return None
+
+    vectors: List[list] = []
+    try:
+        for start in range(0, len(texts), EMBED_SERVER_MAX_BATCH):
+            chunk = [t[:8000] for t in texts[start:start + EMBED_SERVER_MAX_BATCH]]
+            req = urllib.request.Request(
+                f"{base_url}/embed_batch",
+                data=json.dumps({"texts": chunk}).encode("utf-8"),
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": vector_codec.F32_CONTENT_TYPE,
+                },
+                method="POST",
+            )
+            # Scales with the chunk: a cold CPU encode of 64 texts is slow.
+            with urllib.request.urlopen(req, timeout=10 + len(chunk)) as resp:
+                content_type = resp.headers.get("Content-Type", "")
+                payload = resp.read()
+            if content_type == vector_codec.F32_CONTENT_TYPE:
+                rows = vector_codec.unpack_f32_rows(payload, 768)
+            else:
+                rows = json.loads(payload.decode("utf-8")).get("embeddings")
+            if (not isinstance(rows, list) or len(rows) != len(chunk)
+                    or any(not isinstance(r, list) or len(r) != 768 for r in rows)):
+                return None
+            vectors.extend(rows)
+    except Exception:
+        return None
+    return vectors
+
+
 def _spawn_embed_server_detached() -> None:
     """Fire-and-forget: spawn embed_server.py so the NEXT call can use it.
 
@@ -416,11 +490,38 @@ def _generate_embedding(text: str) -> list:
       - Falls through to the local model (cold-load, ~1-4s first call, cached after).
 
     Any error from the server silently falls back to local — the server is an
-    optimisation, never a hard dependency.
+    optimisation, never a hard dependency. A process that already holds the
+    model (brain_daemon.py) encodes in-process and skips the server.
+
+    Both paths sit behind the content-addressed on-disk cache (embed_cache.py,
+    keyed on (EMBED_MODEL, sha256(text[:8000]))), so repeated text — the
+    session-start basename search, a re-asked recall prompt — skips the
+    embed entirely. Disable with OPEN_BRAIN_EMBED_CACHE_MAX=0.
     """
+    text = text[:8000]
+    try:
+        import embed_cache
+        cache = embed_cache.default_cache(EMBED_MODEL)
+    except Exception:
+        cache = None
+    if cache is not None:
+        cached = cache.get(text)
+        if cached is not None and len(cached) == 768:
+            return cached
+
+    # A model already resident in this process (brain_daemon.py preloads it)
+    # beats the localhost HTTP hop to embed_server.
+    if _embed_model is not None:
+        embedding = _embed_model.encode(text).tolist()
+        if cache is not None:
+            cache.put(text, embedding)
+        return embedding
+
     # Fast path: try the warm server first.
-    warm_result = _try_warm_embed_server(text[:8000])
+    warm_result = _try_warm_embed_server(text)
     if warm_result is not None:
+        if cache is not None:
+            cache.put(text, warm_result)
         return warm_result
 
     # Server is not up (or unusable for this call).  Spawn it detached so the
@@ -428,7 +529,39 @@ def _generate_embedding(text: str) -> list:
     _spawn_embed_server_detached()
 
     model = _get_embedding_model()
-    return model.encode(text[:8000]).tolist()
+    embedding = model.encode(text).tolist()
+    if cache is not None:
+        cache.put(text, embedding)
+    return embedding
+
+
+def _generate_embeddings(texts: List[str]) -> List[list]:
+    """Batch form of _generate_embedding: one vector per text, in order.
+
+    Cached texts are served from embed_cache; all the misses go through ONE
+    encode — the resident model, else the warm server's /embed_batch, else
+    the local model (spawning the server for next time), the same
+    preference order as the single-text path.
+    """
+    texts = [t[:8000] for t in texts]
+    if not texts:
+        return []
+
+    def encode(batch: List[str]) -> List[list]:
+        if _embed_model is not None:
+            return _embed_model.encode(batch).tolist()
+        warm = _try_warm_embed_server_batch(batch)
+        if warm is not None:
+            return warm
+        _spawn_embed_server_detached()
+        return _get_embedding_model().encode(batch).tolist()
+
+    try:
+        import embed_cache
+        cache = embed_cache.default_cache(EMBED_MODEL)
+    except Exception:
+        return encode(texts)
+    return embed_cache.encode_through(cache, texts, encode)
 
 
 # ─── Metadata Extraction (fallback chain) ────────────────────────────────────
@@ -713,7 +846,7 @@ def _get_database_url() -> str:
     )
 
 
-def _connect():
+def _connect(dsn: Optional[str] = None, keepalive: bool = False):
     """Establish PostgreSQL connection with a hard connect_timeout.
 
     Neon (and other cloud Postgres endpoints) can stall a TCP SYN for
@@ -731,23 +864,70 @@ def _connect():
       - If the DSN has a '?' query section we append with '&'.
       - Otherwise we append with '?'.
 
+    ``dsn`` overrides _get_database_url() (the pool resolves it once, so a
+    reconnect never re-runs the Keychain lookup). ``keepalive`` adds libpq
+    TCP keepalives, same injection rules, for connections that sit idle in
+    a pool: a peer that vanished is then noticed by the kernel instead of
+    by the next query.
+
     Note: pgvector types are passed as string literals with ::vector casts
     in SQL, so no special type registration is needed.  This works through
     Neon's connection pooler.
     """
     import psycopg2
-    dsn = _get_database_url()
+    dsn = dsn or _get_database_url()
     # Inject connect_timeout unless the caller already set one.
     if "connect_timeout" not in dsn:
         if "?" in dsn:
             dsn = dsn + "&connect_timeout=10"
         else:
             dsn = dsn + "?connect_timeout=10"
+    if keepalive and "keepalives" not in dsn:
+        dsn = dsn + ("&" if "?" in dsn else "?") + POOL_KEEPALIVE_PARAMS
     conn = psycopg2.connect(dsn)
     conn.autocommit = False
     return conn
 
 
+# ─── Pooled connections (long-lived in-process callers) ──────────────────────
+# One-shot CLI / Pi-bridge invocations keep using _connect(): a process that
+# runs one op and exits has nothing to reuse. Processes that serve many ops
+# (brain_daemon.py) check connections out of this shared pg_pool pool.
+#
+#   OPEN_BRAIN_POOLER_URL          connect through a local pgbouncer-style
+#                                  pooler instead of the direct DSN
+#   OPEN_BRAIN_POOL_SIZE           max open connections (default 4)
+#   OPEN_BRAIN_POOL_MAX_IDLE_S     recycle after this long idle (default 300)
+#   OPEN_BRAIN_POOL_MAX_LIFETIME_S recycle after this long open (default 3600)
+
+POOL_KEEPALIVE_PARAMS = "keepalives=1&keepalives_idle=30&keepalives_interval=10&keepalives_count=3"
+
+_conn_pool = None
+_conn_pool_lock = threading.Lock()
+
+
+def _connection_pool():
+    """Process-wide pg_pool.ConnectionPool, built on first use."""
+    global _conn_pool
+    with _conn_pool_lock:
+        if _conn_pool is None:
+            import pg_pool
+            dsn = os.environ.get("OPEN_BRAIN_POOLER_URL") or _get_database_url()
+            size, max_idle_s, max_lifetime_s = pg_pool.parse_pool_env(os.environ)
+            _conn_pool = pg_pool.ConnectionPool(
+                lambda: _connect(dsn, keepalive=True),
+                max_size=size,
+                max_idle_s=max_idle_s,
+                max_lifetime_s=max_lifetime_s,
+            )
+        return _conn_pool
+
+
+def pooled_connection():
+    """``with pooled_connection() as conn:`` — a health-checked pooled connection."""
+    return _connection_pool().connection()
+
+
 def _get_user_id() -> str:
     """Get current user ID from environment (lowercase for consistency)."""
     for var in ("USER", "USERNAME", "LOGNAME"):
@@ -781,6 +961,20 @@ def _parse_array(val) -> list:
     return list(val) if hasattr(val, '__iter__') else []
 
 
+def _parse_object(val) -> dict:
+    """Parse a JSONB object column which may come back as string, dict, or None."""
+    if isinstance(val, dict):
+        return val
+    if isinstance(val, str):
+        try:
+            parsed = json.loads(val)
+            if isinstance(parsed, dict):
+                return parsed
+        except (json.JSONDecodeError, TypeError):
+            pass
+    return {}
+
+
 def _strip_markdown_fencing(text: str) -> str:
     """Strip ```json ... ``` fencing that LLMs sometimes add."""
     text = text.strip()
@@ -942,35 +1136,151 @@ def _dependency_from_signals(
     return False
 
 
-def _derivation_ancestors(conn, atom_id: str, user_id: str, max_depth: int = 12) -> set:
-    """Transitive ``was_derived_from`` ancestors of an atom - a single-parent chain
-    walk, depth-capped and cycle-guarded. Raises on DB error (the caller's
-    fail-safe then treats the pair as dependent). Empty set = no recorded lineage."""
-    ancestors: set = set()
-    seen = {atom_id}
-    current = atom_id
+# ─── Derivation ancestry (evidence-independence guard) ───────────────────────
+# _atoms_dependent needs the transitive was_derived_from ancestors of both
+# premises. One recursive CTE returns them for any number of atoms at once
+# (previously one SELECT per hop per atom).
+#
+#   OPEN_BRAIN_ANCESTRY_CLOSURE=true   also materialize each captured atom's
+#                                      ancestor set into brain.thought_ancestry
+#                                      (sql/migrations/2026-06-12-thought-ancestry.sql)
+#                                      so the lookup is one primary-key probe
+#
+# The closure is a cache, never the only source of truth: an atom is served
+# from it only when its recorded parent has a depth-1 closure row. Atoms
+# captured before the flag, restored by a failed forget, or re-parented by
+# hand fall through to the CTE.
+
+DERIVATION_MAX_DEPTH = 12
+
+# Same walk as the old per-hop loop: start in the caller's scope, follow
+# was_derived_from under the same user_id, stop at max_depth hops or on a
+# repeated thought_id. Every non-NULL parent reached counts (including a
+# cross-user parent, which ends the chain).
+_DERIVATION_ANCESTORS_SQL = """
+    WITH RECURSIVE chain AS (
+        SELECT thought_id AS origin, thought_id, was_derived_from, 0 AS depth,
+               ARRAY[thought_id::text] AS path
+          FROM brain.thoughts
+         WHERE thought_id = ANY(%(ids)s) AND user_id = %(user_id)s
+        UNION ALL
+        SELECT c.origin, p.thought_id, p.was_derived_from, c.depth + 1,
+               c.path || p.thought_id::text
+          FROM chain c
+          JOIN brain.thoughts p
+            ON p.thought_id = c.was_derived_from AND p.user_id = %(user_id)s
+         WHERE c.depth + 1 < %(max_depth)s
+           AND NOT (p.thought_id::text = ANY(c.path))
+    )
+    SELECT origin, was_derived_from AS ancestor_id, depth + 1 AS ancestor_depth
+      FROM chain
+     WHERE was_derived_from IS NOT NULL AND was_derived_from <> ''
+       AND NOT (was_derived_from::text = ANY(path))
+"""
+
+
+def _ancestry_closure_enabled() -> bool:
+    return os.environ.get("OPEN_BRAIN_ANCESTRY_CLOSURE", "").lower() == "true"
+
+
+def _derivation_ancestors_many(
+    conn, atom_ids: List[str], user_id: str, max_depth: int = DERIVATION_MAX_DEPTH
+) -> Dict[str, set]:
+    """``{atom_id: ancestors}`` for several atoms in one round trip (two with the
+    closure enabled and some atom not materialized). Raises on DB error."""
+    ids = list(dict.fromkeys(atom_ids))
+    ancestors: Dict[str, set] = {a: set() for a in ids}
+    pending = ids
     cur = conn.cursor()
     try:
-        for _ in range(max_depth):
+        if _ancestry_closure_enabled() and max_depth <= DERIVATION_MAX_DEPTH:
             cur.execute(
-                "SELECT was_derived_from FROM brain.thoughts "
-                "WHERE thought_id = %s AND user_id = %s",
-                (current, user_id),
+                "SELECT t.thought_id, t.was_derived_from, a.ancestor_id, a.depth "
+                "FROM brain.thoughts t "
+                "LEFT JOIN brain.thought_ancestry a "
+                "  ON a.thought_id = t.thought_id AND a.user_id = t.user_id "
+                " AND a.depth <= %s "
+                "WHERE t.thought_id = ANY(%s) AND t.user_id = %s",
+                (max_depth, ids, user_id),
             )
-            row = cur.fetchone()
-            if not row or not row[0]:
-                break
-            parent = row[0]
-            if parent in seen:  # cycle guard
-                break
-            ancestors.add(parent)
-            seen.add(parent)
-            current = parent
+            rows = cur.fetchall()
+            parents = {r[0]: r[1] for r in rows}
+            materialized = {
+                tid for tid, parent, anc, depth in rows
+                if parent and anc == parent and depth == 1
+            }
+            for tid, _parent, anc, _depth in rows:
+                if tid in materialized:
+                    ancestors[tid].add(anc)
+            # Out of scope or no parent -> no lineage; nothing left to walk.
+            pending = [a for a in ids if parents.get(a) and a not in materialized]
+        if pending:
+            cur.execute(
+                _DERIVATION_ANCESTORS_SQL,
+                {"ids": pending, "user_id": user_id, "max_depth": max_depth},
+            )
+            for origin, ancestor_id, _depth in cur.fetchall():
+                ancestors[origin].add(ancestor_id)
     finally:
         cur.close()
     return ancestors
 
 
+def _derivation_ancestors(
+    conn, atom_id: str, user_id: str, max_depth: int = DERIVATION_MAX_DEPTH
+) -> set:
+    """Transitive ``was_derived_from`` ancestors of an atom - a single-parent chain
+    walk, depth-capped and cycle-guarded. Raises on DB error (the caller's
+    fail-safe then treats the pair as dependent). Empty set = no recorded lineage."""
+    return _derivation_ancestors_many(conn, [atom_id], user_id, max_depth)[atom_id]
+
+
+def _materialize_ancestry(cur, thought_id: str, user_id: str) -> None:
+    """Write ``thought_id``'s ancestor set into brain.thought_ancestry.
+
+    Runs inside the capture transaction, behind a savepoint: if the closure
+    table is missing or an ancestor row is dangling, the atom is simply left
+    unmaterialized (the CTE serves it) and the capture goes on.
+    """
+    cur.execute("SAVEPOINT thought_ancestry")
+    try:
+        cur.execute(
+            "INSERT INTO brain.thought_ancestry (thought_id, ancestor_id, depth, user_id) "
+            "SELECT origin, ancestor_id, ancestor_depth, %(user_id)s "
+            f"FROM ({_DERIVATION_ANCESTORS_SQL}) AS a "
+            "ON CONFLICT DO NOTHING",
+            {"ids": [thought_id], "user_id": user_id, "max_depth": DERIVATION_MAX_DEPTH},
+        )
+        cur.execute("RELEASE SAVEPOINT thought_ancestry")
+    except Exception as e:
+        cur.execute("ROLLBACK TO SAVEPOINT thought_ancestry")
+        logger.warning(f"thought_ancestry not materialized for {thought_id}: {e}")
+
+
+def _unlink_ancestry(cur, thought_id: str) -> None:
+    """Before ``thought_id`` is deleted: drop the closure rows that reach past it.
+
+    The FK ``ON DELETE SET NULL`` cuts every descendant's chain at the deleted
+    atom, so a descendant no longer derives from the atom's ancestors either.
+    Rows naming the atom itself go with the row (``ON DELETE CASCADE``).
+    No-op when the closure table was never created.
+    """
+    cur.execute("SELECT to_regclass('brain.thought_ancestry')")
+    row = cur.fetchone()
+    if not row or row[0] is None:
+        return
+    cur.execute(
+        """
+        DELETE FROM brain.thought_ancestry
+         WHERE thought_id IN (SELECT thought_id FROM brain.thought_ancestry
+                               WHERE ancestor_id = %(tid)s)
+           AND ancestor_id IN (SELECT ancestor_id FROM brain.thought_ancestry
+                                WHERE thought_id = %(tid)s)
+        """,
+        {"tid": thought_id},
+    )
+
+
 def _atoms_dependent(conn, id_a: str, id_b: str, user_id: str) -> bool:
     """DB-backed dependency check: same ``session_id``, a direct
     ``was_derived_from`` parent/child, OR shared TRANSITIVE derivation ancestry
@@ -1001,8 +1311,8 @@ def _atoms_dependent(conn, id_a: str, id_b: str, user_id: str) -> bool:
         # Transitive ancestry: the same evidence can be reached across a derivation
         # chain or via a shared root - fuse those as dependent too, not just the
         # direct parent/child case.
-        anc_a = _derivation_ancestors(conn, id_a, user_id)
-        anc_b = _derivation_ancestors(conn, id_b, user_id)
+        ancestry = _derivation_ancestors_many(conn, [id_a, id_b], user_id)
+        anc_a, anc_b = ancestry[id_a], ancestry[id_b]
         return bool(id_b in anc_a or id_a in anc_b or (anc_a & anc_b))
     except Exception:
         return True  # fail-safe: unknown provenance -> dependent (no accumulation)
@@ -1719,6 +2029,30 @@ def diff_versions(
     return patch.patch
 
 
+def _inspect_many(conn, thought_ids: List[str], user_id: str) -> Dict[str, Any]:
+    """``--inspect-many``: the no-qualifier ``--inspect ID --json`` payload per ID.
+
+    Keyed by thought_id in request order. An ID outside ``user_id``'s scope
+    (or forgotten) gets ``{"thought_id", "result": None, "error"}`` instead
+    of failing the whole lookup; no other user's row is ever read
+    (time_travel.inspect_latest_many).
+    """
+    import time_travel
+    found = time_travel.inspect_latest_many(conn, thought_ids, user_id)
+    out: Dict[str, Any] = {}
+    for thought_id in dict.fromkeys(thought_ids):
+        result = found.get(thought_id)
+        if result is None:
+            out[thought_id] = {
+                "thought_id": thought_id,
+                "result": None,
+                "error": f"thought {thought_id} not in user scope (user={user_id})",
+            }
+        else:
+            out[thought_id] = time_travel.inspect_result_to_dict(result)
+    return out
+
+
 # ─── VF_eps primitive: --forget with delete-after-verify ─────────────────────
 #
 # brain-W1-S8 / fblai-152r8. Implements the verified-forgetting flow.
@@ -2368,6 +2702,7 @@ def forget_thought(
     # outgoing (source=thought_id) will cascade here too; that is belt-and-suspenders.
     cur = conn.cursor()
     try:
+        _unlink_ancestry(cur, thought_id)
         cur.execute(
             "DELETE FROM brain.thoughts WHERE thought_id = %s AND user_id = %s",
             (thought_id, user_id),
@@ -2755,6 +3090,24 @@ VERACITY_PENALTY_COEFFICIENT = 0.10
 DEDUP_COSINE = 0.92          # pairwise cosine >= this collapses r into survivor s
 DEDUP_OVERFETCH_FACTOR = 3   # SQL LIMIT multiplier when dedup=True (frees slots)
 DEDUP_OVERFETCH_CAP = 50     # hard ceiling on the over-fetched row count
+# The NumPy collapse compares in float32; a pair whose float32 cosine lands
+# within this margin of DEDUP_COSINE is re-decided by the exact float64
+# _cosine_similarity, so the survivor set never differs from the pure path.
+DEDUP_EXACT_MARGIN = 1e-4
+# Server-side dedup (OPEN_BRAIN_DEDUP_SERVER / dedup_server=): Postgres computes
+# each over-fetched row's near-duplicate neighbours within the result set and
+# returns their ids instead of the embedding; Python only runs the rank-order
+# collapse over that adjacency.
+DEDUP_SERVER_DEFAULT = False
+
+# Two-stage ANN retrieval in search(). Stage 1 is an HNSW-ordered prefetch
+# (ORDER BY embedding <=> q LIMIT k) so idx_thoughts_embedding_hnsw serves the
+# scan; stage 2 applies the hybrid/keyword/time-decay scoring to those k rows
+# only (Hebbian + veracity rescoring already run on the returned set in Python).
+# 0 = off: the single-stage full-scan SQL (D7 golden) is emitted unchanged.
+ANN_CANDIDATES_DEFAULT = 0   # override via OPEN_BRAIN_ANN_CANDIDATES or ann_candidates=
+ANN_CANDIDATES_MAX = 1000    # pgvector caps hnsw.ef_search at 1000
+HNSW_EF_SEARCH_MIN = 40      # pgvector's own default ef_search
 
 
 def promote_thought(
@@ -3012,6 +3365,28 @@ def compute_effective_weights_batch(
     return {tid: by_tid.get(tid, 0.0) for tid in thought_ids}
 
 
+# Write-fast capture (capture(write_fast=True) / OPEN_BRAIN_WRITE_FAST=true):
+# the atom is inserted with its embedding and placeholder metadata, plus a
+# brain.enrichment_queue row in the same transaction. enrich_pending() later
+# claims queued atoms in batches, runs the LLM extraction concurrently, and
+# writes the real metadata, stv and graph edges. brain_daemon's enrichment
+# worker runs it whenever rows are due; a CLI write-fast capture wakes (or
+# autostarts) that daemon via _wake_enrich_worker(). --enrich-pending drains
+# by hand, e.g. from cron when the daemon is disabled.
+ENRICH_BATCH_SIZE = 16       # atoms claimed per enrich_pending() call
+ENRICH_MAX_ATTEMPTS = 5      # after this many empty extractions the placeholder stays
+ENRICH_RETRY_BASE_S = 60     # retry backoff: base * 2**(attempts - 1) seconds
+ENRICH_LEASE_S = 600         # a claimed row is hidden from other workers this long
+ENRICH_WORKERS = 4           # concurrent LLM extractions per batch
+
+
+def _resolve_write_fast(write_fast: Optional[bool]) -> bool:
+    """``write_fast`` if given, else ``OPEN_BRAIN_WRITE_FAST`` (default off)."""
+    if write_fast is not None:
+        return bool(write_fast)
+    return os.environ.get("OPEN_BRAIN_WRITE_FAST", "").lower() == "true"
+
+
 def capture(
     conn,
     text: str,
@@ -3025,6 +3400,7 @@ def capture(
     stv_f: Optional[float] = None,
     stv_c: Optional[float] = None,
     condition_score: Optional[float] = None,
+    write_fast: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """Capture a thought with local embedding + Claude metadata extraction.
 
@@ -3043,6 +3419,13 @@ def capture(
         Optional parent ``thought_id``. Validated to exist within the
         caller's ``user_id`` scope (PS — Principal Scoping); a mismatch
         raises :class:`RuntimeError`.
+    write_fast
+        Skip the LLM metadata extraction (default None ->
+        ``OPEN_BRAIN_WRITE_FAST``, off). The atom is inserted with its
+        embedding and placeholder metadata, and a ``brain.enrichment_queue``
+        row is written in the same transaction; :func:`enrich_pending` fills
+        in type, topics, people, action items, stv and graph edges later.
+        The result carries ``"enrichment": "pending"``.
 
     Notes
     -----
@@ -3114,15 +3497,13 @@ def capture(
         text_for_storage = text if store_raw else redacted_text
 
         # Step 1: Extract metadata via Claude API — ALWAYS uses redacted text.
-        metadata = _extract_metadata(redacted_text)
+        # Write-fast defers it to the enrichment queue (placeholder for now).
+        write_fast = _resolve_write_fast(write_fast)
+        metadata = {} if write_fast else _extract_metadata(redacted_text)
         if not metadata:
-            metadata = {
-                "type": "insight",
-                "topics": [],
-                "people": [],
-                "action_items": [],
-                "summary": redacted_text[:200],
-            }
+            metadata = _placeholder_metadata(redacted_text)
+        if write_fast:
+            metadata["enrichment"] = "pending"
 
         # Stamp escape-hatch flag so consumers can distinguish raw-stored atoms.
         if store_raw:
@@ -3156,37 +3537,13 @@ def capture(
                 "A schema migration is required before switching embedding models."
             )
 
-        # Step 3a: Resolve NAL stv values.
-        # Priority: explicit stv_f/stv_c overrides > confidence label from metadata.
-        # Caller-supplied values must be validated in [0,1] before this point
-        # (CLI validation happens in main(); Pi-bridge validation in _run_from_pi()).
-        if stv_f is not None or stv_c is not None:
-            # Explicit overrides — clamp to valid range
-            final_stv_f = float(max(0.0, min(1.0, stv_f if stv_f is not None else 1.0)))
-            final_stv_c = float(max(0.0, min(0.9999, stv_c if stv_c is not None else 0.5)))
-        else:
-            # Seed from confidence label extracted by LLM metadata
-            confidence_label = metadata.get("confidence")
-            _, final_stv_c = _stv_from_confidence(confidence_label)
-            final_stv_f = 1.0  # default: positive evidence
-
-        # Step 3a-bis (Veracity layer V1): if the captured TEXT carries persuasion-
-        # bombing tells, OR the TURN it was produced in was flagged (turn-condition
-        # threading), DISCOUNT its confidence so a pushback-produced assessment enters
-        # memory at low veracity - even when the summary text itself reads clean.
-        # Applies even to an explicit --stv-c (a confident self-stamp cannot exempt a
-        # suspect assessment); only ever LOWERS.
+        # Step 3a: Resolve NAL stv values (overrides, confidence label, V1
+        # veracity discount — see _capture_stv).
         _condition = max(
             _persuasion_condition_score(text),
             _resolve_turn_condition(condition_score, session_id),
         )
-        if _condition >= CONDITION_DISCOUNT_THRESHOLD:
-            _discounted = _discount_confidence(final_stv_c, _condition)
-            if _discounted < final_stv_c:
-                final_stv_c = _discounted
-                if isinstance(metadata, dict):
-                    metadata["condition_score"] = round(_condition, 3)
-                    metadata["condition_discounted"] = True
+        final_stv_f, final_stv_c = _capture_stv(metadata, stv_f, stv_c, _condition)
 
         # Step 3b: INSERT with PROV-DM fields + stv columns.
         # source_uri stays NULL for internal captures (deferred to a later bead
@@ -3229,7 +3586,7 @@ def capture(
                 was_generated_by,
                 was_derived_from,
                 None,  # source_uri — reserved for external-URL captures
-                str(embedding),
+                vector_codec.to_pgvector_literal(embedding),
                 EMBED_MODEL,           # embed_model — fblai-3yd1j versioning
                 len(embedding),        # embed_dim — fblai-3yd1j versioning
                 json.dumps(metadata),
@@ -3241,6 +3598,19 @@ def capture(
                 # re-backfill this atom's stv (fblai-3zk83).
             ),
         )
+        if was_derived_from is not None and _ancestry_closure_enabled():
+            _materialize_ancestry(cur, thought_id, user_id)
+        if write_fast:
+            # Same transaction as the atom: a committed atom always has its
+            # queue row, so enrichment survives a crash right after capture.
+            cur.execute(
+                "INSERT INTO brain.enrichment_queue (thought_id, user_id, payload) "
+                "VALUES (%s, %s, %s::jsonb)",
+                (thought_id, user_id, json.dumps({
+                    "stv_f": stv_f, "stv_c": stv_c, "condition": _condition,
+                    "seed_f": final_stv_f, "seed_c": final_stv_c,
+                })),
+            )
         conn.commit()
     except Exception:
         # gz-af9kn — cursor try-finally + rollback. _extract_metadata and
@@ -3278,7 +3648,7 @@ def capture(
         prov_agent=prov_agent,
     )
 
-    return {
+    result = {
         "thought_id": thought_id,
         "summary": summary,
         "type": thought_type,
@@ -3287,6 +3657,322 @@ def capture(
         "action_items": action_items,
         "stv": {"f": final_stv_f, "c": final_stv_c},
     }
+    if write_fast:
+        result["enrichment"] = "pending"
+    return result
+
+
+def _placeholder_metadata(redacted_text: str) -> Dict[str, Any]:
+    """Metadata for an atom whose LLM extraction failed or has not run yet."""
+    return {
+        "type": "insight",
+        "topics": [],
+        "people": [],
+        "action_items": [],
+        "summary": redacted_text[:200],
+    }
+
+
+def _capture_stv(
+    metadata: Dict[str, Any],
+    stv_f: Optional[float],
+    stv_c: Optional[float],
+    condition: float,
+) -> tuple:
+    """(f, c) for a new atom; stamps the V1 discount markers into ``metadata``.
+
+    Shared by capture() and enrich_pending(), which re-derives the stv once
+    the real confidence label is known.
+    """
+    # Priority: explicit stv_f/stv_c overrides > confidence label from metadata.
+    # Caller-supplied values must be validated in [0,1] before this point
+    # (CLI validation happens in main(); Pi-bridge validation in _run_from_pi()).
+    if stv_f is not None or stv_c is not None:
+        # Explicit overrides — clamp to valid range
+        final_stv_f = float(max(0.0, min(1.0, stv_f if stv_f is not None else 1.0)))
+        final_stv_c = float(max(0.0, min(0.9999, stv_c if stv_c is not None else 0.5)))
+    else:
+        # Seed from confidence label extracted by LLM metadata
+        confidence_label = metadata.get("confidence")
+        _, final_stv_c = _stv_from_confidence(confidence_label)
+        final_stv_f = 1.0  # default: positive evidence
+
+    # Veracity layer V1: if the captured TEXT carries persuasion-
+    # bombing tells, OR the TURN it was produced in was flagged (turn-condition
+    # threading), DISCOUNT its confidence so a pushback-produced assessment enters
+    # memory at low veracity - even when the summary text itself reads clean.
+    # Applies even to an explicit --stv-c (a confident self-stamp cannot exempt a
+    # suspect assessment); only ever LOWERS.
+    if condition >= CONDITION_DISCOUNT_THRESHOLD:
+        _discounted = _discount_confidence(final_stv_c, condition)
+        if _discounted < final_stv_c:
+            final_stv_c = _discounted
+            if isinstance(metadata, dict):
+                metadata["condition_score"] = round(condition, 3)
+                metadata["condition_discounted"] = True
+
+    return final_stv_f, final_stv_c
+
+
+CAPTURE_BATCH_FIELDS = frozenset({
+    "text", "source", "session_id", "project", "prov_agent", "prov_activity",
+    "was_derived_from", "stv_f", "stv_c", "condition_score",
+})
+
+
+def _validate_batch_item(item: Any, index: int) -> Dict[str, Any]:
+    """One capture_batch item, checked before any DB or model work.
+
+    Raises ValueError naming the item; stv overrides must be in [0, 1]
+    (the same rule main() and _run_from_pi() apply to a single capture).
+    """
+    if isinstance(item, str):
+        item = {"text": item}
+    if not isinstance(item, dict):
+        raise ValueError(f"item {index}: expected an object or a string")
+    unknown = set(item) - CAPTURE_BATCH_FIELDS
+    if unknown:
+        raise ValueError(f"item {index}: unknown field(s) {', '.join(sorted(unknown))}")
+    text = item.get("text")
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError(f"item {index}: text must be a non-empty string")
+    for name in ("stv_f", "stv_c"):
+        value = item.get(name)
+        if value is None:
+            continue
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"item {index}: {name} must be a float")
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"item {index}: {name} must be in [0, 1]")
+        item = {**item, name: value}
+    return item
+
+
+_CAPTURE_BATCH_SQL = """
+    INSERT INTO brain.thoughts (
+        thought_id, user_id, raw_text, summary, thought_type,
+        topics, people, action_items, source, session_id, project,
+        prov_agent, prov_activity, was_generated_by, was_derived_from, source_uri,
+        embedding, embed_model, embed_dim,
+        metadata, stv_frequency, stv_confidence, stv_seeded,
+        created_at, updated_at
+    )
+    SELECT b.thought_id, %s, b.raw_text, b.summary, b.thought_type,
+           b.topics::jsonb, b.people::jsonb, b.action_items::jsonb,
+           b.source, b.session_id, b.project,
+           b.prov_agent, b.prov_activity, b.was_generated_by, b.was_derived_from, NULL,
+           b.embedding::vector, %s, %s,
+           b.metadata::jsonb, b.stv_f, b.stv_c, TRUE,
+           NOW(), NOW()
+      FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[], %s::text[],
+                  %s::text[], %s::text[], %s::text[], %s::text[], %s::text[],
+                  %s::text[], %s::text[], %s::text[], %s::text[], %s::text[],
+                  %s::text[], %s::float8[], %s::float8[])
+           AS b(thought_id, raw_text, summary, thought_type, topics,
+                people, action_items, source, session_id, project,
+                prov_agent, prov_activity, was_generated_by, was_derived_from,
+                embedding, metadata, stv_f, stv_c)
+"""
+
+
+def capture_batch(
+    conn,
+    items: List[Any],
+    user_id: str,
+    source: str = "manual",
+    session_id: str = "",
+    project: str = "",
+    write_fast: Optional[bool] = None,
+) -> List[Dict[str, Any]]:
+    """Capture many thoughts at once; returns capture()'s result per item, in order.
+
+    Each item is a text string or an object with capture()'s per-thought
+    fields (``text`` plus optional ``source``, ``session_id``, ``project``,
+    ``prov_agent``, ``prov_activity``, ``was_derived_from``, ``stv_f``,
+    ``stv_c``, ``condition_score``); the keyword arguments are the defaults
+    for fields an item leaves out. Every item is validated before any work
+    (ValueError names the first bad one).
+
+    Same pipeline as capture() — front-door redaction, the
+    OPEN_BRAIN_STORE_RAW escape hatch, V1 discount, PROV-DM stamps, the
+    write-fast enrichment queue — with the per-item costs batched: metadata
+    is extracted on ``ENRICH_WORKERS`` threads, the embeddings come from
+    one :func:`_generate_embeddings` encode, the rows land in ONE
+    ``INSERT ... SELECT FROM unnest`` (one transaction: all or nothing),
+    and the graph nodes/edges of the whole batch in one
+    :func:`_update_graph_bulk`. One replay-log row covers the batch.
+    """
+    items = [_validate_batch_item(item, i) for i, item in enumerate(items)]
+    if not items:
+        return []
+
+    rows: List[Dict[str, Any]] = []
+    for item in items:
+        item_source = item.get("source") or source
+        thought_id = _generate_thought_id()
+        rows.append({
+            "thought_id": thought_id,
+            "text": item["text"],
+            "source": item_source,
+            "session_id": item.get("session_id") or session_id,
+            "project": item.get("project") or project,
+            "prov_agent": item.get("prov_agent") or _derive_prov_agent(item_source, user_id),
+            "prov_activity": item.get("prov_activity") or "capture",
+            "was_generated_by": _generate_activity_id(thought_id),
+            "was_derived_from": item.get("was_derived_from"),
+            "stv_f": item.get("stv_f"),
+            "stv_c": item.get("stv_c"),
+            "condition_score": item.get("condition_score"),
+        })
+
+    cur = conn.cursor()
+    try:
+        # PS primitive, as in capture(): every parent must be in the caller's
+        # scope — one lookup for the whole batch, before any model work.
+        parents = sorted({r["was_derived_from"] for r in rows if r["was_derived_from"]})
+        if parents:
+            cur.execute(
+                "SELECT thought_id FROM brain.thoughts "
+                "WHERE user_id = %s AND thought_id = ANY(%s)",
+                (user_id, parents),
+            )
+            found = {row[0] for row in cur.fetchall()}
+            missing = [p for p in parents if p not in found]
+            if missing:
+                raise RuntimeError(
+                    "was_derived_from references non-existent thought "
+                    f"(or wrong user scope): {missing[0]} (user={user_id})"
+                )
+
+        # fblai-y0zsb front-door redaction — see capture() for the contract.
+        store_raw = os.environ.get("OPEN_BRAIN_STORE_RAW", "").lower() == "true"
+        if store_raw:
+            print(
+                "WARNING: OPEN_BRAIN_STORE_RAW=true is active — "
+                "raw (unredacted) text will be stored in brain.thoughts.raw_text. "
+                "External LLMs still receive only redacted text. "
+                "This is an escape hatch; disable in production. (fblai-y0zsb)",
+                file=sys.stderr,
+            )
+        for r in rows:
+            r["redacted"] = redact_pii(r["text"])
+            r["stored"] = r["text"] if store_raw else r["redacted"]
+
+        write_fast = _resolve_write_fast(write_fast)
+        if write_fast:
+            extracted: List[dict] = [{} for _ in rows]
+        else:
+            with ThreadPoolExecutor(max_workers=min(ENRICH_WORKERS, len(rows))) as pool:
+                extracted = list(pool.map(_extract_metadata, [r["redacted"] for r in rows]))
+
+        embeddings = _generate_embeddings([r["stored"] for r in rows])
+        # Dim-mismatch guard (fblai-3yd1j), as in capture().
+        for embedding in embeddings:
+            if len(embedding) != 768:
+                raise ValueError(
+                    f"Embedding dimension mismatch: model '{EMBED_MODEL}' produced "
+                    f"{len(embedding)} dims but schema expects 768. "
+                    "A schema migration is required before switching embedding models."
+                )
+
+        for r, meta in zip(rows, extracted):
+            metadata = meta or _placeholder_metadata(r["redacted"])
+            if write_fast:
+                metadata["enrichment"] = "pending"
+            if store_raw:
+                metadata["stored_raw"] = True
+            # gz-j29f0 null-summary guard, as in capture().
+            r["summary"] = metadata.get("summary") or r["redacted"][:200]
+            r["metadata"] = metadata
+            r["condition"] = max(
+                _persuasion_condition_score(r["text"]),
+                _resolve_turn_condition(r["condition_score"], r["session_id"]),
+            )
+            r["stv"] = _capture_stv(metadata, r["stv_f"], r["stv_c"], r["condition"])
+
+        cur.execute(_CAPTURE_BATCH_SQL, [user_id, EMBED_MODEL, 768] + [
+            [r["thought_id"] for r in rows],
+            [r["stored"][:16384] for r in rows],
+            [r["summary"][:1000] for r in rows],
+            [r["metadata"].get("type", "insight") for r in rows],
+            [json.dumps(r["metadata"].get("topics", [])) for r in rows],
+            [json.dumps(r["metadata"].get("people", [])) for r in rows],
+            [json.dumps(r["metadata"].get("action_items", [])) for r in rows],
+            [r["source"] for r in rows],
+            [r["session_id"] for r in rows],
+            [r["project"] for r in rows],
+            [r["prov_agent"] for r in rows],
+            [r["prov_activity"] for r in rows],
+            [r["was_generated_by"] for r in rows],
+            [r["was_derived_from"] for r in rows],
+            [vector_codec.to_pgvector_literal(e) for e in embeddings],
+            [json.dumps(r["metadata"]) for r in rows],
+            [r["stv"][0] for r in rows],
+            [r["stv"][1] for r in rows],
+        ])
+        if _ancestry_closure_enabled():
+            for r in rows:
+                if r["was_derived_from"]:
+                    _materialize_ancestry(cur, r["thought_id"], user_id)
+        if write_fast:
+            cur.execute(
+                """
+                INSERT INTO brain.enrichment_queue (thought_id, user_id, payload)
+                SELECT q.thought_id, %s, q.payload::jsonb
+                  FROM unnest(%s::text[], %s::text[]) AS q(thought_id, payload)
+                """,
+                (user_id, [r["thought_id"] for r in rows], [json.dumps({
+                    "stv_f": r["stv_f"], "stv_c": r["stv_c"], "condition": r["condition"],
+                    "seed_f": r["stv"][0], "seed_c": r["stv"][1],
+                }) for r in rows]),
+            )
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        try:
+            cur.close()
+        except Exception:
+            pass
+
+    _update_graph_bulk(conn, [
+        (r["thought_id"], r["summary"], r["metadata"].get("type", "insight"),
+         r["metadata"].get("topics", []), r["metadata"].get("people", []), r["project"])
+        for r in rows
+    ], user_id)
+
+    emit_replay_log(
+        conn,
+        user_id=user_id,
+        event_type="capture",
+        result_text=f"batch of {len(rows)} thoughts",
+        session_id=session_id or None,
+        prov_agent=rows[0]["prov_agent"],
+        metadata={"batch_size": len(rows), "thought_ids": [r["thought_id"] for r in rows]},
+    )
+
+    results = []
+    for r in rows:
+        md = r["metadata"]
+        result = {
+            "thought_id": r["thought_id"],
+            "summary": r["summary"],
+            "type": md.get("type", "insight"),
+            "topics": md.get("topics", []),
+            "people": md.get("people", []),
+            "action_items": md.get("action_items", []),
+            "stv": {"f": r["stv"][0], "c": r["stv"][1]},
+        }
+        if write_fast:
+            result["enrichment"] = "pending"
+        results.append(result)
+    return results
 
 
 def _update_graph_incremental(
@@ -3303,115 +3989,320 @@ def _update_graph_incremental(
 
     Creates/upserts nodes for the thought, its topics, people, and project,
     then wires edges between them. Failures are logged but never raised —
-    graph update must not block the capture path.
+    graph update must not block the capture path. See _update_graph_bulk.
+    """
+    _update_graph_bulk(
+        conn, [(thought_id, summary, thought_type, topics, people, project)], user_id
+    )
+
+
+def _update_graph_bulk(conn, atoms: List[tuple], user_id: str) -> None:
+    """Graph nodes and edges for ``atoms`` — (thought_id, summary, thought_type,
+    topics, people, project) tuples — in one transaction.
+
+    Two round trips regardless of metadata size or atom count: every node is
+    upserted by one ``INSERT ... SELECT FROM unnest(...) ... RETURNING``,
+    every edge by a second. Node keys are de-duplicated first (ON CONFLICT
+    DO UPDATE may not touch the same row twice in one statement); the first
+    spelling names the node, as it did when each node was its own INSERT.
+    Failures are logged but never raised.
     """
     try:
-        cur = conn.cursor()
+        # (node_nk, node_type, name, source_thought_id) in insertion order.
+        nodes: Dict[str, tuple] = {}
+        # (edge_id, source_nk, target_nk, edge_type)
+        edges: Dict[str, tuple] = {}
+        for thought_id, summary, _thought_type, topics, people, project in atoms:
+            thought_nk = f"thought:{thought_id}"
+            nodes.setdefault(thought_nk, (thought_nk, "thought", summary[:200], thought_id))
+
+            # ── Topic nodes + TAGGED_WITH edges ──────────────────────────
+            for topic in (topics or []):
+                topic_lower = topic.lower().replace(" ", "_")
+                topic_nk = f"topic:{topic_lower}"
+                nodes.setdefault(topic_nk, (topic_nk, "topic", topic, None))
+                edge_id = f"{user_id}|thought:{thought_id}|TAGGED_WITH|topic:{topic_lower}"
+                edges.setdefault(edge_id, (edge_id, thought_nk, topic_nk, "TAGGED_WITH"))
+
+            # ── Person nodes + MENTIONED_BY edges ────────────────────────
+            for person in (people or []):
+                person_lower = person.lower().replace(" ", "_")
+                person_nk = f"person:{person_lower}"
+                nodes.setdefault(person_nk, (person_nk, "person", person, None))
+                edge_id = f"{user_id}|person:{person_lower}|MENTIONED_BY|thought:{thought_id}"
+                edges.setdefault(edge_id, (edge_id, person_nk, thought_nk, "MENTIONED_BY"))
+
+            # ── Project node + RELATED_TO_PROJECT edge ───────────────────
+            if project:
+                project_lower = project.lower()
+                project_nk = f"project:{project_lower}"
+                nodes.setdefault(project_nk, (project_nk, "project", project, None))
+                edge_id = (f"{user_id}|thought:{thought_id}|RELATED_TO_PROJECT"
+                           f"|project:{project_lower}")
+                edges.setdefault(edge_id, (edge_id, thought_nk, project_nk, "RELATED_TO_PROJECT"))
+
+        if not nodes:
+            return
 
-        # ── 1. Thought node ──────────────────────────────────────────────
-        thought_nk = f"thought:{thought_id}"
+        cur = conn.cursor()
+        node_cols = list(zip(*nodes.values()))
         cur.execute(
             """
             INSERT INTO brain.knowledge_graph_nodes
                    (node_nk, node_type, name, user_id, source_thought_id)
-            VALUES (%s, %s, %s, %s, %s)
+            SELECT n.node_nk, n.node_type, n.name, %s, n.source_thought_id
+              FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[])
+                   AS n(node_nk, node_type, name, source_thought_id)
             ON CONFLICT (node_nk, user_id) DO UPDATE SET updated_at = NOW()
-            RETURNING node_id
+            RETURNING node_nk, node_id
             """,
-            (thought_nk, "thought", summary[:200], user_id, thought_id),
+            [user_id] + [list(col) for col in node_cols],
         )
-        thought_node_id = cur.fetchone()[0]
-
-        # ── 2. Topic nodes + TAGGED_WITH edges ──────────────────────────
-        for topic in (topics or []):
-            topic_lower = topic.lower().replace(" ", "_")
-            topic_nk = f"topic:{topic_lower}"
-            cur.execute(
-                """
-                INSERT INTO brain.knowledge_graph_nodes
-                       (node_nk, node_type, name, user_id)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (node_nk, user_id) DO UPDATE SET updated_at = NOW()
-                RETURNING node_id
-                """,
-                (topic_nk, "topic", topic, user_id),
-            )
-            topic_node_id = cur.fetchone()[0]
+        node_ids = dict(cur.fetchall())
 
-            edge_id = f"{user_id}|thought:{thought_id}|TAGGED_WITH|topic:{topic_lower}"
+        if edges:
+            edge_rows = [
+                (edge_id, node_ids[src], node_ids[tgt], edge_type)
+                for edge_id, src, tgt, edge_type in edges.values()
+            ]
             cur.execute(
                 """
                 INSERT INTO brain.knowledge_graph_edges
                        (edge_id, source_node, target_node, edge_type, user_id)
-                VALUES (%s, %s, %s, %s, %s)
+                SELECT e.edge_id, e.source_node, e.target_node, e.edge_type, %s
+                  FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[])
+                       AS e(edge_id, source_node, target_node, edge_type)
                 ON CONFLICT (edge_id) DO NOTHING
                 """,
-                (edge_id, thought_node_id, topic_node_id, "TAGGED_WITH", user_id),
+                [user_id] + [list(col) for col in zip(*edge_rows)],
             )
 
-        # ── 3. Person nodes + MENTIONED_BY edges ────────────────────────
-        for person in (people or []):
-            person_lower = person.lower().replace(" ", "_")
-            person_nk = f"person:{person_lower}"
-            cur.execute(
-                """
-                INSERT INTO brain.knowledge_graph_nodes
-                       (node_nk, node_type, name, user_id)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (node_nk, user_id) DO UPDATE SET updated_at = NOW()
-                RETURNING node_id
-                """,
-                (person_nk, "person", person, user_id),
-            )
-            person_node_id = cur.fetchone()[0]
+        conn.commit()
+        cur.close()
 
-            edge_id = f"{user_id}|person:{person_lower}|MENTIONED_BY|thought:{thought_id}"
-            cur.execute(
-                """
-                INSERT INTO brain.knowledge_graph_edges
-                       (edge_id, source_node, target_node, edge_type, user_id)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (edge_id) DO NOTHING
-                """,
-                (edge_id, person_node_id, thought_node_id, "MENTIONED_BY", user_id),
-            )
+    except Exception as e:
+        ids = ", ".join(a[0] for a in atoms)
+        logger.warning(f"Knowledge graph update failed for thought {ids}: {e}")
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+
+
+_ENRICH_CLAIM_SQL = """
+    UPDATE brain.enrichment_queue q
+       SET attempts = q.attempts + 1,
+           not_before = NOW() + make_interval(secs => %s)
+      FROM brain.thoughts t
+     WHERE q.thought_id IN (
+               SELECT thought_id
+                 FROM brain.enrichment_queue
+                WHERE user_id = %s AND not_before <= NOW()
+                ORDER BY enqueued_at
+                LIMIT %s
+                  FOR UPDATE SKIP LOCKED
+           )
+       AND t.thought_id = q.thought_id
+       AND t.user_id = q.user_id
+    RETURNING q.thought_id, q.attempts, q.payload, t.raw_text, t.summary,
+              t.project, t.metadata
+"""
+
+# The stv is only replaced while it still holds the capture-time seed — a NAL
+# revision that landed in between wins over the late confidence label. The
+# stv columns are REAL, so the float8 seeds are compared as ::real: a
+# condition-discounted seed is rarely exact in float4 and would never match.
+_ENRICH_APPLY_SQL = """
+    UPDATE brain.thoughts t
+       SET summary = u.summary,
+           thought_type = u.thought_type,
+           topics = u.topics::jsonb,
+           people = u.people::jsonb,
+           action_items = u.action_items::jsonb,
+           metadata = u.metadata::jsonb,
+           stv_frequency = CASE WHEN t.stv_frequency = u.seed_f::real
+                                 AND t.stv_confidence = u.seed_c::real
+                                THEN u.stv_f ELSE t.stv_frequency END,
+           stv_confidence = CASE WHEN t.stv_frequency = u.seed_f::real
+                                  AND t.stv_confidence = u.seed_c::real
+                                 THEN u.stv_c ELSE t.stv_confidence END
+      FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[], %s::text[],
+                  %s::text[], %s::text[], %s::float8[], %s::float8[],
+                  %s::float8[], %s::float8[])
+           AS u(thought_id, summary, thought_type, topics, people, action_items,
+                metadata, stv_f, stv_c, seed_f, seed_c)
+     WHERE t.thought_id = u.thought_id AND t.user_id = %s
+"""
+
+
+def enrich_pending(
+    conn,
+    user_id: str,
+    limit: int = ENRICH_BATCH_SIZE,
+    max_attempts: int = ENRICH_MAX_ATTEMPTS,
+) -> Dict[str, int]:
+    """Fill in LLM metadata for up to ``limit`` write-fast atoms of ``user_id``.
+
+    Claims a batch with one ``UPDATE ... FOR UPDATE SKIP LOCKED`` (bumping
+    ``attempts`` and leasing the rows for ``ENRICH_LEASE_S``, so concurrent
+    workers never double-process and a crashed worker's rows come back),
+    extracts metadata for the batch on ``ENRICH_WORKERS`` threads, then
+    writes every finished atom with one UPDATE and clears its queue rows.
+
+    An empty extraction (every provider down) is retried with exponential
+    backoff; after ``max_attempts`` the atom keeps its placeholder metadata,
+    stamped ``enrichment: "failed"`` — the state a synchronous capture lands
+    in when every provider fails. Graph edges are added per enriched atom
+    (``_update_graph_incremental``, two round trips each).
+
+    Never raises on a failed write: the rows are rolled back and reappear
+    when their lease expires. A row that comes back past ``max_attempts``
+    (its last attempt crashed or rolled back) is not extracted again; it
+    only gets the failed placeholder write. Returns counts for claimed /
+    enriched / retrying / failed atoms.
+    """
+    counts = {"claimed": 0, "enriched": 0, "retrying": 0, "failed": 0}
+    cur = conn.cursor()
+    try:
+        cur.execute(_ENRICH_CLAIM_SQL, (ENRICH_LEASE_S, user_id, limit))
+        claimed = cur.fetchall()
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        cur.close()
+    counts["claimed"] = len(claimed)
+    if not claimed:
+        return counts
+
+    # Same rule as capture(): the LLM only ever sees redacted text (raw_text
+    # is already redacted unless OPEN_BRAIN_STORE_RAW stored it raw).
+    texts = [redact_pii(row[3] or "") for row in claimed]
+    with ThreadPoolExecutor(max_workers=min(ENRICH_WORKERS, len(texts))) as pool:
+        extracted = list(pool.map(
+            lambda text, attempts: _extract_metadata(text) if attempts <= max_attempts else {},
+            texts, [row[1] for row in claimed],
+        ))
+
+    done: List[tuple] = []
+    retry: List[tuple] = []
+    for (tid, attempts, payload, _raw, summary, project, old_meta), text, meta in zip(
+        claimed, texts, extracted
+    ):
+        payload = _parse_object(payload)
+        old_meta = _parse_object(old_meta)
+        if not meta and attempts < max_attempts:
+            retry.append((tid, ENRICH_RETRY_BASE_S * 2 ** (attempts - 1)))
+            continue
+        metadata = dict(meta) if meta else _placeholder_metadata(text)
+        if not meta:
+            metadata["enrichment"] = "failed"
+        # gz-j29f0 null-summary guard, as in capture().
+        metadata["summary"] = metadata.get("summary") or summary or text[:200]
+        if old_meta.get("stored_raw"):
+            metadata["stored_raw"] = True
+        stv = _capture_stv(
+            metadata, payload.get("stv_f"), payload.get("stv_c"),
+            float(payload.get("condition") or 0.0),
+        )
+        done.append((tid, metadata, stv, payload, project, bool(meta)))
 
-        # ── 4. Project node + RELATED_TO_PROJECT edge ───────────────────
-        if project:
-            project_lower = project.lower()
-            project_nk = f"project:{project_lower}"
+    cur = conn.cursor()
+    try:
+        if done:
+            cols = list(zip(*[
+                (
+                    tid,
+                    md["summary"][:1000],
+                    md.get("type", "insight"),
+                    json.dumps(md.get("topics", [])),
+                    json.dumps(md.get("people", [])),
+                    json.dumps(md.get("action_items", [])),
+                    json.dumps(md),
+                    stv[0], stv[1],
+                    float(payload.get("seed_f", 1.0)), float(payload.get("seed_c", 0.5)),
+                )
+                for tid, md, stv, payload, _p, _ok in done
+            ]))
+            cur.execute(_ENRICH_APPLY_SQL, [list(c) for c in cols] + [user_id])
             cur.execute(
-                """
-                INSERT INTO brain.knowledge_graph_nodes
-                       (node_nk, node_type, name, user_id)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (node_nk, user_id) DO UPDATE SET updated_at = NOW()
-                RETURNING node_id
-                """,
-                (project_nk, "project", project, user_id),
+                "DELETE FROM brain.enrichment_queue WHERE thought_id = ANY(%s)",
+                ([d[0] for d in done],),
             )
-            project_node_id = cur.fetchone()[0]
-
-            edge_id = f"{user_id}|thought:{thought_id}|RELATED_TO_PROJECT|project:{project_lower}"
+        if retry:
             cur.execute(
                 """
-                INSERT INTO brain.knowledge_graph_edges
-                       (edge_id, source_node, target_node, edge_type, user_id)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (edge_id) DO NOTHING
+                UPDATE brain.enrichment_queue q
+                   SET not_before = NOW() + make_interval(secs => r.delay_s),
+                       last_error = 'metadata extraction returned nothing'
+                  FROM unnest(%s::text[], %s::float8[]) AS r(thought_id, delay_s)
+                 WHERE q.thought_id = r.thought_id
                 """,
-                (edge_id, thought_node_id, project_node_id, "RELATED_TO_PROJECT", user_id),
+                ([r[0] for r in retry], [float(r[1]) for r in retry]),
             )
-
         conn.commit()
-        cur.close()
-
     except Exception as e:
-        logger.warning(f"Knowledge graph update failed for thought {thought_id}: {e}")
+        logger.warning(f"enrich_pending: write failed ({e}); rows retry after their lease")
         try:
             conn.rollback()
         except Exception:
             pass
+        return counts
+    finally:
+        cur.close()
+
+    for tid, md, _stv, _payload, project, ok in done:
+        counts["enriched" if ok else "failed"] += 1
+        if ok:
+            _update_graph_incremental(
+                conn, tid, md["summary"], md.get("type", "insight"),
+                md.get("topics", []), md.get("people", []), project or "", user_id,
+            )
+    counts["retrying"] = len(retry)
+    return counts
+
+
+def enrich_next_due(conn, user_id: str) -> Optional[float]:
+    """Seconds until ``user_id``'s next claimable queue row is due (0 if one is
+    due now), or None when nothing is queued. Same join as the claim, so a
+    row whose atom is gone never looks due."""
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            """
+            SELECT GREATEST(0, EXTRACT(EPOCH FROM MIN(q.not_before) - NOW()))
+              FROM brain.enrichment_queue q
+              JOIN brain.thoughts t
+                ON t.thought_id = q.thought_id AND t.user_id = q.user_id
+             WHERE q.user_id = %s
+            """,
+            (user_id,),
+        )
+        row = cur.fetchone()
+        conn.commit()
+    finally:
+        cur.close()
+    return None if not row or row[0] is None else float(row[0])
+
+
+def _wake_enrich_worker(results: Any) -> None:
+    """After a write-fast capture outside the daemon, nudge brain_daemon's
+    enrichment worker; if no daemon answers, autostart one (throttled) —
+    its worker drains the queue on start."""
+    if isinstance(results, dict):
+        results = [results]
+    if not any(isinstance(r, dict) and r.get("enrichment") == "pending" for r in results):
+        return
+    try:
+        import brain_client
+    except ImportError:
+        return
+    if brain_client.enabled() and not brain_client.notify("enrich_wake"):
+        brain_client.spawn_detached()
 
 
 STOP_WORDS = frozenset({
@@ -3464,6 +4355,34 @@ def _parse_pgvector_text(text_val: Optional[str]) -> Optional[List[float]]:
         return None
 
 
+def _decode_embedding_column(val) -> Optional[List[float]]:
+    """Decode a selected embedding column into a float list (fail-open).
+
+    search(dedup=True) selects ``vector_send(embedding)`` — a bytea that
+    psycopg2 hands back as ``memoryview``/``bytes`` — and decodes it with
+    vector_codec.unpack_pgvector_send. A ``::text`` value still parses via
+    _parse_pgvector_text, so callers and fixtures on the old shape keep working.
+    """
+    if isinstance(val, (bytes, bytearray, memoryview)):
+        return vector_codec.unpack_pgvector_send(val)
+    return _parse_pgvector_text(val)
+
+
+_numpy_module: Any = False  # False = not tried yet; None = unavailable
+
+
+def _numpy():
+    """numpy if importable, else None — only the dedup fast path uses it."""
+    global _numpy_module
+    if _numpy_module is False:
+        try:
+            import numpy
+            _numpy_module = numpy
+        except ImportError:
+            _numpy_module = None
+    return _numpy_module
+
+
 def _cosine_similarity(a: Optional[List[float]], b: Optional[List[float]]) -> float:
     """Pure cosine similarity over two equal-length float vectors.
 
@@ -3504,7 +4423,35 @@ def _semantic_dedup(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     D6: ``_EMBEDDING`` is a transient scoring-input field only — it is
     stripped from every survivor before this function returns (search()
     additionally re-strips defensively, so it truly never egresses).
+
+    With NumPy importable the pairwise cosines come from one Gram matrix
+    (``_dedup_collapse_numpy``); otherwise, or for inputs that path declines
+    (mixed embedding dimensions, < 2 embeddings), the pure-Python loop runs.
+    Both produce the same survivors and annotations. Results carrying
+    server-computed ``_NEAR_IDS`` (search(dedup_server=True)) skip the
+    cosine work entirely (``_dedup_collapse_adjacency``).
     """
+    if any("_NEAR_IDS" in r for r in results):
+        survivors = _dedup_collapse_adjacency(results)
+    else:
+        np = _numpy()
+        survivors = _dedup_collapse_numpy(np, results) if np is not None else None
+        if survivors is None:
+            survivors = _dedup_collapse_python(results)
+    for _s in survivors:
+        _s.pop("_EMBEDDING", None)
+        _s.pop("_NEAR_IDS", None)
+    return survivors
+
+
+def _absorb(survivor: Dict[str, Any], r: Dict[str, Any]) -> None:
+    survivor.setdefault("NEAR_DUPLICATE_IDS", [])
+    survivor["NEAR_DUPLICATE_IDS"].append(r.get("THOUGHT_ID"))
+    survivor["NEAR_DUPLICATE_COUNT"] = survivor.get("NEAR_DUPLICATE_COUNT", 0) + 1
+
+
+def _dedup_collapse_python(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reference collapse: each result vs every embedded survivor, in rank order."""
     survivors: List[Dict[str, Any]] = []
     for r in results:
         r_embedding = r.get("_EMBEDDING")
@@ -3517,15 +4464,86 @@ def _semantic_dedup(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             if not s_embedding:
                 continue
             if _cosine_similarity(r_embedding, s_embedding) >= DEDUP_COSINE:
-                s.setdefault("NEAR_DUPLICATE_IDS", [])
-                s["NEAR_DUPLICATE_IDS"].append(r.get("THOUGHT_ID"))
-                s["NEAR_DUPLICATE_COUNT"] = s.get("NEAR_DUPLICATE_COUNT", 0) + 1
+                _absorb(s, r)
                 absorbed = True
                 break
         if not absorbed:
             survivors.append(r)
-    for _s in survivors:
-        _s.pop("_EMBEDDING", None)
+    return survivors
+
+
+def _dedup_collapse_adjacency(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The same greedy rank-order collapse over server-computed neighbour sets.
+
+    Each result carries ``_NEAR_IDS`` — the ids of the other over-fetched
+    rows whose cosine to it is >= ``DEDUP_COSINE`` (computed by Postgres,
+    see :func:`search`). Cosine is symmetric, so "r is near survivor s" is
+    ``s.THOUGHT_ID in r._NEAR_IDS``. A result without ``_NEAR_IDS`` is a D2
+    fail-open survivor, exactly like one without ``_EMBEDDING``.
+    """
+    survivors: List[Dict[str, Any]] = []
+    for r in results:
+        near = r.get("_NEAR_IDS")
+        if near is None:
+            survivors.append(r)
+            continue
+        target = None
+        if near:
+            for s in survivors:
+                if s.get("_NEAR_IDS") is not None and s.get("THOUGHT_ID") in near:
+                    target = s
+                    break
+        if target is None:
+            survivors.append(r)
+        else:
+            _absorb(target, r)
+    return survivors
+
+
+def _dedup_collapse_numpy(np, results: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """The same greedy rank-order collapse over a precomputed Gram matrix.
+
+    Embeddings are stacked into one L2-normalized float32 matrix, so every
+    pairwise cosine is a single ``X @ X.T``; the greedy pass then only
+    indexes it. A zero vector normalizes to zeros (cosine 0, as in
+    ``_cosine_similarity``). Returns None when the input has fewer than two
+    embeddings or mixed dimensions — the pure path handles those.
+    """
+    rows = [i for i, r in enumerate(results) if r.get("_EMBEDDING")]
+    if len(rows) < 2 or len({len(results[i]["_EMBEDDING"]) for i in rows}) != 1:
+        return None
+    try:
+        mat = np.asarray([results[i]["_EMBEDDING"] for i in rows], dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+    norms = np.linalg.norm(mat, axis=1)
+    norms[norms == 0.0] = 1.0
+    mat /= norms[:, None]
+    gram = mat @ mat.T
+    row_of = {i: k for k, i in enumerate(rows)}
+
+    survivors: List[Dict[str, Any]] = []
+    kept: List[int] = []  # Gram rows of the embedded survivors, in survivor order
+    for i, r in enumerate(results):
+        k = row_of.get(i)
+        if k is None:
+            survivors.append(r)  # D2 fail-open
+            continue
+        target = None
+        if kept:
+            sims = gram[k, kept]
+            for j in np.flatnonzero(sims >= DEDUP_COSINE - DEDUP_EXACT_MARGIN):
+                s = results[rows[kept[j]]]
+                if sims[j] >= DEDUP_COSINE + DEDUP_EXACT_MARGIN or (
+                    _cosine_similarity(r["_EMBEDDING"], s["_EMBEDDING"]) >= DEDUP_COSINE
+                ):
+                    target = s
+                    break
+        if target is None:
+            survivors.append(r)
+            kept.append(k)
+        else:
+            _absorb(target, r)
     return survivors
 
 
@@ -3663,43 +4681,194 @@ def _annotate_provenance(
             pass
 
 
-def search(
+def _resolve_ann_candidates(ann_candidates: Optional[int], sql_limit: int) -> int:
+    """Resolve the stage-1 ANN candidate count for :func:`search`.
+
+    ``None`` defers to ``OPEN_BRAIN_ANN_CANDIDATES`` (default
+    ``ANN_CANDIDATES_DEFAULT`` = off). A positive value is raised to at least
+    ``sql_limit`` (stage 2 can never return more rows than stage 1 prefetched)
+    and clamped to ``ANN_CANDIDATES_MAX``. Unparseable env values mean off.
+    """
+    if ann_candidates is None:
+        try:
+            ann_candidates = int(
+                os.environ.get("OPEN_BRAIN_ANN_CANDIDATES", ANN_CANDIDATES_DEFAULT)
+            )
+        except (TypeError, ValueError):
+            ann_candidates = 0
+    if ann_candidates <= 0:
+        return 0
+    return min(max(int(ann_candidates), int(sql_limit)), ANN_CANDIDATES_MAX)
+
+
+def _resolve_hnsw_ef_search(k_candidates: int) -> int:
+    """``hnsw.ef_search`` for a stage-1 prefetch of ``k_candidates`` rows.
+
+    The HNSW scan yields at most ef_search tuples before the user/model WHERE
+    filter is applied, so ef_search below k silently truncates the candidate
+    set. ``OPEN_BRAIN_HNSW_EF_SEARCH`` raises recall further (at a latency
+    cost); the result is always in [max(k, HNSW_EF_SEARCH_MIN), ANN_CANDIDATES_MAX].
+    """
+    try:
+        ef = int(os.environ.get("OPEN_BRAIN_HNSW_EF_SEARCH", "0"))
+    except (TypeError, ValueError):
+        ef = 0
+    return min(max(ef, k_candidates, HNSW_EF_SEARCH_MIN), ANN_CANDIDATES_MAX)
+
+
+def _resolve_dedup_server(dedup_server: Optional[bool]) -> bool:
+    """``dedup_server`` if given, else ``OPEN_BRAIN_DEDUP_SERVER`` (default off)."""
+    if dedup_server is not None:
+        return bool(dedup_server)
+    env = os.environ.get("OPEN_BRAIN_DEDUP_SERVER", "")
+    return env.lower() == "true" if env else DEDUP_SERVER_DEFAULT
+
+
+def _normalize_search_row(d: Dict[str, Any]) -> None:
+    """Shape one hybrid-scored row (lowercase keys) into a search() result, in place.
+
+    Shared by search() and graph_search()'s fused path; the caller applies
+    its threshold and uppercases the keys afterwards.
+    """
+    d["created_at"] = str(d["created_at"]) if d.get("created_at") else ""
+    d["topics"] = _parse_array(d.get("topics"))
+    d["people"] = _parse_array(d.get("people"))
+    d["action_items"] = _parse_array(d.get("action_items"))
+    hybrid = d.get("hybrid_score", 0)
+    d["similarity"] = round(float(d.get("vec_similarity") or 0.0), 4)
+    d["hybrid_score"] = round(float(hybrid), 4) if hybrid is not None else 0.0
+    d["keyword_boost"] = round(float(d.get("keyword_boost", 0)), 4)
+    d["time_decay"] = round(float(d.get("time_decay", 0)), 4)
+    # NAL stv: extract before uppercasing, normalize to STV dict.
+    # Use `if x is not None` (NOT `x or default`) — 0.0 is a VALID stv
+    # value (frequency=0.0 = fully-refuted; confidence=0.0 = no evidence)
+    # and `0.0 or default` would silently alias it to the default.
+    _raw_stv_f = d.pop("stv_frequency", None)
+    _raw_stv_c = d.pop("stv_confidence", None)
+    _stv_f = float(_raw_stv_f if _raw_stv_f is not None else 1.0)
+    _stv_c = float(_raw_stv_c if _raw_stv_c is not None else 0.5)
+    d["stv"] = {"f": round(_stv_f, 4), "c": round(_stv_c, 4)}
+    d["low_confidence"] = _stv_c < NAL_LOW_CONFIDENCE_THRESHOLD
+    # Veracity recall label (V1): flag atoms discounted for a persuasion-
+    # bombing production condition so downstream reasoning sees it.
+    d["condition_discounted"] = _is_condition_discounted(d.get("metadata"))
+    # VL-6: numeric condition-score for the ranking penalty.
+    d["condition_score"] = _condition_score_of(d.get("metadata"))
+    # Remove intermediate columns not needed in output
+    d.pop("vec_similarity", None)
+
+
+def _apply_hebbian_boost(
     conn,
-    query: str,
+    results: List[Dict[str, Any]],
     user_id: str,
-    limit: int = DEFAULT_SEARCH_LIMIT,
-    threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
     sort_by: str = "similarity",
-    thought_type: Optional[str] = None,
-    topics: Optional[List[str]] = None,
-    people: Optional[List[str]] = None,
-    date_from: Optional[str] = None,
-    date_to: Optional[str] = None,
-    dedup: bool = False,
-) -> List[Dict[str, Any]]:
-    """Hybrid search across user's thoughts using vector similarity, keyword boost, and time decay.
+) -> None:
+    """Add the gated Hebbian promotion boost to ``results`` IN PLACE (search() pass)."""
+    # brain-W1-S13 (gz-97l2z): Hebbian promotion boost, gated by within-kind
+    # over-application defense. A heavily-promoted-but-irrelevant thought
+    # MUST NOT outrank a relevant unpromoted one — so the boost is zeroed
+    # below HEBBIAN_MIN_RELEVANCE_FLOOR (0.30 cosine sim). Defense per
+    # gz-dsax2 / W1-R0 finding.
+    #
+    # Final score formula:
+    #     hybrid_score' = hybrid_score
+    #                     + HEBBIAN_BOOST_COEFFICIENT * effective_weight
+    #                       if similarity >= HEBBIAN_MIN_RELEVANCE_FLOOR
+    #                       else 0
+    #
+    # Implementation note: effective_weight fetched via single SQL aggregate
+    # round-trip (compute_effective_weights_batch — gz-8nsvj) rather than
+    # N per-thought queries.
+    if not results:
+        return
+    candidate_tids = [r.get("THOUGHT_ID") for r in results if r.get("THOUGHT_ID")]
+    if candidate_tids:
+        try:
+            weights_by_tid = compute_effective_weights_batch(
+                conn, candidate_tids, user_id,
+            )
+        except Exception:
+            # On any aggregate error, degrade gracefully: emit zero
+            # boosts. Hebbian is a scoring assist, not a correctness
+            # invariant — search() must still return results.
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            weights_by_tid = {tid: 0.0 for tid in candidate_tids}
 
-    Combines three scoring signals:
-      - vec_similarity (weight 0.85): pgvector cosine similarity
-      - keyword_boost (weight 0.10): fraction of query keywords found in raw_text/summary
-      - time_decay (weight 0.05): recency bonus decaying to 0 over 90 days
+        for r in results:
+            tid = r.get("THOUGHT_ID")
+            vs = float(r.get("SIMILARITY", 0.0) or 0.0)
+            eff_weight = float(weights_by_tid.get(tid, 0.0))
+            # Gate: below the floor, boost is 0 regardless of weight.
+            if vs >= HEBBIAN_MIN_RELEVANCE_FLOOR and eff_weight != 0.0:
+                promotion_boost = HEBBIAN_BOOST_COEFFICIENT * eff_weight
+            else:
+                promotion_boost = 0.0
+            r["EFFECTIVE_WEIGHT"] = round(eff_weight, 4)
+            r["PROMOTION_BOOST"] = round(promotion_boost, 4)
+            base_score = float(r.get("HYBRID_SCORE", 0.0) or 0.0)
+            # VL-6: marginal veracity penalty demotes a low-veracity atom.
+            boosted = base_score + promotion_boost
+            r["HYBRID_SCORE"] = round(
+                _apply_veracity_penalty(boosted, r.get("CONDITION_SCORE", 0.0)), 4
+            )
 
-    Supports metadata filters: thought_type, topics (OR), people (OR), date_from, date_to.
-    All new parameters are Optional with None defaults for backward compatibility.
+        # Re-sort by the now-boosted HYBRID_SCORE — the input order
+        # reflects pre-boost ranking. Only re-sort when sort_by leaves
+        # similarity-driven ordering in effect (sort_by="time" callers
+        # explicitly want chronological order; respect that).
+        if sort_by != "time":
+            results.sort(
+                key=lambda x: float(x.get("HYBRID_SCORE", 0.0) or 0.0),
+                reverse=True,
+            )
 
-    dedup (T3, fblai-bfyjr, default False): when True, over-fetches
-    (min(limit*DEDUP_OVERFETCH_FACTOR, DEDUP_OVERFETCH_CAP)) and collapses
-    near-duplicate results (pairwise cosine >= DEDUP_COSINE) via
-    _semantic_dedup() AFTER all scoring passes and BEFORE the reinforcement
-    touch, then truncates survivors to `limit`. When False (default), the
-    SQL and returned rows are BYTE-IDENTICAL to pre-T3 behavior (D7) — no
-    embedding column is selected, no over-fetch, no new fields.
-    """
-    cur = conn.cursor()
 
-    # Generate query embedding locally
-    query_embedding = _generate_embedding(query)
+def _reinforce_accessed(conn, thought_ids: List[str], user_id: str) -> None:
+    """Touch ``updated_at`` on recalled thoughts (resets their time_decay clock)."""
+    if not thought_ids:
+        return
+    try:
+        reinforce_cur = conn.cursor()
+        placeholders = ",".join(["%s"] * len(thought_ids))
+        reinforce_cur.execute(
+            f"UPDATE {TABLE} SET updated_at = NOW() WHERE thought_id IN ({placeholders}) AND user_id = %s",
+            list(thought_ids) + [user_id],
+        )
+        conn.commit()
+        reinforce_cur.close()
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
 
+
+def _hybrid_search_sql(
+    query: str,
+    query_embedding: List[float],
+    user_id: str,
+    sort_by: str,
+    thought_type: Optional[str],
+    topics: Optional[List[str]],
+    people: Optional[List[str]],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    sql_limit: int,
+    k_candidates: int,
+    embedding_select: str = "",
+) -> Tuple[str, List[Any]]:
+    """(sql, params) for the hybrid-scored row set :func:`search` fetches.
+
+    Factored out of search() so graph_search()'s fused statement embeds the
+    identical seed query. ``k_candidates`` > 0 selects the two-stage ANN shape
+    (the caller still owns the ``hnsw.ef_search`` set_config); the statement
+    ends in ``ORDER BY ... LIMIT sql_limit`` and its output columns are the
+    scored thought columns plus ``hybrid_score``.
+    """
     # Extract keywords for keyword boost scoring
     keywords = _extract_keywords(query)
 
@@ -3758,20 +4927,67 @@ def search(
 
     order_clause = "hybrid_score DESC" if sort_by != "time" else "created_at ASC"
 
-    # T3 (fblai-bfyjr, D7 byte-stability): dedup=True over-fetches (so the
-    # collapse pass has slack to free up) and additionally selects the
-    # embedding as text so _semantic_dedup() has vectors to compare.
-    # dedup=False produces the EXACT SAME SQL string as pre-T3 — no
-    # embedding column, no over-fetch — `embedding_select` is "" so the
-    # f-string below is byte-identical to before this change.
-    if dedup:
-        sql_limit = min(limit * DEDUP_OVERFETCH_FACTOR, DEDUP_OVERFETCH_CAP)
-        embedding_select = ",\n                embedding::text AS _embedding_text"
-    else:
-        sql_limit = limit
-        embedding_select = ""
+    if k_candidates:
+        # Two-stage: the candidates CTE is a plain ORDER BY distance LIMIT k
+        # over the filtered table — the shape the HNSW planner path needs.
+        # updated_at is carried through for the stage-2 time_decay term.
+        embedding_passthrough = ",\n                _embedding_bin" if embedding_select else ""
+        search_sql = f"""
+        WITH candidates AS (
+            SELECT
+                thought_id,
+                raw_text,
+                summary,
+                thought_type,
+                topics,
+                people,
+                action_items,
+                source,
+                project,
+                created_at,
+                updated_at,
+                stv_frequency,
+                stv_confidence,
+                embedding <=> %s::vector AS vec_distance{embedding_select}
+            FROM {TABLE}
+            WHERE {where_sql}
+            ORDER BY vec_distance
+            LIMIT %s
+        ),
+        scored AS (
+            SELECT
+                thought_id,
+                raw_text,
+                summary,
+                thought_type,
+                topics,
+                people,
+                action_items,
+                source,
+                project,
+                created_at,
+                stv_frequency,
+                stv_confidence,
+                1 - vec_distance AS vec_similarity,
+                {keyword_boost_expr} AS keyword_boost,
+                GREATEST(0, 1.0 - EXTRACT(EPOCH FROM (NOW() - GREATEST(created_at, COALESCE(updated_at, created_at)))) / (90 * 86400.0)) AS time_decay{embedding_passthrough}
+            FROM candidates
+        )
+        SELECT *,
+            (vec_similarity * 0.85) + (keyword_boost * 0.10) + (time_decay * 0.05) AS hybrid_score
+        FROM scored
+        ORDER BY {order_clause}
+        LIMIT %s
+    """
+        # Params: embedding, where params, k, keyword patterns, limit.
+        params: list = [vector_codec.to_pgvector_literal(query_embedding)]
+        params.extend(where_params)
+        params.append(k_candidates)
+        params.extend(keyword_params)
+        params.append(sql_limit)
 
-    search_sql = f"""
+    else:
+        search_sql = f"""
         WITH scored AS (
             SELECT
                 thought_id,
@@ -3799,11 +5015,136 @@ def search(
         LIMIT %s
     """
 
-    # Assemble all params in order: embedding, keyword patterns, where params, limit
-    params: list = [str(query_embedding)]
-    params.extend(keyword_params)
-    params.extend(where_params)
-    params.append(sql_limit)
+        # Assemble all params in order: embedding, keyword patterns, where params, limit
+        params = [vector_codec.to_pgvector_literal(query_embedding)]
+        params.extend(keyword_params)
+        params.extend(where_params)
+        params.append(sql_limit)
+
+    return search_sql, params
+
+
+def search(
+    conn,
+    query: str,
+    user_id: str,
+    limit: int = DEFAULT_SEARCH_LIMIT,
+    threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    sort_by: str = "similarity",
+    thought_type: Optional[str] = None,
+    topics: Optional[List[str]] = None,
+    people: Optional[List[str]] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    dedup: bool = False,
+    ann_candidates: Optional[int] = None,
+    dedup_server: Optional[bool] = None,
+) -> List[Dict[str, Any]]:
+    """Hybrid search across user's thoughts using vector similarity, keyword boost, and time decay.
+
+    Combines three scoring signals:
+      - vec_similarity (weight 0.85): pgvector cosine similarity
+      - keyword_boost (weight 0.10): fraction of query keywords found in raw_text/summary
+      - time_decay (weight 0.05): recency bonus decaying to 0 over 90 days
+
+    Supports metadata filters: thought_type, topics (OR), people (OR), date_from, date_to.
+    All new parameters are Optional with None defaults for backward compatibility.
+
+    dedup (T3, fblai-bfyjr, default False): when True, over-fetches
+    (min(limit*DEDUP_OVERFETCH_FACTOR, DEDUP_OVERFETCH_CAP)) and collapses
+    near-duplicate results (pairwise cosine >= DEDUP_COSINE) via
+    _semantic_dedup() AFTER all scoring passes and BEFORE the reinforcement
+    touch, then truncates survivors to `limit`. When False (default), the
+    SQL and returned rows are BYTE-IDENTICAL to pre-T3 behavior (D7) — no
+    embedding column is selected, no over-fetch, no new fields.
+
+    ann_candidates (default None -> OPEN_BRAIN_ANN_CANDIDATES, off when 0):
+    two-stage retrieval. Stage 1 prefetches the ``ann_candidates`` nearest
+    rows in HNSW order (``ORDER BY embedding <=> q LIMIT k``, with
+    ``hnsw.ef_search`` raised to at least k for this transaction); stage 2
+    computes the hybrid score over that candidate set only. Trades exact
+    recall of low-similarity/high-keyword rows for an index scan instead of
+    a sequential scan of every row the user owns. Off = the single-stage SQL
+    above, byte-identical.
+
+    dedup_server (default None -> OPEN_BRAIN_DEDUP_SERVER, off): with dedup,
+    the pairwise cosine test runs inside Postgres. The over-fetched rows are
+    wrapped in a ``hits`` CTE and each returned row carries ``_near_ids`` —
+    the other hits within ``DEDUP_COSINE`` of it — instead of its embedding,
+    so no vectors cross the wire and the client skips decoding and the Gram
+    pass. Survivor selection still happens in Python, after the Hebbian and
+    provenance passes that produce the final rank (those need this same
+    row set), so survivors and NEAR_DUPLICATE_IDS match the client path.
+    Ignored when dedup is False.
+    """
+    cur = conn.cursor()
+
+    # Generate query embedding locally
+    query_embedding = _generate_embedding(query)
+
+    # T3 (fblai-bfyjr, D7 byte-stability): dedup=True over-fetches (so the
+    # collapse pass has slack to free up) and additionally selects the
+    # embedding (pgvector binary send format, decoded without per-float
+    # text parsing) so _semantic_dedup() has vectors to compare.
+    # dedup=False produces the EXACT SAME SQL string as pre-T3 — no
+    # embedding column, no over-fetch — `embedding_select` is "" so the
+    # _hybrid_search_sql() f-string is byte-identical to before this change.
+    # Server-side dedup needs no vectors back: the adjacency wrapper below
+    # re-reads them by thought_id.
+    server_dedup = dedup and _resolve_dedup_server(dedup_server)
+    if dedup:
+        sql_limit = min(limit * DEDUP_OVERFETCH_FACTOR, DEDUP_OVERFETCH_CAP)
+        embedding_select = (
+            "" if server_dedup
+            else ",\n                vector_send(embedding) AS _embedding_bin"
+        )
+    else:
+        sql_limit = limit
+        embedding_select = ""
+
+    k_candidates = _resolve_ann_candidates(ann_candidates, sql_limit)
+
+    search_sql, params = _hybrid_search_sql(
+        query, query_embedding, user_id, sort_by,
+        thought_type, topics, people, date_from, date_to,
+        sql_limit, k_candidates, embedding_select,
+    )
+    if k_candidates:
+        # is_local=true scopes the GUC to this transaction, so a pooled or
+        # reused connection never inherits a raised ef_search.
+        cur.execute(
+            "SELECT set_config('hnsw.ef_search', %s, true)",
+            (str(_resolve_hnsw_ef_search(k_candidates)),),
+        )
+
+    if server_dedup:
+        # Near-duplicate adjacency among the over-fetched hits. The distance
+        # form (<= 1 - DEDUP_COSINE) is the cosine test with NaN (zero-norm
+        # vectors) falling out as "not near", and the CASE keeps a stray
+        # mixed-dimension pair from raising instead of comparing false.
+        order_clause = "hybrid_score DESC" if sort_by != "time" else "created_at ASC"
+        search_sql = f"""
+        WITH hits AS ({search_sql}),
+        vecs AS (
+            SELECT t.thought_id, t.embedding
+            FROM {TABLE} t
+            JOIN hits h ON h.thought_id = t.thought_id
+            WHERE t.user_id = %s
+        )
+        SELECT hits.*,
+            ARRAY(
+                SELECT b.thought_id
+                FROM vecs a
+                JOIN vecs b ON b.thought_id <> a.thought_id
+                WHERE a.thought_id = hits.thought_id
+                  AND CASE WHEN vector_dims(a.embedding) = vector_dims(b.embedding)
+                           THEN (a.embedding <=> b.embedding) <= %s
+                           ELSE false END
+            ) AS _near_ids
+        FROM hits
+        ORDER BY {order_clause}
+    """
+        params.extend([user_id, 1.0 - DEDUP_COSINE])
 
     cur.execute(search_sql, params)
     columns = [desc[0] for desc in cur.description]
@@ -3813,107 +5154,27 @@ def search(
     results = []
     for row in rows:
         d = dict(zip(columns, row))
-        hybrid = d.get("hybrid_score", 0)
         vec_sim = d.get("vec_similarity", 0)
         if vec_sim is not None and float(vec_sim) >= threshold:
-            d["created_at"] = str(d["created_at"]) if d.get("created_at") else ""
-            d["topics"] = _parse_array(d.get("topics"))
-            d["people"] = _parse_array(d.get("people"))
-            d["action_items"] = _parse_array(d.get("action_items"))
-            d["similarity"] = round(float(vec_sim), 4)
-            d["hybrid_score"] = round(float(hybrid), 4) if hybrid is not None else 0.0
-            d["keyword_boost"] = round(float(d.get("keyword_boost", 0)), 4)
-            d["time_decay"] = round(float(d.get("time_decay", 0)), 4)
-            # NAL stv: extract before uppercasing, normalize to STV dict.
-            # Use `if x is not None` (NOT `x or default`) — 0.0 is a VALID stv
-            # value (frequency=0.0 = fully-refuted; confidence=0.0 = no evidence)
-            # and `0.0 or default` would silently alias it to the default.
-            _raw_stv_f = d.pop("stv_frequency", None)
-            _raw_stv_c = d.pop("stv_confidence", None)
-            _stv_f = float(_raw_stv_f if _raw_stv_f is not None else 1.0)
-            _stv_c = float(_raw_stv_c if _raw_stv_c is not None else 0.5)
-            d["stv"] = {"f": round(_stv_f, 4), "c": round(_stv_c, 4)}
-            d["low_confidence"] = _stv_c < NAL_LOW_CONFIDENCE_THRESHOLD
-            # Veracity recall label (V1): flag atoms discounted for a persuasion-
-            # bombing production condition so downstream reasoning sees it.
-            d["condition_discounted"] = _is_condition_discounted(d.get("metadata"))
-            # VL-6: numeric condition-score for the ranking penalty.
-            d["condition_score"] = _condition_score_of(d.get("metadata"))
-            # Remove intermediate columns not needed in output
-            d.pop("vec_similarity", None)
+            _normalize_search_row(d)
             # T3 (fblai-bfyjr): only present when dedup=True (embedding_select
             # above). Parse into a transient _EMBEDDING key BEFORE the
             # uppercase pass below — the leading-underscore-uppercase key is
             # left untouched by .upper() so it survives the transform, and
             # it is popped again before results leave search() (D6).
             if dedup:
-                _emb_text = d.pop("_embedding_text", None)
-                _parsed_embedding = _parse_pgvector_text(_emb_text)
+                _parsed_embedding = _decode_embedding_column(
+                    d.pop("_embedding_bin", None))
                 if _parsed_embedding is not None:
                     d["_EMBEDDING"] = _parsed_embedding
+                if server_dedup:
+                    _near = d.pop("_near_ids", None)
+                    d["_NEAR_IDS"] = {str(n) for n in (_near or [])}
             # Normalize to uppercase keys for compatibility with formatters/Pi bridge
             d = {k.upper(): v for k, v in d.items()}
             results.append(d)
 
-    # brain-W1-S13 (gz-97l2z): Hebbian promotion boost, gated by within-kind
-    # over-application defense. A heavily-promoted-but-irrelevant thought
-    # MUST NOT outrank a relevant unpromoted one — so the boost is zeroed
-    # below HEBBIAN_MIN_RELEVANCE_FLOOR (0.30 cosine sim). Defense per
-    # gz-dsax2 / W1-R0 finding.
-    #
-    # Final score formula:
-    #     hybrid_score' = hybrid_score
-    #                     + HEBBIAN_BOOST_COEFFICIENT * effective_weight
-    #                       if similarity >= HEBBIAN_MIN_RELEVANCE_FLOOR
-    #                       else 0
-    #
-    # Implementation note: effective_weight fetched via single SQL aggregate
-    # round-trip (compute_effective_weights_batch — gz-8nsvj) rather than
-    # N per-thought queries.
-    if results:
-        candidate_tids = [r.get("THOUGHT_ID") for r in results if r.get("THOUGHT_ID")]
-        if candidate_tids:
-            try:
-                weights_by_tid = compute_effective_weights_batch(
-                    conn, candidate_tids, user_id,
-                )
-            except Exception:
-                # On any aggregate error, degrade gracefully: emit zero
-                # boosts. Hebbian is a scoring assist, not a correctness
-                # invariant — search() must still return results.
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass
-                weights_by_tid = {tid: 0.0 for tid in candidate_tids}
-
-            for r in results:
-                tid = r.get("THOUGHT_ID")
-                vs = float(r.get("SIMILARITY", 0.0) or 0.0)
-                eff_weight = float(weights_by_tid.get(tid, 0.0))
-                # Gate: below the floor, boost is 0 regardless of weight.
-                if vs >= HEBBIAN_MIN_RELEVANCE_FLOOR and eff_weight != 0.0:
-                    promotion_boost = HEBBIAN_BOOST_COEFFICIENT * eff_weight
-                else:
-                    promotion_boost = 0.0
-                r["EFFECTIVE_WEIGHT"] = round(eff_weight, 4)
-                r["PROMOTION_BOOST"] = round(promotion_boost, 4)
-                base_score = float(r.get("HYBRID_SCORE", 0.0) or 0.0)
-                # VL-6: marginal veracity penalty demotes a low-veracity atom.
-                boosted = base_score + promotion_boost
-                r["HYBRID_SCORE"] = round(
-                    _apply_veracity_penalty(boosted, r.get("CONDITION_SCORE", 0.0)), 4
-                )
-
-            # Re-sort by the now-boosted HYBRID_SCORE — the input order
-            # reflects pre-boost ranking. Only re-sort when sort_by leaves
-            # similarity-driven ordering in effect (sort_by="time" callers
-            # explicitly want chronological order; respect that).
-            if sort_by != "time":
-                results.sort(
-                    key=lambda x: float(x.get("HYBRID_SCORE", 0.0) or 0.0),
-                    reverse=True,
-                )
+    _apply_hebbian_boost(conn, results, user_id, sort_by)
 
     # ── atom_links provenance annotation (fblai-lk4gt) ───────────────────────
     # SUPERSEDES SUPPRESSION + DISPUTED ANNOTATION — factored into
@@ -3936,28 +5197,14 @@ def search(
         results = _semantic_dedup(results)
         for _r in results:
             _r.pop("_EMBEDDING", None)  # D6: never egresses from search()
+            _r.pop("_NEAR_IDS", None)
         results = results[:limit]
         _dedup_collapsed = sum(r.get("NEAR_DUPLICATE_COUNT", 0) for r in results)
 
     # ── Memory reinforcement: touch updated_at on accessed thoughts ──
     # This resets the time_decay clock, making frequently-accessed memories
     # stay "fresh" longer. The more you recall a memory, the more it persists.
-    if results:
-        try:
-            accessed_ids = [r["THOUGHT_ID"] for r in results]
-            reinforce_cur = conn.cursor()
-            placeholders = ",".join(["%s"] * len(accessed_ids))
-            reinforce_cur.execute(
-                f"UPDATE {TABLE} SET updated_at = NOW() WHERE thought_id IN ({placeholders}) AND user_id = %s",
-                accessed_ids + [user_id],
-            )
-            conn.commit()
-            reinforce_cur.close()
-        except Exception:
-            try:
-                conn.rollback()
-            except Exception:
-                pass
+    _reinforce_accessed(conn, [r["THOUGHT_ID"] for r in results], user_id)
 
     # brain-W2-S6.1 (gz-woema): replay log emission for search ops.
     # Query is PII-redacted at the emitter boundary. result_summary captures
@@ -3995,6 +5242,286 @@ def search(
     return results
 
 
+# graph_search() atom_links expansion (fblai-lk4gt): link-type-weighted
+# proximity. "strong" semantic links (supersedes, derives_from, verifies) get
+# 0.85; "weak" informational links 0.55; unknown types default to 0.55.
+_ATOM_LINK_PROXIMITY = {
+    "supersedes": 0.85,
+    "derives_from": 0.85,
+    "verifies": 0.85,
+    "refutes": 0.70,
+    "contradicts": 0.70,
+    "resolves": 0.70,
+    "rationale_for": 0.55,
+    "alternative_rejected_by": 0.55,
+    "cites": 0.55,
+    "references_bead": 0.40,
+}
+
+
+def _atom_link_depth(link_type: Optional[str]) -> int:
+    """Approximate hop depth for an atom_links edge, so linked atoms score with
+    the same proximity formula as kg_neighborhood results."""
+    prox = _ATOM_LINK_PROXIMITY.get(link_type, 0.55)
+    if prox >= 0.80:
+        return 0
+    if prox >= 0.65:
+        return 1
+    return 2
+
+
+def _resolve_graph_fused(fused: Optional[bool]) -> bool:
+    """``fused`` if given, else ``OPEN_BRAIN_GRAPH_FUSED`` (default off)."""
+    if fused is not None:
+        return bool(fused)
+    return os.environ.get("OPEN_BRAIN_GRAPH_FUSED", "").lower() == "true"
+
+
+# Seeds expanded per graph_search() call (the legacy path's top_seed_ids).
+GRAPH_TOP_SEEDS = 5
+
+
+def _graph_search_fused(
+    conn,
+    query: str,
+    user_id: str,
+    limit: int,
+    threshold: float,
+    sort_by: str,
+    thought_type: Optional[str],
+    topics: Optional[List[str]],
+    people: Optional[List[str]],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    graph_hops: int,
+    graph_weight: float,
+) -> Optional[List[Dict[str, Any]]]:
+    """graph_search() as one statement: seeds -> expansion -> fetch -> graph boost.
+
+    The seed query is search()'s own (``_hybrid_search_sql``, limit*3,
+    threshold*0.7). Both expansions run server-side from the top
+    ``GRAPH_TOP_SEEDS`` seeds — kg_neighborhood (thought nodes plus the
+    source_thought_id of non-thought nodes) and 1-hop atom_links — and each
+    reachable thought's proximity boost is computed in SQL. Every row comes
+    back flagged seed or graph-only with its ``graph_boost``.
+
+    Python then runs the passes that search() also runs after its SELECT
+    (Hebbian boost on seeds, provenance on everything, reinforcement of the
+    seeds, one replay-log row) and the legacy merge/threshold step. Top
+    seeds are picked in SQL rank order, i.e. before the Hebbian re-sort.
+
+    Returns None if the statement fails (e.g. the graph tables or
+    kg_neighborhood are missing); graph_search() then takes the legacy path.
+    """
+    query_embedding = _generate_embedding(query)
+    seed_limit = limit * 3
+    seed_threshold = threshold * 0.7
+    k_candidates = _resolve_ann_candidates(None, seed_limit)
+    seed_sql, seed_params = _hybrid_search_sql(
+        query, query_embedding, user_id, sort_by,
+        thought_type, topics, people, date_from, date_to,
+        seed_limit, k_candidates,
+    )
+    order_clause = "hybrid_score DESC" if sort_by != "time" else "created_at ASC"
+    link_depth_case = "CASE al.link_type {} ELSE {} END".format(
+        " ".join(f"WHEN '{t}' THEN {_atom_link_depth(t)}" for t in _ATOM_LINK_PROXIMITY),
+        _atom_link_depth(None),
+    )
+    extra_where = ""
+    extra_params: List[Any] = []
+    if thought_type is not None:
+        extra_where += " AND t.thought_type = %s"
+        extra_params.append(thought_type)
+    if date_from is not None:
+        extra_where += " AND t.created_at >= %s::date"
+        extra_params.append(date_from)
+    if date_to is not None:
+        extra_where += " AND t.created_at <= (%s::date + INTERVAL '1 day')"
+        extra_params.append(date_to)
+
+    t_columns = ", ".join(f"t.{c}" for c in (
+        "thought_id", "raw_text", "summary", "thought_type", "topics", "people",
+        "action_items", "source", "project", "created_at",
+        "stv_frequency", "stv_confidence",
+    ))
+    fused_sql = f"""
+        WITH seeds AS ({seed_sql}),
+        kept AS (
+            SELECT * FROM seeds WHERE vec_similarity >= %s
+        ),
+        top_seeds AS (
+            SELECT thought_id FROM kept ORDER BY {order_clause} LIMIT %s
+        ),
+        kg AS (
+            SELECT nb.node_id, nb.node_nk, nb.node_type, nb.min_depth
+            FROM brain.knowledge_graph_nodes sn
+            JOIN top_seeds ts ON sn.node_nk = 'thought:' || ts.thought_id
+            CROSS JOIN LATERAL brain.kg_neighborhood(sn.node_id, %s, %s) nb
+            WHERE sn.user_id = %s AND sn.lifecycle_status = 'active'
+        ),
+        graph_hits AS (
+            SELECT substr(kg.node_nk, 9) AS thought_id, kg.min_depth AS depth
+            FROM kg
+            WHERE kg.node_type = 'thought' AND kg.node_nk LIKE 'thought:%%'
+            UNION ALL
+            SELECT n.source_thought_id, kg.min_depth
+            FROM kg
+            JOIN brain.knowledge_graph_nodes n ON n.node_id = kg.node_id
+            WHERE kg.node_type <> 'thought'
+              AND n.source_thought_id IS NOT NULL
+              AND n.user_id = %s
+            UNION ALL
+            SELECT linked.thought_id, {link_depth_case}
+            FROM brain.atom_links al
+            CROSS JOIN LATERAL (VALUES (al.source_id), (al.target_id)) AS linked(thought_id)
+            WHERE al.user_id = %s
+              AND (al.source_id IN (SELECT thought_id FROM top_seeds)
+                   OR al.target_id IN (SELECT thought_id FROM top_seeds))
+              AND linked.thought_id NOT IN (SELECT thought_id FROM top_seeds)
+        ),
+        graph AS (
+            SELECT thought_id,
+                   MIN(depth) AS depth,
+                   GREATEST(0.0, 1.0 - MIN(depth)::float8 / (%s + 1)) * %s AS graph_boost
+            FROM graph_hits
+            GROUP BY thought_id
+        )
+        SELECT k.thought_id, k.raw_text, k.summary, k.thought_type, k.topics, k.people,
+               k.action_items, k.source, k.project, k.created_at,
+               k.stv_frequency, k.stv_confidence,
+               k.vec_similarity, k.keyword_boost, k.time_decay, k.hybrid_score,
+               g.depth AS graph_depth,
+               COALESCE(g.graph_boost, 0.0) AS graph_boost,
+               false AS graph_only,
+               EXISTS (SELECT 1 FROM brain.knowledge_graph_nodes WHERE user_id = %s) AS kg_present,
+               (SELECT COUNT(*) FROM graph) AS graph_hit_count
+        FROM kept k
+        LEFT JOIN graph g ON g.thought_id = k.thought_id
+        UNION ALL
+        SELECT {t_columns},
+               0.0, 0.0, 0.0, g.graph_boost,
+               g.depth, g.graph_boost, true, NULL, NULL
+        FROM graph g
+        JOIN {TABLE} t ON t.thought_id = g.thought_id
+        WHERE t.user_id = %s
+          AND (t.embed_model = %s OR t.embed_model IS NULL)
+          AND g.thought_id NOT IN (SELECT thought_id FROM kept){extra_where}
+    """
+    params: List[Any] = list(seed_params)
+    params += [seed_threshold, GRAPH_TOP_SEEDS, user_id, graph_hops, user_id, user_id,
+               user_id, graph_hops, graph_weight, user_id, user_id, EMBED_MODEL]
+    params += extra_params
+
+    cur = conn.cursor()
+    try:
+        if k_candidates:
+            cur.execute(
+                "SELECT set_config('hnsw.ef_search', %s, true)",
+                (str(_resolve_hnsw_ef_search(k_candidates)),),
+            )
+        cur.execute(fused_sql, params)
+        columns = [desc[0] for desc in cur.description]
+        rows = cur.fetchall()
+    except Exception as e:
+        logger.warning(f"graph_search: fused statement failed ({e}); using the multi-query path")
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        return None
+    finally:
+        cur.close()
+
+    seeds: List[Dict[str, Any]] = []
+    graph_results: List[Dict[str, Any]] = []
+    graph_depths: Dict[str, int] = {}
+    graph_boosts: Dict[str, float] = {}
+    kg_present = False
+    graph_hit_count = 0
+    for row in rows:
+        d = dict(zip(columns, row))
+        graph_only = bool(d.pop("graph_only"))
+        depth = d.pop("graph_depth")
+        boost = float(d.pop("graph_boost") or 0.0)
+        kg_present = kg_present or bool(d.pop("kg_present"))
+        graph_hit_count = max(graph_hit_count, int(d.pop("graph_hit_count") or 0))
+        if depth is not None:
+            graph_depths[d["thought_id"]] = int(depth)
+            graph_boosts[d["thought_id"]] = boost
+        _normalize_search_row(d)
+        if graph_only:
+            # Topic/people filters stay case-insensitive, as in the legacy path.
+            if topics and not any(
+                t.lower() in [x.lower() for x in d["topics"]] for t in topics
+            ):
+                continue
+            if people and not any(
+                p.lower() in [x.lower() for x in d["people"]] for p in people
+            ):
+                continue
+            d["graph_depth"] = int(depth)
+            d["graph_source"] = True
+            d["hybrid_score"] = round(
+                _apply_veracity_penalty(d["hybrid_score"], d["condition_score"]), 4
+            )
+            graph_results.append({k.upper(): v for k, v in d.items()})
+        else:
+            seeds.append({k.upper(): v for k, v in d.items()})
+
+    _apply_hebbian_boost(conn, seeds, user_id, sort_by)
+    _annotate_provenance(conn, seeds, user_id, sort_by)
+    _annotate_provenance(conn, graph_results, user_id, sort_by)
+    _reinforce_accessed(conn, [r["THOUGHT_ID"] for r in seeds], user_id)
+    emit_replay_log(
+        conn,
+        user_id=user_id,
+        event_type="search",
+        query=query,
+        result_text=(
+            f"{len(seeds)} result(s); top={seeds[0].get('summary', '')[:80]}"
+            if seeds else "0 results"
+        ),
+        metadata={
+            "result_count": len(seeds),
+            "top_thought_id": seeds[0].get("THOUGHT_ID") if seeds else None,
+            "top_similarity": seeds[0].get("SIMILARITY") if seeds else None,
+            "limit": seed_limit,
+            "threshold": seed_threshold,
+            "sort_by": sort_by,
+            "has_filters": any([thought_type, topics, people, date_from, date_to]),
+            "dedup": False,
+            "dedup_collapsed": 0,
+            "graph_fused": True,
+        },
+    )
+
+    if not seeds:
+        return seeds
+    # As in the legacy path: only no graph hit at all (counting links to atoms
+    # that are gone or filtered out) skips the final threshold.
+    if not graph_hit_count and not kg_present:
+        return seeds[:limit]
+
+    merged: List[Dict[str, Any]] = []
+    for s in seeds:
+        tid = s.get("THOUGHT_ID")
+        if tid in graph_boosts:
+            s["HYBRID_SCORE"] = round(s.get("HYBRID_SCORE", 0.0) + graph_boosts[tid], 4)
+            s["GRAPH_DEPTH"] = graph_depths[tid]
+            s["GRAPH_SOURCE"] = False
+        merged.append(s)
+    merged.extend(graph_results)
+    merged.sort(key=lambda r: r.get("HYBRID_SCORE", 0.0), reverse=True)
+
+    final: List[Dict[str, Any]] = []
+    for r in merged:
+        if r.get("GRAPH_SOURCE") or r.get("SIMILARITY", 0.0) >= threshold:
+            final.append(r)
+        if len(final) >= limit:
+            break
+    return final
+
+
 def graph_search(
     conn,
     query: str,
@@ -4009,6 +5536,7 @@ def graph_search(
     date_to: Optional[str] = None,
     graph_hops: int = 2,
     graph_weight: float = 0.15,
+    fused: Optional[bool] = None,
 ) -> List[Dict[str, Any]]:
     """Graph-augmented search: hybrid search seeds expanded via knowledge graph traversal.
 
@@ -4023,7 +5551,21 @@ def graph_search(
 
     Falls back gracefully to regular search if graph tables are empty or on any
     graph-related error.
+
+    fused (default None -> OPEN_BRAIN_GRAPH_FUSED, off): run steps 1-6 as one
+    SQL statement (``_graph_search_fused``) instead of a search() call plus
+    one query per expansion step and per neighbour. Falls through to the
+    path below if that statement fails.
     """
+    if _resolve_graph_fused(fused):
+        fused_results = _graph_search_fused(
+            conn, query, user_id, limit, threshold, sort_by,
+            thought_type, topics, people, date_from, date_to,
+            graph_hops, graph_weight,
+        )
+        if fused_results is not None:
+            return fused_results
+
     # Step 1: Get seed results from hybrid search (fetch more, with lower threshold)
     seeds = search(
         conn,
@@ -4050,7 +5592,7 @@ def graph_search(
             seed_by_id[tid] = s
 
     # Collect top seed ids once (reused by both kg_neighborhood and atom_links).
-    top_seed_ids = list(seed_by_id.keys())[:5]
+    top_seed_ids = list(seed_by_id.keys())[:GRAPH_TOP_SEEDS]
 
     # Step 2-3: Expand top seeds through the knowledge graph
     graph_thought_ids: Dict[str, int] = {}  # thought_id -> min_depth from any seed
@@ -4121,24 +5663,9 @@ def graph_search(
         # recursive atom_links traversal).  Both OUTGOING and INCOMING edges are
         # walked; linked atoms must belong to the same user_id.
         #
-        # Link-type-weighted proximity: "strong" semantic links (supersedes,
-        # derives_from, verifies) get proximity=0.85; "weak" informational links
-        # (cites, references_bead, contradicts, refutes, resolves,
-        # rationale_for, alternative_rejected_by) get proximity=0.55.  Unknown
-        # types default to 0.55.  The proximity value is multiplied by
+        # Link-type-weighted proximity (_ATOM_LINK_PROXIMITY), mapped to an
+        # approximate depth by _atom_link_depth() so it is multiplied by
         # graph_weight downstream (same formula as kg_neighborhood results).
-        _ATOM_LINK_PROXIMITY = {
-            "supersedes": 0.85,
-            "derives_from": 0.85,
-            "verifies": 0.85,
-            "refutes": 0.70,
-            "contradicts": 0.70,
-            "resolves": 0.70,
-            "rationale_for": 0.55,
-            "alternative_rejected_by": 0.55,
-            "cites": 0.55,
-            "references_bead": 0.40,
-        }
         if top_seed_ids:
             try:
                 _al_placeholders = ",".join(["%s"] * len(top_seed_ids))
@@ -4162,15 +5689,7 @@ def graph_search(
                             continue  # skip the seed itself
                         # Existence check is deferred to the batch fetch in Step 3
                         # (WHERE user_id clause filters ghost atoms).
-                        _prox = _ATOM_LINK_PROXIMITY.get(_ltype, 0.55)
-                        # Map proximity to approximate depth for the same
-                        # proximity_score formula used by kg_neighborhood results.
-                        if _prox >= 0.80:
-                            _depth_approx = 0
-                        elif _prox >= 0.65:
-                            _depth_approx = 1
-                        else:
-                            _depth_approx = 2
+                        _depth_approx = _atom_link_depth(_ltype)
                         if _linked_tid not in graph_thought_ids or _depth_approx < graph_thought_ids[_linked_tid]:
                             graph_thought_ids[_linked_tid] = _depth_approx
             except Exception as _al_exc:
@@ -4421,6 +5940,42 @@ def recent(
     return results
 
 
+def prime(
+    conn,
+    query: str,
+    user_id: str,
+    days: int = DEFAULT_RECENT_DAYS,
+    recent_limit: int = DEFAULT_RECENT_LIMIT,
+    search_limit: int = DEFAULT_SEARCH_LIMIT,
+) -> Dict[str, Any]:
+    """Session-start priming: recent() plus search(query) in one call.
+
+    context_primer used to shell ``--recent`` and then ``--search`` as two
+    processes, each paying the import, a connection and (for the search) the
+    embedder. Here both run on ``conn`` and ``query`` is embedded once.
+
+    Returns ``{"recent": [...], "search": [...]}`` with the same rows the two
+    commands print. A failing search does not lose the recent list: the
+    transaction is rolled back and the error is reported as ``search_error``
+    with an empty ``search``.
+    """
+    result: Dict[str, Any] = {
+        "recent": recent(conn, user_id=user_id, days=days, limit=recent_limit),
+        "search": [],
+    }
+    if not query.strip():
+        return result
+    try:
+        result["search"] = search(conn, query=query, user_id=user_id, limit=search_limit)
+    except Exception as e:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        result["search_error"] = str(e)
+    return result
+
+
 def stats(conn, user_id: str) -> Dict[str, Any]:
     """Get user's brain statistics."""
     cur = conn.cursor()
@@ -5658,6 +7213,19 @@ def register_skill(
 
 # ─── Formatters (human-readable CLI output) ──────────────────────────────────
 
+def _read_jsonl_items(stream) -> List[Any]:
+    """--capture-batch input: one JSON value per non-blank line."""
+    items = []
+    for lineno, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {lineno}: invalid JSON ({e.msg})")
+    return items
+
+
 def _format_capture_result(result: Dict) -> str:
     lines = [f"Captured: {result['thought_id']}"]
     lines.append(f"   Type: {result['type']}")
@@ -5953,6 +7521,7 @@ def _run_from_pi():
                 stv_f=_pi_stv_f,
                 stv_c=_pi_stv_c,
                 condition_score=args.get("condition_score"),
+                write_fast=args.get("write_fast"),
             )
             # links passthrough: list of {"target_id": str, "link_type": str}
             # or "target_id:link_type" strings (mirrors --link CLI flag).
@@ -6002,6 +7571,30 @@ def _run_from_pi():
                 if _written_links:
                     result["links"] = _written_links
             print(json.dumps(result))
+            _wake_enrich_worker(result)
+        elif op == "capture_batch":
+            # items: list of strings or {text, source?, session_id?, project?,
+            # prov_agent?, prov_activity?, was_derived_from?, stv_f?, stv_c?,
+            # condition_score?} objects; the top-level fields are defaults.
+            items = args.get("items")
+            if not isinstance(items, list):
+                print(json.dumps({"error": "items must be a list"}))
+                return
+            try:
+                results = capture_batch(
+                    conn,
+                    items,
+                    user_id=user_id,
+                    source=args.get("source", "pi"),
+                    session_id=args.get("session_id", ""),
+                    project=args.get("project", ""),
+                    write_fast=args.get("write_fast"),
+                )
+            except ValueError as e:
+                print(json.dumps({"error": str(e)}))
+                return
+            print(json.dumps(results))
+            _wake_enrich_worker(results)
         elif op == "revise":
             # NAL revision: create derived atom with fused stv.
             _rev_id_a = args.get("id_a", "")
@@ -6037,6 +7630,8 @@ def _run_from_pi():
                 date_from=args.get("date_from"),
                 date_to=args.get("date_to"),
                 dedup=args.get("dedup", False),
+                ann_candidates=args.get("ann_candidates"),
+                dedup_server=args.get("dedup_server"),
             )
             print(json.dumps(results, default=str))
         elif op == "graph_search":
@@ -6054,6 +7649,7 @@ def _run_from_pi():
                 date_to=args.get("date_to"),
                 graph_hops=args.get("graph_hops", 2),
                 graph_weight=args.get("graph_weight", 0.15),
+                fused=args.get("fused"),
             )
             print(json.dumps(results, default=str))
         elif op == "admin_stats":
@@ -6085,6 +7681,12 @@ def _run_from_pi():
                 limit=args.get("limit", DEFAULT_TIMELINE_LIMIT),
             )
             print(json.dumps(results, default=str))
+        elif op == "enrich_pending":
+            result = enrich_pending(
+                conn, user_id=user_id,
+                limit=max(1, int(args.get("limit", ENRICH_BATCH_SIZE))),
+            )
+            print(json.dumps(result))
         elif op == "recent":
             results = recent(
                 conn,
@@ -6094,6 +7696,16 @@ def _run_from_pi():
                 thought_type=args.get("thought_type"),
             )
             print(json.dumps(results, default=str))
+        elif op == "prime":
+            result = prime(
+                conn,
+                query=args.get("query", ""),
+                user_id=user_id,
+                days=args.get("days", DEFAULT_RECENT_DAYS),
+                recent_limit=args.get("limit", DEFAULT_RECENT_LIMIT),
+                search_limit=args.get("search_limit", DEFAULT_SEARCH_LIMIT),
+            )
+            print(json.dumps(result, default=str))
         elif op == "stats":
             result = stats(conn, user_id=user_id)
             print(json.dumps(result, default=str))
@@ -6201,6 +7813,14 @@ def _run_from_pi():
                 print(json.dumps({"thought_id": args.get("thought_id", ""), "result": None}))
             else:
                 print(json.dumps(time_travel.inspect_result_to_dict(result), default=str))
+        elif op == "inspect_many":
+            thought_ids = args.get("thought_ids")
+            if not isinstance(thought_ids, list) or not all(
+                isinstance(t, str) and t for t in thought_ids
+            ):
+                print(json.dumps({"error": "thought_ids must be a list of strings"}))
+                return
+            print(json.dumps(_inspect_many(conn, thought_ids, user_id), default=str))
         elif op == "promote":
             result = promote_thought(
                 conn,
@@ -6406,8 +8026,19 @@ def main():
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--init", action="store_true", help="Initialize schema")
     group.add_argument("--capture", type=str, metavar="TEXT", help="Capture a thought")
+    group.add_argument("--capture-batch", action="store_true", dest="capture_batch",
+                       help="Capture many thoughts from JSONL on stdin: one JSON string or "
+                            "object ({text, source?, session_id?, project?, stv_f?, stv_c?, ...}) "
+                            "per line; --source/--session-id/--project/--write-fast are the defaults")
     group.add_argument("--search", type=str, metavar="QUERY", help="Semantic search")
     group.add_argument("--recent", action="store_true", help="List recent thoughts")
+    group.add_argument("--prime", type=str, metavar="QUERY",
+                       help="Session priming: --recent (--days, --limit) plus a --search "
+                            "for QUERY (--search-limit) from one connection and one embedding")
+    group.add_argument("--enrich-pending", type=int, nargs="?", const=ENRICH_BATCH_SIZE,
+                       default=None, dest="enrich_pending", metavar="N",
+                       help="Run LLM metadata extraction for up to N queued write-fast "
+                            f"captures (default {ENRICH_BATCH_SIZE}).")
     group.add_argument("--stats", action="store_true", help="Show brain stats")
     group.add_argument("--timeline", type=str, metavar="TOPIC", help="Temporal evolution of a topic")
     group.add_argument("--migrate", type=str, metavar="SQL_FILE",
@@ -6432,6 +8063,9 @@ def main():
     group.add_argument("--inspect", type=str, metavar="THOUGHT_ID",
                        help="Inspect historical state of a thought "
                             "(combine with --at or --at-revision; default: latest)")
+    group.add_argument("--inspect-many", nargs="+", metavar="THOUGHT_ID", dest="inspect_many",
+                       help="Latest state of several thoughts in one lookup "
+                            "(the --inspect default path, per ID)")
     group.add_argument("--replay", action="store_true",
                        help="Show the chronological brain replay log "
                             "(combine with --session-id, --from, --to, --event-type)")
@@ -6513,6 +8147,12 @@ def main():
                         help="With --capture: the turn's persuasion-bombing condition (0.0–1.0). "
                              "Discounts the atom's confidence (V1 veracity layer). Default: "
                              "the recent same-session turn score the Stop hook recorded, else the text score.")
+    parser.add_argument("--write-fast", action=argparse.BooleanOptionalAction, default=None,
+                        dest="write_fast",
+                        help="With --capture / --capture-batch: store the atom immediately with placeholder "
+                             "metadata and queue the LLM extraction (run by the brain daemon's "
+                             "enrichment worker, or by hand with --enrich-pending). "
+                             "Default: $OPEN_BRAIN_WRITE_FAST, else off.")
     parser.add_argument("--text", type=str, default=None, dest="revise_text",
                         metavar="TEXT",
                         help="With --revise: override the derived atom's text. "
@@ -6558,8 +8198,20 @@ def main():
                              "atoms (pairwise cosine >= DEDUP_COSINE) into their "
                              "highest-ranked survivor. --no-dedup is the (default) "
                              "byte-stable pre-T3 behavior.")
+    parser.add_argument("--dedup-server", action=argparse.BooleanOptionalAction, default=None,
+                        dest="dedup_server",
+                        help="With --dedup, compute the near-duplicate pairs inside Postgres "
+                             "and return neighbour ids instead of embeddings. Default: "
+                             "$OPEN_BRAIN_DEDUP_SERVER, else off.")
+    parser.add_argument("--ann-candidates", type=int, default=None, dest="ann_candidates",
+                        metavar="K",
+                        help="Two-stage --search: prefetch the K nearest atoms via the HNSW "
+                             "index, then hybrid-score only those. 0 disables. Default: "
+                             "$OPEN_BRAIN_ANN_CANDIDATES, else off (full-scan scoring).")
     parser.add_argument("--days", type=int, default=DEFAULT_RECENT_DAYS)
     parser.add_argument("--limit", type=int, default=DEFAULT_RECENT_LIMIT)
+    parser.add_argument("--search-limit", type=int, default=DEFAULT_SEARCH_LIMIT,
+                        dest="search_limit", help="--prime: number of QUERY matches")
     parser.add_argument("--type", type=str, dest="thought_type",
                         help="Filter by type: decision|insight|person_note|meeting|idea|task|reflection|preference|impression|pattern|working_memory|sentinel_event|sentinel_relevant")
     parser.add_argument("--source", type=str, default="manual")
@@ -6667,6 +8319,7 @@ def main():
                 stv_f=_cli_stv_f,
                 stv_c=_cli_stv_c,
                 condition_score=args.condition_score,
+                write_fast=args.write_fast,
             )
 
             # Write the validated links AFTER capture commits. Each row
@@ -6709,11 +8362,40 @@ def main():
                         f"   Link: {lr['link_type']} -> {lr['target_id']} "
                         f"(link_id={lr['link_id']})"
                     )
+            _wake_enrich_worker(result)
+
+        elif args.capture_batch:
+            try:
+                items = _read_jsonl_items(sys.stdin)
+                results = capture_batch(
+                    conn,
+                    items,
+                    user_id=user_id,
+                    source=args.source,
+                    session_id=args.session_id,
+                    project=args.project,
+                    write_fast=args.write_fast,
+                )
+            except ValueError as e:
+                if args.json:
+                    print(json.dumps({"error": str(e)}))
+                else:
+                    print(f"Error: {e}", file=sys.stderr)
+                sys.exit(2)
+            if args.json:
+                print(json.dumps(results))
+            else:
+                print(f"Captured {len(results)} thought(s)")
+                for result in results:
+                    print(_format_capture_result(result))
+            _wake_enrich_worker(results)
 
         elif args.search:
             results = search(
                 conn, query=args.search, user_id=user_id, limit=args.limit,
                 sort_by=args.sort, dedup=args.dedup,
+                ann_candidates=args.ann_candidates,
+                dedup_server=args.dedup_server,
             )
             if args.json:
                 print(json.dumps(results, default=str))
@@ -6744,6 +8426,35 @@ def main():
             else:
                 print(_format_recent_results(results))
 
+        elif args.prime is not None:
+            result = prime(
+                conn,
+                query=args.prime,
+                user_id=user_id,
+                days=args.days,
+                recent_limit=args.limit,
+                search_limit=args.search_limit,
+            )
+            if args.json:
+                print(json.dumps(result, default=str))
+            else:
+                print(_format_recent_results(result["recent"]))
+                print()
+                if "search_error" in result:
+                    print(f"Search failed: {result['search_error']}")
+                else:
+                    print(_format_search_results(result["search"]))
+
+        elif args.enrich_pending is not None:
+            result = enrich_pending(conn, user_id=user_id, limit=max(1, args.enrich_pending))
+            if args.json:
+                print(json.dumps(result))
+            else:
+                print(
+                    f"Enrichment: {result['enriched']} enriched, {result['retrying']} "
+                    f"retrying, {result['failed']} failed ({result['claimed']} claimed)"
+                )
+
         elif args.stats:
             result = stats(conn, user_id=user_id)
             if args.json:
@@ -7045,6 +8756,20 @@ def main():
                     if result.summary:
                         print(f"  summary: {result.summary[:100]}")
 
+        elif args.inspect_many:
+            results = _inspect_many(conn, args.inspect_many, user_id)
+            if args.json:
+                print(json.dumps(results, indent=2, default=str))
+            else:
+                for thought_id, d in results.items():
+                    if d.get("error"):
+                        print(f"✗ {thought_id}: {d['error']}")
+                    else:
+                        print(
+                            f"● {thought_id} revision={d['revision']} source={d['source']} "
+                            f"({d['prov_activity']}, {d['created_at']})"
+                        )
+
         elif args.replay:
             # brain-W2-S7: replay-log dispatcher. Read-only over brain.replay_log.
             rows = query_replay_log(
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""ABOUTME: Small thread-safe Postgres connection pool for long-lived, in-process callers.
+ABOUTME: Health-checks idle connections, recycles stale ones, and reconnects transparently.
+
+A fresh ``psycopg2.connect`` to a cloud Postgres costs a TCP + TLS handshake
+(and on Neon, sometimes a compute wake-up) — often more than the query. A
+process that serves many operations (brain_daemon.py, pg_sync's service
+loop) should pay that once. One-shot CLI invocations keep using
+``open_brain._connect()`` directly; a pool buys them nothing.
+
+Checkout policy (LIFO, so the warmest connection is reused and the rest age out):
+
+  * closed, or idle longer than ``max_idle_s``, or older than
+    ``max_lifetime_s``                   -> closed and replaced
+  * idle longer than ``check_after_s``   -> ``SELECT 1`` first; a failure
+                                            replaces it
+  * otherwise                            -> handed out as-is
+
+Check-in always issues ``rollback()`` (the CLI closes without commit, so an
+op's uncommitted work is discarded either way) — also after an ordinary
+query error, which leaves the connection perfectly reusable. A connection
+that raised a disconnect error, or whose rollback fails, is closed instead.
+
+Transparent reconnect: :meth:`ConnectionPool.run` re-runs ``fn`` once on a
+fresh connection when the first attempt died with a connection-level error
+(OperationalError / InterfaceError, or the connection reports closed). Only
+pass ``retry=True`` for idempotent work — a write whose COMMIT was sent but
+not acknowledged could otherwise be applied twice.
+
+pgbouncer / Neon-pooler compatible: nothing here relies on session state.
+The health check is a plain ``SELECT 1``, reset is ``rollback()`` (never
+``DISCARD ALL``), and open_brain's only setting (hnsw.ef_search) is applied
+transaction-locally with ``set_config(..., true)``. The pool can therefore sit
+in front of a transaction-mode pooler — see open_brain's OPEN_BRAIN_POOLER_URL.
+
+Stdlib-only; psycopg2 is only touched through the ``connect_fn`` you pass in.
+"""
+import contextlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_SIZE = 4
+DEFAULT_MAX_IDLE_S = 300.0       # Neon's pooler drops idle clients after ~5 min
+DEFAULT_MAX_LIFETIME_S = 3600.0  # recycle even busy connections hourly
+DEFAULT_CHECK_AFTER_S = 30.0     # skip the SELECT 1 round trip for just-used connections
+
+_DISCONNECT_ERRORS = ("OperationalError", "InterfaceError")
+
+
+def is_disconnect(exc: BaseException, conn: Any = None) -> bool:
+    """True if ``exc`` means the connection itself is gone (vs. a query error)."""
+    if conn is not None and getattr(conn, "closed", 0):
+        return True
+    return any(cls.__name__ in _DISCONNECT_ERRORS for cls in type(exc).__mro__)
+
+
+class _Slot:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn: Any, now: float):
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """Bounded pool of DB-API connections produced by ``connect_fn``.
+
+    At most ``max_size`` connections are checked out at once; further
+    callers block (up to ``acquire_timeout_s``, then TimeoutError).
+    """
+
+    def __init__(
+        self,
+        connect_fn: Callable[[], Any],
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_idle_s: float = DEFAULT_MAX_IDLE_S,
+        max_lifetime_s: float = DEFAULT_MAX_LIFETIME_S,
+        check_after_s: float = DEFAULT_CHECK_AFTER_S,
+        acquire_timeout_s: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._connect = connect_fn
+        self.max_size = max(1, int(max_size))
+        self.max_idle_s = max_idle_s
+        self.max_lifetime_s = max_lifetime_s
+        self.check_after_s = check_after_s
+        self.acquire_timeout_s = acquire_timeout_s
+        self._clock = clock
+        self._idle: List[_Slot] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._stats: Dict[str, int] = {"opened": 0, "reused": 0, "recycled": 0, "failed_checks": 0}
+
+    # ─── checkout / checkin ──────────────────────────────────────────────────
+
+    def _checkout(self) -> _Slot:
+        while True:
+            with self._lock:
+                slot = self._idle.pop() if self._idle else None
+            if slot is None:
+                conn = self._connect()
+                with self._lock:
+                    self._stats["opened"] += 1
+                return _Slot(conn, self._clock())
+            now = self._clock()
+            if (getattr(slot.conn, "closed", 0)
+                    or now - slot.last_used > self.max_idle_s
+                    or now - slot.created_at > self.max_lifetime_s):
+                self._close(slot, "recycled")
+                continue
+            if now - slot.last_used > self.check_after_s and not self._healthy(slot.conn):
+                self._close(slot, "failed_checks")
+                continue
+            with self._lock:
+                self._stats["reused"] += 1
+            return slot
+
+    @staticmethod
+    def _healthy(conn: Any) -> bool:
+        try:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT 1")
+                cur.fetchone()
+            finally:
+                cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _checkin(self, slot: _Slot) -> None:
+        try:
+            slot.conn.rollback()
+        except Exception:
+            self._close(slot, None)
+            return
+        slot.last_used = self._clock()
+        with self._lock:
+            self._idle.append(slot)
+
+    def _close(self, slot: _Slot, stat: Optional[str]) -> None:
+        if stat:
+            with self._lock:
+                self._stats[stat] += 1
+        try:
+            slot.conn.close()
+        except Exception:
+            pass
+
+    # ─── public API ──────────────────────────────────────────────────────────
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Check a connection out for the duration of the ``with`` block."""
+        if self.acquire_timeout_s is None:
+            self._slots.acquire()
+        elif not self._slots.acquire(timeout=self.acquire_timeout_s):
+            raise TimeoutError(f"no pooled connection free within {self.acquire_timeout_s}s")
+        try:
+            slot = self._checkout()
+            try:
+                yield slot.conn
+            except BaseException as e:
+                if isinstance(e, Exception) and not is_disconnect(e, slot.conn):
+                    self._checkin(slot)
+                else:
+                    self._close(slot, None)
+                raise
+            self._checkin(slot)
+        finally:
+            self._slots.release()
+
+    def run(self, fn: Callable[[Any], Any], retry: bool = False) -> Any:
+        """``fn(conn)`` on a pooled connection; with ``retry``, once more after a disconnect."""
+        try:
+            with self.connection() as conn:
+                return fn(conn)
+        except Exception as e:
+            if not retry or not is_disconnect(e):
+                raise
+        with self.connection() as conn:
+            return fn(conn)
+
+    def prime(self, count: int = 1) -> None:
+        """Open up to ``count`` connections now so the first callers skip the handshake."""
+        slots = [self._checkout() for _ in range(min(count, self.max_size))]
+        for slot in slots:
+            self._checkin(slot)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, idle=len(self._idle))
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for slot in idle:
+            self._close(slot, None)
+
+
+def parse_pool_env(environ, prefix: str = "OPEN_BRAIN_POOL") -> Tuple[int, float, float]:
+    """(max_size, max_idle_s, max_lifetime_s) from ``<prefix>_SIZE/_MAX_IDLE_S/_MAX_LIFETIME_S``."""
+    def _num(name, default, cast):
+        try:
+            return cast(environ.get(f"{prefix}_{name}", default))
+        except (TypeError, ValueError):
+            return default
+    return (
+        _num("SIZE", DEFAULT_MAX_SIZE, int),
+        _num("MAX_IDLE_S", DEFAULT_MAX_IDLE_S, float),
+        _num("MAX_LIFETIME_S", DEFAULT_MAX_LIFETIME_S, float),
+    )
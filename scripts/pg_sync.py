@@ -22,11 +22,17 @@ import json
 import time
 import logging
 import argparse
+import fnmatch
 import signal
 import hashlib
+import io
+import select
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass, asdict, field
 
 logger = logging.getLogger("pg_sync")
@@ -34,10 +40,16 @@ logger = logging.getLogger("pg_sync")
 
 @dataclass
 class SyncState:
-    """Tracks sync position across runs for each project"""
+    """Tracks sync position across runs for each project.
+
+    Shared by the concurrent drain workers: every read, update and save
+    holds ``_lock``, and save() replaces the file atomically so a crash
+    mid-write never leaves a truncated checkpoint behind.
+    """
     projects: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     last_sync_time: str = ""
     total_synced: int = 0
+    _lock: Any = field(default_factory=threading.RLock, repr=False, compare=False)
 
     @classmethod
     def load(cls, state_file: Path) -> "SyncState":
@@ -57,29 +69,34 @@ class SyncState:
     def save(self, state_file: Path) -> None:
         try:
             state_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(state_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "projects": self.projects,
-                    "last_sync_time": self.last_sync_time,
-                    "total_synced": self.total_synced
-                }, f, indent=2)
+            tmp_file = state_file.with_name(state_file.name + ".tmp")
+            with self._lock:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        "projects": self.projects,
+                        "last_sync_time": self.last_sync_time,
+                        "total_synced": self.total_synced
+                    }, f, indent=2)
+                os.replace(tmp_file, state_file)
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
 
     def get_project_position(self, project_path: str) -> tuple:
-        proj = self.projects.get(project_path, {})
-        return proj.get("last_file", ""), proj.get("last_position", 0)
+        with self._lock:
+            proj = self.projects.get(project_path, {})
+            return proj.get("last_file", ""), proj.get("last_position", 0)
 
     def update_project(self, project_path: str, file: str, position: int, count: int) -> None:
-        if project_path not in self.projects:
-            self.projects[project_path] = {}
-        self.projects[project_path].update({
-            "last_file": file,
-            "last_position": position,
-            "last_sync": datetime.now(timezone.utc).isoformat()
-        })
-        self.last_sync_time = datetime.now(timezone.utc).isoformat()
-        self.total_synced += count
+        with self._lock:
+            if project_path not in self.projects:
+                self.projects[project_path] = {}
+            self.projects[project_path].update({
+                "last_file": file,
+                "last_position": position,
+                "last_sync": datetime.now(timezone.utc).isoformat()
+            })
+            self.last_sync_time = datetime.now(timezone.utc).isoformat()
+            self.total_synced += count
 
 
 class ProjectScanner:
@@ -110,23 +127,34 @@ class ProjectScanner:
         return projects
 
 
+LOG_FILE_PATTERNS = ("agent-activity-*.log", "beads-events-*.log")
+
+
+def resolve_logs_dir(project_path: Path) -> Path:
+    """The directory LogTailer reads: the project itself for direct logs, else .claude/logs."""
+    direct_logs = project_path / f"agent-activity-{datetime.now().strftime('%Y-%m-%d')}.log"
+    if direct_logs.exists() or list(project_path.glob("agent-activity-*.log")):
+        return project_path
+    return project_path / ".claude" / "logs"
+
+
+def is_sync_log(name: str) -> bool:
+    return fnmatch.fnmatch(name, LOG_FILE_PATTERNS[0]) or fnmatch.fnmatch(name, LOG_FILE_PATTERNS[1])
+
+
 class LogTailer:
     """Reads new entries from a project's log files"""
 
     def __init__(self, project_path: Path, state: SyncState):
         self.project_path = project_path
-        direct_logs = project_path / f"agent-activity-{datetime.now().strftime('%Y-%m-%d')}.log"
-        if direct_logs.exists() or list(project_path.glob("agent-activity-*.log")):
-            self.logs_dir = project_path
-        else:
-            self.logs_dir = project_path / ".claude" / "logs"
+        self.logs_dir = resolve_logs_dir(project_path)
         self.state = state
         self._current_file: Optional[Path] = None
         self._current_position: int = 0
 
     def get_all_log_files(self) -> List[Path]:
-        files = list(self.logs_dir.glob("agent-activity-*.log"))
-        files.extend(self.logs_dir.glob("beads-events-*.log"))
+        files = list(self.logs_dir.glob(LOG_FILE_PATTERNS[0]))
+        files.extend(self.logs_dir.glob(LOG_FILE_PATTERNS[1]))
 
         def extract_date(f: Path) -> str:
             name = f.stem
@@ -209,13 +237,213 @@ class LogTailer:
         )
 
 
+class PollingWatcher:
+    """Portable change detection: stats only the watched projects' log files.
+
+    Far cheaper than a rescan — no walk of the scan paths, just one small
+    directory listing per known project every ``poll_interval`` seconds.
+    """
+
+    def __init__(self, poll_interval: float = 2.0):
+        self.poll_interval = poll_interval
+        self._dirs: Dict[Path, Path] = {}
+        self._snapshot: Dict[Path, Tuple[int, int]] = {}
+
+    def watch(self, project_path: Path) -> None:
+        logs_dir = resolve_logs_dir(project_path)
+        if logs_dir not in self._dirs:
+            self._dirs[logs_dir] = project_path
+            self._snapshot.update(self._stat_dir(logs_dir))
+
+    @staticmethod
+    def _stat_dir(logs_dir: Path) -> Dict[Path, Tuple[int, int]]:
+        stats = {}
+        try:
+            for f in logs_dir.iterdir():
+                if is_sync_log(f.name):
+                    st = f.stat()
+                    stats[f] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass
+        return stats
+
+    def _changed(self) -> Set[Path]:
+        changed = set()
+        for logs_dir, project_path in self._dirs.items():
+            for f, sig in self._stat_dir(logs_dir).items():
+                if self._snapshot.get(f) != sig:
+                    self._snapshot[f] = sig
+                    changed.add(project_path)
+        return changed
+
+    def wait(self, timeout: float) -> Set[Path]:
+        """Projects whose log files changed, returning as soon as any did (or after ``timeout``)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            time.sleep(max(0.0, min(self.poll_interval, deadline - time.monotonic())))
+            changed = self._changed()
+            if changed or time.monotonic() >= deadline:
+                return changed
+
+    def close(self) -> None:
+        self._dirs.clear()
+
+
+class InotifyWatcher:
+    """Linux inotify on each project's logs directory (via libc, no extra dependency).
+
+    A watch is per directory, so a new day's log file is seen as soon as the
+    hook creates it. Raises OSError from __init__ where inotify is missing.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_IGNORED = 0x00008000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, debounce: float = 0.5):
+        import ctypes
+        import ctypes.util
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is Linux-only")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.debounce = debounce
+        self._dirs: Dict[Path, Path] = {}
+        self._wds: Dict[int, Path] = {}
+
+    def watch(self, project_path: Path) -> None:
+        import ctypes
+        logs_dir = resolve_logs_dir(project_path)
+        if logs_dir in self._dirs:
+            return
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(logs_dir)), mask)
+        if wd < 0:
+            logger.warning(f"inotify watch failed for {logs_dir}: {os.strerror(ctypes.get_errno())}")
+            return
+        self._dirs[logs_dir] = project_path
+        self._wds[wd] = project_path
+
+    def _drain(self, changed: Set[Path]) -> None:
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + self._EVENT.size <= len(data):
+            wd, mask, _cookie, name_len = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = data[offset:offset + name_len].rstrip(b"\0").decode("utf-8", "replace")
+            offset += name_len
+            if mask & self.IN_IGNORED:
+                project_path = self._wds.pop(wd, None)
+                self._dirs = {d: p for d, p in self._dirs.items() if p != project_path}
+            elif wd in self._wds and is_sync_log(name):
+                changed.add(self._wds[wd])
+
+    def wait(self, timeout: float) -> Set[Path]:
+        """Block until a watched log changes (or ``timeout``), then gather ``debounce`` more seconds of events."""
+        changed: Set[Path] = set()
+        deadline = time.monotonic() + timeout
+        while not changed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return changed
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if ready:
+                self._drain(changed)
+        # Hooks append line by line; coalesce a burst into one sync pass.
+        settle = time.monotonic() + self.debounce
+        while True:
+            remaining = settle - time.monotonic()
+            if remaining <= 0:
+                return changed
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if ready:
+                self._drain(changed)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+WATCH_MODES = ("auto", "inotify", "poll", "off")
+
+
+def make_watcher(mode: str, poll_interval: float = 2.0):
+    """Watcher for ``mode``; "auto" prefers inotify and falls back to polling. None for "off"."""
+    if mode not in WATCH_MODES:
+        raise ValueError(f"watch must be one of {', '.join(WATCH_MODES)}")
+    if mode == "off":
+        return None
+    if mode in ("auto", "inotify"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as e:
+            if mode == "inotify":
+                raise
+            logger.info(f"inotify unavailable ({e}); polling log files instead")
+    return PollingWatcher(poll_interval)
+
+
+RAW_EVENTS_TABLE = "landing.raw_events"
+RAW_EVENT_COLUMNS = (
+    "event_id", "tenant_id", "source_system", "event_type", "event_at",
+    "actor_id", "actor_type", "subject_id", "subject_type",
+    "metadata", "event_nk_hash",
+)
+STAGE_TABLE = "pg_sync_stage"
+
+# write_mode: "auto" COPYs batches of at least copy_threshold rows and sends
+# smaller ones as multi-row INSERTs; "copy" / "values" force one path;
+# "row" is the original one-INSERT-per-event loop.
+WRITE_MODES = ("auto", "copy", "values", "row")
+DEFAULT_COPY_THRESHOLD = 500
+DEFAULT_PAGE_SIZE = 500
+
+# Concurrent drain (sync.workers / sync.max_batches_per_pass).
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_BATCHES_PER_PASS = 50
+DEFAULT_RESCAN_INTERVAL = 300
+
+
+def _copy_field(value: Any) -> str:
+    """One field in COPY text format: \\N for NULL, backslash-escaped otherwise."""
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def _copy_line(row: tuple) -> str:
+    return "\t".join(_copy_field(v) for v in row) + "\n"
+
+
 class PostgresWriter:
     """Handles PostgreSQL connection and batch writes to landing.raw_events"""
 
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, write_mode: str = "auto",
+                 copy_threshold: int = DEFAULT_COPY_THRESHOLD,
+                 page_size: int = DEFAULT_PAGE_SIZE):
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f"write_mode must be one of {', '.join(WRITE_MODES)}")
         self.database_url = database_url
+        self.write_mode = write_mode
+        self.copy_threshold = max(1, int(copy_threshold))
+        self.page_size = max(1, int(page_size))
         self._conn = None
 
+    def clone(self) -> "PostgresWriter":
+        """A writer with the same settings and its own (not yet opened) connection."""
+        return PostgresWriter(self.database_url, write_mode=self.write_mode,
+                              copy_threshold=self.copy_threshold, page_size=self.page_size)
+
     def connect(self) -> None:
         if self._conn is not None:
             return
@@ -316,24 +544,17 @@ class PostgresWriter:
             return 0
 
         self.connect()
+        rows = [self._transform_entry(entry) for entry in entries]
         cursor = self._conn.cursor()
 
-        insert_sql = """
-            INSERT INTO landing.raw_events (
-                event_id, tenant_id, source_system, event_type, event_at,
-                actor_id, actor_type, subject_id, subject_type,
-                metadata, event_nk_hash
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s)
-            ON CONFLICT (event_id) DO NOTHING
-        """
-
         try:
-            inserted = 0
-            for entry in entries:
-                row = self._transform_entry(entry)
-                cursor.execute(insert_sql, row)
-                inserted += cursor.rowcount
+            if self.write_mode == "row":
+                inserted = self._insert_rows(cursor, rows)
+            elif self.write_mode == "copy" or (
+                    self.write_mode == "auto" and len(rows) >= self.copy_threshold):
+                inserted = self._insert_bulk(cursor, rows)
+            else:
+                inserted = self._insert_values(cursor, rows)
             self._conn.commit()
             logger.info(f"Inserted {inserted} events into landing.raw_events")
             return inserted
@@ -344,6 +565,70 @@ class PostgresWriter:
         finally:
             cursor.close()
 
+    def _insert_rows(self, cursor, rows: List[tuple]) -> int:
+        """Legacy path: one INSERT round trip per event."""
+        insert_sql = f"""
+            INSERT INTO {RAW_EVENTS_TABLE} ({", ".join(RAW_EVENT_COLUMNS)})
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s)
+            ON CONFLICT (event_id) DO NOTHING
+        """
+        inserted = 0
+        for row in rows:
+            cursor.execute(insert_sql, row)
+            inserted += cursor.rowcount
+        return inserted
+
+    def _insert_values(self, cursor, rows: List[tuple]) -> int:
+        """Multi-row INSERT, ``page_size`` rows per statement.
+
+        ``RETURNING 1`` is fetched because execute_values' rowcount only
+        reflects the last page; rows skipped by ON CONFLICT return nothing.
+        """
+        from psycopg2.extras import execute_values
+        returned = execute_values(
+            cursor,
+            f"INSERT INTO {RAW_EVENTS_TABLE} ({', '.join(RAW_EVENT_COLUMNS)}) VALUES %s "
+            f"ON CONFLICT (event_id) DO NOTHING RETURNING 1",
+            rows,
+            template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s)",
+            page_size=self.page_size,
+            fetch=True,
+        )
+        return len(returned)
+
+    def _insert_bulk(self, cursor, rows: List[tuple]) -> int:
+        """COPY into a session temp table, then one set-based INSERT ... SELECT.
+
+        The stage table copies the target's column types (so COPY parses
+        event_at / metadata exactly as the INSERT would) but none of its
+        constraints or defaults, and ON COMMIT DELETE ROWS empties it per
+        batch. COPY runs under a savepoint: if it is refused (no TEMP
+        privilege, a proxy without COPY support) the transaction is rewound
+        and the batch goes through execute_values instead.
+        """
+        columns = ", ".join(RAW_EVENT_COLUMNS)
+        cursor.execute("SAVEPOINT pg_sync_copy")
+        try:
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {STAGE_TABLE} ON COMMIT DELETE ROWS AS "
+                f"SELECT {columns} FROM {RAW_EVENTS_TABLE} WITH NO DATA"
+            )
+            cursor.copy_expert(
+                f"COPY {STAGE_TABLE} ({columns}) FROM STDIN",
+                io.StringIO("".join(_copy_line(row) for row in rows)),
+            )
+        except Exception as e:
+            logger.warning(f"COPY ingestion unavailable, falling back to execute_values: {e}")
+            cursor.execute("ROLLBACK TO SAVEPOINT pg_sync_copy")
+            return self._insert_values(cursor, rows)
+        cursor.execute("RELEASE SAVEPOINT pg_sync_copy")
+        cursor.execute(
+            f"INSERT INTO {RAW_EVENTS_TABLE} ({columns}) "
+            f"SELECT {columns} FROM {STAGE_TABLE} "
+            f"ON CONFLICT (event_id) DO NOTHING"
+        )
+        return cursor.rowcount
+
     def close(self) -> None:
         if self._conn:
             self._conn.close()
@@ -373,12 +658,30 @@ class SyncService:
         self.writer: Optional[PostgresWriter] = None
         self.dry_run = False
         self._running = True
+        # Writers (one connection each) lent to drain workers; self.writer is
+        # always the first, extra ones are clones opened on demand.
+        self._writer_lock = threading.Lock()
+        self._idle_writers: List[PostgresWriter] = []
+        self._all_writers: List[PostgresWriter] = []
+        # Projects still behind after a pass (hit max_batches_per_pass);
+        # run_continuous starts the next pass without sleeping.
+        self._backlogged: set = set()
+        # Projects whose last batch exhausted its retries in the latest pass.
+        self._failed: set = set()
 
         pg_config = self.config.get("destinations", {}).get("postgresql", {})
         if pg_config.get("enabled", False):
             db_url = pg_config.get("connection_string") or os.environ.get("DATABASE_URL", "")
             if db_url:
-                self.writer = PostgresWriter(db_url)
+                sync_config = pg_config.get("sync", {})
+                self.writer = PostgresWriter(
+                    db_url,
+                    write_mode=sync_config.get("write_mode", "auto"),
+                    copy_threshold=sync_config.get("copy_threshold", DEFAULT_COPY_THRESHOLD),
+                    page_size=sync_config.get("page_size", DEFAULT_PAGE_SIZE),
+                )
+                self._idle_writers.append(self.writer)
+                self._all_writers.append(self.writer)
 
     def _load_config(self, config_path: Optional[Path]) -> Dict[str, Any]:
         if config_path is None:
@@ -388,7 +691,8 @@ class SyncService:
         with open(config_path, 'r', encoding='utf-8') as f:
             return json.load(f)
 
-    def run_once(self) -> int:
+    def run_once(self, projects: Optional[List[Path]] = None) -> int:
+        """One sync pass over ``projects`` (default: a fresh scan of the scan paths)."""
         pg_config = self.config.get("destinations", {}).get("postgresql", {})
         if not pg_config.get("enabled", False):
             logger.info("PostgreSQL sync is disabled in configuration")
@@ -398,54 +702,110 @@ class SyncService:
             logger.error("postgresql enabled but no connection string resolvable")
             return 0
 
-        projects = self.scanner.find_projects_with_logs()
-        logger.info(f"Found {len(projects)} project(s) with logs")
+        if projects is None:
+            projects = self.scanner.find_projects_with_logs()
+            logger.info(f"Found {len(projects)} project(s) with logs")
+        # Deduplicated: two workers must never drain the same project.
+        projects = list(dict.fromkeys(projects))
         if not projects:
             return 0
 
-        total_synced = 0
-        batch_size = pg_config.get("sync", {}).get("batch_size", 100)
-
-        for project_path in projects:
-            if not self._running:
-                break
+        sync_config = pg_config.get("sync", {})
+        workers = max(1, int(sync_config.get("workers", DEFAULT_WORKERS)))
+        self._backlogged = set()
+        self._failed = set()
+
+        if workers == 1 or len(projects) == 1:
+            return sum(self._drain_project(p, sync_config) for p in projects if self._running)
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(projects)),
+                                thread_name_prefix="pg_sync") as pool:
+            futures = [pool.submit(self._drain_project, p, sync_config) for p in projects]
+            return sum(f.result() for f in futures)
+
+    def _acquire_writer(self) -> PostgresWriter:
+        with self._writer_lock:
+            if self._idle_writers:
+                return self._idle_writers.pop()
+            writer = self.writer.clone()
+            self._all_writers.append(writer)
+            return writer
+
+    def _release_writer(self, writer: PostgresWriter) -> None:
+        with self._writer_lock:
+            self._idle_writers.append(writer)
+
+    def _drain_project(self, project_path: Path, sync_config: Dict[str, Any]) -> int:
+        """Write one project's backlog batch by batch until it is caught up.
+
+        Runs on a worker thread with a writer of its own. Each project is
+        drained by exactly one worker per pass, so its checkpoint only ever
+        moves forward; the checkpoint is saved after every committed batch.
+        Backpressure: at most ``max_batches_per_pass`` batches per pass (0 =
+        no cap; a capped project is picked up again immediately), and a batch
+        that exhausts its retries stops the drain until the next interval.
+        """
+        batch_size = sync_config.get("batch_size", 100)
+        max_batches = sync_config.get("max_batches_per_pass", DEFAULT_MAX_BATCHES_PER_PASS)
+        synced = 0
+        batches = 0
+        writer = self._acquire_writer()
+        try:
+            while self._running:
+                if max_batches and batches >= max_batches:
+                    logger.info(f"[{project_path.name}] Batch cap reached, resuming next pass")
+                    self._backlogged.add(project_path)
+                    break
 
-            tailer = LogTailer(project_path, self.state)
-            entries = tailer.read_new_entries(limit=batch_size)
-            if not entries:
-                continue
+                tailer = LogTailer(project_path, self.state)
+                entries = tailer.read_new_entries(limit=batch_size)
+                if not entries:
+                    break
+                batches += 1
 
-            logger.info(f"[{project_path.name}] Found {len(entries)} new entries")
+                logger.info(f"[{project_path.name}] Found {len(entries)} new entries")
 
-            if self.dry_run:
-                for entry in entries[:3]:
-                    logger.info(f"  - {entry.get('operation')}: {entry.get('prompt', '')[:50]}")
-                if len(entries) > 3:
-                    logger.info(f"  ... and {len(entries) - 3} more")
-                continue
+                if self.dry_run:
+                    for entry in entries[:3]:
+                        logger.info(f"  - {entry.get('operation')}: {entry.get('prompt', '')[:50]}")
+                    if len(entries) > 3:
+                        logger.info(f"  ... and {len(entries) - 3} more")
+                    break
 
-            retry_config = pg_config.get("sync", {})
-            retry_attempts = retry_config.get("retry_attempts", 3)
-            retry_delay = retry_config.get("retry_delay_seconds", 5)
-
-            for attempt in range(retry_attempts):
-                try:
-                    count = self.writer.write_batch(entries)
-                    file_path, position = tailer.get_position()
-                    self.state.update_project(str(project_path), file_path, position, count)
-                    self.state.save(self.state_file)
-                    total_synced += count
+                count = self._write_with_retry(writer, project_path, entries, sync_config)
+                if count is None:
+                    self._failed.add(project_path)
                     break
-                except Exception as e:
-                    logger.warning(f"[{project_path.name}] Sync attempt {attempt + 1} failed: {e}")
-                    if attempt < retry_attempts - 1:
-                        time.sleep(retry_delay)
-                        if self.writer:
-                            self.writer.close()
-                    else:
-                        logger.error(f"[{project_path.name}] All retry attempts exhausted")
+                file_path, position = tailer.get_position()
+                self.state.update_project(str(project_path), file_path, position, count)
+                self.state.save(self.state_file)
+                synced += count
 
-        return total_synced
+                if len(entries) < batch_size:
+                    break  # caught up
+        except Exception as e:
+            logger.error(f"[{project_path.name}] Drain failed: {e}")
+        finally:
+            self._release_writer(writer)
+        return synced
+
+    def _write_with_retry(self, writer: PostgresWriter, project_path: Path,
+                          entries: List[Dict[str, Any]], sync_config: Dict[str, Any]) -> Optional[int]:
+        """Inserted count, or None once every retry attempt has failed."""
+        retry_attempts = sync_config.get("retry_attempts", 3)
+        retry_delay = sync_config.get("retry_delay_seconds", 5)
+
+        for attempt in range(retry_attempts):
+            try:
+                return writer.write_batch(entries)
+            except Exception as e:
+                logger.warning(f"[{project_path.name}] Sync attempt {attempt + 1} failed: {e}")
+                if attempt < retry_attempts - 1:
+                    time.sleep(retry_delay)
+                    writer.close()
+                else:
+                    logger.error(f"[{project_path.name}] All retry attempts exhausted")
+        return None
 
     def run_continuous(self) -> None:
         pg_config = self.config.get("destinations", {}).get("postgresql", {})
@@ -453,14 +813,27 @@ class SyncService:
             logger.error("PostgreSQL sync is disabled. Enable it in auto-logger-config.json")
             return
 
-        flush_interval = pg_config.get("sync", {}).get("flush_interval_seconds", 60)
-        logger.info(f"Starting continuous sync (interval: {flush_interval}s)")
+        sync_config = pg_config.get("sync", {})
+        flush_interval = sync_config.get("flush_interval_seconds", 60)
+        watcher = make_watcher(sync_config.get("watch", "auto"),
+                               sync_config.get("poll_interval_seconds", 2))
+        logger.info(f"Starting continuous sync (interval: {flush_interval}s, "
+                    f"watcher: {type(watcher).__name__ if watcher else 'off'})")
         logger.info(f"Scanning: {[str(p) for p in self.scan_paths]}")
         logger.info("Press Ctrl+C to stop")
 
         signal.signal(signal.SIGINT, self._handle_signal)
         signal.signal(signal.SIGTERM, self._handle_signal)
 
+        if watcher is not None:
+            try:
+                self._run_watching(watcher, flush_interval,
+                                   sync_config.get("rescan_interval_seconds", DEFAULT_RESCAN_INTERVAL))
+            finally:
+                watcher.close()
+            self.shutdown()
+            return
+
         while self._running:
             try:
                 synced = self.run_once()
@@ -469,6 +842,9 @@ class SyncService:
             except Exception as e:
                 logger.error(f"Sync error: {e}")
 
+            if self._backlogged and self._running:
+                continue
+
             for _ in range(flush_interval):
                 if not self._running:
                     break
@@ -476,13 +852,68 @@ class SyncService:
 
         self.shutdown()
 
+    def _run_watching(self, watcher, flush_interval: float, rescan_interval: float) -> None:
+        """Event-driven loop: sync the projects whose logs changed as soon as they change.
+
+        The scan paths are only walked every ``rescan_interval`` seconds (to
+        discover new projects); in between, the watcher reports which known
+        projects were written. Projects whose write failed are retried at
+        most every ``flush_interval`` seconds (writes to their logs wait for
+        that deadline too), and backlogged ones at once.
+        """
+        next_rescan = 0.0
+        next_failed_retry = 0.0
+        pending: Set[Path] = set()
+        failed: Set[Path] = set()
+        while self._running:
+            try:
+                if time.monotonic() >= next_rescan:
+                    projects = self.scanner.find_projects_with_logs()
+                    for project_path in projects:
+                        watcher.watch(project_path)
+                    next_rescan = time.monotonic() + rescan_interval
+                    pending.clear()
+                else:
+                    # Log writes must not turn into a retry against a Postgres
+                    # that is down: failed projects wait for their deadline.
+                    projects = set(pending)
+                    if time.monotonic() >= next_failed_retry:
+                        projects |= failed
+                    else:
+                        projects -= failed
+                    projects = sorted(projects)
+                    pending.clear()
+                if projects:
+                    retried = bool(failed) and failed <= set(projects)
+                    synced = self.run_once(projects)
+                    if synced > 0:
+                        logger.info(f"Synced {synced} entries (total: {self.state.total_synced})")
+                    failed = (failed - set(projects)) | set(self._failed)
+                    if failed and (retried or time.monotonic() >= next_failed_retry):
+                        next_failed_retry = time.monotonic() + flush_interval
+            except Exception as e:
+                logger.error(f"Sync error: {e}")
+
+            if self._backlogged:
+                pending = set(self._backlogged)
+                continue
+
+            # Wake on a log write, the failed-retry deadline, the next rescan, or shutdown.
+            deadline = min(next_rescan, next_failed_retry) if failed else next_rescan
+            wait_slice = max(1.0, getattr(watcher, "poll_interval", 1.0))
+            while self._running and not pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                pending = watcher.wait(min(wait_slice, remaining))
+
     def _handle_signal(self, signum, frame):
         logger.info("Received shutdown signal...")
         self._running = False
 
     def shutdown(self) -> None:
-        if self.writer:
-            self.writer.close()
+        for writer in self._all_writers:
+            writer.close()
         self.state.save(self.state_file)
         logger.info(f"Final state saved. Total synced: {self.state.total_synced}")
 
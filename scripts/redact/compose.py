@@ -10,18 +10,24 @@ This module exposes:
 
 - gather_hits(text, redactors) — collect + overlap-resolve all hits
 - redact(text, redactors)      — apply all redactors to text
-- compose(redactors)           — identity composition (returns the list)
+- compose(redactors)           — pipeline assembly (fuses regex recognizers)
 
 The compose() function exists for the slim Open Brain v0.2.1 surface where
 callers write `redact(text, compose([r1, r2]))`. It performs argument
-validation (rejecting None) and returns the redactors list unchanged.
-Conceptually it is the place where future pipeline-time wiring (caching,
-metrics, dedup, instrumentation) would attach without changing call sites.
+validation (rejecting None) and is the place where pipeline-time wiring
+(caching, metrics, dedup, instrumentation) attaches without changing call
+sites. Today it fuses each run of consecutive regex recognizers into one
+MultiRegexRedactor, which first sweeps the text for each recognizer's
+required literals (AKIA, sk-ant-, ghp_, xox*, -----BEGIN, eyJ, @, ...) to
+skip the ones that cannot match, then scans once for the rest. It yields
+the same hits in the same order (see multi_regex.py).
 """
 from __future__ import annotations
 
 from typing import Optional, Sequence
 
+from .multi_regex import MultiRegexRedactor
+from .regex_redactor import RegexRedactor, _SingleRegexRedactor
 from .types import RedactionHit, Redactor
 
 
@@ -93,11 +99,14 @@ def redact(text: Optional[str], redactors: Sequence[Redactor]) -> Optional[str]:
 def compose(redactors: Optional[Sequence[Redactor]]) -> list[Redactor]:
     """Compose a list of redactors into a pipeline-ready list.
 
-    The slim Open Brain v0.2.1 surface for pipeline assembly. Today this is
-    an identity function over the input (with None coerced to empty list and
-    a defensive copy taken). It exists so future pipeline-time concerns
-    (caching, metric instrumentation, dedup) can be added at this seam
-    without changing call sites that already write
+    The slim Open Brain v0.2.1 surface for pipeline assembly (None is
+    coerced to an empty list). Each run of two or more consecutive regex
+    recognizers — _SingleRegexRedactor instances and the rules inside a
+    RegexRedactor — is replaced by one MultiRegexRedactor over the same
+    rules in the same order; every other redactor is passed through as is.
+    gather_hits() over the result equals gather_hits() over the input.
+    Pipeline-time concerns (caching, metric instrumentation, dedup) attach
+    here without changing call sites that already write
     `redact(text, compose([...]))`.
 
     Args:
@@ -130,7 +139,45 @@ def compose(redactors: Optional[Sequence[Redactor]]) -> list[Redactor]:
             "compose() requires a sequence with a defined length"
         ) from exc
 
-    return list(redactors)
+    return _fuse_regex_runs(list(redactors))
+
+
+def _regex_rules(redactor: Redactor) -> Optional[list[_SingleRegexRedactor]]:
+    """The single-pattern rules behind a regex recognizer, else None.
+
+    Exact type checks: a subclass may override scan(), so it is never fused.
+    """
+    if type(redactor) is _SingleRegexRedactor:
+        return [redactor]
+    if type(redactor) is RegexRedactor:
+        return list(redactor._inner)
+    return None
+
+
+def _fuse_regex_runs(redactors: list[Redactor]) -> list[Redactor]:
+    """Replace each run of consecutive regex recognizers with one MultiRegexRedactor."""
+    fused: list[Redactor] = []
+    run: list[Redactor] = []
+    rules: list[_SingleRegexRedactor] = []
+
+    def flush() -> None:
+        if len(rules) >= 2:
+            fused.append(MultiRegexRedactor(rules))
+        else:
+            fused.extend(run)
+        run.clear()
+        rules.clear()
+
+    for redactor in redactors:
+        inner = _regex_rules(redactor)
+        if inner is None:
+            flush()
+            fused.append(redactor)
+        else:
+            run.append(redactor)
+            rules.extend(inner)
+    flush()
+    return fused
 
 
 def _resolve_overlaps(hits: list[RedactionHit]) -> list[RedactionHit]:
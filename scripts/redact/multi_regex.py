@@ -0,0 +1,317 @@
+"""Single-pass engine for a run of regex recognizers.
+
+gather_hits() over secrets_redactors + pii_redactors ran one finditer() per
+recognizer — ~30 passes over the same text on every capture, replay-log
+write and PostToolUse output. CPython's re only skips ahead quickly when a
+pattern opens with a literal; the vendored patterns open with ``\\b`` or a
+lookbehind, so every pass paid a full match attempt at every offset.
+
+MultiRegexRedactor is a prefix-filtered dispatcher over a list of
+_SingleRegexRedactor instances:
+
+- At construction, each pattern's parse tree is walked for its literal
+  anchors: the strings every match must start with (``AKIA``, ``sk-``,
+  ``ghp_``/``github_pat_``/``gh[osu]_``, ``eyJ``/``EyJ``, ...).
+- scan() finds anchor occurrences with ONE locator regex (an alternation of
+  literals, which re scans with its fast prefix search) and runs each
+  anchored pattern with ``pattern.match(text, pos)`` only where its anchor
+  sits. Lookbehinds and ``\\b`` still see the text before ``pos``.
+- Patterns without a usable anchor (case-insensitive ones, and PII shapes
+  that start with a digit or character class) keep their own finditer.
+
+Before any of that, a literal prefilter decides which members can match at
+all. Each pattern also gets its required literals — strings one of which
+every match contains (``@`` for email, ``::`` for compressed IPv6,
+``aws_secret`` for the AWS secret key, the anchors above) — and one
+substring sweep (``literal in text``, each a C-speed search) drops every
+member whose literals are absent. A large Read/Bash output without an
+``@`` never runs the email regex, and without any anchor skips the
+locator pass entirely. Members with no required literal (phone, PAN)
+always run.
+
+A plain alternation of all patterns cannot be used: it reports one match
+per offset, but recognizers legitimately produce overlapping hits that
+_resolve_overlaps() arbitrates. The dispatcher replays finditer() per
+pattern instead (a rejected or accepted match resumes that pattern's
+search at its end), so scan() returns exactly the hits the members'
+scan() calls would, in the same order.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional, Sequence
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover — Python < 3.11
+    import sre_parse as _sre_parse
+
+from .regex_redactor import _SingleRegexRedactor
+from .types import RedactionHit
+
+# Anchor derivation limits. A leading character class expands into one
+# anchor per member only when it is a short literal set ([eE], [osu]); an
+# anchor shorter than two characters matches too often to be worth a
+# locator hit.
+_MAX_CLASS_EXPANSION = 4
+_MAX_ANCHORS = 16
+_MIN_ANCHOR_LEN = 2
+
+_ZERO_WIDTH = (_sre_parse.AT, _sre_parse.ASSERT, _sre_parse.ASSERT_NOT)
+
+
+def literal_prefixes(pattern: re.Pattern) -> Optional[tuple[str, ...]]:
+    """Return the literal strings every match of ``pattern`` starts with.
+
+    None when no such set exists or it is not selective enough: the pattern
+    is case-insensitive, may start with an arbitrary character, or an
+    anchor would be shorter than _MIN_ANCHOR_LEN. Anchors that extend
+    another anchor are dropped (``sk-`` covers ``sk-proj-``).
+    """
+    if not isinstance(pattern.pattern, str) or pattern.flags & re.IGNORECASE:
+        return None
+    try:
+        parsed = _sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    prefixes, _complete = _walk_prefixes(list(parsed), {""})
+    if not prefixes or min(len(p) for p in prefixes) < _MIN_ANCHOR_LEN:
+        return None
+    ordered = sorted(prefixes, key=lambda p: (len(p), p))
+    minimal: list[str] = []
+    for prefix in ordered:
+        if not any(prefix.startswith(shorter) for shorter in minimal):
+            minimal.append(prefix)
+    return tuple(minimal)
+
+
+def _walk_prefixes(items: list, prefixes: set[str]) -> tuple[set[str], bool]:
+    """Extend ``prefixes`` through a parsed sequence.
+
+    Returns (prefixes, complete). ``complete`` is False when the walk
+    stopped early at something that is not a fixed literal; the prefixes
+    gathered up to that point are still a necessary start of every match.
+    """
+    for op, av in items:
+        if op in _ZERO_WIDTH:
+            continue
+        if op is _sre_parse.LITERAL:
+            prefixes = {p + chr(av) for p in prefixes}
+        elif (op is _sre_parse.IN and len(av) <= _MAX_CLASS_EXPANSION
+              and all(item_op is _sre_parse.LITERAL for item_op, _ in av)):
+            extended = {p + chr(c) for p in prefixes for _, c in av}
+            if len(extended) > _MAX_ANCHORS:
+                return prefixes, False
+            prefixes = extended
+        elif op is _sre_parse.SUBPATTERN and not av[1] & re.IGNORECASE:
+            # av = (group, add_flags, del_flags, subpattern)
+            prefixes, complete = _walk_prefixes(list(av[-1]), prefixes)
+            if not complete:
+                return prefixes, False
+        elif op is _sre_parse.BRANCH:
+            merged: set[str] = set()
+            complete = True
+            for branch in av[1]:
+                branch_prefixes, branch_complete = _walk_prefixes(list(branch), prefixes)
+                merged |= branch_prefixes
+                complete = complete and branch_complete
+            if len(merged) > _MAX_ANCHORS:
+                return prefixes, False
+            prefixes = merged
+            if not complete:
+                return prefixes, False
+        else:
+            return prefixes, False
+    return prefixes, True
+
+
+def required_literals(pattern: re.Pattern) -> Optional[tuple[str, ...]]:
+    """Return literals one of which every match of ``pattern`` contains.
+
+    Picks the most selective candidate the parse tree offers (the set whose
+    shortest literal is longest). For a case-insensitive pattern the
+    literals are casefolded ASCII and must be looked up in _fold(text).
+    None when no literal is required (e.g. phone numbers, PANs: digit
+    classes only); such a pattern always has to run.
+    """
+    if not isinstance(pattern.pattern, str):
+        return None
+    try:
+        parsed = _sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    literals = _required_in(list(parsed))
+    if literals is None:
+        return None
+    if pattern.flags & re.IGNORECASE:
+        if not all(lit.isascii() for lit in literals):
+            return None
+        literals = {lit.casefold() for lit in literals}
+    return tuple(sorted(literals))
+
+
+def _required_in(items: list) -> Optional[set[str]]:
+    """Best required-literal set of a parsed sequence (None if there is none)."""
+    candidates: list[set[str]] = []
+    run: list[str] = []
+    for op, av in items:
+        if op is _sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            candidates.append({"".join(run)})
+            run = []
+        sub: Optional[set[str]] = None
+        if (op is _sre_parse.IN and len(av) <= _MAX_CLASS_EXPANSION
+                and all(item_op is _sre_parse.LITERAL for item_op, _ in av)):
+            sub = {chr(c) for _, c in av}
+        elif op is _sre_parse.SUBPATTERN and not av[1] & re.IGNORECASE:
+            sub = _required_in(list(av[-1]))
+        elif op is _sre_parse.BRANCH:
+            sub = set()
+            for branch in av[1]:
+                branch_literals = _required_in(list(branch))
+                if branch_literals is None:
+                    sub = None
+                    break
+                sub |= branch_literals
+        elif op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT) and av[0] >= 1:
+            sub = _required_in(list(av[2]))
+        if sub:
+            candidates.append(sub)
+    if run:
+        candidates.append({"".join(run)})
+    candidates = [c for c in candidates if len(c) <= _MAX_ANCHORS]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: (min(len(lit) for lit in c), -len(c)))
+
+
+# Characters re.IGNORECASE matches against an ASCII letter that casefold()
+# does not turn into exactly that letter: U+0130 (dotted capital I) folds
+# to "i" + U+0307, which splits a literal; U+0131 (dotless i) is left as
+# is. Every other such character casefolds to its ASCII letter (checked
+# over all code points).
+_FOLD_FIXUPS = str.maketrans({"\u0130": "i", "\u0131": "i"})
+
+
+def _fold(text: str) -> str:
+    """Casefold for the case-insensitive literal check (see _FOLD_FIXUPS)."""
+    return text.translate(_FOLD_FIXUPS).casefold()
+
+
+class MultiRegexRedactor:
+    """One scan for a run of _SingleRegexRedactor instances.
+
+    Implements the Redactor protocol. ``redactors`` keeps the member list in
+    its original order; scan() concatenates per-member hits in that order,
+    so compose()/gather_hits() resolve overlaps exactly as they would over
+    the members themselves.
+    """
+
+    def __init__(self, redactors: Sequence[_SingleRegexRedactor]) -> None:
+        """Build the anchor table and the locator regex.
+
+        Args:
+            redactors: The _SingleRegexRedactor instances to fuse.
+
+        Raises:
+            ValueError: If any member is not a _SingleRegexRedactor.
+        """
+        self.redactors: list[_SingleRegexRedactor] = list(redactors)
+        self._anchored: list[tuple[int, _SingleRegexRedactor, tuple[str, ...]]] = []
+        self._unanchored: list[tuple[int, _SingleRegexRedactor]] = []
+        # Prefilter: member index -> (required literals, case-insensitive?).
+        self._required: dict[int, tuple[tuple[str, ...], bool]] = {}
+        for idx, redactor in enumerate(self.redactors):
+            if not isinstance(redactor, _SingleRegexRedactor):
+                raise ValueError(
+                    f"MultiRegexRedactor member at index {idx} is not a regex recognizer"
+                )
+            anchors = literal_prefixes(redactor.pattern)
+            if anchors is None:
+                self._unanchored.append((idx, redactor))
+            else:
+                self._anchored.append((idx, redactor, anchors))
+            literals = anchors or required_literals(redactor.pattern)
+            if literals is not None:
+                ignore_case = anchors is None and bool(redactor.pattern.flags & re.IGNORECASE)
+                self._required[idx] = (literals, ignore_case)
+
+        # Longest first, so the alternation never stops at a shorter anchor
+        # that a longer one extends (scan() re-checks every member anyway).
+        all_anchors = sorted(
+            {a for _, _, anchors in self._anchored for a in anchors},
+            key=lambda a: (-len(a), a),
+        )
+        self._locator: Optional[re.Pattern] = (
+            re.compile("|".join(re.escape(a) for a in all_anchors)) if all_anchors else None
+        )
+
+    def scan(self, text: str) -> list[RedactionHit]:
+        """Scan text for every member; same hits, same order as the members.
+
+        Args:
+            text: The string to scan.
+
+        Returns:
+            Concatenated RedactionHits, member by member. Never raises on
+            valid string input.
+        """
+        if not isinstance(text, str) or len(text) == 0:
+            return []
+
+        live = self._prefilter(text)
+        per_member: list[list[RedactionHit]] = [[] for _ in self.redactors]
+        for idx, redactor in self._unanchored:
+            if live[idx]:
+                per_member[idx] = redactor.scan(text)
+        anchored = [entry for entry in self._anchored if live[entry[0]]]
+        if anchored:
+            self._scan_anchored(text, anchored, per_member)
+        return [hit for hits in per_member for hit in hits]
+
+    def _prefilter(self, text: str) -> list[bool]:
+        """Literal sweep: which members can match ``text`` at all."""
+        live = [True] * len(self.redactors)
+        present: dict[tuple[str, bool], bool] = {}
+        folded: Optional[str] = None
+        for idx, (literals, ignore_case) in self._required.items():
+            if ignore_case and folded is None:
+                folded = _fold(text)
+            haystack = folded if ignore_case else text
+            for literal in literals:
+                key = (literal, ignore_case)
+                if key not in present:
+                    present[key] = literal in haystack
+                if present[key]:
+                    break
+            else:
+                live[idx] = False
+        return live
+
+    def _scan_anchored(
+        self,
+        text: str,
+        anchored: list[tuple[int, _SingleRegexRedactor, tuple[str, ...]]],
+        per_member: list[list[RedactionHit]],
+    ) -> None:
+        """Replay finditer() for the live anchored members from one locator pass."""
+        # finditer() resumes a pattern's search at the end of its previous
+        # match, accepted by the validator or not; ``resume`` tracks that.
+        resume = [0] * len(self.redactors)
+        search = self._locator.search
+        found = search(text)
+        while found is not None:
+            pos = found.start()
+            for idx, redactor, anchors in anchored:
+                if pos < resume[idx] or not text.startswith(anchors, pos):
+                    continue
+                m = redactor.pattern.match(text, pos)
+                if m is None:
+                    continue
+                resume[idx] = m.end()
+                hit = redactor._hit(m)
+                if hit is not None:
+                    per_member[idx].append(hit)
+            found = search(text, pos + 1)
@@ -109,30 +109,37 @@ class _SingleRegexRedactor:
         hits: list[RedactionHit] = []
 
         for m in self.pattern.finditer(text):
-            valid: bool = True
-            try:
-                valid = self.validator(m)
-            except Exception:
-                # Validator threw. Treat as a rejected match and continue.
-                # This preserves the Redactor contract that scan() never throws
-                # on valid string input.
-                continue
-
-            if not valid:
-                continue
-
-            hits.append(
-                RedactionHit(
-                    start=m.start(),
-                    end=m.end(),
-                    category=self.category,
-                    confidence=self.confidence,
-                    replacement=self.replacement,
-                )
-            )
+            hit = self._hit(m)
+            if hit is not None:
+                hits.append(hit)
 
         return hits
 
+    def _hit(self, m: re.Match) -> Optional[RedactionHit]:
+        """Validate one match and build its RedactionHit (None if rejected).
+
+        Shared with MultiRegexRedactor, which finds the same matches without
+        a finditer() pass of its own.
+        """
+        try:
+            valid = self.validator(m)
+        except Exception:
+            # Validator threw. Treat as a rejected match and continue.
+            # This preserves the Redactor contract that scan() never throws
+            # on valid string input.
+            return None
+
+        if not valid:
+            return None
+
+        return RedactionHit(
+            start=m.start(),
+            end=m.end(),
+            category=self.category,
+            confidence=self.confidence,
+            replacement=self.replacement,
+        )
+
 
 # Type alias for the slim public constructor signature.
 RegexRule = Tuple[re.Pattern, str, str, float]
@@ -0,0 +1,23 @@
+"""Shared pytest fixtures for scripts/tests.
+
+The on-disk embedding cache (embed_cache.py) defaults ON and lives under
+~/.claude. Tests that stub the warm server / local model and then assert on
+what _generate_embedding() returned would otherwise be served a vector cached
+by an earlier run — and would write test vectors into the developer's real
+cache. Tests that exercise the cache itself point it at tmp_path explicitly.
+
+The brain daemon (brain_daemon.py) is likewise switched off: a developer's
+running daemon must not answer a test's recall, and a test's fallback must
+not autostart one.
+"""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolate_embed_cache(monkeypatch):
+    monkeypatch.setenv("OPEN_BRAIN_EMBED_CACHE_MAX", "0")
+
+
+@pytest.fixture(autouse=True)
+def _isolate_brain_daemon(monkeypatch):
+    monkeypatch.setenv("OPEN_BRAIN_DAEMON", "0")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Two-stage ANN retrieval in open_brain.search().
+
+Mocked-connection tests (no DB) for the HNSW-friendly search mode:
+
+  (a) Default (ann_candidates unset, env unset) emits exactly ONE execute —
+      the D7 single-stage SQL — so TestD7GoldenSqlByteStability still holds.
+  (b) ann_candidates=K sets hnsw.ef_search transaction-locally, then runs a
+      candidates CTE ordered by raw distance with LIMIT K, and scores only
+      that CTE in stage 2.
+  (c) Param order matches the placeholder order (embedding, where params, K,
+      keyword patterns, limit).
+  (d) K / ef_search resolution: env fallback, floor at the SQL limit, cap at
+      ANN_CANDIDATES_MAX, ef_search >= K.
+
+Run: python3 -m pytest scripts/tests/test_ann_search.py -v
+"""
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import open_brain  # noqa: E402
+
+
+def _make_mock_conn():
+    mock_conn = MagicMock()
+    mock_cur = MagicMock()
+    mock_conn.cursor.return_value = mock_cur
+    mock_cur.description = []
+    mock_cur.fetchall.return_value = []
+    return mock_conn, mock_cur
+
+
+def _run_search(monkeypatch, **kwargs):
+    monkeypatch.delenv("OPEN_BRAIN_ANN_CANDIDATES", raising=False)
+    monkeypatch.delenv("OPEN_BRAIN_HNSW_EF_SEARCH", raising=False)
+    mock_conn, mock_cur = _make_mock_conn()
+    with patch.object(open_brain, "_generate_embedding", return_value=[0.1] * 768), \
+         patch.object(open_brain, "emit_replay_log", return_value=1):
+        open_brain.search(mock_conn, user_id="user-x", **kwargs)
+    return mock_cur.execute.call_args_list
+
+
+class TestDefaultIsSingleStage:
+    def test_no_ann_means_one_execute_without_candidates_cte(self, monkeypatch):
+        calls = _run_search(monkeypatch, query="is a to", limit=5)
+        assert len(calls) == 1
+        sql_text = calls[0][0][0]
+        assert "candidates" not in sql_text
+        assert "hnsw.ef_search" not in sql_text
+
+    def test_explicit_zero_disables_even_with_env(self, monkeypatch):
+        mock_conn, mock_cur = _make_mock_conn()
+        monkeypatch.setenv("OPEN_BRAIN_ANN_CANDIDATES", "200")
+        with patch.object(open_brain, "_generate_embedding", return_value=[0.1] * 768), \
+             patch.object(open_brain, "emit_replay_log", return_value=1):
+            open_brain.search(mock_conn, query="is a to", user_id="u",
+                              limit=5, ann_candidates=0)
+        assert mock_cur.execute.call_count == 1
+
+
+class TestTwoStageSql:
+    def test_sets_ef_search_locally_then_prefetches_k(self, monkeypatch):
+        calls = _run_search(monkeypatch, query="is a to", limit=5, ann_candidates=100)
+        assert len(calls) == 2
+        set_sql, set_params = calls[0][0]
+        assert "set_config('hnsw.ef_search'" in set_sql
+        assert "true" in set_sql, "ef_search must be transaction-local"
+        assert set_params == ("100",)
+
+        sql_text, params = calls[1][0]
+        assert "WITH candidates AS" in sql_text
+        assert "ORDER BY vec_distance" in sql_text
+        assert "FROM candidates" in sql_text
+        # The stage-1 ORDER BY must be the bare distance, not hybrid_score —
+        # otherwise the HNSW index cannot serve it.
+        stage1 = sql_text.split("scored AS")[0]
+        assert "hybrid_score" not in stage1
+        # All-stopword query: no keyword params between K and the limit.
+        assert params[-2:] == [100, 5]
+
+    def test_param_order_matches_placeholders(self, monkeypatch):
+        calls = _run_search(monkeypatch, query="postgres index tuning",
+                            limit=5, ann_candidates=50)
+        sql_text, params = calls[1][0]
+        assert sql_text.count("%s") == len(params)
+        # embedding first, then user_id + model (where), then K.
+        assert params[0].startswith("[")
+        assert params[1] == "user-x"
+        assert params[2] == open_brain.EMBED_MODEL
+        assert params[3] == 50
+        # keyword ILIKE patterns come after K; limit last.
+        assert params[4] == "%postgres%"
+        assert params[-1] == 5
+
+    def test_dedup_carries_embedding_bytes_through_both_stages(self, monkeypatch):
+        calls = _run_search(monkeypatch, query="is a to", limit=5,
+                            ann_candidates=100, dedup=True)
+        sql_text, params = calls[1][0]
+        assert "vector_send(embedding) AS _embedding_bin" in sql_text.split("scored AS")[0]
+        assert "_embedding_bin" in sql_text.split("scored AS")[1]
+        assert params[-1] == 15  # dedup over-fetch unchanged
+
+
+class TestResolution:
+    def test_env_fallback(self, monkeypatch):
+        monkeypatch.setenv("OPEN_BRAIN_ANN_CANDIDATES", "250")
+        assert open_brain._resolve_ann_candidates(None, 10) == 250
+
+    def test_env_garbage_means_off(self, monkeypatch):
+        monkeypatch.setenv("OPEN_BRAIN_ANN_CANDIDATES", "lots")
+        assert open_brain._resolve_ann_candidates(None, 10) == 0
+
+    def test_floor_at_sql_limit_and_cap(self):
+        assert open_brain._resolve_ann_candidates(5, 30) == 30
+        assert open_brain._resolve_ann_candidates(10 ** 6, 10) == open_brain.ANN_CANDIDATES_MAX
+
+    @pytest.mark.parametrize("env,k,expected", [
+        (None, 10, open_brain.HNSW_EF_SEARCH_MIN),
+        (None, 200, 200),
+        ("400", 200, 400),
+        ("5000", 200, open_brain.ANN_CANDIDATES_MAX),
+    ])
+    def test_ef_search_never_below_k(self, monkeypatch, env, k, expected):
+        if env is None:
+            monkeypatch.delenv("OPEN_BRAIN_HNSW_EF_SEARCH", raising=False)
+        else:
+            monkeypatch.setenv("OPEN_BRAIN_HNSW_EF_SEARCH", env)
+        assert open_brain._resolve_hnsw_ef_search(k) == expected
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""brain_daemon.py + brain_client.py — resident Unix-socket JSON-RPC service.
+
+No DB, no model: open_brain ops are patched and a pg_pool.ConnectionPool
+hands out MagicMock connections (the pool itself is covered by test_pg_pool).
+
+  (a) BrainService dispatch: method routing, param validation, ignored
+      caller user_id, error objects, notifications produce no response.
+  (b) Read ops retry once after a disconnect; capture never does. The
+      enrichment worker drains on start, sleeps until the next due row and
+      is woken by write-fast captures and enrich_wake.
+  (c) End to end over a real socket in tmp_path: call / notify / ping, and
+      try_call's (served, result) contract including the disabled and
+      not-running cases (autostart throttled, never spawned here); writes
+      (idempotent=False) fall back only when the request was never delivered,
+      not when the daemon hangs up after reading it.
+
+Run: python3 -m pytest scripts/tests/test_brain_daemon.py -v
+"""
+import os
+import socket
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import brain_client  # noqa: E402
+import brain_daemon  # noqa: E402
+import pg_pool  # noqa: E402
+
+
+def _pool():
+    made = []
+
+    def connect():
+        conn = MagicMock()
+        conn.closed = 0
+        made.append(conn)
+        return conn
+
+    return pg_pool.ConnectionPool(connect, max_size=2), made
+
+
+class OperationalError(Exception):
+    """Stand-in for psycopg2.OperationalError (matched by class name)."""
+
+
+class TestDispatch:
+    def _service(self):
+        pool, _made = _pool()
+        return brain_daemon.BrainService(pool, user_id="alice")
+
+    def test_ping(self):
+        resp = self._service().dispatch({"jsonrpc": "2.0", "id": 1, "method": "ping"})
+        assert resp == {"jsonrpc": "2.0", "id": 1, "result": "pong"}
+
+    def test_search_uses_daemon_principal_not_params(self):
+        with patch.object(brain_daemon.open_brain, "search", return_value=[{"THOUGHT_ID": "t"}]) as s:
+            resp = self._service().dispatch({
+                "id": 2, "method": "search",
+                "params": {"query": "q", "limit": 5, "user_id": "mallory"},
+            })
+        assert resp["result"] == [{"THOUGHT_ID": "t"}]
+        kwargs = s.call_args.kwargs
+        assert kwargs["user_id"] == "alice"
+        assert kwargs["limit"] == 5 and kwargs["query"] == "q"
+
+    def test_search_text_format(self):
+        with patch.object(brain_daemon.open_brain, "search", return_value=[]), \
+             patch.object(brain_daemon.open_brain, "_format_search_results", return_value="none") as fmt:
+            resp = self._service().dispatch({
+                "id": 3, "method": "search", "params": {"query": "q", "format": "text"},
+            })
+        assert resp["result"] == "none"
+        fmt.assert_called_once_with([], sort_by="similarity")
+
+    @pytest.mark.parametrize("method,params", [
+        ("search", {}),
+        ("search", {"query": "q", "limit": -1}),
+        ("capture", {"text": "x", "stv_f": 2}),
+        ("inspect", {"thought_id": ""}),
+        ("inspect_many", {"thought_ids": []}),
+        ("inspect_many", {"thought_ids": ["a", 3]}),
+        ("enrich_pending", {"limit": 0}),
+        ("prime", {"query": ""}),
+        ("prime", {"query": "q", "search_limit": "5"}),
+        ("capture_batch", {"items": []}),
+        ("capture_batch", {"items": [{"text": "x", "stv_c": 2}]}),
+    ])
+    def test_invalid_params(self, method, params):
+        resp = self._service().dispatch({"id": 4, "method": method, "params": params})
+        assert resp["error"]["code"] == brain_daemon.INVALID_PARAMS
+
+    def test_unknown_method_and_bad_request(self):
+        svc = self._service()
+        assert svc.dispatch({"id": 5, "method": "drop"})["error"]["code"] == brain_daemon.METHOD_NOT_FOUND
+        assert svc.dispatch([1, 2])["error"]["code"] == brain_daemon.INVALID_REQUEST
+
+    def test_op_exception_becomes_server_error(self):
+        with patch.object(brain_daemon.open_brain, "show_links", side_effect=ValueError("nope")):
+            resp = self._service().dispatch({"id": 6, "method": "show_links",
+                                             "params": {"atom_id": "a"}})
+        assert resp["error"]["code"] == brain_daemon.SERVER_ERROR
+        assert "nope" in resp["error"]["message"]
+
+    def test_capture_batch_uses_daemon_principal(self):
+        with patch.object(brain_daemon.open_brain, "capture_batch",
+                          return_value=[{"thought_id": "t1"}]) as cb:
+            resp = self._service().dispatch({"id": 8, "method": "capture_batch",
+                                             "params": {"items": ["a"], "project": "p",
+                                                        "user_id": "mallory"}})
+        assert resp["result"] == [{"thought_id": "t1"}]
+        assert cb.call_args.args[1] == [{"text": "a"}]
+        assert cb.call_args.kwargs["user_id"] == "alice"
+        assert cb.call_args.kwargs["project"] == "p"
+
+    def test_inspect_many(self):
+        with patch.object(brain_daemon.open_brain, "_inspect_many",
+                          return_value={"a": {"thought_id": "a"}}) as im:
+            resp = self._service().dispatch({"id": 9, "method": "inspect_many",
+                                             "params": {"thought_ids": ["a"]}})
+        assert resp["result"] == {"a": {"thought_id": "a"}}
+        assert im.call_args.args[1:] == (["a"], "alice")
+        assert "inspect_many" in brain_daemon.RETRYABLE
+
+    def test_prime(self):
+        primed = {"recent": [{"THOUGHT_ID": "r"}], "search": [{"THOUGHT_ID": "s"}]}
+        with patch.object(brain_daemon.open_brain, "prime", return_value=primed) as pr:
+            resp = self._service().dispatch({"id": 10, "method": "prime",
+                                             "params": {"query": "proj", "days": 3,
+                                                        "limit": 10, "search_limit": 5}})
+        assert resp["result"] == primed
+        assert pr.call_args.kwargs == {"query": "proj", "user_id": "alice", "days": 3,
+                                       "recent_limit": 10, "search_limit": 5}
+        assert "prime" in brain_daemon.RETRYABLE
+
+    def test_enrich_pending_drains_for_daemon_principal(self):
+        counts = {"claimed": 2, "enriched": 2, "retrying": 0, "failed": 0}
+        with patch.object(brain_daemon.open_brain, "enrich_pending", return_value=counts) as ep:
+            resp = self._service().dispatch({"id": 7, "method": "enrich_pending",
+                                             "params": {"limit": 8}})
+        assert resp["result"] == counts
+        assert ep.call_args.kwargs == {"user_id": "alice", "limit": 8}
+
+    def test_notification_has_no_response(self):
+        with patch.object(brain_daemon.open_brain, "capture", return_value={"thought_id": "t"}) as cap:
+            assert self._service().dispatch({"method": "capture", "params": {"text": "hello"}}) is None
+        assert cap.call_args.kwargs["source"] == "manual"
+
+
+class TestEnrichWorker:
+    def _service(self):
+        pool, _made = _pool()
+        return brain_daemon.BrainService(pool, user_id="alice")
+
+    @pytest.mark.parametrize("claimed,due,delay", [
+        (16, 0.0, 0.0),                              # full batch: go again at once
+        (3, 0.0, brain_daemon.ENRICH_IDLE_S),        # still due (held elsewhere): short nap
+        (3, 30.0, 30.0),                             # next retry's not_before
+        (0, 3600.0, brain_daemon.ENRICH_POLL_S),     # far off: poll for CLI captures
+        (0, None, brain_daemon.ENRICH_POLL_S),       # queue empty
+    ])
+    def test_enrich_once_sleeps_until_next_due(self, claimed, due, delay):
+        svc = self._service()
+        counts = {"claimed": claimed, "enriched": claimed, "retrying": 0, "failed": 0}
+        with patch.object(brain_daemon.open_brain, "ENRICH_BATCH_SIZE", 16), \
+             patch.object(brain_daemon.open_brain, "enrich_pending", return_value=counts) as ep, \
+             patch.object(brain_daemon.open_brain, "enrich_next_due", return_value=due):
+            assert brain_daemon.enrich_once(svc) == delay
+        assert ep.call_args.args[1] == "alice"
+
+    def test_enrich_once_never_raises(self, capsys):
+        with patch.object(brain_daemon.open_brain, "enrich_pending",
+                          side_effect=RuntimeError("relation brain.enrichment_queue does not exist")):
+            assert brain_daemon.enrich_once(self._service()) == brain_daemon.ENRICH_POLL_S
+        assert "enrichment failed" in capsys.readouterr().err
+
+    def test_write_fast_capture_and_wake_set_due(self, monkeypatch):
+        monkeypatch.delenv("OPEN_BRAIN_WRITE_FAST", raising=False)
+        svc = self._service()
+        with patch.object(brain_daemon.open_brain, "capture", return_value={"thought_id": "t"}):
+            svc.dispatch({"id": 1, "method": "capture", "params": {"text": "sync"}})
+            assert not svc.enrich_due.is_set()
+            svc.dispatch({"id": 2, "method": "capture",
+                          "params": {"text": "fast", "write_fast": True}})
+        assert svc.enrich_due.is_set()
+        svc.enrich_due.clear()
+        assert svc.dispatch({"method": "enrich_wake"}) is None
+        assert svc.enrich_due.is_set()
+
+    def test_worker_runs_on_start_and_on_wake(self, monkeypatch):
+        monkeypatch.delenv("OPEN_BRAIN_DAEMON_ENRICH", raising=False)
+        svc, stop = self._service(), threading.Event()
+        runs = []
+        ran = threading.Event()
+
+        def once(_svc):
+            runs.append(1)
+            ran.set()
+            return 60.0
+
+        with patch.object(brain_daemon, "enrich_once", side_effect=once):
+            thread = brain_daemon.start_enrich_worker(svc, stop)
+            assert ran.wait(5)
+            ran.clear()
+            svc.enrich_due.set()
+            assert ran.wait(5)
+            stop.set()
+            svc.enrich_due.set()
+            thread.join(5)
+        assert not thread.is_alive() and len(runs) >= 2
+
+    def test_worker_disabled(self, monkeypatch):
+        monkeypatch.setenv("OPEN_BRAIN_DAEMON_ENRICH", "0")
+        assert brain_daemon.start_enrich_worker(self._service(), threading.Event()) is None
+
+
+class TestRetry:
+    def _flaky(self):
+        calls = []
+
+        def op(*_a, **_k):
+            calls.append(1)
+            if len(calls) == 1:
+                raise OperationalError("server closed the connection unexpectedly")
+            return []
+        return op, calls
+
+    def test_read_op_retries_on_fresh_connection(self):
+        pool, made = _pool()
+        op, calls = self._flaky()
+        with patch.object(brain_daemon.open_brain, "recent", side_effect=op):
+            resp = brain_daemon.BrainService(pool, user_id="a").dispatch(
+                {"id": 1, "method": "recent", "params": {}})
+        assert resp["result"] == [] and len(calls) == 2 and len(made) == 2
+
+    def test_capture_is_not_retried(self):
+        pool, _made = _pool()
+        op, calls = self._flaky()
+        with patch.object(brain_daemon.open_brain, "capture", side_effect=op):
+            resp = brain_daemon.BrainService(pool, user_id="a").dispatch(
+                {"id": 1, "method": "capture", "params": {"text": "t"}})
+        assert resp["error"]["code"] == brain_daemon.SERVER_ERROR and len(calls) == 1
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    sock = tmp_path / "brain.sock"
+    monkeypatch.setenv("OPEN_BRAIN_DAEMON", "1")
+    monkeypatch.setenv("OPEN_BRAIN_DAEMON_SOCKET", str(sock))
+    pool, _made = _pool()
+    service = brain_daemon.BrainService(pool, user_id="alice")
+    server = brain_daemon.bind(sock, brain_daemon.make_handler(service, {"last_request": time.time()}))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield sock
+    server.shutdown()
+    server.server_close()
+
+
+class TestOverSocket:
+    def test_socket_is_owner_only(self, running_daemon):
+        assert (running_daemon.stat().st_mode & 0o777) == 0o600
+
+    def test_call_and_ping(self, running_daemon):
+        assert brain_client.ping()
+        with patch.object(brain_daemon.open_brain, "recent", return_value=[{"THOUGHT_ID": "r"}]):
+            assert brain_client.call("recent", {"days": 3}) == [{"THOUGHT_ID": "r"}]
+
+    def test_error_reply_raises(self, running_daemon):
+        with pytest.raises(brain_client.DaemonError) as exc:
+            brain_client.call("nope")
+        assert exc.value.code == brain_daemon.METHOD_NOT_FOUND
+
+    def test_notify_runs_capture(self, running_daemon):
+        done = threading.Event()
+        with patch.object(brain_daemon.open_brain, "capture",
+                          side_effect=lambda *a, **k: done.set() or {"thought_id": "t"}):
+            assert brain_client.notify("capture", {"text": "remember this"})
+            assert done.wait(5)
+
+    def test_try_call_served(self, running_daemon):
+        with patch.object(brain_daemon.open_brain, "search", return_value=[]):
+            assert brain_client.try_call("search", {"query": "q"}) == (True, [])
+
+
+class TestClientFallback:
+    def test_disabled_never_connects(self, monkeypatch):
+        monkeypatch.setenv("OPEN_BRAIN_DAEMON", "0")
+        with patch.object(brain_client, "spawn_detached") as spawn:
+            assert brain_client.try_call("ping") == (False, None)
+        spawn.assert_not_called()
+
+    def test_not_running_falls_back_and_autostarts(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("OPEN_BRAIN_DAEMON", "1")
+        monkeypatch.setenv("OPEN_BRAIN_DAEMON_SOCKET", str(tmp_path / "missing.sock"))
+        with patch.object(brain_client, "spawn_detached") as spawn:
+            assert brain_client.try_call("ping") == (False, None)
+        spawn.assert_called_once()
+
+    @pytest.mark.parametrize("failure", [
+        TimeoutError("timed out"), brain_client.DaemonError(-32000, "db down")])
+    def test_write_not_replayed_after_ambiguous_failure(self, monkeypatch, failure):
+        monkeypatch.setenv("OPEN_BRAIN_DAEMON", "1")
+        with patch.object(brain_client, "call", side_effect=failure):
+            assert brain_client.try_call("search") == (False, None)
+            assert brain_client.try_call("capture", idempotent=False) == (True, None)
+
+    def test_write_falls_back_when_unreachable(self, monkeypatch):
+        monkeypatch.setenv("OPEN_BRAIN_DAEMON", "1")
+        with patch.object(brain_client, "call",
+                          side_effect=brain_client.DaemonUnavailable("refused")), \
+             patch.object(brain_client, "spawn_detached"):
+            assert brain_client.try_call("capture", idempotent=False) == (False, None)
+
+    def test_write_not_replayed_when_daemon_hangs_up_after_reading(self, tmp_path, monkeypatch):
+        # The daemon read the request (and may have committed it), then died.
+        sock_path = tmp_path / "brain.sock"
+        monkeypatch.setenv("OPEN_BRAIN_DAEMON", "1")
+        monkeypatch.setenv("OPEN_BRAIN_DAEMON_SOCKET", str(sock_path))
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(sock_path))
+        server.listen(4)
+        received = []
+
+        def serve():
+            for _ in range(3):
+                conn, _addr = server.accept()
+                with conn, conn.makefile("rb") as reader:
+                    received.append(reader.readline())
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        try:
+            with pytest.raises(brain_client.DaemonNoResponse):
+                brain_client.call("capture", {"text": "t"}, timeout=5)
+            with patch.object(brain_client, "spawn_detached") as spawn:
+                assert brain_client.try_call("capture", {"text": "t"}, timeout=5,
+                                             idempotent=False) == (True, None)
+                assert brain_client.try_call("search", {"query": "q"}, timeout=5) == (False, None)
+            spawn.assert_not_called()
+            thread.join(5)
+        finally:
+            server.close()
+        assert len(received) == 3 and all(b'"method"' in line for line in received)
+
+    def test_spawn_is_throttled(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("OPEN_BRAIN_DAEMON_SOCKET", str(tmp_path / "brain.sock"))
+        monkeypatch.delenv("OPEN_BRAIN_DAEMON_AUTOSTART", raising=False)
+        with patch.object(brain_client.subprocess, "Popen") as popen:
+            brain_client.spawn_detached()
+            brain_client.spawn_detached()
+        assert popen.call_count == 1
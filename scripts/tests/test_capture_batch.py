@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Batched multi-thought capture — capture_batch / --capture-batch / op=capture_batch.
+
+Mocked connection (no DB, no model, no LLM):
+
+  (a) A batch is validated up front, redacted through the shared pipeline,
+      extracted concurrently, embedded by ONE _generate_embeddings call and
+      inserted by ONE INSERT ... SELECT FROM unnest; the graph for the whole
+      batch is one _update_graph_bulk call.
+  (b) Per-item fields override the batch defaults; write-fast queues every
+      atom in the same transaction.
+  (c) A bad item or an out-of-scope parent fails before anything is written.
+  (d) _generate_embeddings encodes all misses in one call; the warm server
+      is asked in /embed_batch chunks; _update_graph_bulk stays at two
+      statements for many atoms.
+
+Run: python3 -m pytest scripts/tests/test_capture_batch.py -v
+"""
+import io
+import json
+import os
+import re
+import sys
+import unittest.mock as mock
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import open_brain  # noqa: E402
+
+
+def _conn(fetch_rows=()):
+    log = []
+    conn = MagicMock()
+    cur = MagicMock()
+    conn.cursor.return_value = cur
+    cur.execute.side_effect = lambda sql, params=None: log.append((sql, params))
+    cur.fetchall.return_value = list(fetch_rows)
+    conn.commit.side_effect = lambda: log.append(("COMMIT", None))
+    return conn, log
+
+
+def _statements(log, needle):
+    return [entry for entry in log if needle in entry[0]]
+
+
+def _placeholders(sql_text):
+    return len(re.findall(r"(?<!%)%s", sql_text))
+
+
+def _batch(conn, items, metadata=None, **kwargs):
+    def extract(text):
+        return dict(metadata or {"type": "decision", "topics": ["t"], "people": [],
+                                 "action_items": [], "summary": f"sum {text[:6]}",
+                                 "confidence": "high"})
+    with patch.object(open_brain, "_extract_metadata", side_effect=extract) as ex, \
+         patch.object(open_brain, "_generate_embeddings",
+                      side_effect=lambda texts: [[0.1] * 768 for _ in texts]) as emb, \
+         patch.object(open_brain, "_update_graph_bulk") as graph, \
+         patch.object(open_brain, "emit_replay_log") as replay:
+        results = open_brain.capture_batch(conn, items, user_id="alice", **kwargs)
+    return results, ex, emb, graph, replay
+
+
+class TestCaptureBatch:
+    def test_one_insert_one_embed_one_graph_call(self):
+        conn, log = _conn()
+        items = [
+            "first thought",
+            {"text": "mail bob@example.com about it", "project": "Other", "stv_c": 0.3},
+            {"text": "third", "source": "import", "session_id": "s2"},
+        ]
+        results, ex, emb, graph, replay = _batch(conn, items, project="Main")
+
+        assert len(results) == 3 and ex.call_count == 3
+        emb.assert_called_once()
+        (texts,) = emb.call_args.args
+        assert len(texts) == 3 and "bob@example.com" not in texts[1]
+
+        (insert,) = _statements(log, "INSERT INTO brain.thoughts")
+        sql_text, params = insert
+        assert "unnest(" in sql_text and _placeholders(sql_text) == len(params)
+        assert params[:3] == ["alice", open_brain.EMBED_MODEL, 768]
+        thought_ids, raw = params[3], params[4]
+        assert thought_ids == [r["thought_id"] for r in results]
+        assert len(set(thought_ids)) == 3
+        assert "bob@example.com" not in raw[1]
+        sources, sessions, projects = params[10], params[11], params[12]
+        assert sources == ["manual", "manual", "import"]
+        assert sessions == ["", "", "s2"] and projects == ["Main", "Other", "Main"]
+        assert params[-1][1] == 0.3 and params[-1][0] == open_brain.NAL_CONFIDENCE_MAP["high"]
+        assert log[-1] == ("COMMIT", None)
+        assert not _statements(log, "enrichment_queue")
+
+        _c, atoms, user_id = graph.call_args.args
+        assert user_id == "alice" and [a[0] for a in atoms] == thought_ids
+        assert atoms[1][5] == "Other"
+        replay.assert_called_once()
+        assert replay.call_args.kwargs["metadata"]["batch_size"] == 3
+        assert results[1]["stv"]["c"] == 0.3 and results[0]["type"] == "decision"
+
+    def test_write_fast_queues_every_atom(self):
+        conn, log = _conn()
+        results, ex, _emb, _graph, _replay = _batch(conn, ["a", "b"], write_fast=True)
+        ex.assert_not_called()
+        assert all(r["enrichment"] == "pending" for r in results)
+        (queued,) = _statements(log, "INSERT INTO brain.enrichment_queue")
+        user_id, ids, payloads = queued[1]
+        assert user_id == "alice" and ids == [r["thought_id"] for r in results]
+        assert json.loads(payloads[0])["seed_c"] == results[0]["stv"]["c"]
+        assert log.index(queued) < log.index(("COMMIT", None))
+
+    @pytest.mark.parametrize("items,message", [
+        ([{"text": ""}], "item 0: text"),
+        (["ok", {"text": "x", "stv_f": 1.5}], "item 1: stv_f"),
+        ([{"text": "x", "user_id": "mallory"}], "unknown field"),
+        ([42], "item 0"),
+    ])
+    def test_invalid_item_rejected_before_any_work(self, items, message):
+        conn, log = _conn()
+        with pytest.raises(ValueError, match=message):
+            _batch(conn, items)
+        assert log == []
+
+    def test_out_of_scope_parent_rejects_whole_batch(self):
+        conn, log = _conn(fetch_rows=[("p1",)])
+        items = [{"text": "a", "was_derived_from": "p1"},
+                 {"text": "b", "was_derived_from": "p-other"}]
+        with pytest.raises(RuntimeError, match="p-other"):
+            _batch(conn, items)
+        assert not _statements(log, "INSERT")
+        conn.rollback.assert_called()
+
+    def test_empty_batch_is_a_no_op(self):
+        conn, log = _conn()
+        assert _batch(conn, [])[0] == []
+        conn.cursor.assert_not_called()
+
+
+def test_read_jsonl_items():
+    stream = io.StringIO('"plain"\n\n{"text": "obj", "project": "p"}\n')
+    assert open_brain._read_jsonl_items(stream) == ["plain", {"text": "obj", "project": "p"}]
+    with pytest.raises(ValueError, match="line 2"):
+        open_brain._read_jsonl_items(io.StringIO('"ok"\n{broken\n'))
+
+
+class TestGenerateEmbeddings:
+    def test_resident_model_encodes_batch_once(self, monkeypatch):
+        model = MagicMock()
+        model.encode.return_value = MagicMock(tolist=lambda: [[0.2] * 768, [0.3] * 768])
+        monkeypatch.setattr(open_brain, "_embed_model", model)
+        assert open_brain._generate_embeddings(["a", "b"]) == [[0.2] * 768, [0.3] * 768]
+        model.encode.assert_called_once_with(["a", "b"])
+
+    def test_warm_server_batch_is_chunked(self, monkeypatch):
+        monkeypatch.setattr(open_brain, "_embed_model", None)
+        monkeypatch.setattr(open_brain, "EMBED_SERVER_MAX_BATCH", 2)
+        sent = []
+
+        def urlopen(request, timeout=None):
+            resp = MagicMock()
+            resp.__enter__ = MagicMock(return_value=resp)
+            resp.__exit__ = MagicMock(return_value=False)
+            resp.headers = {"Content-Type": "application/json"}
+            if request.full_url.endswith("/health"):
+                body = {"status": "ok", "model": open_brain.EMBED_MODEL}
+            else:
+                texts = json.loads(request.data)["texts"]
+                sent.append(texts)
+                body = {"embeddings": [[0.5] * 768 for _ in texts]}
+            resp.read.return_value = json.dumps(body).encode("utf-8")
+            return resp
+
+        with mock.patch("urllib.request.urlopen", side_effect=urlopen), \
+             mock.patch.object(open_brain, "_get_embedding_model") as local:
+            vecs = open_brain._generate_embeddings(["a", "b", "c"])
+        assert len(vecs) == 3 and sent == [["a", "b"], ["c"]]
+        local.assert_not_called()
+
+    def test_server_down_falls_back_to_local_batch(self, monkeypatch):
+        monkeypatch.setattr(open_brain, "_embed_model", None)
+        model = MagicMock()
+        model.encode.return_value = MagicMock(tolist=lambda: [[0.1] * 768] * 2)
+        with mock.patch("urllib.request.urlopen", side_effect=OSError("refused")), \
+             mock.patch.object(open_brain, "_spawn_embed_server_detached") as spawn, \
+             mock.patch.object(open_brain, "_get_embedding_model", return_value=model):
+            assert len(open_brain._generate_embeddings(["a", "b"])) == 2
+        spawn.assert_called_once()
+        model.encode.assert_called_once_with(["a", "b"])
+
+
+def test_graph_bulk_two_statements_for_many_atoms():
+    cur = MagicMock()
+    cur.fetchall.side_effect = lambda: [(nk, f"id-{nk}") for nk in cur.execute.call_args.args[1][1]]
+    conn = MagicMock()
+    conn.cursor.return_value = cur
+    open_brain._update_graph_bulk(conn, [
+        ("t1", "one", "insight", ["Shared"], [], "P"),
+        ("t2", "two", "insight", ["shared"], ["Ann"], "P"),
+    ], "alice")
+    assert cur.execute.call_count == 2
+    node_params = cur.execute.call_args_list[0].args[1]
+    assert node_params[1] == ["thought:t1", "topic:shared", "project:p", "thought:t2", "person:ann"]
+    edge_ids = cur.execute.call_args_list[1].args[1][1]
+    assert len(edge_ids) == 5
+    conn.commit.assert_called_once()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Content-addressed embedding cache (embed_cache.py) + its wiring into
+open_brain._generate_embedding().
+
+Verifies:
+  (a) stored vectors round-trip losslessly for float32 values.
+  (b) get/put keyed on (model, sha256(text)); a different model never hits.
+  (c) LRU eviction past the cap drops the least-recently-USED rows (a get
+      refreshes recency), and evicts down to 90% of the cap.
+  (d) Opening the file under a new model purges the old model's rows.
+  (e) encode_through() sends only the misses to the encoder, in one call.
+  (f) _generate_embedding() serves a repeat from the cache without touching
+      the warm server or the local model; OPEN_BRAIN_EMBED_CACHE_MAX=0
+      disables it.
+  (g) An unopenable path degrades to "no cache", never raises.
+
+Run: python3 -m pytest scripts/tests/test_embed_cache.py -v
+"""
+import array
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import embed_cache  # noqa: E402
+import open_brain  # noqa: E402
+
+
+def _f32(values):
+    return array.array("f", values).tolist()
+
+
+def test_stored_vector_round_trip_is_lossless(tmp_path):
+    c = embed_cache.EmbeddingCache("m", path=tmp_path / "c.sqlite")
+    vec = _f32([0.1 * i for i in range(768)])
+    c.put("t", vec)
+    assert c.get("t") == vec
+
+
+def test_get_put_keyed_on_model_and_text(tmp_path):
+    path = tmp_path / "c.sqlite"
+    a = embed_cache.EmbeddingCache("model-a", path=path)
+    vec = _f32([1.0, 2.0, 3.0])
+    assert a.get("hello") is None
+    a.put("hello", vec)
+    assert a.get("hello") == vec
+    assert a.get("hello ") is None
+    a.close()
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    c = embed_cache.EmbeddingCache("m", path=tmp_path / "c.sqlite", max_entries=10)
+    for i in range(10):
+        c.put(f"t{i}", [float(i)])
+    assert c.get("t0") == [0.0]  # refresh t0 -> most recently used
+    c.put("t10", [10.0])  # 11 > cap -> evict down to 9
+    assert len(c) == 9
+    assert c.get("t0") == [0.0], "recently-read row must survive eviction"
+    assert c.get("t1") is None and c.get("t2") is None
+    assert c.get("t10") == [10.0]
+
+
+def test_model_change_purges_other_models(tmp_path):
+    path = tmp_path / "c.sqlite"
+    old = embed_cache.EmbeddingCache("old-model", path=path)
+    old.put("x", [1.0])
+    old.close()
+    new = embed_cache.EmbeddingCache("new-model", path=path)
+    assert len(new) == 0
+    assert new.get("x") is None
+
+
+def test_encode_through_only_encodes_misses(tmp_path):
+    c = embed_cache.EmbeddingCache("m", path=tmp_path / "c.sqlite")
+    c.put("b", [2.0])
+    calls = []
+
+    def enc(texts):
+        calls.append(list(texts))
+        return [[float(ord(t))] for t in texts]
+
+    out = embed_cache.encode_through(c, ["a", "b", "c"], enc)
+    assert out == [[97.0], [2.0], [99.0]]
+    assert calls == [["a", "c"]]
+    assert embed_cache.encode_through(c, ["a", "c"], enc) == [[97.0], [99.0]]
+    assert len(calls) == 1
+
+
+def test_unopenable_path_is_a_miss_not_an_error(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("not a dir")
+    c = embed_cache.EmbeddingCache("m", path=blocker / "c.sqlite")
+    assert not c.available
+    assert c.get("x") is None
+    c.put("x", [1.0])  # must not raise
+
+
+def test_generate_embedding_serves_repeat_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPEN_BRAIN_EMBED_CACHE_MAX", "100")
+    monkeypatch.setenv("OPEN_BRAIN_EMBED_CACHE_PATH", str(tmp_path / "c.sqlite"))
+    vec = _f32([0.25] * 768)
+    warm = MagicMock(return_value=vec)
+    with patch.object(open_brain, "_try_warm_embed_server", warm), \
+         patch.object(open_brain, "_get_embedding_model") as local:
+        first = open_brain._generate_embedding("repo-basename")
+        second = open_brain._generate_embedding("repo-basename")
+    assert first == second == vec
+    assert warm.call_count == 1, "second call must be a cache hit"
+    local.assert_not_called()
+
+
+def test_generate_embedding_cache_disabled_by_zero_cap(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPEN_BRAIN_EMBED_CACHE_MAX", "0")
+    monkeypatch.setenv("OPEN_BRAIN_EMBED_CACHE_PATH", str(tmp_path / "c.sqlite"))
+    warm = MagicMock(return_value=[0.5] * 768)
+    with patch.object(open_brain, "_try_warm_embed_server", warm):
+        open_brain._generate_embedding("q")
+        open_brain._generate_embedding("q")
+    assert warm.call_count == 2
+    assert not (tmp_path / "c.sqlite").exists()
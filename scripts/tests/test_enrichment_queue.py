@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Write-fast capture + brain.enrichment_queue (capture(write_fast=True), enrich_pending).
+
+Mocked connection (no DB, no LLM):
+
+  (a) A write-fast capture never calls _extract_metadata, stores placeholder
+      metadata marked pending, and queues the atom in the SAME transaction
+      (queue INSERT before the commit).
+  (b) enrich_pending claims a batch, extracts concurrently, writes every
+      finished atom with one UPDATE, deletes their queue rows, and adds graph
+      edges; empty extractions back off, and give up after max_attempts; a
+      row whose last attempt crashed is stamped failed without extraction.
+  (c) Explicit stv overrides and the V1 condition recorded at capture time
+      survive enrichment; a discounted seed is matched against the REAL stv
+      columns as ::real; a failed write rolls back without raising.
+  (d) enrich_next_due for the daemon's worker; a CLI write-fast capture
+      wakes (or autostarts) the daemon.
+
+Run: python3 -m pytest scripts/tests/test_enrichment_queue.py -v
+"""
+import json
+import os
+import struct
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import open_brain  # noqa: E402
+
+
+class _Cursor:
+    def __init__(self, log, claim_rows=(), fail_on=None):
+        self.log = log
+        self.claim_rows = list(claim_rows)
+        self.fail_on = fail_on
+        self._result = []
+
+    def execute(self, sql, params=None):
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError("db write failed")
+        self.log.append(("execute", sql, params))
+        self._result = self.claim_rows if "FOR UPDATE SKIP LOCKED" in sql else []
+
+    def fetchall(self):
+        return self._result
+
+    def fetchone(self):
+        return None
+
+    def close(self):
+        pass
+
+
+def _conn(claim_rows=(), fail_on=None):
+    log = []
+    conn = MagicMock()
+    conn.cursor.side_effect = lambda: _Cursor(log, claim_rows, fail_on)
+    conn.commit.side_effect = lambda: log.append(("commit",))
+    conn.rollback.side_effect = lambda: log.append(("rollback",))
+    return conn, log
+
+
+def _executes(log, needle):
+    return [entry for entry in log if entry[0] == "execute" and needle in entry[1]]
+
+
+class TestWriteFastCapture:
+    def _capture(self, conn, **kwargs):
+        with patch.object(open_brain, "_extract_metadata") as extract, \
+             patch.object(open_brain, "_generate_embedding", return_value=[0.1] * 768), \
+             patch.object(open_brain, "_update_graph_incremental") as graph, \
+             patch.object(open_brain, "emit_replay_log"):
+            result = open_brain.capture(conn, text="decide on the queue design",
+                                        user_id="alice", **kwargs)
+        return result, extract, graph
+
+    def test_inserts_and_queues_in_one_transaction(self):
+        conn, log = _conn()
+        result, extract, graph = self._capture(conn, write_fast=True, stv_c=0.3)
+        extract.assert_not_called()
+        assert result["enrichment"] == "pending" and result["type"] == "insight"
+
+        (insert,) = _executes(log, "INSERT INTO brain.thoughts")
+        assert json.loads(insert[2][19])["enrichment"] == "pending"
+        (queued,) = _executes(log, "INSERT INTO brain.enrichment_queue")
+        assert queued[2][:2] == (result["thought_id"], "alice")
+        payload = json.loads(queued[2][2])
+        assert payload["stv_c"] == 0.3 and payload["seed_c"] == result["stv"]["c"]
+        assert log.index(queued) < log.index(("commit",))
+        # The thought node (and project edge) land now; topics come later.
+        assert graph.call_args.args[5] == [] and graph.call_args.args[4] == []
+
+    def test_env_flag_and_default(self, monkeypatch):
+        monkeypatch.delenv("OPEN_BRAIN_WRITE_FAST", raising=False)
+        conn, log = _conn()
+        with patch.object(open_brain, "_extract_metadata", return_value={}) as extract, \
+             patch.object(open_brain, "_generate_embedding", return_value=[0.1] * 768), \
+             patch.object(open_brain, "_update_graph_incremental"), \
+             patch.object(open_brain, "emit_replay_log"):
+            result = open_brain.capture(conn, text="sync capture", user_id="alice")
+        extract.assert_called_once()
+        assert "enrichment" not in result
+        assert not _executes(log, "enrichment_queue")
+        monkeypatch.setenv("OPEN_BRAIN_WRITE_FAST", "true")
+        assert open_brain._resolve_write_fast(None) is True
+        assert open_brain._resolve_write_fast(False) is False
+
+
+def _claimed(tid, attempts, payload=None, metadata=None):
+    payload = payload or {"stv_f": None, "stv_c": None, "condition": 0.0,
+                          "seed_f": 1.0, "seed_c": 0.5}
+    metadata = metadata or {"type": "insight", "summary": "placeholder", "enrichment": "pending"}
+    return (tid, attempts, payload, f"raw text of {tid}", "placeholder", "proj", metadata)
+
+
+class TestEnrichPending:
+    def _run(self, conn, extracted, **kwargs):
+        def extract(text):
+            return extracted[text.split()[-1]]
+        with patch.object(open_brain, "_extract_metadata", side_effect=extract), \
+             patch.object(open_brain, "_update_graph_incremental") as graph:
+            counts = open_brain.enrich_pending(conn, "alice", **kwargs)
+        return counts, graph
+
+    def test_batch_enrich_retry_and_give_up(self):
+        max_attempts = open_brain.ENRICH_MAX_ATTEMPTS
+        conn, log = _conn([
+            _claimed("t-ok", 1, metadata={"type": "insight", "summary": "placeholder",
+                                          "enrichment": "pending", "stored_raw": True}),
+            _claimed("t-retry", 2),
+            _claimed("t-dead", max_attempts),
+        ])
+        extracted = {
+            "t-ok": {"type": "decision", "topics": ["queues"], "people": ["Ann"],
+                     "action_items": [], "summary": "Queue design", "confidence": "high"},
+            "t-retry": {},
+            "t-dead": {},
+        }
+        counts, graph = self._run(conn, extracted)
+        assert counts == {"claimed": 3, "enriched": 1, "retrying": 1, "failed": 1}
+
+        (claim,) = _executes(log, "FOR UPDATE SKIP LOCKED")
+        assert claim[2] == (open_brain.ENRICH_LEASE_S, "alice", open_brain.ENRICH_BATCH_SIZE)
+        (apply,) = _executes(log, "UPDATE brain.thoughts t")
+        ids, summaries, types = apply[2][0], apply[2][1], apply[2][2]
+        assert ids == ["t-ok", "t-dead"]
+        assert summaries == ["Queue design", "raw text of t-dead"]
+        assert types == ["decision", "insight"]
+        ok_meta, dead_meta = (json.loads(m) for m in apply[2][6])
+        assert "enrichment" not in ok_meta and ok_meta["stored_raw"] is True
+        assert dead_meta["enrichment"] == "failed"
+        assert apply[2][8][0] == open_brain.NAL_CONFIDENCE_MAP["high"]
+        assert apply[2][-1] == "alice"
+
+        (delete,) = _executes(log, "DELETE FROM brain.enrichment_queue")
+        assert delete[2] == (["t-ok", "t-dead"],)
+        (retry,) = _executes(log, "last_error")
+        assert retry[2] == (["t-retry"], [open_brain.ENRICH_RETRY_BASE_S * 2.0])
+        assert log[-1] == ("commit",)
+
+        graph.assert_called_once()
+        assert graph.call_args.args[1:] == (
+            "t-ok", "Queue design", "decision", ["queues"], ["Ann"], "proj", "alice")
+
+    def test_crashed_last_attempt_is_stamped_failed(self):
+        # The worker claimed the last allowed attempt (attempts -> max) and died
+        # before writing; once the lease expires the row is claimed past the cap.
+        max_attempts = open_brain.ENRICH_MAX_ATTEMPTS
+        conn, log = _conn([_claimed("t-stuck", max_attempts + 1)])
+        with patch.object(open_brain, "_extract_metadata") as extract, \
+             patch.object(open_brain, "_update_graph_incremental") as graph:
+            counts = open_brain.enrich_pending(conn, "alice")
+        extract.assert_not_called()
+        graph.assert_not_called()
+        assert counts == {"claimed": 1, "enriched": 0, "retrying": 0, "failed": 1}
+        (claim,) = _executes(log, "FOR UPDATE SKIP LOCKED")
+        assert "attempts <" not in claim[1]
+        (apply,) = _executes(log, "UPDATE brain.thoughts t")
+        assert json.loads(apply[2][6][0])["enrichment"] == "failed"
+        (delete,) = _executes(log, "DELETE FROM brain.enrichment_queue")
+        assert delete[2] == (["t-stuck"],)
+        assert log[-1] == ("commit",)
+
+    def test_explicit_stv_and_condition_survive(self):
+        payload = {"stv_f": 0.8, "stv_c": 0.3, "condition": 0.0, "seed_f": 0.8, "seed_c": 0.3}
+        conn, log = _conn([_claimed("t1", 1, payload=payload)])
+        self._run(conn, {"t1": {"type": "insight", "confidence": "high", "summary": "s"}})
+        (apply,) = _executes(log, "UPDATE brain.thoughts t")
+        assert (apply[2][7][0], apply[2][8][0]) == (0.8, 0.3)
+        assert (apply[2][9][0], apply[2][10][0]) == (0.8, 0.3)
+
+        payload = {"stv_f": None, "stv_c": None, "condition": 0.95, "seed_f": 1.0, "seed_c": 0.1}
+        conn, log = _conn([_claimed("t2", 1, payload=payload)])
+        self._run(conn, {"t2": {"type": "insight", "confidence": "high", "summary": "s"}})
+        (apply,) = _executes(log, "UPDATE brain.thoughts t")
+        assert apply[2][8][0] < open_brain.NAL_CONFIDENCE_MAP["high"]
+        assert json.loads(apply[2][6][0])["condition_discounted"] is True
+
+    def test_discounted_seed_compared_at_column_type(self):
+        metadata = {"confidence": "medium"}
+        seed_f, seed_c = open_brain._capture_stv(metadata, None, None, 0.95)
+        assert metadata["condition_discounted"] is True
+        stored_c = struct.unpack("f", struct.pack("f", seed_c))[0]  # REAL column
+        assert stored_c != seed_c  # a float8 comparison would never match
+        sql = " ".join(open_brain._ENRICH_APPLY_SQL.split())
+        assert sql.count("t.stv_frequency = u.seed_f::real") == 2
+        assert sql.count("t.stv_confidence = u.seed_c::real") == 2
+        assert "= u.seed_c " not in sql and "= u.seed_f " not in sql
+
+        payload = {"stv_f": None, "stv_c": None, "condition": 0.95,
+                   "seed_f": seed_f, "seed_c": seed_c}
+        conn, log = _conn([_claimed("t1", 1, payload=payload)])
+        self._run(conn, {"t1": {"type": "insight", "confidence": "medium", "summary": "s"}})
+        (apply,) = _executes(log, "UPDATE brain.thoughts t")
+        assert (apply[2][9][0], apply[2][10][0]) == (seed_f, seed_c)
+
+    def test_empty_queue_is_one_statement(self):
+        conn, log = _conn([])
+        counts, graph = self._run(conn, {})
+        assert counts["claimed"] == 0
+        assert [e[0] for e in log] == ["execute", "commit"]
+        graph.assert_not_called()
+
+    def test_failed_write_rolls_back_without_raising(self):
+        conn, log = _conn([_claimed("t1", 1)], fail_on="UPDATE brain.thoughts t")
+        counts, graph = self._run(conn, {"t1": {"type": "insight", "summary": "s"}})
+        assert counts["enriched"] == 0 and log[-1] == ("rollback",)
+        graph.assert_not_called()
+
+    def test_next_due(self):
+        conn, cur = MagicMock(), MagicMock()
+        conn.cursor.return_value = cur
+        cur.fetchone.return_value = (12.5,)
+        assert open_brain.enrich_next_due(conn, "alice") == 12.5
+        assert "JOIN brain.thoughts t" in cur.execute.call_args.args[0]
+        assert cur.execute.call_args.args[1] == ("alice",)
+        cur.fetchone.return_value = (None,)
+        assert open_brain.enrich_next_due(conn, "alice") is None
+
+    @pytest.mark.parametrize("results,notified,answered,spawned", [
+        ({"thought_id": "t", "enrichment": "pending"}, True, True, False),
+        ([{"thought_id": "t", "enrichment": "pending"}], True, False, True),
+        ({"thought_id": "t"}, False, False, False),
+    ])
+    def test_cli_capture_wakes_the_daemon_worker(self, monkeypatch, results, notified,
+                                                 answered, spawned):
+        import brain_client
+        monkeypatch.setenv("OPEN_BRAIN_DAEMON", "1")
+        with patch.object(brain_client, "notify", return_value=answered) as notify, \
+             patch.object(brain_client, "spawn_detached") as spawn:
+            open_brain._wake_enrich_worker(results)
+        assert notify.called is notified
+        if notified:
+            assert notify.call_args.args == ("enrich_wake",)
+        assert spawn.called is spawned
+
+    def test_claim_failure_raises(self):
+        conn, _log = _conn(fail_on="FOR UPDATE SKIP LOCKED")
+        with pytest.raises(RuntimeError):
+            open_brain.enrich_pending(conn, "alice")
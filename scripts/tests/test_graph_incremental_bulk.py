@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Bulk knowledge-graph upsert in open_brain._update_graph_incremental().
+
+Mocked-cursor tests (no DB): every capture's graph maintenance is one node
+upsert (unnest arrays, RETURNING node_nk/node_id) plus one edge insert, no
+matter how many topics / people it carries.
+
+Run: python3 -m pytest scripts/tests/test_graph_incremental_bulk.py -v
+"""
+import os
+import sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import open_brain  # noqa: E402
+
+
+class _Cursor:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+        self._rows = []
+
+    def execute(self, sql, params):
+        if self.fail:
+            raise RuntimeError("relation brain.knowledge_graph_nodes does not exist")
+        self.calls.append((sql, params))
+        if "knowledge_graph_nodes" in sql:
+            self._rows = [(nk, f"id-{nk}") for nk in params[1]]
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+def _run(cur, topics, people, project="Demo"):
+    conn = MagicMock()
+    conn.cursor.return_value = cur
+    open_brain._update_graph_incremental(
+        conn, "t1", "a summary", "insight", topics, people, project, "alice",
+    )
+    return conn
+
+
+def test_two_statements_for_any_metadata_size():
+    cur = _Cursor()
+    conn = _run(cur, [f"topic {i}" for i in range(8)], ["Ann", "Bob", "Cy"])
+    assert len(cur.calls) == 2
+    node_sql, node_params = cur.calls[0]
+    assert "unnest(" in node_sql and "RETURNING node_nk, node_id" in node_sql
+    user_id, nks, types, names, sources = node_params
+    assert user_id == "alice"
+    assert nks[0] == "thought:t1" and sources[0] == "t1" and names[0] == "a summary"
+    assert len(nks) == 1 + 8 + 3 + 1
+    assert types.count("topic") == 8 and types.count("person") == 3
+    assert sources[1:] == [None] * 12
+
+    _edge_sql, edge_params = cur.calls[1]
+    user_id, edge_ids, src, tgt, kinds = edge_params
+    assert len(edge_ids) == 12
+    assert kinds.count("TAGGED_WITH") == 8 and kinds.count("RELATED_TO_PROJECT") == 1
+    i = edge_ids.index("alice|person:ann|MENTIONED_BY|thought:t1")
+    assert (src[i], tgt[i]) == ("id-person:ann", "id-thought:t1")
+    j = edge_ids.index("alice|thought:t1|TAGGED_WITH|topic:topic_0")
+    assert (src[j], tgt[j]) == ("id-thought:t1", "id-topic:topic_0")
+    conn.commit.assert_called_once()
+
+
+def test_duplicate_keys_collapse_first_spelling_wins():
+    cur = _Cursor()
+    _run(cur, ["Graph DB", "graph_db", "graph db"], [], project=None)
+    _sql, (_user, nks, _types, names, _src) = cur.calls[0]
+    assert nks == ["thought:t1", "topic:graph_db"]
+    assert names[1] == "Graph DB"
+    assert len(cur.calls[1][1][1]) == 1
+
+
+def test_bare_thought_skips_edge_statement():
+    cur = _Cursor()
+    _run(cur, [], [], project=None)
+    assert len(cur.calls) == 1
+
+
+def test_failure_is_logged_not_raised():
+    conn = _run(_Cursor(fail=True), ["x"], [])
+    conn.rollback.assert_called_once()
+    conn.commit.assert_not_called()
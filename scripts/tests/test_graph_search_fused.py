@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Fused single-statement graph_search() (fused=True / OPEN_BRAIN_GRAPH_FUSED).
+
+Mocked-connection tests (no DB):
+
+  (a) The fused statement carries the seed query, both expansions and the
+      candidate fetch, and its params line up with its placeholders (with
+      and without metadata filters / two-stage ANN seeds).
+  (b) Rows come back flagged seed / graph-only with an SQL graph_boost; the
+      Python merge adds the boost to seeds, keeps graph-only rows past the
+      threshold, applies the in-memory topic filter, and truncates.
+  (c) No graph data at all -> the seeds, as the legacy path returns them;
+      a graph hit on a missing/filtered atom still applies the threshold.
+  (d) A failing fused statement falls through to the legacy multi-query
+      path; fused is off by default.
+
+Run: python3 -m pytest scripts/tests/test_graph_search_fused.py -v
+"""
+import os
+import re
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import open_brain  # noqa: E402
+
+_COLUMNS = (
+    "thought_id", "raw_text", "summary", "thought_type", "topics", "people",
+    "action_items", "source", "project", "created_at", "stv_frequency",
+    "stv_confidence", "vec_similarity", "keyword_boost", "time_decay",
+    "hybrid_score", "graph_depth", "graph_boost", "graph_only", "kg_present",
+    "graph_hit_count",
+)
+
+
+def _row(tid, sim, hybrid, depth=None, boost=0.0, graph_only=False, topics="[]",
+         kg_present=True, graph_hit_count=0):
+    return (tid, f"raw {tid}", f"summary {tid}", "insight", topics, "[]", "[]",
+            "manual", None, None, 1.0, 0.9, sim, 0.0, 0.0, hybrid,
+            depth, boost, graph_only, None if graph_only else kg_present,
+            None if graph_only else graph_hit_count)
+
+
+def _conn(rows):
+    conn = MagicMock()
+    cur = MagicMock()
+    conn.cursor.return_value = cur
+    cur.description = [(c,) for c in _COLUMNS]
+    cur.fetchall.return_value = rows
+    return conn, cur
+
+
+def _fused(conn, **kwargs):
+    kwargs.setdefault("query", "graph query")
+    with patch.object(open_brain, "_generate_embedding", return_value=[0.1] * 768), \
+         patch.object(open_brain, "compute_effective_weights_batch", return_value={}), \
+         patch.object(open_brain, "_annotate_provenance"), \
+         patch.object(open_brain, "emit_replay_log", return_value=1):
+        return open_brain.graph_search(conn, user_id="user-x", fused=True, **kwargs)
+
+
+def _placeholders(sql_text):
+    return len(re.findall(r"(?<!%)%s", sql_text.replace("%%", "")))
+
+
+class TestStatementShape:
+    @pytest.mark.parametrize("kwargs", [
+        {},
+        {"thought_type": "decision", "date_from": "2026-01-01", "date_to": "2026-02-01",
+         "topics": ["x"], "people": ["y"]},
+    ])
+    def test_one_statement_with_matching_params(self, kwargs, monkeypatch):
+        monkeypatch.delenv("OPEN_BRAIN_ANN_CANDIDATES", raising=False)
+        conn, cur = _conn([])
+        _fused(conn, limit=4, **kwargs)
+        sql_text, params = cur.execute.call_args_list[0][0]
+        assert "brain.kg_neighborhood(sn.node_id" in sql_text
+        assert "FROM brain.atom_links al" in sql_text
+        assert "AS graph_boost" in sql_text
+        assert _placeholders(sql_text) == len(params)
+        if kwargs:
+            assert params[-3:] == ["decision", "2026-01-01", "2026-02-01"]
+        else:
+            assert params[-1] == open_brain.EMBED_MODEL
+
+    def test_ann_seeds_set_ef_search_first(self, monkeypatch):
+        monkeypatch.setenv("OPEN_BRAIN_ANN_CANDIDATES", "100")
+        conn, cur = _conn([])
+        _fused(conn, limit=4)
+        calls = cur.execute.call_args_list
+        assert "hnsw.ef_search" in calls[0][0][0]
+        sql_text, params = calls[1][0]
+        assert "WITH candidates AS" in sql_text
+        assert _placeholders(sql_text) == len(params)
+
+
+class TestMerge:
+    def test_boosts_seeds_and_keeps_graph_only_rows(self, monkeypatch):
+        monkeypatch.delenv("OPEN_BRAIN_ANN_CANDIDATES", raising=False)
+        conn, cur = _conn([
+            _row("a", 0.90, 0.80),
+            _row("b", 0.50, 0.45),                      # below threshold, no graph link
+            _row("c", 0.70, 0.60, depth=1, boost=0.1),  # seed also reached by the graph
+            _row("g", 0.0, 0.15, depth=0, boost=0.15, graph_only=True, topics='["t"]'),
+            _row("h", 0.0, 0.15, depth=0, boost=0.15, graph_only=True, topics='["other"]'),
+        ])
+        results = _fused(conn, limit=10, threshold=0.6, topics=["T"])
+
+        assert [r["THOUGHT_ID"] for r in results] == ["a", "c", "g"]
+        c = results[1]
+        assert c["HYBRID_SCORE"] == pytest.approx(0.7)
+        assert c["GRAPH_DEPTH"] == 1 and c["GRAPH_SOURCE"] is False
+        g = results[2]
+        assert g["GRAPH_SOURCE"] is True and g["GRAPH_DEPTH"] == 0
+        assert g["SIMILARITY"] == 0.0 and g["STV"] == {"f": 1.0, "c": 0.9}
+        # Only the fused SELECT plus the seed reinforcement ran on the cursor.
+        statements = [call[0][0] for call in cur.execute.call_args_list]
+        assert len(statements) == 2 and statements[1].lstrip().startswith("UPDATE")
+
+    def test_limit_truncates(self, monkeypatch):
+        monkeypatch.delenv("OPEN_BRAIN_ANN_CANDIDATES", raising=False)
+        conn, _cur = _conn([_row(f"s{i}", 0.9, 0.9 - i / 100, depth=1, boost=0.1)
+                            for i in range(6)])
+        assert len(_fused(conn, limit=2)) == 2
+
+    def test_no_graph_data_returns_seeds(self, monkeypatch):
+        monkeypatch.delenv("OPEN_BRAIN_ANN_CANDIDATES", raising=False)
+        conn, _cur = _conn([_row("a", 0.9, 0.8, kg_present=False),
+                            _row("b", 0.5, 0.45, kg_present=False)])
+        results = _fused(conn, limit=5, threshold=0.6)
+        # Legacy fallback: seeds[:limit] at the relaxed seed threshold.
+        assert [r["THOUGHT_ID"] for r in results] == ["a", "b"]
+        assert "GRAPH_DEPTH" not in results[0]
+
+    def test_links_to_missing_atoms_still_apply_threshold(self, monkeypatch):
+        monkeypatch.delenv("OPEN_BRAIN_ANN_CANDIDATES", raising=False)
+        # atom_links reached an atom that is deleted or filtered out: no row
+        # carries a graph_depth, but the legacy path still filters by threshold.
+        conn, _cur = _conn([_row("a", 0.9, 0.8, kg_present=False, graph_hit_count=1),
+                            _row("b", 0.5, 0.45, kg_present=False, graph_hit_count=1)])
+        results = _fused(conn, limit=5, threshold=0.6)
+        assert [r["THOUGHT_ID"] for r in results] == ["a"]
+
+
+class TestFallback:
+    def test_failed_statement_uses_legacy_path(self, monkeypatch):
+        monkeypatch.delenv("OPEN_BRAIN_ANN_CANDIDATES", raising=False)
+        conn, cur = _conn([])
+        cur.execute.side_effect = RuntimeError("function brain.kg_neighborhood does not exist")
+        with patch.object(open_brain, "search", return_value=[]) as legacy:
+            assert _fused(conn, limit=3) == []
+        legacy.assert_called_once()
+        conn.rollback.assert_called()
+
+    def test_off_by_default(self, monkeypatch):
+        monkeypatch.delenv("OPEN_BRAIN_GRAPH_FUSED", raising=False)
+        conn, _cur = _conn([])
+        with patch.object(open_brain, "search", return_value=[]) as legacy, \
+             patch.object(open_brain, "_graph_search_fused") as fused:
+            open_brain.graph_search(conn, query="q", user_id="u")
+        legacy.assert_called_once()
+        fused.assert_not_called()
+        monkeypatch.setenv("OPEN_BRAIN_GRAPH_FUSED", "true")
+        assert open_brain._resolve_graph_fused(None) is True
+        assert open_brain._resolve_graph_fused(False) is False
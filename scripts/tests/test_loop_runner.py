@@ -551,3 +551,111 @@ class TestShouldContinue:
         ok, reason = should_continue(s, cfg)
         assert ok
         assert reason == ""
+
+
+# ---------------------------------------------------------------------------
+# InProcessBeads — beads runners without `beads` subprocesses
+# ---------------------------------------------------------------------------
+
+
+class TestInProcessBeads:
+    @pytest.fixture
+    def store(self, tmp_path, monkeypatch):
+        from beads.storage import BeadsDatabase
+
+        (tmp_path / ".beads").mkdir()
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("OPTIVAI_LOOP_BEADS", raising=False)
+        return BeadsDatabase(tmp_path / ".beads")
+
+    def test_ready_update_close_relabel(self, store) -> None:
+        from loop_runner import _make_in_process_beads
+
+        step = store.create(title="Step", labels=["mol-1"])
+        store.create(title="Elsewhere", labels=["mol-2"])
+        beads = _make_in_process_beads()
+        assert beads is not None
+
+        ready = beads.ready("mol-1")
+        assert [b["id"] for b in ready] == [step.id]
+        assert ready[0]["title"] == "Step" and ready[0]["status"] == "open"
+
+        beads.update(step.id, "in_progress")
+        beads.relabel(step.id, "needs-review")
+        assert beads.ready("mol-1") == []
+        store.refresh()
+        assert store.get(step.id).status.value == "in_progress"
+        assert "needs-review" in store.get(step.id).labels
+
+        beads.close(step.id)
+        store.refresh()
+        assert store.get(step.id).status.value == "closed"
+
+    def test_sees_writes_from_other_processes(self, store) -> None:
+        from loop_runner import _make_in_process_beads
+
+        beads = _make_in_process_beads()
+        assert beads.ready("mol-1") == []
+        late = store.create(title="Late", labels=["mol-1"])
+        assert [b["id"] for b in beads.ready("mol-1")] == [late.id]
+
+    def test_batch_defers_to_one_append(self, store) -> None:
+        from loop_runner import _make_in_process_beads
+
+        ids = [store.create(title=f"T{i}", labels=["mol-1"]).id for i in range(3)]
+        beads = _make_in_process_beads()
+        before = store.issues_file.read_text().count("\n")
+        with beads.batch():
+            for bead_id in ids:
+                beads.update(bead_id, "in_progress")
+            assert store.issues_file.read_text().count("\n") == before
+        assert store.issues_file.read_text().count("\n") == before + 3
+
+    def test_store_errors_are_logged_not_raised(self, store, caplog) -> None:
+        from loop_runner import _make_in_process_beads
+
+        step = store.create(title="Step", labels=["mol-1"])
+        beads = _make_in_process_beads()
+        beads.close("missing-id")
+        beads.update("missing-id", "in_progress")
+        beads.relabel("missing-id", "needs-review")
+        with patch.object(beads.db, "refresh", side_effect=OSError("issues.jsonl unreadable")):
+            assert beads.ready("mol-1") == []
+            beads.close(step.id)
+            beads.update(step.id, "in_progress")
+            beads.relabel(step.id, "needs-review")
+        assert caplog.text.count("issues.jsonl unreadable") == 4
+        store.refresh()
+        assert store.get(step.id).status.value == "open"
+
+    def test_cli_override_and_parent_store(self, store, tmp_path, monkeypatch) -> None:
+        from loop_runner import _make_in_process_beads
+
+        monkeypatch.setenv("OPTIVAI_LOOP_BEADS", "cli")
+        assert _make_in_process_beads() is None
+        monkeypatch.delenv("OPTIVAI_LOOP_BEADS")
+        elsewhere = tmp_path / "nested"
+        elsewhere.mkdir()
+        monkeypatch.chdir(elsewhere)
+        assert _make_in_process_beads() is not None  # found by walking up
+
+
+# ---------------------------------------------------------------------------
+# _live_brain_capture — daemon first, CLI only when the daemon is unreachable
+# ---------------------------------------------------------------------------
+
+
+class TestLiveBrainCapture:
+    @pytest.mark.parametrize("daemon,cli_runs", [
+        ((True, {"thought_id": "t"}), 0),  # served
+        ((True, None), 0),                 # timed out / errored: may be stored already
+        ((False, None), 1),                # unreachable
+    ])
+    def test_cli_fallback_only_when_unreachable(self, daemon, cli_runs) -> None:
+        import loop_runner
+
+        with patch.object(loop_runner, "_brain_daemon_call", return_value=daemon) as d, \
+             patch.object(loop_runner.subprocess, "run") as run:
+            loop_runner._live_brain_capture("remember this", "decision")
+        assert d.call_args.kwargs["idempotent"] is False
+        assert run.call_count == cli_runs
@@ -77,12 +77,44 @@ def test_atoms_dependent_fails_safe_to_dependent_on_db_error():
 
 # ── Transitive derivation-ancestry guard (multi-hop chains + shared roots) ────
 class _FakeCursor:
-    def __init__(self, atoms):
+    def __init__(self, atoms, closure=None, log=None):
         self.atoms = atoms
+        self.closure = closure if closure is not None else {}
+        self.log = log if log is not None else []
         self._result = None
 
+    def _ancestor_rows(self, ids, max_depth):
+        """Evaluate _DERIVATION_ANCESTORS_SQL the way Postgres would."""
+        rows = []
+        for origin in ids:
+            if origin not in self.atoms:
+                continue
+            node, depth, path = origin, 0, [origin]
+            while True:
+                parent = self.atoms[node]["parent"]
+                if not parent or parent in path:
+                    break
+                rows.append((origin, parent, depth + 1))
+                if parent not in self.atoms or depth + 1 >= max_depth:
+                    break
+                node, depth = parent, depth + 1
+                path.append(parent)
+        return rows
+
     def execute(self, sql, params):
-        if "ANY(%s)" in sql:  # batch session/parent lookup
+        self.log.append(sql)
+        if "WITH RECURSIVE" in sql:  # set-based ancestry CTE
+            self._result = self._ancestor_rows(params["ids"], params["max_depth"])
+        elif "thought_ancestry" in sql:  # closure lookup
+            max_depth, ids, _user = params
+            self._result = []
+            for i in ids:
+                if i not in self.atoms:
+                    continue
+                anc = [(a, d) for a, d in self.closure.get(i, []) if d <= max_depth]
+                for a, d in anc or [(None, None)]:
+                    self._result.append((i, self.atoms[i]["parent"], a, d))
+        elif "ANY(%s)" in sql:  # batch session/parent lookup
             ids = params[0]
             self._result = [
                 (i, self.atoms[i]["session"], self.atoms[i]["parent"])
@@ -104,11 +136,13 @@ class _FakeCursor:
 
 
 class _FakeConn:
-    def __init__(self, atoms):
+    def __init__(self, atoms, closure=None):
         self.atoms = atoms
+        self.closure = closure
+        self.log = []
 
     def cursor(self):
-        return _FakeCursor(self.atoms)
+        return _FakeCursor(self.atoms, self.closure, self.log)
 
 
 def test_derivation_ancestors_walks_the_chain():
@@ -158,3 +192,51 @@ def test_derivation_ancestors_cycle_guard_terminates():
     }
     anc = open_brain._derivation_ancestors(_FakeConn(atoms), "A", "u")
     assert anc == {"B", "A"} or anc == {"B"}  # terminates; exact set depends on stop point
+
+
+def test_atoms_dependent_ancestry_is_one_query():
+    """Both premises' ancestor sets come from one recursive CTE, however deep."""
+    atoms = {"R": {"session": "s0", "parent": None}}
+    prev = "R"
+    for i in range(10):
+        atoms[f"X{i}"] = {"session": f"x{i}", "parent": prev}
+        prev = f"X{i}"
+    atoms["Y"] = {"session": "y", "parent": "R"}
+    conn = _FakeConn(atoms)
+    assert open_brain._atoms_dependent(conn, "X9", "Y", "u") is True
+    assert len(conn.log) == 2  # session/parent lookup + one ancestry CTE
+
+
+def test_derivation_ancestors_respects_depth_cap():
+    atoms = {"A0": {"session": "s", "parent": None}}
+    for i in range(1, 20):
+        atoms[f"A{i}"] = {"session": "s", "parent": f"A{i - 1}"}
+    anc = open_brain._derivation_ancestors(_FakeConn(atoms), "A19", "u")
+    assert anc == {f"A{i}" for i in range(7, 19)}  # 12 hops
+
+
+def test_closure_serves_materialized_atoms(monkeypatch):
+    """With the closure on, a materialized atom never reaches the CTE."""
+    monkeypatch.setenv("OPEN_BRAIN_ANCESTRY_CLOSURE", "true")
+    atoms = {
+        "A": {"session": "s1", "parent": None},
+        "B": {"session": "s2", "parent": "A"},
+        "C": {"session": "s3", "parent": "B"},
+    }
+    closure = {"B": [("A", 1)], "C": [("B", 1), ("A", 2)]}
+    conn = _FakeConn(atoms, closure)
+    assert open_brain._derivation_ancestors_many(conn, ["A", "C"], "u") == {"A": set(), "C": {"A", "B"}}
+    assert not any("WITH RECURSIVE" in q for q in conn.log)
+
+
+def test_closure_falls_back_when_not_materialized(monkeypatch):
+    """An atom with a parent but no depth-1 closure row is walked by the CTE."""
+    monkeypatch.setenv("OPEN_BRAIN_ANCESTRY_CLOSURE", "true")
+    atoms = {
+        "A": {"session": "s1", "parent": None},
+        "B": {"session": "s2", "parent": "A"},
+        "C": {"session": "s3", "parent": "B"},
+    }
+    conn = _FakeConn(atoms, {"B": [("A", 1)]})  # C captured before the flag
+    assert open_brain._derivation_ancestors_many(conn, ["B", "C"], "u") == {"B": {"A"}, "C": {"A", "B"}}
+    assert sum("WITH RECURSIVE" in q for q in conn.log) == 1
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""pg_pool.ConnectionPool — health checks, recycling, reconnect (no DB).
+
+Connections are MagicMocks; time comes from a fake clock so idle/lifetime
+thresholds are exercised without sleeping.
+
+  (a) LIFO reuse with rollback on check-in; query errors keep the
+      connection, disconnect errors close it.
+  (b) Idle past check_after_s -> SELECT 1 health check; a failing check
+      or a connection idle past max_idle_s / older than max_lifetime_s is
+      replaced.
+  (c) run(retry=True) re-runs once after a disconnect; retry=False and
+      non-disconnect errors propagate.
+  (d) open_brain.pooled_connection() builds one process-wide pool, prefers
+      OPEN_BRAIN_POOLER_URL, and asks _connect for keepalives.
+
+Run: python3 -m pytest scripts/tests/test_pg_pool.py -v
+"""
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pg_pool  # noqa: E402
+
+
+class OperationalError(Exception):
+    """Stand-in for psycopg2.OperationalError (matched by class name)."""
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _pool(**kwargs):
+    made = []
+
+    def connect():
+        conn = MagicMock()
+        conn.closed = 0
+        made.append(conn)
+        return conn
+
+    clock = _Clock()
+    return pg_pool.ConnectionPool(connect, clock=clock, **kwargs), made, clock
+
+
+class TestReuse:
+    def test_reuses_and_rolls_back(self):
+        pool, made, _ = _pool()
+        with pool.connection() as a:
+            pass
+        with pool.connection() as b:
+            pass
+        assert a is b and len(made) == 1
+        assert a.rollback.call_count == 2
+        assert pool.stats()["reused"] == 1
+
+    def test_query_error_keeps_connection(self):
+        pool, made, _ = _pool()
+        with pytest.raises(ValueError):
+            with pool.connection():
+                raise ValueError("syntax error")
+        with pool.connection() as conn:
+            assert conn is made[0]
+
+    def test_disconnect_closes_connection(self):
+        pool, made, _ = _pool()
+        with pytest.raises(OperationalError):
+            with pool.connection():
+                raise OperationalError("SSL connection has been closed unexpectedly")
+        made[0].close.assert_called_once()
+        with pool.connection() as conn:
+            assert conn is made[1]
+
+    def test_acquire_timeout(self):
+        pool, _, _ = _pool(max_size=1, acquire_timeout_s=0.01)
+        with pool.connection():
+            with pytest.raises(TimeoutError):
+                with pool.connection():
+                    pass
+
+
+class TestRecycling:
+    def test_recent_connection_skips_health_check(self):
+        pool, made, clock = _pool(check_after_s=30)
+        with pool.connection():
+            pass
+        clock.now += 5
+        with pool.connection() as conn:
+            conn.cursor.assert_not_called()
+
+    def test_health_check_after_idle(self):
+        pool, made, clock = _pool(check_after_s=30)
+        with pool.connection():
+            pass
+        clock.now += 60
+        with pool.connection() as conn:
+            assert conn is made[0]
+            conn.cursor.return_value.execute.assert_called_once_with("SELECT 1")
+
+    def test_failed_health_check_reconnects(self):
+        pool, made, clock = _pool(check_after_s=30)
+        with pool.connection():
+            pass
+        made[0].cursor.return_value.execute.side_effect = OperationalError("gone")
+        clock.now += 60
+        with pool.connection() as conn:
+            assert conn is made[1]
+        assert pool.stats()["failed_checks"] == 1
+
+    @pytest.mark.parametrize("advance,kwargs", [
+        (400, {"max_idle_s": 300}),
+        (10, {"max_lifetime_s": 5}),
+    ])
+    def test_stale_connections_recycled(self, advance, kwargs):
+        pool, made, clock = _pool(check_after_s=1e9, **kwargs)
+        with pool.connection():
+            pass
+        clock.now += advance
+        with pool.connection() as conn:
+            assert conn is made[1]
+        assert pool.stats()["recycled"] == 1
+
+    def test_closed_idle_connection_recycled(self):
+        pool, made, _ = _pool()
+        with pool.connection() as conn:
+            pass
+        conn.closed = 2
+        with pool.connection() as fresh:
+            assert fresh is made[1]
+
+
+class TestRun:
+    def _flaky(self, exc):
+        calls = []
+
+        def fn(conn):
+            calls.append(conn)
+            if len(calls) == 1:
+                raise exc
+            return "ok"
+        return fn, calls
+
+    def test_retry_after_disconnect(self):
+        pool, made, _ = _pool()
+        fn, calls = self._flaky(OperationalError("terminating connection"))
+        assert pool.run(fn, retry=True) == "ok"
+        assert calls == made and len(made) == 2
+
+    def test_no_retry_without_flag(self):
+        pool, _, _ = _pool()
+        fn, calls = self._flaky(OperationalError("terminating connection"))
+        with pytest.raises(OperationalError):
+            pool.run(fn)
+        assert len(calls) == 1
+
+    def test_query_errors_not_retried(self):
+        pool, _, _ = _pool()
+        fn, calls = self._flaky(ValueError("bad"))
+        with pytest.raises(ValueError):
+            pool.run(fn, retry=True)
+        assert len(calls) == 1
+
+
+class TestOpenBrainPool:
+    def test_pooler_url_and_keepalive(self, monkeypatch):
+        import open_brain
+        monkeypatch.setattr(open_brain, "_conn_pool", None)
+        monkeypatch.setenv("OPEN_BRAIN_POOLER_URL", "postgresql://127.0.0.1:6432/brain")
+        monkeypatch.setenv("OPEN_BRAIN_POOL_SIZE", "2")
+        conn = MagicMock()
+        conn.closed = 0
+        with patch.object(open_brain, "_connect", return_value=conn) as connect, \
+             patch.object(open_brain, "_get_database_url") as direct:
+            with open_brain.pooled_connection() as c:
+                assert c is conn
+            assert open_brain._connection_pool() is open_brain._connection_pool()
+        connect.assert_called_once_with("postgresql://127.0.0.1:6432/brain", keepalive=True)
+        direct.assert_not_called()
+        assert open_brain._connection_pool().max_size == 2
+
+    @pytest.mark.parametrize("dsn,expected_sep", [
+        ("postgresql://h/db", "?"),
+        ("postgresql://h/db?sslmode=require", "&"),
+    ])
+    def test_connect_keepalive_dsn(self, dsn, expected_sep):
+        import open_brain
+        import psycopg2
+        with patch.object(psycopg2, "connect") as pg_connect:
+            open_brain._connect(dsn, keepalive=True)
+        sent = pg_connect.call_args.args[0]
+        assert sent.startswith(dsn + expected_sep + "connect_timeout=10")
+        assert sent.endswith("&" + open_brain.POOL_KEEPALIVE_PARAMS)
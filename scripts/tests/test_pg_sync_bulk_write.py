@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""pg_sync.PostgresWriter bulk ingestion — COPY staging + execute_values fallback.
+
+write_batch picks a path by ``write_mode`` (sync.write_mode in the config):
+
+  * auto   — COPY into a temp stage table + INSERT ... SELECT ON CONFLICT
+             for batches >= copy_threshold, multi-row INSERT below it
+  * copy / values / row — force one path ("row" is the legacy loop)
+
+A refused COPY is rewound to a savepoint and retried through
+execute_values inside the same transaction.
+
+No DB: the connection and cursor are MagicMocks, and execute_values is
+patched (the real one needs a live cursor for mogrify).
+
+Run: python3 -m pytest scripts/tests/test_pg_sync_bulk_write.py -v
+"""
+import json
+import os
+import re
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pg_sync  # noqa: E402
+
+
+def _entries(n):
+    return [
+        {"operation": "user.prompt", "prompt": f"p{i}\tx\n", "session_id": f"sess{i:08d}",
+         "epoch": 1700000000 + i, "project": "demo", "user": "u",
+         "timestamp": "2026-01-01T00:00:00+00:00"}
+        for i in range(n)
+    ]
+
+
+def _writer(**kwargs):
+    writer = pg_sync.PostgresWriter("postgresql://u:p@h/db", **kwargs)
+    writer._conn = MagicMock()
+    cursor = writer._conn.cursor.return_value
+    return writer, cursor
+
+
+def _sql(cursor):
+    return [c.args[0] for c in cursor.execute.call_args_list]
+
+
+def test_copy_field_escaping():
+    assert pg_sync._copy_field(None) == "\\N"
+    assert pg_sync._copy_field("a\\b\tc\nd\re") == "a\\\\b\\tc\\nd\\re"
+    assert pg_sync._copy_line(("x", None, 3)) == "x\t\\N\t3\n"
+
+
+def test_auto_small_batch_uses_execute_values():
+    writer, cursor = _writer(copy_threshold=10, page_size=7)
+    with patch("psycopg2.extras.execute_values", return_value=[(1,), (1,)]) as ev:
+        assert writer.write_batch(_entries(3)) == 2
+    sql, rows = ev.call_args.args[1], ev.call_args.args[2]
+    assert "ON CONFLICT (event_id) DO NOTHING RETURNING 1" in sql
+    assert len(rows) == 3 and ev.call_args.kwargs["page_size"] == 7
+    assert ev.call_args.kwargs["fetch"] is True
+    writer._conn.commit.assert_called_once()
+
+
+def test_auto_large_batch_copies_through_stage_table():
+    writer, cursor = _writer(copy_threshold=2)
+    cursor.rowcount = 4
+    assert writer.write_batch(_entries(4)) == 4
+
+    statements = _sql(cursor)
+    assert statements[0] == "SAVEPOINT pg_sync_copy"
+    assert "CREATE TEMP TABLE IF NOT EXISTS pg_sync_stage ON COMMIT DELETE ROWS" in statements[1]
+    assert "RELEASE SAVEPOINT pg_sync_copy" in statements
+    assert statements[-1].startswith("INSERT INTO landing.raw_events")
+    assert "FROM pg_sync_stage ON CONFLICT (event_id) DO NOTHING" in statements[-1]
+
+    copy_sql, buf = cursor.copy_expert.call_args.args
+    assert copy_sql.startswith("COPY pg_sync_stage (event_id, tenant_id")
+    lines = buf.getvalue().split("\n")
+    assert lines[-1] == "" and len(lines) == 5
+    fields = lines[0].split("\t")
+    assert len(fields) == len(pg_sync.RAW_EVENT_COLUMNS)
+    # The prompt's tab/newline are escaped, so the metadata stays one field.
+    metadata = fields[pg_sync.RAW_EVENT_COLUMNS.index("metadata")]
+    unescaped = re.sub(r"\\(.)", lambda m: {"t": "\t", "n": "\n", "r": "\r"}.get(m.group(1), m.group(1)), metadata)
+    assert json.loads(unescaped)["prompt"] == "p0\tx\n"
+    writer._conn.commit.assert_called_once()
+
+
+def test_refused_copy_falls_back_to_execute_values():
+    writer, cursor = _writer(write_mode="copy")
+    cursor.copy_expert.side_effect = RuntimeError("COPY not supported")
+    with patch("psycopg2.extras.execute_values", return_value=[(1,)] * 3) as ev:
+        assert writer.write_batch(_entries(3)) == 3
+    assert "ROLLBACK TO SAVEPOINT pg_sync_copy" in _sql(cursor)
+    ev.assert_called_once()
+    writer._conn.commit.assert_called_once()
+    writer._conn.rollback.assert_not_called()
+
+
+def test_row_mode_keeps_per_event_inserts():
+    writer, cursor = _writer(write_mode="row")
+    cursor.rowcount = 1
+    assert writer.write_batch(_entries(3)) == 3
+    assert cursor.execute.call_count == 3
+    assert "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s)" in _sql(cursor)[0]
+
+
+def test_failed_batch_rolls_back_and_raises():
+    writer, cursor = _writer(write_mode="values")
+    with patch("psycopg2.extras.execute_values", side_effect=RuntimeError("boom")):
+        with pytest.raises(RuntimeError):
+            writer.write_batch(_entries(2))
+    writer._conn.rollback.assert_called_once()
+    writer._conn.commit.assert_not_called()
+
+
+def test_invalid_write_mode_rejected():
+    with pytest.raises(ValueError):
+        pg_sync.PostgresWriter("postgresql://u:p@h/db", write_mode="bulk")
+
+
+def test_sync_service_passes_sync_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = tmp_path / "auto-logger-config.json"
+    config.write_text(json.dumps({"destinations": {"postgresql": {
+        "enabled": True, "connection_string": "postgresql://u:p@h/db",
+        "sync": {"write_mode": "values", "page_size": 250},
+    }}}), encoding="utf-8")
+    service = pg_sync.SyncService(config_path=config, scan_paths=[tmp_path])
+    assert service.writer.write_mode == "values"
+    assert service.writer.page_size == 250
+    assert service.writer.copy_threshold == pg_sync.DEFAULT_COPY_THRESHOLD
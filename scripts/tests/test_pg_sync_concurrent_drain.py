@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""pg_sync.SyncService concurrent drain — worker pool, drain-to-caught-up, backpressure.
+
+run_once() hands each project to a bounded ThreadPoolExecutor (sync.workers).
+A worker borrows its own PostgresWriter and keeps writing batch_size batches
+until the project is caught up or sync.max_batches_per_pass is hit, saving
+the shared SyncState checkpoint after every committed batch.
+
+No DB: a FakeWriter records batches and flags any writer used by two
+threads at once. HOME is redirected to tmp_path so the real state file is
+never touched.
+
+Run: python3 -m pytest scripts/tests/test_pg_sync_concurrent_drain.py -v
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pg_sync  # noqa: E402
+
+
+class FakeWriter:
+    def __init__(self, registry, fail=False):
+        self.registry = registry
+        self.fail = fail
+        self.batches = []
+        self.busy = False
+        self.closed = 0
+        registry.append(self)
+
+    def clone(self):
+        return FakeWriter(self.registry, fail=self.fail)
+
+    def write_batch(self, entries):
+        if self.busy:
+            raise AssertionError("writer shared between workers")
+        self.busy = True
+        try:
+            time.sleep(0.005)
+            if self.fail:
+                raise RuntimeError("db down")
+            self.batches.append(len(entries))
+            return len(entries)
+        finally:
+            self.busy = False
+
+    def close(self):
+        self.closed += 1
+
+
+def _project(scan_dir, name, n):
+    logs = scan_dir / name / ".claude" / "logs"
+    logs.mkdir(parents=True)
+    log = logs / "agent-activity-2026-01-01.log"
+    log.write_text("".join(
+        json.dumps({"operation": "user.prompt", "prompt": f"{name}-{i}", "epoch": i}) + "\n"
+        for i in range(n)
+    ), encoding="utf-8")
+    return scan_dir / name, log
+
+
+def _service(tmp_path, monkeypatch, fail=False, **sync):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = tmp_path / "auto-logger-config.json"
+    sync.setdefault("retry_delay_seconds", 0)
+    config.write_text(json.dumps({"destinations": {"postgresql": {
+        "enabled": True, "connection_string": "postgresql://u:p@h/db", "sync": sync,
+    }}}), encoding="utf-8")
+    scan_dir = tmp_path / "scan"
+    scan_dir.mkdir(exist_ok=True)
+    service = pg_sync.SyncService(config_path=config, scan_paths=[scan_dir])
+    registry = []
+    service.writer = FakeWriter(registry, fail=fail)
+    service._idle_writers = [service.writer]
+    service._all_writers = [service.writer]
+    return service, scan_dir, registry
+
+
+def test_drains_backlog_until_caught_up(tmp_path, monkeypatch):
+    service, scan_dir, registry = _service(tmp_path, monkeypatch, batch_size=100, workers=1)
+    project, log = _project(scan_dir, "alpha", 250)
+
+    assert service.run_once() == 250
+    assert registry[0].batches == [100, 100, 50]
+    last_file, position = service.state.get_project_position(str(project))
+    assert last_file == str(log) and position == log.stat().st_size
+    assert not service._backlogged
+    assert service.run_once() == 0
+
+
+def test_batch_cap_leaves_project_backlogged(tmp_path, monkeypatch):
+    service, scan_dir, registry = _service(
+        tmp_path, monkeypatch, batch_size=100, workers=1, max_batches_per_pass=2)
+    project, _log = _project(scan_dir, "alpha", 250)
+
+    assert service.run_once() == 200
+    assert service._backlogged == {project}
+    assert service.run_once() == 50
+    assert not service._backlogged
+
+
+def test_projects_drain_concurrently_with_own_writers(tmp_path, monkeypatch):
+    service, scan_dir, registry = _service(tmp_path, monkeypatch, batch_size=10, workers=3)
+    projects = [_project(scan_dir, f"p{i}", 35)[0] for i in range(3)]
+
+    threads_seen = set()
+    original = FakeWriter.write_batch
+
+    def tracking(self, entries):
+        threads_seen.add(threading.current_thread().name)
+        return original(self, entries)
+
+    monkeypatch.setattr(FakeWriter, "write_batch", tracking)
+    assert service.run_once() == 105
+    assert len(registry) <= 3
+    assert len(threads_seen) > 1
+    assert sum(sum(w.batches) for w in registry) == 105
+
+    saved = json.loads(service.state_file.read_text(encoding="utf-8"))
+    assert set(saved["projects"]) == {str(p) for p in projects}
+    assert saved["total_synced"] == 105
+    assert not service.state_file.with_name(service.state_file.name + ".tmp").exists()
+
+    service.shutdown()
+    assert all(w.closed for w in registry)
+
+
+def test_failed_write_keeps_checkpoint_and_waits(tmp_path, monkeypatch):
+    service, scan_dir, registry = _service(
+        tmp_path, monkeypatch, fail=True, batch_size=100, workers=1, retry_attempts=2)
+    project, _log = _project(scan_dir, "alpha", 20)
+
+    assert service.run_once() == 0
+    assert service.state.get_project_position(str(project)) == ("", 0)
+    assert registry[0].closed == 1  # reconnect between the two attempts
+    assert not service._backlogged
+
+
+def test_duplicate_scan_hits_drained_once(tmp_path, monkeypatch):
+    service, scan_dir, registry = _service(tmp_path, monkeypatch, batch_size=100, workers=4)
+    project, _log = _project(scan_dir, "alpha", 30)
+    monkeypatch.setattr(service.scanner, "find_projects_with_logs", lambda: [project, project])
+
+    assert service.run_once() == 30
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""pg_sync event-driven watching — InotifyWatcher / PollingWatcher / _run_watching.
+
+In continuous mode (sync.watch, default "auto") the service walks the scan
+paths only every rescan_interval_seconds; in between, a watcher on each
+known project's logs directory reports which projects were written, and
+only those are synced — immediately.
+
+  (a) Both watchers report a project when one of its sync logs grows or a
+      new day's log appears, and ignore unrelated files.
+  (b) make_watcher: mode validation, "off", and the polling fallback.
+  (c) _run_watching syncs an appended entry without waiting for a rescan,
+      and retries a project whose write failed only once per flush interval.
+
+No DB: a stub writer counts entries. HOME is redirected to tmp_path.
+
+Run: python3 -m pytest scripts/tests/test_pg_sync_watcher.py -v
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pg_sync  # noqa: E402
+
+
+def _project(root, name="alpha"):
+    logs = root / name / ".claude" / "logs"
+    logs.mkdir(parents=True)
+    log = logs / "agent-activity-2026-01-01.log"
+    log.write_text(json.dumps({"operation": "user.prompt", "epoch": 1}) + "\n", encoding="utf-8")
+    return root / name, log
+
+
+def _append(log, epoch):
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"operation": "user.prompt", "epoch": epoch}) + "\n")
+
+
+@pytest.fixture(params=["poll", "inotify"])
+def watcher(request):
+    if request.param == "poll":
+        return pg_sync.PollingWatcher(poll_interval=0.05)
+    try:
+        return pg_sync.InotifyWatcher(debounce=0.05)
+    except (OSError, AttributeError):
+        pytest.skip("inotify unavailable on this platform")
+
+
+class TestWatchers:
+    def test_append_and_new_file_reported(self, watcher, tmp_path):
+        project, log = _project(tmp_path)
+        watcher.watch(project)
+        try:
+            assert watcher.wait(0.2) == set()
+            _append(log, 2)
+            assert watcher.wait(2.0) == {project}
+            (log.parent / "beads-events-2026-01-02.log").write_text("{}\n", encoding="utf-8")
+            assert watcher.wait(2.0) == {project}
+        finally:
+            watcher.close()
+
+    def test_unrelated_files_ignored(self, watcher, tmp_path):
+        project, log = _project(tmp_path)
+        watcher.watch(project)
+        try:
+            (log.parent / "hook_errors.log").write_text("boom\n", encoding="utf-8")
+            (log.parent / "activity.jsonl").write_text("{}\n", encoding="utf-8")
+            assert watcher.wait(0.3) == set()
+        finally:
+            watcher.close()
+
+
+def test_make_watcher_modes():
+    assert pg_sync.make_watcher("off") is None
+    assert isinstance(pg_sync.make_watcher("poll", 3), pg_sync.PollingWatcher)
+    auto = pg_sync.make_watcher("auto")
+    assert isinstance(auto, (pg_sync.InotifyWatcher, pg_sync.PollingWatcher))
+    auto.close()
+    with pytest.raises(ValueError):
+        pg_sync.make_watcher("fsevents")
+
+
+def test_auto_falls_back_to_polling(monkeypatch):
+    def unavailable(*_a, **_k):
+        raise OSError("no inotify")
+    monkeypatch.setattr(pg_sync.InotifyWatcher, "__init__", unavailable)
+    assert isinstance(pg_sync.make_watcher("auto"), pg_sync.PollingWatcher)
+
+
+class CountingWriter:
+    def __init__(self):
+        self.written = 0
+
+    def clone(self):
+        return self
+
+    def write_batch(self, entries):
+        self.written += len(entries)
+        return len(entries)
+
+    def close(self):
+        pass
+
+
+class FailingForProjectWriter(CountingWriter):
+    """Postgres "down" for one project: its entries (operation "doomed") never write."""
+
+    def __init__(self):
+        super().__init__()
+        self.failed_attempts = 0
+
+    def write_batch(self, entries):
+        if any(e.get("operation") == "doomed" for e in entries):
+            self.failed_attempts += 1
+            raise ConnectionError("server closed the connection unexpectedly")
+        return super().write_batch(entries)
+
+
+def _service(tmp_path, writer, sync=None):
+    config = tmp_path / "auto-logger-config.json"
+    config.write_text(json.dumps({"destinations": {"postgresql": {
+        "enabled": True, "connection_string": "postgresql://u:p@h/db", "sync": sync or {},
+    }}}), encoding="utf-8")
+    scan_dir = tmp_path / "scan"
+    scan_dir.mkdir()
+    service = pg_sync.SyncService(config_path=config, scan_paths=[scan_dir])
+    service.writer = writer
+    service._idle_writers = [writer]
+    service._all_writers = [writer]
+    return service, scan_dir
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return predicate()
+
+
+def test_run_watching_syncs_on_write_without_rescan(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    writer = CountingWriter()
+    service, scan_dir = _service(tmp_path, writer)
+    project, log = _project(scan_dir)
+
+    scans = []
+    real_scan = service.scanner.find_projects_with_logs
+    monkeypatch.setattr(service.scanner, "find_projects_with_logs",
+                        lambda: scans.append(1) or real_scan())
+
+    watcher = pg_sync.PollingWatcher(poll_interval=0.05)
+    thread = threading.Thread(
+        target=service._run_watching, args=(watcher, 60, 3600), daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while writer.written < 1 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert writer.written == 1  # initial scan pass
+
+        _append(log, 2)
+        deadline = time.monotonic() + 5
+        while writer.written < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert writer.written == 2
+        assert len(scans) == 1  # the write was picked up by the watcher, not a rescan
+    finally:
+        service._running = False
+        thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_failed_project_retried_once_per_flush_interval(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    writer = FailingForProjectWriter()
+    service, scan_dir = _service(tmp_path, writer, sync={"retry_attempts": 1, "workers": 1})
+    _project_ok, log = _project(scan_dir)
+    doomed = scan_dir / "doomed" / ".claude" / "logs"
+    doomed.mkdir(parents=True)
+    (doomed / "agent-activity-2026-01-01.log").write_text(
+        json.dumps({"operation": "doomed", "epoch": 1}) + "\n", encoding="utf-8")
+
+    watcher = pg_sync.PollingWatcher(poll_interval=0.05)
+    thread = threading.Thread(
+        target=service._run_watching, args=(watcher, 60, 3600), daemon=True)
+    thread.start()
+    try:
+        assert _wait_for(lambda: writer.written == 1 and writer.failed_attempts == 1)
+        for epoch in range(2, 6):  # several writes inside one flush interval
+            _append(log, epoch)
+            assert _wait_for(lambda: writer.written == epoch)
+        assert writer.failed_attempts == 1
+    finally:
+        service._running = False
+        thread.join(5)
+    assert not thread.is_alive()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Session priming in one call — open_brain.prime / --prime / op=prime.
+
+Mocked connection (no DB, no model):
+
+  (a) recent() and search() run on the SAME connection; the query goes
+      through search() exactly once.
+  (b) A failing search rolls back and is reported as search_error, keeping
+      the recent list; an empty query skips the search.
+  (c) --prime --json prints {recent, search} using --days / --limit /
+      --search-limit.
+
+Run: python3 -m pytest scripts/tests/test_prime.py -v
+"""
+import json
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import open_brain  # noqa: E402
+
+
+def _prime(conn, query="my-project", search_effect=None):
+    with patch.object(open_brain, "recent", return_value=[{"THOUGHT_ID": "r"}]) as rec, \
+         patch.object(open_brain, "search", return_value=[{"THOUGHT_ID": "s"}],
+                      side_effect=search_effect) as srch:
+        result = open_brain.prime(conn, query=query, user_id="alice", days=3,
+                                  recent_limit=10, search_limit=5)
+    return result, rec, srch
+
+
+def test_recent_and_search_share_the_connection():
+    conn = MagicMock()
+    result, rec, srch = _prime(conn)
+    assert result == {"recent": [{"THOUGHT_ID": "r"}], "search": [{"THOUGHT_ID": "s"}]}
+    assert rec.call_args.args == (conn,) and srch.call_args.args == (conn,)
+    assert rec.call_args.kwargs == {"user_id": "alice", "days": 3, "limit": 10}
+    srch.assert_called_once_with(conn, query="my-project", user_id="alice", limit=5)
+
+
+def test_search_failure_keeps_recent():
+    conn = MagicMock()
+    result, _rec, _srch = _prime(conn, search_effect=RuntimeError("embed server down"))
+    assert result["recent"] == [{"THOUGHT_ID": "r"}] and result["search"] == []
+    assert result["search_error"] == "embed server down"
+    conn.rollback.assert_called_once()
+
+
+def test_blank_query_skips_search():
+    result, _rec, srch = _prime(MagicMock(), query="  ")
+    srch.assert_not_called()
+    assert result["search"] == [] and "search_error" not in result
+
+
+def test_cli_prime_json(capsys):
+    primed = {"recent": [], "search": [{"THOUGHT_ID": "s"}]}
+    argv = ["open_brain.py", "--prime", "proj", "--days", "3", "--limit", "10",
+            "--search-limit", "4", "--json"]
+    with patch.object(sys, "argv", argv), \
+         patch.object(open_brain, "_connect", return_value=MagicMock()), \
+         patch.object(open_brain, "_get_user_id", return_value="alice"), \
+         patch.object(open_brain, "prime", return_value=primed) as pr:
+        open_brain.main()
+    assert json.loads(capsys.readouterr().out) == primed
+    assert pr.call_args.kwargs == {"query": "proj", "user_id": "alice", "days": 3,
+                                   "recent_limit": 10, "search_limit": 4}
@@ -227,6 +227,134 @@ class TestR3AndF5:
         )
 
 
+class TestNumpyCollapseParity:
+    """The NumPy Gram-matrix collapse == the pure-Python reference, exactly."""
+
+    @staticmethod
+    def _clustered(seed: int, n: int = 50, dim: int = 768) -> list:
+        import random
+        rng = random.Random(seed)
+        centers = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(6)]
+        atoms = []
+        for i in range(n):
+            if i % 11 == 5:
+                atoms.append(_atom(_id(i)))  # D2: no embedding
+                continue
+            c = centers[rng.randrange(len(centers))]
+            noise = rng.choice([0.05, 0.2, 0.3, 0.35, 1.0])
+            atoms.append(_atom(_id(i), embedding=[x + rng.gauss(0, noise) for x in c]))
+        return atoms
+
+    def _both(self, atoms, monkeypatch):
+        fast = open_brain._semantic_dedup(copy.deepcopy(atoms))
+        monkeypatch.setattr(open_brain, "_numpy", lambda: None)
+        slow = open_brain._semantic_dedup(copy.deepcopy(atoms))
+        return fast, slow
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_clusters_match_pure_path(self, seed, monkeypatch):
+        pytest.importorskip("numpy")
+        fast, slow = self._both(self._clustered(seed), monkeypatch)
+        assert fast == slow
+        assert any(s.get("NEAR_DUPLICATE_COUNT") for s in fast)
+
+    def test_pairs_straddling_threshold_decided_exactly(self, monkeypatch):
+        pytest.importorskip("numpy")
+        import math
+        atoms = [_atom(_id(0), embedding=[1.0, 0.0, 0.0])]
+        for i, delta in enumerate((-2e-7, -1e-9, 0.0, 1e-9, 2e-7), start=1):
+            theta = math.acos(open_brain.DEDUP_COSINE + delta)
+            atoms.append(_atom(_id(i), embedding=[math.cos(theta), 0.0, math.sin(theta)]))
+        fast, slow = self._both(atoms, monkeypatch)
+        assert fast == slow
+
+    def test_zero_vector_and_mixed_dims_match(self, monkeypatch):
+        pytest.importorskip("numpy")
+        v = [1.0, 0.0, 0.0, 0.0]
+        zero = [_atom(_id(1), embedding=[0.0] * 4), _atom(_id(2), embedding=v),
+                _atom(_id(3), embedding=[0.0] * 4), _atom(_id(4), embedding=v)]
+        mixed = [_atom(_id(1), embedding=v), _atom(_id(2), embedding=v + [0.0]),
+                 _atom(_id(3), embedding=v)]
+        for atoms in (zero, mixed):
+            fast, slow = self._both(atoms, monkeypatch)
+            assert fast == slow
+
+
+class TestServerSideDedup:
+    """dedup_server: Postgres returns neighbour ids, Python collapses them."""
+
+    @staticmethod
+    def _as_adjacency(atoms: list) -> list:
+        # What the _near_ids subquery computes, from the same embeddings.
+        out = copy.deepcopy(atoms)
+        for r in out:
+            if not r.get("_EMBEDDING"):
+                continue
+            r["_NEAR_IDS"] = {
+                o["THOUGHT_ID"] for o in atoms
+                if o is not r and o["THOUGHT_ID"] != r["THOUGHT_ID"] and o.get("_EMBEDDING")
+                and len(o["_EMBEDDING"]) == len(r["_EMBEDDING"])
+                and open_brain._cosine_similarity(r["_EMBEDDING"], o["_EMBEDDING"])
+                >= open_brain.DEDUP_COSINE
+            }
+        for r in out:
+            r.pop("_EMBEDDING", None)
+        return out
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_adjacency_collapse_matches_embedding_collapse(self, seed, monkeypatch):
+        atoms = TestNumpyCollapseParity._clustered(seed)
+        server = open_brain._semantic_dedup(self._as_adjacency(atoms))
+        monkeypatch.setattr(open_brain, "_numpy", lambda: None)
+        client = open_brain._semantic_dedup(copy.deepcopy(atoms))
+        assert server == client
+        assert all("_NEAR_IDS" not in s for s in server)
+
+    def test_sql_returns_neighbour_ids_not_embeddings(self):
+        mock_conn, mock_cur = TestD7SqlByteStability._make_mock_conn()
+        with patch.object(open_brain, "_generate_embedding", return_value=[0.1] * 768), \
+             patch.object(open_brain, "emit_replay_log", return_value=1):
+            open_brain.search(
+                mock_conn, query="server dedup", user_id="user-x",
+                limit=5, dedup=True, dedup_server=True,
+            )
+        sql_text, params = mock_cur.execute.call_args_list[0][0]
+        assert "vector_send" not in sql_text and "_embedding_bin" not in sql_text
+        assert "AS _near_ids" in sql_text and "WITH hits AS" in sql_text
+        expected_limit = min(5 * open_brain.DEDUP_OVERFETCH_FACTOR, open_brain.DEDUP_OVERFETCH_CAP)
+        assert params[-3:] == [expected_limit, "user-x", 1.0 - open_brain.DEDUP_COSINE]
+
+    def test_env_flag_and_dedup_false_ignore_it(self, monkeypatch):
+        monkeypatch.setenv("OPEN_BRAIN_DEDUP_SERVER", "true")
+        for dedup, expect in ((True, True), (False, False)):
+            mock_conn, mock_cur = TestD7SqlByteStability._make_mock_conn()
+            with patch.object(open_brain, "_generate_embedding", return_value=[0.1] * 768), \
+                 patch.object(open_brain, "emit_replay_log", return_value=1):
+                open_brain.search(mock_conn, query="q", user_id="u", limit=5, dedup=dedup)
+            assert ("_near_ids" in mock_cur.execute.call_args_list[0][0][0]) is expect
+
+    def test_search_collapses_server_adjacency(self):
+        mock_conn, mock_cur = TestD7SqlByteStability._make_mock_conn()
+        mock_cur.description = [(c,) for c in (
+            "thought_id", "summary", "created_at", "vec_similarity", "hybrid_score", "_near_ids")]
+        mock_cur.fetchall.return_value = [
+            (_id(0), "a", None, 0.9, 0.80, [_id(2)]),
+            (_id(1), "b", None, 0.8, 0.70, []),
+            (_id(2), "a'", None, 0.8, 0.60, [_id(0)]),
+        ]
+        with patch.object(open_brain, "_generate_embedding", return_value=[0.1] * 768), \
+             patch.object(open_brain, "compute_effective_weights_batch", return_value={}), \
+             patch.object(open_brain, "_annotate_provenance"), \
+             patch.object(open_brain, "emit_replay_log", return_value=1):
+            results = open_brain.search(
+                mock_conn, query="q", user_id="u", limit=5, threshold=0.0,
+                dedup=True, dedup_server=True,
+            )
+        assert [r["THOUGHT_ID"] for r in results] == [_id(0), _id(1)]
+        assert results[0]["NEAR_DUPLICATE_IDS"] == [_id(2)]
+        assert all("_NEAR_IDS" not in r and "_NEAR_IDS".lower() not in r for r in results)
+
+
 # ─── D7 + over-fetch — mocked conn/cursor, no DB required ────────────────────
 
 
@@ -256,8 +384,8 @@ class TestD7SqlByteStability:
 
         assert mock_cur.execute.call_count == 1
         sql_text, params = mock_cur.execute.call_args_list[0][0]
-        assert "_embedding_text" not in sql_text
-        assert "embedding::text" not in sql_text
+        assert "_embedding_bin" not in sql_text
+        assert "vector_send(embedding)" not in sql_text
         assert params[-1] == 5, "LIMIT must be the caller's limit, unmodified"
 
     def test_dedup_true_sql_selects_embedding_and_overfetches(self):
@@ -270,8 +398,8 @@ class TestD7SqlByteStability:
             )
 
         sql_text, params = mock_cur.execute.call_args_list[0][0]
-        assert "embedding::text" in sql_text
-        assert "_embedding_text" in sql_text
+        assert "vector_send(embedding)" in sql_text
+        assert "_embedding_bin" in sql_text
         expected_limit = min(5 * open_brain.DEDUP_OVERFETCH_FACTOR, open_brain.DEDUP_OVERFETCH_CAP)
         assert params[-1] == expected_limit
 
@@ -346,8 +474,8 @@ class TestD7GoldenSqlByteStability:
         # must produce a genuinely DIFFERENT SQL string from the dedup=False
         # golden, so this suite actually distinguishes the two code paths.
         assert sql_text != self._GOLDEN_DEDUP_FALSE_SQL
-        assert "_embedding_text" in sql_text
-        assert "embedding::text" in sql_text
+        assert "_embedding_bin" in sql_text
+        assert "vector_send(embedding)" in sql_text
         expected_limit = min(5 * open_brain.DEDUP_OVERFETCH_FACTOR, open_brain.DEDUP_OVERFETCH_CAP)
         assert params[-1] == expected_limit, (
             "dedup=True must over-fetch, not use the caller's raw limit"
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""vector_codec — float32 / pgvector binary codecs for embeddings.
+
+Pure-Python, no DB:
+
+  (a) pack_f32 / unpack_f32 round-trip float32-representable vectors exactly.
+  (b) unpack_pgvector_send decodes the big-endian ``vector_send`` layout and
+      fails open (None) on truncated or garbage input.
+  (c) to_pgvector_literal matches the ``[f1,f2,...]`` shape pgvector parses.
+  (d) open_brain._decode_embedding_column accepts both bytea and ::text values.
+
+Run: python3 -m pytest scripts/tests/test_vector_codec.py -v
+"""
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import vector_codec  # noqa: E402
+
+
+def _vector_send(vec):
+    return struct.pack(">hh", len(vec), 0) + struct.pack(f">{len(vec)}f", *vec)
+
+
+class TestFloat32:
+    def test_round_trip_is_exact_for_float32_values(self):
+        vec = [0.5, -1.25, 3.0, 1e-3]
+        expected = list(struct.unpack("<4f", struct.pack("<4f", *vec)))
+        blob = vector_codec.pack_f32(vec)
+        assert len(blob) == 16
+        assert vector_codec.unpack_f32(blob) == expected
+
+    def test_wire_order_is_little_endian(self):
+        assert vector_codec.pack_f32([1.0]) == struct.pack("<f", 1.0)
+
+    def test_rows_split_and_reject_ragged(self):
+        blob = vector_codec.pack_f32([1.0, 2.0, 3.0, 4.0])
+        assert vector_codec.unpack_f32_rows(blob, 2) == [[1.0, 2.0], [3.0, 4.0]]
+        with pytest.raises(ValueError):
+            vector_codec.unpack_f32_rows(blob, 3)
+
+
+class TestPgvectorSend:
+    def test_decodes_big_endian_payload(self):
+        assert vector_codec.unpack_pgvector_send(_vector_send([0.25, -2.0])) == [0.25, -2.0]
+
+    def test_accepts_memoryview(self):
+        blob = memoryview(_vector_send([1.5] * 768))
+        assert vector_codec.unpack_pgvector_send(blob) == [1.5] * 768
+
+    @pytest.mark.parametrize("blob", [None, b"", b"\x00", _vector_send([1.0, 2.0])[:-1],
+                                      struct.pack(">hh", 0, 0)])
+    def test_malformed_is_none(self, blob):
+        assert vector_codec.unpack_pgvector_send(blob) is None
+
+
+class TestLiteral:
+    def test_literal_shape(self):
+        assert vector_codec.to_pgvector_literal([1, 0.5]) == "[1.0,0.5]"
+
+    def test_accepts_tolist_objects(self):
+        class _Arr:
+            def tolist(self):
+                return [0.25]
+        assert vector_codec.to_pgvector_literal(_Arr()) == "[0.25]"
+
+
+class TestOpenBrainDecode:
+    def test_bytes_and_text_decode_identically(self):
+        import open_brain
+        vec = [0.5, -0.25, 2.0]
+        assert open_brain._decode_embedding_column(_vector_send(vec)) == vec
+        assert open_brain._decode_embedding_column("[0.5,-0.25,2]") == vec
+        assert open_brain._decode_embedding_column(None) is None
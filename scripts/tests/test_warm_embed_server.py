@@ -10,6 +10,8 @@ Verifies:
   (c) A malformed / wrong-dim server response falls back to the local model.
   (d) A server health-check timeout falls back to the local model.
   (e) A server with status != "ok" falls back to the local model.
+  (f) The embed request asks for binary float32 and decodes an
+      application/octet-stream response.
 
 All tests mock HTTP calls and subprocess — no real embed server is needed.
 
@@ -108,6 +110,35 @@ def test_warm_server_returns_correct_length():
     )
 
 
+def test_warm_server_binary_response_is_decoded():
+    """Accept: octet-stream is sent; a raw float32 body is decoded to the same vector."""
+    import vector_codec
+    server_embedding = [0.5] * 768
+    seen_accept = []
+
+    def urlopen_side_effect(request, timeout=None):
+        mock_resp = mock.MagicMock()
+        if "/health" in request.full_url:
+            mock_resp.read.return_value = json.dumps(
+                {"status": "ok", "model": "all-mpnet-base-v2"}).encode("utf-8")
+        else:
+            seen_accept.append(request.get_header("Accept"))
+            mock_resp.headers = {"Content-Type": vector_codec.F32_CONTENT_TYPE}
+            mock_resp.read.return_value = vector_codec.pack_f32(server_embedding)
+        mock_resp.__enter__ = mock.MagicMock(return_value=mock_resp)
+        mock_resp.__exit__ = mock.MagicMock(return_value=False)
+        return mock_resp
+
+    with mock.patch("urllib.request.urlopen", side_effect=urlopen_side_effect), \
+         mock.patch("open_brain._get_embedding_model") as mock_get_model:
+
+        result = open_brain._generate_embedding("binary test")
+
+    assert seen_accept == [vector_codec.F32_CONTENT_TYPE]
+    assert result == server_embedding
+    mock_get_model.assert_not_called()
+
+
 # ─── (b) Server down → fallback + spawn ──────────────────────────────────────
 
 def test_server_down_falls_back_to_local_model():
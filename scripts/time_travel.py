@@ -285,7 +285,71 @@ def inspect_live(
 
     if row is None:
         return None
+    return _live_row_to_result(thought_id, row)
 
+
+def inspect_latest_many(
+    conn,
+    thought_ids: List[str],
+    user_id: str,
+) -> Dict[str, InspectResult]:
+    """Batch form of the no-qualifier inspect path: ``inspect_latest``, else
+    ``inspect_live``, for every thought in ``thought_ids``.
+
+    Two queries however many IDs: the live rows, selected with the same
+    ``thought_id`` + ``user_id`` predicate ``_assert_in_scope`` uses, then
+    the latest version of each thought that query returned. Thoughts NOT in
+    ``user_id``'s scope are absent from the result (never raised here, so
+    one foreign or forgotten ID cannot hide the others); callers report the
+    missing IDs the way a single inspect would.
+    """
+    ids = list(dict.fromkeys(thought_ids))
+    if not ids:
+        return {}
+
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            """
+            SELECT thought_id, raw_text, summary, thought_type, topics, people,
+                   action_items, prov_agent, prov_activity, created_at
+            FROM brain.thoughts
+            WHERE user_id=%s AND thought_id = ANY(%s)
+            """,
+            (user_id, ids),
+        )
+        live = {row[0]: row[1:] for row in cur.fetchall()}
+        versions: Dict[str, tuple] = {}
+        if live:
+            cur.execute(
+                """
+                SELECT DISTINCT ON (thought_id)
+                       thought_id, version_id, revision, raw_text, summary,
+                       thought_type, topics, people, action_items,
+                       prov_agent, prov_activity, parent_version, created_at
+                FROM brain.thought_versions
+                WHERE thought_id = ANY(%s)
+                ORDER BY thought_id, revision DESC
+                """,
+                (list(live),),
+            )
+            versions = {row[0]: row[1:] for row in cur.fetchall()}
+    finally:
+        cur.close()
+
+    results: Dict[str, InspectResult] = {}
+    for thought_id in ids:
+        if thought_id in versions:
+            results[thought_id] = _row_to_result(
+                thought_id, versions[thought_id], query_kind="latest", query_value=None
+            )
+        elif thought_id in live:
+            results[thought_id] = _live_row_to_result(thought_id, live[thought_id])
+    return results
+
+
+def _live_row_to_result(thought_id: str, row: tuple) -> InspectResult:
+    """Convert a brain.thoughts row tuple into a ``source="live"`` result."""
     (
         raw_text,
         summary,
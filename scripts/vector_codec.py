@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""ABOUTME: Compact binary codecs for 768-dim embeddings, shared by open_brain, embed_server,
+ABOUTME: embed_cache and vf_probe — so no hop between them has to go through JSON or float text.
+
+Three representations:
+
+  * raw little-endian float32 — the embed_server wire format
+    (``Accept: application/octet-stream``) and the embed_cache BLOB format.
+    all-mpnet-base-v2 produces float32, so this round-trip is lossless.
+  * pgvector's binary send format — ``vector_send(embedding)`` returns
+    ``int16 dim | int16 unused | dim x float4``, all big-endian (network
+    order). psycopg2 only speaks the text protocol, but a bytea result is
+    decoded in C, so selecting ``vector_send(embedding)`` instead of
+    ``embedding::text`` replaces ~768 Python ``float()`` parses per row with
+    one ``array.frombytes``.
+  * the ``[f1,f2,...]`` text literal for ``%s::vector`` parameters. pgvector's
+    binary input function (``vector_recv``) is not SQL-callable, and psycopg2
+    interpolates parameters as text, so inserts and ANN query vectors stay on
+    the literal; :func:`to_pgvector_literal` is the one place that builds it.
+
+Stdlib-only (``array`` + ``struct``): the hooks import this without numpy.
+"""
+import array
+import struct
+import sys
+from typing import List, Optional
+
+F32_CONTENT_TYPE = "application/octet-stream"
+_PGVECTOR_HEADER = struct.Struct(">hh")
+
+
+def pack_f32(vec) -> bytes:
+    """float sequence -> raw little-endian float32 bytes."""
+    arr = array.array("f", vec)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def unpack_f32(blob) -> List[float]:
+    """raw little-endian float32 bytes -> list of Python floats.
+
+    Raises ValueError when the length is not a multiple of 4.
+    """
+    arr = array.array("f")
+    arr.frombytes(bytes(blob))
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tolist()
+
+
+def unpack_f32_rows(blob, dim: int) -> List[List[float]]:
+    """Concatenated little-endian float32 rows of width ``dim`` -> list of rows."""
+    flat = unpack_f32(blob)
+    if dim <= 0 or len(flat) % dim:
+        raise ValueError(f"{len(flat)} floats do not split into rows of {dim}")
+    return [flat[i:i + dim] for i in range(0, len(flat), dim)]
+
+
+def unpack_pgvector_send(blob) -> Optional[List[float]]:
+    """Decode a ``vector_send(embedding)`` bytea; None if malformed (fail-open)."""
+    if blob is None:
+        return None
+    try:
+        raw = bytes(blob)
+        dim, _unused = _PGVECTOR_HEADER.unpack_from(raw)
+        if dim <= 0 or len(raw) != _PGVECTOR_HEADER.size + 4 * dim:
+            return None
+        arr = array.array("f")
+        arr.frombytes(raw[_PGVECTOR_HEADER.size:])
+        if sys.byteorder == "little":
+            arr.byteswap()
+        return arr.tolist()
+    except (struct.error, TypeError, ValueError):
+        return None
+
+
+def to_pgvector_literal(vec) -> str:
+    """``[f1,f2,...]`` literal for a ``%s::vector`` parameter.
+
+    Accepts lists, tuples, ``array.array`` and numpy arrays (via ``tolist``),
+    so a numpy float32 never leaks its repr into the SQL text.
+    """
+    if hasattr(vec, "tolist"):
+        vec = vec.tolist()
+    return "[" + ",".join(repr(float(v)) for v in vec) + "]"
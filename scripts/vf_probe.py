@@ -39,6 +39,8 @@ import re
 from dataclasses import asdict, dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
+import vector_codec
+
 
 # gz-j5mj7 — fenced-block stripper. Some Claude responses wrap JSON in
 # ```json ... ``` fences; the prior strip("`") + lstrip("json") was
@@ -238,13 +240,17 @@ def _coerce_embedding(raw: Any) -> Optional[List[float]]:
     """Coerce a pgvector return value to a list of floats.
 
     psycopg2 returns pgvector columns as a string ``"[0.1, 0.2, ...]"`` by
-    default; some adapters return a real list. Both are handled here. Returns
+    default; some adapters return a real list; the snapshot query selects
+    ``vector_send(embedding)``, which arrives as ``bytes``/``memoryview``.
+    All three are handled here. Returns
     ``None`` for unparseable / missing values rather than raising — the
     snapshot is permitted to lack an embedding, the perturb-probe generator
     handles the empty case.
     """
     if raw is None:
         return None
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        return vector_codec.unpack_pgvector_send(raw)
     if isinstance(raw, list):
         try:
             return [float(x) for x in raw]
@@ -309,7 +315,7 @@ def build_probe_seed_snapshot(
     try:
         cur.execute(
             """
-            SELECT raw_text, summary, topics, embedding
+            SELECT raw_text, summary, topics, vector_send(embedding)
             FROM brain.thoughts
             WHERE thought_id = %s AND user_id = %s
             """,
@@ -331,7 +337,7 @@ def build_probe_seed_snapshot(
         neighbors_sexprs: List[str] = []
         if embedding_list is not None and topn > 0:
             try:
-                vec_literal = "[" + ",".join(repr(float(v)) for v in embedding_list) + "]"
+                vec_literal = vector_codec.to_pgvector_literal(embedding_list)
                 cur.execute(
                     """
                     SELECT raw_text
@@ -541,9 +547,7 @@ def _score_probe(
     try:
         try:
             if probe_vector is not None and len(probe_vector) > 0:
-                vec_literal = (
-                    "[" + ",".join(repr(float(v)) for v in probe_vector) + "]"
-                )
+                vec_literal = vector_codec.to_pgvector_literal(probe_vector)
                 cur.execute(
                     """
                     SELECT thought_id, 1.0 - (embedding <=> %s::vector) AS sim
@@ -602,6 +606,131 @@ def _score_probe(
         cur.close()
 
 
+# ─── Batched scoring ────────────────────────────────────────────────────────
+
+# Probes per statement. Bounds the statement size (a 768-dim vector literal is
+# ~8 KB) when a caller asks for a large n; the default n=300 fits in one.
+PROBE_BATCH_SIZE: int = 256
+
+# One statement scores many vector probes: each probe literal becomes a row
+# of the unnest, and the LATERAL subquery is exactly _score_probe's top-3
+# query with the probe as its (per-row) parameter, so the HNSW index still
+# serves every probe.
+_VECTOR_BATCH_SQL = """
+    SELECT p.ord, t.thought_id, t.sim
+    FROM (
+        SELECT ord, lit::vector AS vec
+        FROM unnest(%s::text[]) WITH ORDINALITY AS u(lit, ord)
+    ) AS p
+    CROSS JOIN LATERAL (
+        SELECT thought_id, 1.0 - (embedding <=> p.vec) AS sim
+        FROM brain.thoughts
+        WHERE user_id = %s AND embedding IS NOT NULL
+        ORDER BY embedding <=> p.vec
+        LIMIT 3
+    ) AS t
+    ORDER BY p.ord, t.sim DESC
+"""
+
+# Same idea for substring probes: one ILIKE pattern per unnest row, each with
+# _score_probe's user-scoped LIMIT 3.
+_TEXT_BATCH_SQL = """
+    SELECT p.ord, t.thought_id, 1.0 AS sim
+    FROM unnest(%s::text[]) WITH ORDINALITY AS p(pattern, ord)
+    CROSS JOIN LATERAL (
+        SELECT thought_id
+        FROM brain.thoughts
+        WHERE user_id = %s AND raw_text ILIKE p.pattern
+        LIMIT 3
+    ) AS t
+    ORDER BY p.ord
+"""
+
+
+def _batched_top3(
+    conn, sql: str, params: List[str], user_id: str
+) -> Dict[str, List[Tuple[Any, Any]]]:
+    """Run ``sql`` over the distinct ``params``; map each to its top-3 rows.
+
+    Raises on any query error (after rolling back) so the caller can fall
+    back to per-probe scoring.
+    """
+    distinct = list(dict.fromkeys(params))
+    rows_by_param: Dict[str, List[Tuple[Any, Any]]] = {p: [] for p in distinct}
+    cur = conn.cursor()
+    try:
+        for start in range(0, len(distinct), PROBE_BATCH_SIZE):
+            chunk = distinct[start:start + PROBE_BATCH_SIZE]
+            cur.execute(sql, (chunk, user_id))
+            for ord_, thought_id, sim in cur.fetchall():
+                rows_by_param[chunk[int(ord_) - 1]].append((thought_id, sim))
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return rows_by_param
+
+
+def _score_probes_batched(
+    conn,
+    snapshot: ProbeSeedSnapshot,
+    text_probes: List[Tuple[str, str]],
+    vec_probes: List[Tuple[str, List[float]]],
+) -> List[ProbeResult]:
+    """Score every probe in two statements instead of one round trip per probe.
+
+    Returns the same per-probe :class:`ProbeResult` list, in the same order
+    (text probes, then vector probes), that calling :func:`_score_probe` on
+    each would: a probe surfaces the forgotten thought iff it is among that
+    probe's own top-3 rows, and the top row is reported. Identical probes
+    (semantic probes rotate through <= TOPN_NEIGHBORS neighbours) are
+    queried once. If either statement fails, the probes fall back to
+    :func:`_score_probe` one by one, so a batch error never turns into a
+    silent "no residue".
+    """
+    text_keys = [f"%{text[:50]}%" if text else None for _, text in text_probes]
+    vec_keys = [
+        vector_codec.to_pgvector_literal(vec) if vec else None
+        for _, vec in vec_probes
+    ]
+    try:
+        text_rows = _batched_top3(
+            conn, _TEXT_BATCH_SQL, [k for k in text_keys if k], snapshot.user_id
+        ) if any(text_keys) else {}
+        vec_rows = _batched_top3(
+            conn, _VECTOR_BATCH_SQL, [k for k in vec_keys if k], snapshot.user_id
+        ) if any(vec_keys) else {}
+    except Exception:
+        return (
+            [_score_probe(conn, snapshot, kind, text, None) for kind, text in text_probes]
+            + [_score_probe(conn, snapshot, kind, None, vec) for kind, vec in vec_probes]
+        )
+
+    def _result(kind, text, vector_used, rows):
+        top_id = rows[0][0] if rows else None
+        top_sim = float(rows[0][1]) if rows and rows[0][1] is not None else None
+        return ProbeResult(
+            probe_id=-1,
+            probe_kind=kind,
+            probe_text=text,
+            probe_vector_used=vector_used,
+            surfaced_forgotten=any(r[0] == snapshot.forgotten_thought_id for r in rows),
+            top_result_thought_id=top_id,
+            top_result_similarity=top_sim,
+        )
+
+    results = [
+        _result(kind, text, False, text_rows.get(key, []) if key else [])
+        for (kind, text), key in zip(text_probes, text_keys)
+    ]
+    results.extend(
+        _result(kind, None, vec is not None, vec_rows.get(key, []) if key else [])
+        for (kind, vec), key in zip(vec_probes, vec_keys)
+    )
+    return results
+
+
 # ─── Public verify_forgetting entrypoint ────────────────────────────────────
 
 
@@ -831,6 +960,7 @@ def verify_forgetting(
     epsilon: float = DEFAULT_EPSILON,
     distribution: Optional[Dict[str, int]] = None,
     scrub_snapshot: Optional[Dict[str, Any]] = None,
+    batched: bool = True,
 ) -> VerifyForgettingResult:
     """Run ``n`` probes against the live store; verify no residue surfaces.
 
@@ -874,6 +1004,11 @@ def verify_forgetting(
         Optional dict from ``_scrub_residue_surfaces`` — enables per-surface
         presence probes (fblai-152r8 Half-B). If None, only text/vector probes
         run (backward-compatible with callers that don't supply it).
+    batched
+        Score the probes with :func:`_score_probes_batched` (one statement
+        for the text probes, one for the vector probes) rather than one
+        query per probe. The per-probe results, and therefore k and both
+        bounds, are the same either way.
 
     Raises
     ------
@@ -948,18 +1083,15 @@ def verify_forgetting(
     actual_distribution["perturb"] = actual_distribution.get("perturb", 0) + perturb_count
 
     # Score each probe
-    probe_results: List[ProbeResult] = []
-    pid = 0
-    for kind, text in text_probes:
-        result = _score_probe(conn, snapshot, kind, text, None)
-        result.probe_id = pid
-        pid += 1
-        probe_results.append(result)
-    for kind, vec in vec_probes:
-        result = _score_probe(conn, snapshot, kind, None, vec)
+    if batched:
+        probe_results = _score_probes_batched(conn, snapshot, text_probes, vec_probes)
+    else:
+        probe_results = (
+            [_score_probe(conn, snapshot, kind, text, None) for kind, text in text_probes]
+            + [_score_probe(conn, snapshot, kind, None, vec) for kind, vec in vec_probes]
+        )
+    for pid, result in enumerate(probe_results):
         result.probe_id = pid
-        pid += 1
-        probe_results.append(result)
 
     k_standard = sum(1 for r in probe_results if r.surfaced_forgotten)
 
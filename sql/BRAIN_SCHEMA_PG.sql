@@ -258,6 +258,46 @@ CREATE INDEX IF NOT EXISTS atom_links_target_idx ON atom_links(target_id);
 CREATE INDEX IF NOT EXISTS atom_links_type_idx   ON atom_links(link_type);
 CREATE INDEX IF NOT EXISTS atom_links_user_idx   ON atom_links(user_id);
 
+-- ============================================================================
+-- Derivation-ancestry closure (optional; OPEN_BRAIN_ANCESTRY_CLOSURE=true).
+-- One row per (atom, transitive was_derived_from ancestor), written by
+-- capture() so the NAL evidence-independence check is a primary-key lookup
+-- instead of a recursive walk. A cache only: open_brain trusts an atom's rows
+-- when its recorded parent has a depth-1 row, and walks the chain otherwise.
+-- Both FKs CASCADE so a forgotten atom leaves no closure residue;
+-- forget_thought() also drops descendant rows that reached past it.
+-- Backfill for existing atoms: sql/migrations/2026-06-12-thought-ancestry.sql
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS thought_ancestry (
+    thought_id   VARCHAR(64)   NOT NULL REFERENCES thoughts(thought_id) ON DELETE CASCADE,
+    ancestor_id  VARCHAR(64)   NOT NULL REFERENCES thoughts(thought_id) ON DELETE CASCADE,
+    depth        SMALLINT      NOT NULL,
+    user_id      VARCHAR(100)  NOT NULL,
+    PRIMARY KEY (thought_id, ancestor_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_thought_ancestry_ancestor ON thought_ancestry (ancestor_id);
+
+-- ============================================================================
+-- Enrichment queue for write-fast captures (OPEN_BRAIN_WRITE_FAST=true).
+-- capture() inserts the atom with placeholder metadata and this row in one
+-- transaction; open_brain.enrich_pending() claims rows (FOR UPDATE SKIP LOCKED,
+-- leased via not_before), runs the LLM extraction and deletes the row.
+-- attempts counts claims; rows at ENRICH_MAX_ATTEMPTS are no longer claimed.
+-- Migration for existing databases: sql/migrations/2026-06-13-enrichment-queue.sql
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS enrichment_queue (
+    thought_id   VARCHAR(64)   NOT NULL PRIMARY KEY REFERENCES thoughts(thought_id) ON DELETE CASCADE,
+    user_id      VARCHAR(100)  NOT NULL,
+    payload      JSONB         NOT NULL DEFAULT '{}'::jsonb,
+    attempts     INT           NOT NULL DEFAULT 0,
+    last_error   TEXT,
+    not_before   TIMESTAMPTZ   NOT NULL DEFAULT NOW(),
+    enqueued_at  TIMESTAMPTZ   NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_enrichment_queue_due ON enrichment_queue (user_id, not_before);
+
 -- Landing schema for activity logs
 CREATE SCHEMA IF NOT EXISTS landing;
 
@@ -0,0 +1,42 @@
+-- Migration: derivation-ancestry closure table (brain.thought_ancestry)
+-- Optional cache behind OPEN_BRAIN_ANCESTRY_CLOSURE=true: capture() writes each
+-- atom's transitive was_derived_from ancestors so _atoms_dependent (NAL
+-- revision's evidence-independence guard) is one indexed lookup.
+-- Idempotent: CREATE ... IF NOT EXISTS, and the backfill is ON CONFLICT DO NOTHING.
+-- The backfill mirrors open_brain._DERIVATION_ANCESTORS_SQL: same-user hops
+-- only, at most 12 hops (DERIVATION_MAX_DEPTH), cycle-guarded.
+-- Applied live: python3 scripts/open_brain.py --migrate sql/migrations/2026-06-12-thought-ancestry.sql
+
+CREATE TABLE IF NOT EXISTS brain.thought_ancestry (
+    thought_id   VARCHAR(64)   NOT NULL REFERENCES brain.thoughts(thought_id) ON DELETE CASCADE,
+    ancestor_id  VARCHAR(64)   NOT NULL REFERENCES brain.thoughts(thought_id) ON DELETE CASCADE,
+    depth        SMALLINT      NOT NULL,
+    user_id      VARCHAR(100)  NOT NULL,
+    PRIMARY KEY (thought_id, ancestor_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_thought_ancestry_ancestor
+    ON brain.thought_ancestry (ancestor_id);
+
+INSERT INTO brain.thought_ancestry (thought_id, ancestor_id, depth, user_id)
+WITH RECURSIVE chain AS (
+    SELECT thought_id AS origin, user_id, thought_id, was_derived_from, 0 AS depth,
+           ARRAY[thought_id::text] AS path
+      FROM brain.thoughts
+     WHERE was_derived_from IS NOT NULL
+    UNION ALL
+    SELECT c.origin, c.user_id, p.thought_id, p.was_derived_from, c.depth + 1,
+           c.path || p.thought_id::text
+      FROM chain c
+      JOIN brain.thoughts p
+        ON p.thought_id = c.was_derived_from AND p.user_id = c.user_id
+     WHERE c.depth + 1 < 12
+       AND NOT (p.thought_id::text = ANY(c.path))
+)
+SELECT origin, was_derived_from, depth + 1, user_id
+  FROM chain
+ WHERE was_derived_from <> ''
+   AND NOT (was_derived_from::text = ANY(path))
+   -- a dangling parent (FK bypassed) would fail the whole backfill; skip it
+   AND EXISTS (SELECT 1 FROM brain.thoughts x WHERE x.thought_id = chain.was_derived_from)
+ON CONFLICT DO NOTHING;
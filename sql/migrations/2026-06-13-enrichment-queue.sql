@@ -0,0 +1,20 @@
+-- Migration: enrichment queue for write-fast captures (brain.enrichment_queue)
+-- capture(write_fast=True) / OPEN_BRAIN_WRITE_FAST=true inserts the atom with
+-- placeholder metadata plus one row here in the same transaction;
+-- open_brain.py --enrich-pending drains it (LLM metadata, stv, graph edges).
+-- Idempotent: CREATE ... IF NOT EXISTS. No backfill — only write-fast
+-- captures are ever queued.
+-- Applied live: python3 scripts/open_brain.py --migrate sql/migrations/2026-06-13-enrichment-queue.sql
+
+CREATE TABLE IF NOT EXISTS brain.enrichment_queue (
+    thought_id   VARCHAR(64)   NOT NULL PRIMARY KEY REFERENCES brain.thoughts(thought_id) ON DELETE CASCADE,
+    user_id      VARCHAR(100)  NOT NULL,
+    payload      JSONB         NOT NULL DEFAULT '{}'::jsonb,
+    attempts     INT           NOT NULL DEFAULT 0,
+    last_error   TEXT,
+    not_before   TIMESTAMPTZ   NOT NULL DEFAULT NOW(),
+    enqueued_at  TIMESTAMPTZ   NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_enrichment_queue_due
+    ON brain.enrichment_queue (user_id, not_before);
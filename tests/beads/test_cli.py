@@ -111,6 +111,28 @@ class TestCLI:
             assert result.exit_code == 0
             assert 'Ready task' in result.output
 
+    def test_ready_json_and_label(self, runner, tmp_path):
+        """CLI can output the ready frontier as JSON, filtered by label."""
+        from beads.cli import cli
+        import json
+
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            runner.invoke(cli, ['init', '--prefix', 'test'])
+            first = runner.invoke(cli, ['create', 'Molecule step']).output.strip().split()[-1]
+            runner.invoke(cli, ['create', 'Unlabelled'])
+            blocked = runner.invoke(cli, ['create', 'Blocked step']).output.strip().split()[-1]
+            runner.invoke(cli, ['label', first, 'mol'])
+            runner.invoke(cli, ['label', blocked, 'mol'])
+            runner.invoke(cli, ['depend', blocked, first])
+
+            result = runner.invoke(cli, ['ready', '--json', '-l', 'mol'])
+            assert result.exit_code == 0
+            assert [b['id'] for b in json.loads(result.output)] == [first]
+
+            runner.invoke(cli, ['close', first])
+            result = runner.invoke(cli, ['ready', '--json', '--label', 'mol'])
+            assert [b['id'] for b in json.loads(result.output)] == [blocked]
+
     def test_list_with_status_filter(self, runner, tmp_path):
         """CLI can filter list by status."""
         from beads.cli import cli
@@ -157,6 +179,22 @@ class TestCLI:
             data = json.loads(result.output)
             assert data['title'] == 'JSON show task'
 
+    def test_show_many_json_output(self, runner, tmp_path):
+        """CLI shows several issues in one call; unknown IDs go to stderr."""
+        from beads.cli import cli
+        import json
+
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            runner.invoke(cli, ['init', '--prefix', 'test'])
+            first = runner.invoke(cli, ['create', 'First']).output.strip().split()[-1]
+            second = runner.invoke(cli, ['create', 'Second']).output.strip().split()[-1]
+
+            result = runner.invoke(cli, ['show', first, 'test-missing', second, '--json'])
+            assert result.exit_code == 0
+            data = json.loads(result.stdout)
+            assert [d['id'] for d in data] == [first, second]
+            assert 'Issue not found: test-missing' in result.stderr
+
     def test_version_option(self, runner):
         """CLI shows version."""
         from beads.cli import cli
@@ -164,3 +164,179 @@ class TestBeadsDatabase:
 
         assert retrieved is not None
         assert retrieved.title == "Persistent"
+
+    def test_update_appends_instead_of_rewriting(self, temp_beads_dir):
+        """Each mutation appends one snapshot; the last line for an id wins on load."""
+        from beads.storage import BeadsDatabase
+
+        db = BeadsDatabase(temp_beads_dir)
+        a = db.create(title="A")
+        b = db.create(title="B")
+        db.update(a.id, status="in_progress")
+        db.close(a.id)
+
+        lines = (temp_beads_dir / "issues.jsonl").read_text().splitlines()
+        assert len(lines) == 4
+
+        reloaded = BeadsDatabase(temp_beads_dir)
+        assert reloaded.get(a.id).status.value == "closed"
+        assert reloaded.get(b.id).status.value == "open"
+
+    def test_compaction_folds_superseded_lines(self, temp_beads_dir, monkeypatch):
+        """Once superseded lines dominate, the log is compacted to one line per issue."""
+        from beads import storage
+        from beads.storage import BeadsDatabase
+
+        monkeypatch.setattr(storage, "COMPACT_MIN_LINES", 10)
+        monkeypatch.setattr(storage, "COMPACT_RATIO", 2)
+        db = BeadsDatabase(temp_beads_dir)
+        issue = db.create(title="Churn")
+        for priority in range(9):
+            db.update(issue.id, priority=priority % 4)
+
+        lines = (temp_beads_dir / "issues.jsonl").read_text().splitlines()
+        assert len(lines) == 1
+        assert BeadsDatabase(temp_beads_dir).get(issue.id).priority == 0
+
+    def test_compaction_keeps_other_writers_lines(self, temp_beads_dir):
+        """compact() works from the file, so another instance's appends survive."""
+        from beads.storage import BeadsDatabase
+
+        db1 = BeadsDatabase(temp_beads_dir)
+        mine = db1.create(title="Mine")
+        db2 = BeadsDatabase(temp_beads_dir)
+        theirs = db2.create(title="Theirs")
+        db1.update(mine.id, title="Mine v2")
+        db1.compact()
+
+        reloaded = BeadsDatabase(temp_beads_dir)
+        assert reloaded.get(theirs.id).title == "Theirs"
+        assert reloaded.get(mine.id).title == "Mine v2"
+
+    def test_indexes_follow_updates(self, temp_beads_dir):
+        """list() filters served from the indexes track status/label/assignee changes."""
+        from beads.storage import BeadsDatabase
+
+        db = BeadsDatabase(temp_beads_dir)
+        parent = db.create(title="Epic", type="epic")
+        a = db.create(title="A", parent=parent.id, labels=["mayor"])
+        b = db.create(title="B", parent=parent.id)
+
+        db.update(a.id, status="in_progress", assignee="polecat-1")
+        assert db.add_label(b.id, "mayor")
+        assert not db.add_label(b.id, "mayor")
+
+        assert [i.id for i in db.list(status="open")] == [parent.id, b.id]
+        assert [i.id for i in db.list(status="in_progress")] == [a.id]
+        assert {i.id for i in db.list(label="mayor")} == {a.id, b.id}
+        assert [i.id for i in db.list(assignee="polecat-1")] == [a.id]
+        assert {i.id for i in db.list(parent=parent.id, assignee="")} == {b.id}
+        assert [i.id for i in db.list(parent="")] == [parent.id]
+        assert db.list(label="nope") == []
+
+        reloaded = BeadsDatabase(temp_beads_dir)
+        assert {i.id for i in reloaded.list(label="mayor")} == {a.id, b.id}
+        assert reloaded.get(parent.id).children == [a.id, b.id]
+
+    def test_ready_frontier_tracks_mutations(self, temp_beads_dir):
+        """The incremental frontier matches a full recompute after every mutation."""
+        import random
+        from beads.models import IssueStatus
+        from beads.storage import BeadsDatabase
+
+        def brute_force(db):
+            done = (IssueStatus.DONE, IssueStatus.CLOSED)
+            return sorted(
+                i.id for i in db._cache.values()
+                if i.status == IssueStatus.OPEN and not any(
+                    d in db._cache and db._cache[d].status not in done for d in i.depends_on)
+            )
+
+        rng = random.Random(7)
+        db = BeadsDatabase(temp_beads_dir)
+        ids = [db.create(title=f"t{n}").id for n in range(12)]
+        statuses = ["open", "in_progress", "done", "closed", "open"]
+        for _ in range(200):
+            a, b = rng.sample(ids, 2)
+            op = rng.random()
+            if op < 0.35:
+                db.add_dependency(a, b)
+            elif op < 0.5:
+                db.remove_dependency(a, b)
+            elif op < 0.9:
+                db.update(a, status=rng.choice(statuses))
+            else:
+                ids.append(db.create(title="late").id)
+            assert sorted(i.id for i in db.ready()) == brute_force(db)
+
+        reloaded = BeadsDatabase(temp_beads_dir)
+        assert sorted(i.id for i in reloaded.ready()) == brute_force(db)
+
+    def test_ready_label_filter(self, temp_beads_dir):
+        """ready(label=...) intersects the frontier with the label index."""
+        from beads.storage import BeadsDatabase
+
+        db = BeadsDatabase(temp_beads_dir)
+        step = db.create(title="Step", labels=["mol"])
+        db.create(title="Other")
+        blocked = db.create(title="Blocked", labels=["mol"])
+        db.add_dependency(blocked.id, step.id)
+
+        assert [i.id for i in db.ready(label="mol")] == [step.id]
+        db.close(step.id)
+        assert [i.id for i in db.ready(label="mol")] == [blocked.id]
+
+    def test_refresh_reads_other_instances_appends(self, temp_beads_dir):
+        """refresh() tails the log and applies another process's writes to indexes and frontier."""
+        from beads.storage import BeadsDatabase
+
+        mine = BeadsDatabase(temp_beads_dir)
+        theirs = BeadsDatabase(temp_beads_dir)
+        step = mine.create(title="Step", labels=["mol"])
+        assert mine.refresh() is False
+
+        theirs.refresh()
+        theirs.close(step.id)
+        late = theirs.create(title="Late", labels=["mol"])
+
+        assert mine.refresh() is True
+        assert mine.get(step.id).status.value == "closed"
+        assert [i.id for i in mine.ready(label="mol")] == [late.id]
+        assert mine.refresh() is False
+
+    def test_refresh_reloads_after_foreign_compaction(self, temp_beads_dir):
+        """A log replaced by another instance's compact() is re-read in full."""
+        from beads.storage import BeadsDatabase
+
+        mine = BeadsDatabase(temp_beads_dir)
+        issue = mine.create(title="Task")
+        theirs = BeadsDatabase(temp_beads_dir)
+        theirs.update(issue.id, title="Renamed")
+        theirs.compact()
+
+        assert mine.refresh() is True
+        assert mine.get(issue.id).title == "Renamed"
+        mine.update(issue.id, status="in_progress")
+        assert BeadsDatabase(temp_beads_dir).get(issue.id).status.value == "in_progress"
+
+    def test_batch_appends_each_touched_issue_once(self, temp_beads_dir):
+        """Mutations inside batch() land as one line per issue, in final state, at exit."""
+        from beads.storage import BeadsDatabase
+
+        db = BeadsDatabase(temp_beads_dir)
+        a = db.create(title="A")
+        b = db.create(title="B")
+        before = db.issues_file.read_text().count("\n")
+
+        with db.batch():
+            db.update(a.id, status="in_progress")
+            db.update(b.id, status="in_progress")
+            with db.batch():
+                db.close(a.id)
+            assert db.issues_file.read_text().count("\n") == before
+            assert db.get(a.id).status.value == "closed"
+
+        assert db.issues_file.read_text().count("\n") == before + 2
+        reloaded = BeadsDatabase(temp_beads_dir)
+        assert reloaded.get(a.id).status.value == "closed"
+        assert reloaded.get(b.id).status.value == "in_progress"
@@ -185,6 +185,103 @@ class TestCitationNodeDataclass:
         assert decoded["children"][0]["thought_id"] == "t-parent"
 
 
+# ─── Recursive-CTE mode vs per-step walk (no DB) ─────────────────────────────
+
+
+class _ChainCursor:
+    """Answers both walker query shapes from an in-memory brain.thoughts.
+
+    The WITH RECURSIVE branch evaluates the CTE the way Postgres would
+    (anchor under scope, in-scope parent join, depth and path guards).
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+
+    def _row(self, tid, user_id):
+        row = self.conn.rows.get(tid)
+        return row if row is not None and row["user_id"] == user_id else None
+
+    def execute(self, sql, params):
+        self.conn.statements += 1
+        if "WITH RECURSIVE" in sql:
+            row = self._row(params["thought_id"], params["user_id"])
+            depth, path, out = 0, [], []
+            while row is not None:
+                path.append(row["thought_id"])
+                out.append((
+                    row["thought_id"], depth, (row["raw_text"] or "")[:params["preview"]],
+                    row["prov_agent"], "capture", f"activity-{row['thought_id']}",
+                    row["parent"], None, row["stv_f"], 0.9,
+                ))
+                parent = self._row(row["parent"], params["user_id"]) if row["parent"] else None
+                if parent is None or depth + 1 >= params["max_depth"] or parent["thought_id"] in path:
+                    break
+                row, depth = parent, depth + 1
+            self._rows = out
+        elif sql.lstrip().startswith("SELECT 1"):
+            self._rows = [(1,)] if self._row(*params) else []
+        else:
+            row = self._row(*params)
+            self._rows = [] if row is None else [(
+                row["raw_text"], row["prov_agent"], "capture", f"activity-{row['thought_id']}",
+                row["parent"], None, row["stv_f"], 0.9,
+            )]
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class _ChainConn:
+    def __init__(self, *rows):
+        self.rows = {
+            tid: {"thought_id": tid, "user_id": uid, "parent": parent,
+                  "raw_text": f"text of {tid} " * 40, "prov_agent": "agent", "stv_f": 0.7}
+            for tid, uid, parent in rows
+        }
+        self.statements = 0
+
+    def cursor(self):
+        return _ChainCursor(self)
+
+
+class TestRecursiveMode:
+    @pytest.mark.parametrize("rows,start,max_depth,markers", [
+        ([("a", "u", None)], "a", 50, []),
+        ([("c", "u", "b"), ("b", "u", "a"), ("a", "u", None)], "c", 50, []),
+        ([("c", "u", "b"), ("b", "u", "a"), ("a", "u", None)], "c", 2, ["max-depth"]),
+        ([("b", "u", "a"), ("a", "other", None)], "b", 50, ["orphaned"]),
+        ([("b", "u", "ghost")], "b", 50, ["orphaned"]),
+        ([("c", "u", "b"), ("b", "u", "a"), ("a", "u", "c")], "c", 50, ["cycle"]),
+        ([("a", "u", "a")], "a", 1, ["max-depth"]),
+    ])
+    def test_matches_per_step_walk(self, rows, start, max_depth, markers):
+        fast_conn, slow_conn = _ChainConn(*rows), _ChainConn(*rows)
+        fast = citation_walker.trace_citation(fast_conn, start, "u", max_depth=max_depth)
+        slow = citation_walker.trace_citation(slow_conn, start, "u", max_depth=max_depth, recursive=False)
+        assert citation_walker.citation_node_to_dict(fast) == citation_walker.citation_node_to_dict(slow)
+        assert fast_conn.statements == 1
+
+        found, node = [], fast
+        while node.children:
+            node = node.children[0]
+            if node.orphan_marker:
+                found.append(node.orphan_marker)
+        assert found == markers
+
+    def test_out_of_scope_start_rejected(self):
+        conn = _ChainConn(("a", "other", None))
+        with pytest.raises(RuntimeError, match="not in user scope"):
+            citation_walker.trace_citation(conn, "a", "u")
+
+
 # ─── Basics: NULL / chain-of-2 / chain-of-3 ──────────────────────────────────
 
 
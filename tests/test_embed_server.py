@@ -10,13 +10,14 @@ import urllib.error
 import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
-from embed_server import make_handler, start_idle_watchdog
+from embed_server import MAX_BATCH, MicroBatcher, make_handler, start_idle_watchdog
+from vector_codec import F32_CONTENT_TYPE, unpack_f32, unpack_f32_rows
 from http.server import ThreadingHTTPServer
 
 
-def _make_server(encode_fn=lambda t: [0.1] * 768, state=None):
+def _make_server(encode_fn=lambda t: [0.1] * 768, state=None, batcher=None):
     state = state if state is not None else {"last_request": time.time()}
-    handler = make_handler(encode_fn, "fake-model", 0.0, state)
+    handler = make_handler(encode_fn, "fake-model", 0.0, state, batcher=batcher)
     srv = ThreadingHTTPServer(("127.0.0.1", 0), handler)
     thread = threading.Thread(target=srv.serve_forever, daemon=True)
     thread.start()
@@ -30,9 +31,12 @@ def server_url():
     srv.shutdown()
 
 
-def _post(url, body, raw=False):
+def _post(url, body, raw=False, accept=None):
     data = body if raw else json.dumps(body).encode()
-    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"}, method="POST")
+    headers = {"Content-Type": "application/json"}
+    if accept:
+        headers["Accept"] = accept
+    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
     return urllib.request.urlopen(req, timeout=5)
 
 
@@ -102,3 +106,127 @@ def test_idle_watchdog_shuts_down_after_idle():
 
 def test_idle_watchdog_disabled_when_zero():
     assert start_idle_watchdog(None, {"last_request": 0.0}, idle_s=0, interval=0.05) is None
+
+
+# ─── /embed_batch + micro-batching ───────────────────────────────────────────
+
+
+def test_embed_batch_returns_one_vector_per_text(server_url):
+    with _post(server_url + "/embed_batch", {"texts": ["a", "b", "c"]}) as r:
+        payload = json.load(r)
+    assert r.status == 200
+    assert payload["count"] == 3
+    assert payload["dim"] == 768
+    assert len(payload["embeddings"]) == 3
+
+
+@pytest.mark.parametrize("body", [{"texts": []}, {"texts": "one"}, {"texts": ["ok", ""]}, {"text": "x"}])
+def test_embed_batch_rejects_bad_texts(server_url, body):
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _post(server_url + "/embed_batch", body)
+    assert exc.value.code == 400
+
+
+def test_embed_batch_over_max_is_413(server_url):
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _post(server_url + "/embed_batch", {"texts": ["t"] * (MAX_BATCH + 1)})
+    assert exc.value.code == 413
+
+
+# ─── binary float32 responses ────────────────────────────────────────────────
+
+
+def test_embed_returns_f32_when_accepted():
+    srv, _t, url, _s = _make_server(encode_fn=lambda t: [0.5, -1.25, 3.0])
+    try:
+        with _post(url + "/embed", {"text": "x"}, accept=F32_CONTENT_TYPE) as r:
+            body = r.read()
+            assert r.headers["Content-Type"] == F32_CONTENT_TYPE
+            assert r.headers["X-Embedding-Dim"] == "3"
+    finally:
+        srv.shutdown()
+    assert unpack_f32(body) == [0.5, -1.25, 3.0]
+
+
+def test_embed_batch_returns_f32_rows_when_accepted(server_url):
+    with _post(server_url + "/embed_batch", {"texts": ["a", "b"]}, accept=F32_CONTENT_TYPE) as r:
+        body = r.read()
+        assert r.headers["X-Embedding-Count"] == "2"
+        dim = int(r.headers["X-Embedding-Dim"])
+    rows = unpack_f32_rows(body, dim)
+    assert len(rows) == 2 and all(len(v) == 768 for v in rows)
+
+
+def test_embed_defaults_to_json_without_accept(server_url):
+    with _post(server_url + "/embed", {"text": "x"}) as r:
+        assert r.headers["Content-Type"].startswith("application/json")
+        assert len(json.load(r)["embedding"]) == 768
+
+
+def test_micro_batcher_coalesces_concurrent_embeds():
+    calls = []
+
+    def encode_batch(texts):
+        calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    batcher = MicroBatcher(encode_batch, window_s=0.2)
+    srv, _t, url, _s = _make_server(encode_fn=None, batcher=batcher)
+    results = {}
+
+    def worker(text):
+        with _post(url + "/embed", {"text": text}) as r:
+            results[text] = json.load(r)["embedding"]
+
+    try:
+        threads = [threading.Thread(target=worker, args=("x" * n,)) for n in range(1, 6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+    finally:
+        srv.shutdown()
+        batcher.close()
+    # Every caller got ITS OWN row back ...
+    assert results == {"x" * n: [float(n)] for n in range(1, 6)}
+    # ... from fewer encode() calls than requests (all five normally share one).
+    assert sum(len(c) for c in calls) == 5
+    assert len(calls) < 5
+
+
+def test_micro_batcher_splits_at_max_batch_and_preserves_order():
+    calls = []
+
+    def encode_batch(texts):
+        calls.append(len(texts))
+        return [[int(t)] for t in texts]
+
+    batcher = MicroBatcher(encode_batch, window_s=0.05, max_batch=4)
+    try:
+        out = batcher.submit_many([str(i) for i in range(10)])
+    finally:
+        batcher.close()
+    assert out == [[i] for i in range(10)]
+    assert max(calls) <= 4
+
+
+def test_micro_batcher_error_fails_group_and_worker_survives():
+    state = {"fail": True}
+
+    def encode_batch(texts):
+        if state["fail"]:
+            raise RuntimeError("boom")
+        return [[1.0] for _ in texts]
+
+    batcher = MicroBatcher(encode_batch, window_s=0.0)
+    srv, _t, url, _s = _make_server(encode_fn=None, batcher=batcher)
+    try:
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            _post(url + "/embed", {"text": "hi"})
+        assert exc.value.code == 500
+        state["fail"] = False
+        with _post(url + "/embed_batch", {"texts": ["a", "b"]}) as r:
+            assert json.load(r)["embeddings"] == [[1.0], [1.0]]
+    finally:
+        srv.shutdown()
+        batcher.close()
@@ -238,6 +238,28 @@ class TestInspectLatest:
             _cleanup(conn, tid)
 
 
+class TestInspectLatestMany:
+    def test_versions_live_rows_and_foreign_ids(self, conn):
+        snap = open_brain.capture(conn, text="snapshotted", user_id="insp-many")["thought_id"]
+        live = open_brain.capture(conn, text="live only", user_id="insp-many")["thought_id"]
+        other = open_brain.capture(conn, text="foreign", user_id="insp-many-other")["thought_id"]
+        try:
+            open_brain.snapshot_thought(conn, snap, "insp-many")
+            open_brain.snapshot_thought(conn, snap, "insp-many")
+            results = time_travel.inspect_latest_many(
+                conn, [snap, live, other, snap], "insp-many"
+            )
+            assert list(results) == [snap, live]
+            assert results[snap].revision == 2 and results[snap].source == "version"
+            assert results[live].source == "live" and results[live].raw_text == "live only"
+
+            payload = open_brain._inspect_many(conn, [live, other], "insp-many")
+            assert payload[live]["source"] == "live"
+            assert payload[other]["result"] is None and "not in user scope" in payload[other]["error"]
+        finally:
+            _cleanup(conn, snap, live, other)
+
+
 # ─── inspect after rollback (RB invariant exposed) ──────────────────────────
 
 
@@ -298,7 +320,7 @@ class TestInspectCli:
             cwd=os.path.join(os.path.dirname(__file__), ".."),
         )
         assert result.returncode == 0
-        for flag in ("--inspect", "--at", "--at-revision"):
+        for flag in ("--inspect", "--inspect-many", "--at", "--at-revision"):
             assert flag in result.stdout, f"{flag} not in --help"
 
     def test_inspect_json_output_schema(self, conn):
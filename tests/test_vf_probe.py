@@ -9,7 +9,9 @@ procurement headline — these tests anchor it.
 
 Run: python3 -m pytest tests/test_vf_probe.py -v
 """
+import math
 import os
+import re
 import sys
 import pytest
 import psycopg2
@@ -233,6 +235,133 @@ class TestProbeGeneration:
             assert p in snap.forgotten_text
 
 
+# ─── Batched probe scoring (no DB) ──────────────────────────────────────────
+
+
+class _StoreCursor:
+    """Answers vf_probe's probe queries from an in-memory brain.thoughts."""
+
+    def __init__(self, store):
+        self.store = store
+        self._rows = []
+
+    @staticmethod
+    def _ilike(pattern, text):
+        rx = "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern)
+        return re.fullmatch(rx, text, re.IGNORECASE | re.DOTALL) is not None
+
+    @staticmethod
+    def _cos_dist(a, b):
+        dot = sum(x * y for x, y in zip(a, b))
+        return 1.0 - dot / (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b)))
+
+    def _text_top3(self, user_id, pattern):
+        return [(tid, 1.0) for tid, uid, text, _ in self.store.rows
+                if uid == user_id and self._ilike(pattern, text)][:3]
+
+    def _vec_top3(self, user_id, literal):
+        probe = [float(v) for v in literal.strip("[]").split(",")]
+        hits = sorted((self._cos_dist(emb, probe), tid) for tid, uid, _, emb in self.store.rows
+                      if uid == user_id and emb is not None)
+        return [(tid, 1.0 - d) for d, tid in hits[:3]]
+
+    def execute(self, sql, params):
+        self.store.statements.append(sql)
+        if self.store.fail_batches and "unnest" in sql:
+            raise RuntimeError("unnest refused")
+        if "unnest" in sql:
+            keys, user_id = params
+            top3 = self._text_top3 if "ILIKE" in sql else self._vec_top3
+            self._rows = [(i, tid, sim) for i, key in enumerate(keys, 1)
+                          for tid, sim in top3(user_id, key)]
+        elif "ILIKE" in sql:
+            self._rows = self._text_top3(params[0], params[1])
+        else:
+            self._rows = self._vec_top3(params[1], params[0])
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class _StoreConn:
+    def __init__(self, rows, fail_batches=False):
+        self.rows = rows  # (thought_id, user_id, raw_text, embedding)
+        self.fail_batches = fail_batches
+        self.statements = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return _StoreCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class TestBatchedScoring:
+    """_score_probes_batched returns exactly the per-probe _score_probe results."""
+
+    TEXT = "The quick brown fox jumps over the lazy dog. Residue canary 42."
+
+    def _snapshot(self):
+        return vf_probe.ProbeSeedSnapshot(
+            forgotten_thought_id="brain-forgotten",
+            forgotten_text=self.TEXT,
+            forgotten_summary=None,
+            forgotten_embedding=[1.0, 0.0, 0.0, 0.0],
+            neighbors_sexprs=["lazy dog", "neighbour two", "no match anywhere"],
+            user_id="alice",
+        )
+
+    def _rows(self, residue):
+        rows = [
+            ("brain-n1", "alice", "a lazy dog naps", [0.9, 0.1, 0.0, 0.0]),
+            ("brain-n2", "alice", "neighbour two", [0.0, 1.0, 0.0, 0.0]),
+            ("brain-n3", "alice", "unrelated", None),
+            ("brain-bob", "bob", self.TEXT, [1.0, 0.0, 0.0, 0.0]),
+        ]
+        if residue:
+            rows.insert(0, ("brain-forgotten", "alice", self.TEXT, [1.0, 0.0, 0.0, 0.0]))
+        return rows
+
+    @pytest.mark.parametrize("residue", [False, True])
+    def test_batched_matches_per_probe(self, monkeypatch, residue):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        snap = self._snapshot()
+        slow_conn = _StoreConn(self._rows(residue))
+        fast_conn = _StoreConn(self._rows(residue))
+        slow = vf_probe.verify_forgetting(slow_conn, snap, n=40, batched=False)
+        fast = vf_probe.verify_forgetting(fast_conn, snap, n=40)
+
+        assert fast.probes == slow.probes
+        assert (fast.k, fast.accepted) == (slow.k, slow.accepted)
+        assert fast.accepted is not residue
+        assert fast.exactBinomialBound == slow.exactBinomialBound
+        assert len(slow_conn.statements) == 40
+        assert len(fast_conn.statements) == 2
+
+    def test_batch_failure_falls_back_to_per_probe(self, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        snap = self._snapshot()
+        conn = _StoreConn(self._rows(True), fail_batches=True)
+        result = vf_probe.verify_forgetting(conn, snap, n=20)
+        assert conn.rollbacks == 1
+        assert result.k > 0 and not result.accepted
+        reference = vf_probe.verify_forgetting(_StoreConn(self._rows(True)), snap, n=20, batched=False)
+        assert result.probes == reference.probes
+
+    def test_chunks_large_probe_sets(self, monkeypatch):
+        monkeypatch.setattr(vf_probe, "PROBE_BATCH_SIZE", 4)
+        conn = _StoreConn(self._rows(False))
+        text_probes = [("partial", f"fragment {i}") for i in range(10)] + [("semantic", "lazy dog")] * 5
+        results = vf_probe._score_probes_batched(conn, self._snapshot(), text_probes, [])
+        assert len(results) == 15
+        assert len(conn.statements) == 3  # 11 distinct patterns / 4 per statement
+        assert results[-1].top_result_thought_id == "brain-n1"
+
+
 # ─── End-to-end verify_forgetting accept/reject ─────────────────────────────
 
 